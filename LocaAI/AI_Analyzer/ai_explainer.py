@@ -2,92 +2,248 @@
 # XGBoost 모델 결과 설명을 위한 ChatGPT API 연동
 
 import os
+from functools import lru_cache
 from openai import OpenAI
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from django.conf import settings
 from django.utils.translation import get_language
 
+from . import explanation_cache
+from .local_explainer import build_local_explanation, contributions_available, format_contributions_for_prompt
 
-def get_xgboost_explanation(features_dict: Dict[str, Any], survival_percentage: float) -> str:
+
+# Django 언어 코드 -> 프롬프트 언어
+LANGUAGE_MAPPING = {
+    'ko': 'ko',
+    'ko-kr': 'ko',
+    'en': 'en',
+    'en-us': 'en',
+    'es': 'es',
+    'es-es': 'es'
+}
+
+# 언어별 시스템 메시지
+SYSTEM_MESSAGES = {
+    'ko': "당신은 상권분석과 창업 컨설팅 전문가입니다.",
+    'en': "You are a commercial area analysis and startup consulting expert.",
+    'es': "Eres un experto en análisis de zonas comerciales y consultoría de startups."
+}
+
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> OpenAI:
+    """
+    프로세스 단위로 재사용하는 OpenAI 클라이언트 (HTTP 연결 풀 공유)
+
+    Note:
+        - LOCAL_EXPLANATION["LLM_TIMEOUT"]을 넘기면 실패로 처리되어 기여도 기반 로컬 설명으로 대체
+    """
+    timeout = getattr(settings, "ANALYSIS_SETTINGS", {}).get("LOCAL_EXPLANATION", {}).get("LLM_TIMEOUT", 30)
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"), timeout=timeout, max_retries=0)
+
+
+def map_language(language: Optional[str] = None) -> str:
+    """Django 언어 코드(없으면 현재 활성 언어)를 ko/en/es 로 변환"""
+    try:
+        current_language = language or get_language() or 'ko'
+        return LANGUAGE_MAPPING.get(current_language.lower(), 'ko')
+    except Exception:
+        return 'ko'
+
+
+def get_fallback_explanation(survival_percentage: float, language: Optional[str] = None,
+                             local_explanation: Optional[Dict[str, Any]] = None) -> Tuple[str, str]:
+    """
+    ChatGPT 호출 실패 시 사용할 언어별 (설명, 요약) 메시지
+
+    Note:
+        - 피쳐 기여도(local_explanation)가 있으면 상승/하락 요인을 담은 로컬 설명을 반환
+    """
+    mapped_language = map_language(language)
+    if contributions_available(local_explanation):
+        return build_local_explanation(local_explanation, survival_percentage, mapped_language)
+    error_messages = {
+        'ko': f"생존 확률 {survival_percentage}%로 예측되었습니다.\n\n상세한 분석을 위해 잠시 후 다시 시도해주세요.",
+        'en': f"Survival probability predicted as {survival_percentage}%.\n\nPlease try again later for detailed analysis.",
+        'es': f"Probabilidad de supervivencia predicha como {survival_percentage}%.\n\nPor favor, inténtelo de nuevo más tarde para un análisis detallado."
+    }
+    summary_messages = {
+        'ko': f"생존 확률 {survival_percentage}%로 예측되었습니다.",
+        'en': f"Survival probability predicted as {survival_percentage}%.",
+        'es': f"Probabilidad de supervivencia predicha como {survival_percentage}%."
+    }
+    return (
+        error_messages.get(mapped_language, error_messages['ko']),
+        summary_messages.get(mapped_language, summary_messages['ko']),
+    )
+
+
+def prepare_explanation(features_dict: Dict[str, Any], survival_percentage: float,
+                        language: Optional[str] = None,
+                        local_explanation: Optional[Dict[str, Any]] = None) -> Tuple[str, str, str]:
+    """
+    설명 요청 준비
+
+    Returns:
+        tuple: (매핑된 언어, 피쳐 요약 문자열, 설명 캐시 키)
+
+    Note:
+        - 설명 캐시를 쓰면 피쳐를 버킷화한 뒤 요약 (explanation_cache.bucket_features)
+        - 피쳐 기여도가 있으면 전체 피쳐 대신 기여도 상위 피쳐만 요약해 프롬프트를 줄임
+    """
+    mapped_language = map_language(language)
+    if contributions_available(local_explanation):
+        if explanation_cache.is_enabled():
+            local_explanation = explanation_cache.bucket_contributions(local_explanation)
+        feature_summary = format_contributions_for_prompt(local_explanation, mapped_language)
+        cache_key = explanation_cache.explanation_key(feature_summary, survival_percentage, mapped_language)
+        return mapped_language, feature_summary, cache_key
+
+    if explanation_cache.is_enabled():
+        features_dict = explanation_cache.bucket_features(features_dict)
+
+    # 피쳐 정보를 분석하기 쉽게 정리
+    feature_summary = format_features_for_analysis(features_dict, mapped_language)
+    cache_key = explanation_cache.explanation_key(feature_summary, survival_percentage, mapped_language)
+    return mapped_language, feature_summary, cache_key
+
+
+def result_features(result):
+    """AnalysisResult -> format_features_for_analysis 입력 피쳐 딕셔너리"""
+    return {
+        'Area': result.area,
+        'Service': result.service_type,
+        'Total_LV': result.total_land_value,
+        '1A_Total': result.life_pop_300m,
+        'Working_Pop': result.working_pop_300m,
+        '1A_20': result.life_pop_20_300m,
+        '1A_30': result.life_pop_30_300m,
+        '1A_40': result.life_pop_40_300m,
+        'Competitor_C': result.competitor_300m,
+        'Adjacent_BIZ': result.adjacent_biz_300m,
+        'Competitor_R': result.competitor_ratio_300m,
+        'Business_D': result.business_diversity_300m,
+        'School': result.school_250m,
+        'PubBuilding': result.public_building_250m,
+        '1A_Long_Total': result.long_foreign_300m,
+        '2A_Temp_Total': result.temp_foreign_1000m,
+    }
+
+
+def build_explanation_messages(mapped_language: str, survival_percentage: float,
+                               feature_summary: str) -> List[Dict[str, str]]:
+    """ChatGPT 요청 메시지 (시스템 + 사용자 프롬프트)"""
+    # 언어별 프롬프트 설정
+    prompt = get_analysis_prompt(mapped_language, survival_percentage, feature_summary)
+    return [
+        {"role": "system", "content": SYSTEM_MESSAGES.get(mapped_language, SYSTEM_MESSAGES['ko'])},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def get_xgboost_explanation(features_dict: Dict[str, Any], survival_percentage: float,
+                            language: Optional[str] = None,
+                            local_explanation: Optional[Dict[str, Any]] = None,
+                            raise_on_error: bool = False) -> str:
     """
     XGBoost 모델의 예측 결과를 ChatGPT를 통해 설명
     
     Args:
         features_dict: XGBoost 모델에 입력된 28개 피쳐 딕셔너리
         survival_percentage: 모델이 예측한 생존 확률(%)
+        language: 설명 언어 (생략 시 현재 활성 언어)
+        local_explanation: 피쳐 기여도 순위 (local_explainer.rank_contributions) - 프롬프트 축약/실패 시 대체
+        raise_on_error: True면 API 오류를 그대로 전달 (호출 측이 실패 상태를 기록할 때)
     
     Returns:
-        str: ChatGPT가 생성한 설명 텍스트
+        str: ChatGPT가 생성한 설명 텍스트 (실패 시 로컬 설명 또는 언어별 기본 메시지)
+
+    Note:
+        - 같은 피쳐 버킷/생존확률 버킷/언어의 설명이 캐시에 있으면 API를 호출하지 않음
     """
-    try:
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        
-        # 현재 언어 감지
-        current_language = get_language()
-        print(f"🌍 감지된 언어: {current_language}")
-        
-        # 언어 코드 매핑 (Django의 언어 코드를 우리 시스템에 맞게 변환)
-        language_mapping = {
-            'ko': 'ko',
-            'ko-kr': 'ko', 
-            'en': 'en',
-            'en-us': 'en',
-            'es': 'es',
-            'es-es': 'es'
-        }
-        mapped_language = language_mapping.get(current_language.lower(), 'ko')
-        print(f"🔄 매핑된 언어: {current_language} -> {mapped_language}")
-        
-        # 피쳐 정보를 분석하기 쉽게 정리
-        feature_summary = format_features_for_analysis(features_dict, mapped_language)
-        
-        # 언어별 프롬프트 설정
-        prompt = get_analysis_prompt(mapped_language, survival_percentage, feature_summary)
-
-        # 언어별 시스템 메시지 설정
-        system_messages = {
-            'ko': "당신은 상권분석과 창업 컨설팅 전문가입니다.",
-            'en': "You are a commercial area analysis and startup consulting expert.",
-            'es': "Eres un experto en análisis de zonas comerciales y consultoría de startups."
-        }
-        
-        system_message = system_messages.get(mapped_language, system_messages['ko'])
+    mapped_language, feature_summary, cache_key = prepare_explanation(
+        features_dict, survival_percentage, language, local_explanation
+    )
+    print(f"🔄 설명 생성 언어: {language or get_language()} -> {mapped_language}")
+
+    cached = explanation_cache.get_cached_explanation(cache_key, survival_percentage)
+    if cached is not None:
+        print("   ♻️ AI 설명 캐시 적중")
+        return cached
 
-        response = client.chat.completions.create(
+    try:
+        response = get_openai_client().chat.completions.create(
             model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": prompt}
-            ],
+            messages=build_explanation_messages(mapped_language, survival_percentage, feature_summary),
             max_tokens=1000,
             temperature=0.7
         )
         
-        return response.choices[0].message.content.strip()
+        explanation = response.choices[0].message.content.strip()
+        explanation_cache.set_cached_explanation(cache_key, explanation, survival_percentage)
+        return explanation
         
     except Exception as e:
         print(f"❌ ChatGPT API 호출 중 오류: {e}")
-        
-        # 언어별 오류 메시지
-        error_messages = {
-            'ko': f"생존 확률 {survival_percentage}%로 예측되었습니다.\n\n상세한 분석을 위해 잠시 후 다시 시도해주세요.",
-            'en': f"Survival probability predicted as {survival_percentage}%.\n\nPlease try again later for detailed analysis.",
-            'es': f"Probabilidad de supervivencia predicha como {survival_percentage}%.\n\nPor favor, inténtelo de nuevo más tarde para un análisis detallado."
-        }
-        
-        # 현재 언어 다시 감지 (오류 발생 시를 위해)
-        try:
-            current_language = get_language()
-            language_mapping = {
-                'ko': 'ko', 'ko-kr': 'ko', 
-                'en': 'en', 'en-us': 'en',
-                'es': 'es', 'es-es': 'es'
-            }
-            mapped_language = language_mapping.get(current_language.lower(), 'ko')
-        except:
-            mapped_language = 'ko'
-            
-        return error_messages.get(mapped_language, error_messages['ko'])
+        if raise_on_error:
+            raise
+        return get_fallback_explanation(survival_percentage, language, local_explanation)[0]
+
+
+def is_fallback_explanation(text: str, survival_percentage: float,
+                            local_explanation: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    저장된 설명이 ChatGPT 응답이 아닌 기본 메시지/로컬 설명인지
+
+    Note:
+        - 언어 컬럼이 없던 과거 행도 판별하도록 모든 언어의 기본 메시지와 비교
+    """
+    text = (text or "").strip()
+    for language in SYSTEM_MESSAGES:
+        for local in (local_explanation, None):
+            if text == get_fallback_explanation(survival_percentage, language, local)[0].strip():
+                return True
+    return False
+
+
+def stream_xgboost_explanation(features_dict: Dict[str, Any], survival_percentage: float,
+                               language: Optional[str] = None,
+                               local_explanation: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+    """
+    ChatGPT 설명을 토큰 단위로 스트리밍
+
+    Yields:
+        str: 응답 텍스트 조각 (캐시 적중 시 전체 설명 한 번)
+
+    Note:
+        - 호출 실패는 예외로 전달되므로 호출 측에서 get_fallback_explanation으로 대체
+        - 스트림을 끝까지 받은 경우에만 캐시에 저장
+    """
+    mapped_language, feature_summary, cache_key = prepare_explanation(
+        features_dict, survival_percentage, language, local_explanation
+    )
+    print(f"🔄 설명 생성 언어: {language or get_language()} -> {mapped_language}")
+
+    cached = explanation_cache.get_cached_explanation(cache_key, survival_percentage)
+    if cached is not None:
+        print("   ♻️ AI 설명 캐시 적중")
+        yield cached
+        return
+
+    stream = get_openai_client().chat.completions.create(
+        model="gpt-4o-mini",
+        messages=build_explanation_messages(mapped_language, survival_percentage, feature_summary),
+        max_tokens=1000,
+        temperature=0.7,
+        stream=True,
+    )
+    chunks = []
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            chunks.append(chunk.choices[0].delta.content)
+            yield chunk.choices[0].delta.content
+    explanation_cache.set_cached_explanation(cache_key, "".join(chunks).strip(), survival_percentage)
 
 
 def get_analysis_prompt(language: str, survival_percentage: float, feature_summary: str) -> str:
@@ -0,0 +1,136 @@
+# LocaAI/AI_Analyzer/analysis_settings.py
+# ✅ 상권분석 전반 설정
+import os
+from pathlib import Path
+
+# LocaAI 프로젝트 루트 (settings.BASE_DIR와 동일)
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+ANALYSIS_SETTINGS = {
+    # 피쳐 추출 엔진: "sql" (단일 쿼리) / "stepwise" (기존 단계별 쿼리, 디버그용)
+    "FEATURE_ENGINE": "sql",
+    # True면 EXPLAIN ANALYZE로 레이어별 소요 시간을 함께 수집 (쿼리 1회 추가 실행)
+    "PROFILE_FEATURE_QUERY": False,
+    # 인구 격자 래스터 스냅샷 디렉터리 (python manage.py build_feature_raster 로 생성)
+    # CURRENT 버전이 있으면 생활인구·직장인구·외국인 피쳐를 memmap 래스터에서 계산
+    "RASTER_ENGINE": True,
+    "RASTER_DIR": str(PROJECT_DIR / "model" / "feature_raster"),
+    "RASTER_KEEP_VERSIONS": 2,
+    # XGBoost 생존 확률 모델 서빙 (model_serving.py)
+    "MODEL_SERVING": {
+        "MODEL_FILE": "model/best_xgb_model.pkl",  # settings.BASE_DIR 기준
+        "NATIVE_FORMAT": "ubj",  # 피클 옆에 네이티브 포맷 사본 생성/로드 (None이면 피클만 사용)
+        "PRELOAD": True,  # AppConfig.ready에서 로드
+        "WARMUP_ROWS": 64,
+    },
+    # 공유 추론 사이드카 (python manage.py run_inference_server)
+    # 소켓이 있으면 웹 워커는 모델을 올리지 않고 predict_batch/embed_batch를 호출, 없으면 프로세스 내 로드
+    "INFERENCE_SIDECAR": {
+        "ENABLED": True,
+        "SOCKET_PATH": os.getenv("INFERENCE_SOCKET", "/tmp/locaai-inference.sock"),
+        "TIMEOUT": 10,  # 초
+        "RETRY_SECONDS": 30,  # 연결 실패 후 사이드카를 건너뛰는 시간
+        "MAX_BATCH_ROWS": 512,
+        "MAX_BATCH_TEXTS": 32,
+        "MAX_WAIT_MS": 5,
+    },
+    # 공간 레이어 레지스트리 (논리 레이어 -> 실제 테이블 + pg_class.reltuples 행 수 추정치)
+    # 재해석: python manage.py resolve_spatial_layers [--analyze]
+    "LAYER_REGISTRY": {
+        "PRELOAD": True,  # 서버 시작 시 백그라운드 해석
+        "CACHE_ALIAS": "shared",  # 워커·관리 명령 간 공유 (settings.CACHES["shared"], 기본 파일 캐시)
+        "REFRESH_SECONDS": 10 * 60,  # 공유 캐시를 다시 읽는 주기 (관리 명령 재해석 반영)
+    },
+    # 점포 포인트 프로세스 로컬 공간 인덱스 (경쟁업체·점포 수·업종 다양성 계산)
+    "STORE_INDEX": {
+        "ENABLED": True,
+        "PRELOAD": True,  # 서버 시작 시 백그라운드 생성
+        "CELL_M": 300,  # 격자 버킷 크기(m)
+        "CACHE_ALIAS": "shared",  # 편집 세대(generation) 카운터 공유 캐시 (세대가 바뀌면 SQL로 계산하며 재생성)
+        "REFRESH_SECONDS": 60 * 60,  # 시그널을 거치지 않은 변경(원시 SQL 적재 등) 반영을 위한 재생성 주기
+    },
+    # 격자 생존 확률 표면 (python manage.py build_survival_surface, api/survival-surface/ 히트맵)
+    "SURVIVAL_SURFACE": {
+        "DIR": str(PROJECT_DIR / "model" / "survival_surface"),
+        "STEP_M": 50,  # 격자 간격(m)
+        "TILE_M": 2000,  # 워커 작업 단위 타일 크기(m)
+        "AREA": 33.0,  # 표면 계산에 쓰는 고정 면적(㎡)
+        "SERVICE_TYPE": 1,  # 고정 서비스 유형 (0: 휴게음식점, 1: 일반음식점)
+        "KEEP_VERSIONS": 2,
+        "MAX_CELLS": 40000,  # 응답 격자 최대 셀 수 (초과 시 블록 최댓값으로 축소)
+    },
+    # 다지점 일괄 분석 (analyze-batch/, NDJSON 스트리밍)
+    "BATCH_ANALYSIS": {
+        "MAX_SITES": 500,
+        "CHUNK_SIZE": 50,  # 지오코딩·피쳐 추출·예측·저장·전송 단위
+        "GEOCODE_WORKERS": 8,  # 카카오 주소 검색 동시 요청 수
+        "GEOCODE_TIMEOUT": 5,  # 초
+        "MAX_EXPLAIN_SITES": 20,  # explain=true로 요청할 수 있는 최대 지점 수 (설명은 별도 1개 워커 풀에서 생성)
+    },
+    # what-if 민감도 분석 (api/result/<id>/sensitivity/)
+    "SENSITIVITY": {
+        "MAX_VALUES": 100,  # 범위 하나의 최대 값 개수
+        "MAX_ROWS": 5000,  # 한 번에 예측하는 최대 조합 수
+    },
+    # 구/행정동 내 최적 입지 탐색 (site-search/ 작업)
+    "SITE_SEARCH": {
+        "STEP_M": 50,  # 후보 격자 간격(m)
+        "MAX_CANDIDATES": 20000,  # 초과 시 격자 간격을 넓힘
+        "CHUNK_SIZE": 1000,  # 피쳐 계산/예측/진행 보고 단위
+        "TIME_BUDGET_SECONDS": 60,
+        "MAX_TIME_BUDGET_SECONDS": 300,
+        "TOP_K": 10,
+        "MAX_TOP_K": 50,
+        "MIN_SEPARATION_M": 150,  # 상위 지점 간 최소 거리
+        "MAX_ACTIVE_PER_USER": 1,  # 회원별 동시 대기/실행 작업 수
+        "MAX_BACKLOG": 4,  # 워커 프로세스당 입지 탐색 풀에 쌓일 수 있는 작업 수 (초과 시 429)
+    },
+    # True면 회원 분석 결과를 먼저 저장/반환하고 ChatGPT 설명은 백그라운드에서 생성
+    # (ws/analysis/results/<id>/explanation/ 토큰 스트림 또는 api/result/<id>/explanation/ 폴링)
+    "DEFERRED_EXPLANATION": True,
+    # XGBoost 피쳐 기여도(pred_contribs) 기반 로컬 설명 (AnalysisResult.feature_contributions)
+    "LOCAL_EXPLANATION": {
+        "TOP_N": 5,  # 상승/하락 요인 각각 저장할 개수
+        "LLM_TIMEOUT": 30,  # ChatGPT 응답 대기 시간(초), 초과 시 로컬 설명으로 대체
+    },
+    # 비동기 분석 작업 큐 (BACKEND: InProcessJobBackend / 테스트용 ImmediateJobBackend)
+    "JOBS": {
+        "BACKEND": "AI_Analyzer.jobs.InProcessJobBackend",
+        "MAX_WORKERS": 4,  # 대화형 분석 / AI 설명 풀
+        # 긴 작업용 별도 풀 (풀 이름 -> 워커 수) - 대화형 분석 풀을 점유하지 않음
+        "POOLS": {
+            "site_search": 1,
+            "batch_explanation": 1,  # 일괄 분석 AI 설명 (낮은 우선순위)
+        },
+        # 작업 상태/비회원 결과 보관 - 상태 조회가 다른 워커로 가도 보이도록 프로세스 간 공유 캐시 사용
+        # (진행 이벤트도 다른 워커의 WebSocket에 전달하려면 공유 채널 레이어 필요: settings.CHANNEL_REDIS_URL)
+        "CACHE_ALIAS": "shared",
+        "STATUS_TTL": 60 * 60,
+        "EXPLANATION_FLUSH_CHARS": 40,  # AI 설명 토큰을 모아 보내는 단위(글자 수)
+        # 작업은 프로세스 메모리의 스레드 풀에만 있어 재시작/워커 종료 시 사라짐 (내구성 없음)
+        # 이보다 오래 queued/running/pending인 행은 python manage.py sweep_stale_jobs 로 정리
+        "STALE_SECONDS": 30 * 60,
+    },
+    # 좌표 스냅 피쳐 캐시 (settings.CACHES[ALIAS] 백엔드 사용)
+    "FEATURE_CACHE": {
+        "ENABLED": True,
+        "ALIAS": "analysis_features",
+        "GRID_M": 10,  # 좌표 스냅 격자(m)
+        "AREA_BUCKET_M2": 10,  # 면적 버킷(㎡)
+        "CELL_M": 100,  # 무효화 셀 크기(m)
+        "TTL": 60 * 60 * 24,  # 초
+        "MAX_ENTRIES": 5000,
+    },
+    # ChatGPT 설명 캐시 (버킷화한 피쳐 요약 + 생존확률 버킷 + 언어 해시 키)
+    # 사전 적재: python manage.py warm_explanation_cache
+    "EXPLANATION_CACHE": {
+        "ENABLED": True,
+        "ALIAS": "analysis_explanations",
+        "SIGNIFICANT_DIGITS": 2,  # 인구·지가 등 수치 피쳐 유효숫자
+        "PERCENT_STEP": 5.0,  # 비율(%) 피쳐 버킷
+        "SURVIVAL_STEP": 1.0,  # 생존 확률(%) 버킷
+        "CONTRIBUTION_STEP": 0.05,  # 피쳐 기여도(로그 오즈) 버킷
+        "TTL": 60 * 60 * 24 * 7,  # 초
+        "MAX_ENTRIES": 2000,
+    },
+}
@@ -1,7 +1,65 @@
+import os
+import sys
+
 from django.apps import AppConfig
 
 
+# 요청을 처리하는 서버 프로그램 (관리 명령은 manage.py runserver만 해당)
+SERVER_PROGRAMS = {"uvicorn", "daphne", "gunicorn", "hypercorn"}
+
+
+def is_serving() -> bool:
+    """
+    현재 프로세스가 요청을 처리하는 서버인지
+
+    Note:
+        - migrate / makemigrations 등 관리 명령에서는 백그라운드 DB 스레드와 모델 로드를 시작하지 않음
+        - runserver는 자동 재시작 감시 프로세스가 아닌 실제 서버 자식 프로세스(RUN_MAIN)에서만
+        - ANALYSIS_PRELOAD=1/0 환경변수로 강제 지정 가능
+    """
+    override = os.getenv("ANALYSIS_PRELOAD")
+    if override is not None:
+        return override.lower() in ("1", "true", "yes")
+    program = os.path.basename(sys.argv[0]) if sys.argv else ""
+    if program == "__main__.py":  # python -m uvicorn
+        program = os.path.basename(os.path.dirname(sys.argv[0]))
+    if program in SERVER_PROGRAMS:
+        return True
+    if len(sys.argv) > 1 and sys.argv[1] == "runserver":
+        return os.environ.get("RUN_MAIN") == "true" or "--noreload" in sys.argv
+    return False
+
+
 class AiAnalyzerConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "AI_Analyzer"
     verbose_name = "AI Analyzer"
+
+    def ready(self):
+        # 편집 레이어 변경 시 피쳐 캐시 무효화 / 점포 인덱스 증분 업데이트
+        import AI_Analyzer.signals  # noqa: F401
+
+        from django.conf import settings
+
+        if not is_serving():
+            return
+
+        # 공간 레이어별 실제 테이블/행 수 추정치를 한 번 해석 (요청마다 테이블 탐색하지 않음)
+        if settings.ANALYSIS_SETTINGS.get("LAYER_REGISTRY", {}).get("PRELOAD"):
+            from AI_Analyzer.layer_registry import preload_layer_registry
+
+            preload_layer_registry()
+
+        if settings.ANALYSIS_SETTINGS.get("STORE_INDEX", {}).get("PRELOAD"):
+            from AI_Analyzer.store_index import preload_store_index
+
+            preload_store_index()
+
+        # XGBoost 모델을 첫 요청 전에 로드/워밍업 (실패 시 첫 예측 때 다시 시도)
+        # 추론 사이드카가 떠 있으면 워커에는 모델을 올리지 않음
+        if settings.ANALYSIS_SETTINGS.get("MODEL_SERVING", {}).get("PRELOAD"):
+            from AI_Analyzer.inference_sidecar import sidecar_available
+            from AI_Analyzer.model_serving import load_survival_model
+
+            if not sidecar_available():
+                load_survival_model(warmup=True)
@@ -0,0 +1,374 @@
+# AI_Analyzer/batch_analysis.py
+# 다지점 일괄 분석 (프랜차이즈 후보지 목록 50~500개)
+#
+# 입력(JSON 목록 / CSV) 검증 → 청크 단위로 주소 지오코딩(동시 요청) → 집합 SQL 피쳐 추출 →
+# 모델 1회 예측 → 회원은 AnalysisRequest/AnalysisResult bulk_create → 지점별 결과를 NDJSON 줄로 반환
+# (ASGI 응답은 stream_batch_analysis: 청크가 끝날 때마다 해당 줄을 바로 전송)
+
+import csv
+import io
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from pyproj import Transformer
+
+from .feature_extractor import build_model_features, extract_features_batch
+from .models import AnalysisRequest, AnalysisResult, BusinessType
+
+
+KAKAO_ADDRESS_URL = "https://dapi.kakao.com/v2/local/search/address.json"
+WGS84_TO_5186 = Transformer.from_crs("EPSG:4326", "EPSG:5186", always_xy=True)
+EPSG5186_TO_WGS84 = Transformer.from_crs("EPSG:5186", "EPSG:4326", always_xy=True)
+
+
+class BatchInputError(Exception):
+    """일괄 분석 입력 오류 (status: HTTP 상태 코드)"""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def _batch_settings() -> Dict[str, Any]:
+    return getattr(settings, "ANALYSIS_SETTINGS", {}).get("BATCH_ANALYSIS", {})
+
+
+def parse_batch_sites(request) -> Tuple[List[Dict[str, Any]], str, bool]:
+    """
+    요청 본문에서 지점 목록 추출
+
+    Args:
+        request: JSON {"sites": [...], "language", "explain"} 또는 multipart CSV 업로드(file)
+
+    Returns:
+        tuple: (지점 딕셔너리 목록, 언어, AI 설명 생성 여부)
+
+    Note:
+        - CSV 헤더: address, area, business_type_id, service_type (선택: latitude, longitude, x_coord, y_coord, ref)
+        - explain은 MAX_EXPLAIN_SITES 이하 지점에서만 허용 (ChatGPT 호출이 지점 수만큼 쌓이므로)
+    """
+    if request.content_type and request.content_type.startswith("multipart/"):
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise BatchInputError("CSV 파일(file)이 필요합니다.")
+        text = upload.read().decode("utf-8-sig")
+        sites = [dict(row) for row in csv.DictReader(io.StringIO(text))]
+        language = request.POST.get("language", "ko")
+        explain = request.POST.get("explain", "").lower() in ("1", "true", "yes")
+    else:
+        try:
+            data = json.loads(request.body)
+        except json.JSONDecodeError:
+            raise BatchInputError("잘못된 JSON 형식입니다.")
+        sites = data.get("sites") if isinstance(data, dict) else data
+        language = data.get("language", "ko") if isinstance(data, dict) else "ko"
+        explain = bool(data.get("explain", False)) if isinstance(data, dict) else False
+
+    if not isinstance(sites, list) or not sites:
+        raise BatchInputError("분석할 지점 목록(sites)이 필요합니다.")
+    max_sites = _batch_settings().get("MAX_SITES", 500)
+    if len(sites) > max_sites:
+        raise BatchInputError(f"한 번에 최대 {max_sites}개 지점까지 분석할 수 있습니다.")
+    max_explain_sites = _batch_settings().get("MAX_EXPLAIN_SITES", 20)
+    if explain and len(sites) > max_explain_sites:
+        raise BatchInputError(f"AI 설명(explain)은 한 번에 최대 {max_explain_sites}개 지점까지 요청할 수 있습니다.")
+    return sites, language, explain
+
+
+def _number(value) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+def normalize_site(index: int, raw: Dict[str, Any], business_types: Dict[int, str]) -> Dict[str, Any]:
+    """
+    지점 입력 검증/정규화
+
+    Raises:
+        ValueError: 필수 필드 누락, 숫자 형식 오류, 없는 업종
+    """
+    for field in ("area", "business_type_id", "service_type"):
+        if raw.get(field) in (None, ""):
+            raise ValueError(f"{field}가 필요합니다.")
+    business_type_id = int(raw["business_type_id"])
+    if business_type_id not in business_types:
+        raise ValueError(f"업종 ID {business_type_id}를 찾을 수 없습니다.")
+
+    site = {
+        "index": index,
+        "ref": raw.get("ref"),
+        "address": (raw.get("address") or "").strip(),
+        "area": float(raw["area"]),
+        "service_type": int(raw["service_type"]),
+        "business_type_id": business_type_id,
+        "business_type_name": business_types[business_type_id],
+        "longitude": _number(raw.get("longitude")),
+        "latitude": _number(raw.get("latitude")),
+        "x_coord": _number(raw.get("x_coord")),
+        "y_coord": _number(raw.get("y_coord")),
+    }
+    if site["x_coord"] is None and site["longitude"] is None and not site["address"]:
+        raise ValueError("address 또는 좌표(latitude/longitude, x_coord/y_coord)가 필요합니다.")
+    return site
+
+
+def geocode_address(session: requests.Session, address: str) -> Tuple[float, float]:
+    """
+    카카오 주소 검색 API로 주소 -> (경도, 위도)
+
+    Raises:
+        ValueError: 주소를 찾을 수 없거나 API 호출 실패
+    """
+    api_key = getattr(settings, "KAKAO_REST_API_KEY", None)
+    if not api_key:
+        raise ValueError("KAKAO_REST_API_KEY가 설정되지 않아 주소를 변환할 수 없습니다.")
+    response = session.get(
+        KAKAO_ADDRESS_URL,
+        headers={"Authorization": f"KakaoAK {api_key}"},
+        params={"query": address},
+        timeout=_batch_settings().get("GEOCODE_TIMEOUT", 5),
+    )
+    if response.status_code != 200:
+        raise ValueError(f"카카오 API 호출 실패 (Status: {response.status_code})")
+    documents = response.json().get("documents") or []
+    if not documents:
+        raise ValueError("주소를 찾을 수 없습니다.")
+    return float(documents[0]["x"]), float(documents[0]["y"])
+
+
+def locate_sites(sites: List[Dict[str, Any]], executor: ThreadPoolExecutor,
+                 session: requests.Session) -> List[Tuple[Dict[str, Any], Optional[str]]]:
+    """
+    좌표가 없는 지점은 동시에 지오코딩하고, WGS84 / EPSG:5186 좌표를 모두 채움
+
+    Returns:
+        list: [(지점, 오류 메시지 또는 None), ...] (입력 순서 유지)
+    """
+    def locate(site):
+        try:
+            if site["x_coord"] is None and site["longitude"] is None:
+                site["longitude"], site["latitude"] = geocode_address(session, site["address"])
+            if site["x_coord"] is None:
+                site["x_coord"], site["y_coord"] = WGS84_TO_5186.transform(site["longitude"], site["latitude"])
+            elif site["longitude"] is None:
+                site["longitude"], site["latitude"] = EPSG5186_TO_WGS84.transform(site["x_coord"], site["y_coord"])
+            if not site["address"]:
+                site["address"] = f"{site['latitude']:.6f}, {site['longitude']:.6f}"
+            return site, None
+        except Exception as e:
+            return site, str(e)
+
+    return list(executor.map(locate, sites))
+
+
+def _save_results(user, sites: List[Dict[str, Any]], results_list: List[Dict[str, Any]],
+                  language: str, explain: bool) -> List[int]:
+    """
+    회원 분석 요청/결과를 청크 단위 bulk_create로 저장
+
+    Returns:
+        list: 지점 순서대로의 AnalysisRequest ID
+    """
+    with transaction.atomic():
+        analysis_requests = AnalysisRequest.objects.bulk_create([
+            AnalysisRequest(
+                user=user,
+                address=site["address"][:200],
+                area=site["area"],
+                business_type_id=site["business_type_id"],
+                service_type=site["service_type"],
+                longitude=site["longitude"],
+                latitude=site["latitude"],
+                x_coord=site["x_coord"],
+                y_coord=site["y_coord"],
+                status=AnalysisRequest.STATUS_COMPLETED,
+                language=language,
+            )
+            for site in sites
+        ])
+        AnalysisResult.objects.bulk_create([
+            AnalysisResult(
+                request=analysis_request,
+                user=user,
+                is_member_analysis=True,
+                ai_explanation_status="pending" if explain else "ready",
+                **results,
+            )
+            for analysis_request, results in zip(analysis_requests, results_list)
+        ])
+    return [analysis_request.id for analysis_request in analysis_requests]
+
+
+def _line(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload, cls=DjangoJSONEncoder, ensure_ascii=False, default=float) + "\n"
+
+
+class BatchRun:
+    """
+    일괄 분석 실행 상태 (청크 단위 처리 + 성공/실패 집계)
+
+    Note:
+        - 사용자 인증 여부와 업종 목록은 생성 시(요청 스레드) 확정해 비동기 스트림에서 DB를 건드리지 않음
+        - process_chunk는 동기 함수로, 비동기 스트림에서는 sync_to_async로 청크마다 호출
+    """
+
+    def __init__(self, user, raw_sites: List[Dict[str, Any]], language: str = "ko", explain: bool = False,
+                 business_types: Optional[Dict[int, str]] = None, chunk_size: Optional[int] = None):
+        conf = _batch_settings()
+        self.user = user
+        self.raw_sites = raw_sites
+        self.language = language
+        self.explain = explain
+        self.save = bool(user and user.is_authenticated)
+        self.business_types = (
+            business_types if business_types is not None else dict(BusinessType.objects.values_list("id", "name"))
+        )
+        self.chunk_size = int(chunk_size or conf.get("CHUNK_SIZE", 50))
+        self.geocode_workers = conf.get("GEOCODE_WORKERS", 8)
+        self.succeeded = self.failed = 0
+        self.started_at = time.time()
+
+    def offsets(self) -> range:
+        return range(0, len(self.raw_sites), self.chunk_size)
+
+    def start_line(self) -> str:
+        print(f"\n📦 [일괄 분석] {len(self.raw_sites)}개 지점 시작 ({'회원' if self.save else '비회원'})")
+        return _line({"type": "start", "total": len(self.raw_sites), "saved": self.save})
+
+    def summary_line(self) -> str:
+        elapsed_ms = round((time.time() - self.started_at) * 1000, 1)
+        print(f"🎉 [일괄 분석] 완료: 성공 {self.succeeded}개, 실패 {self.failed}개 ({elapsed_ms:.0f}ms)")
+        return _line({"type": "summary", "total": len(self.raw_sites), "succeeded": self.succeeded,
+                      "failed": self.failed, "elapsed_ms": elapsed_ms})
+
+    def _error_line(self, index: int, ref, error: str) -> str:
+        self.failed += 1
+        return _line({"type": "error", "index": index, "ref": ref, "error": error})
+
+    def process_chunk(self, offset: int, executor: ThreadPoolExecutor, session: requests.Session) -> List[str]:
+        """
+        청크 하나 처리: 지오코딩 → 집합 SQL 피쳐 추출 → 모델 1회 예측 → 저장
+
+        Returns:
+            list: 청크 지점들의 NDJSON 줄 ({"type": "result"} 또는 {"type": "error"})
+        """
+        from .jobs import enqueue_explanation
+        from .local_explainer import rank_contribution_matrix
+        from .views import build_feature_matrix, local_explanation_top_n, predict_survival_contributions
+
+        lines = []
+        sites = []
+        for index, raw in enumerate(self.raw_sites[offset:offset + self.chunk_size], start=offset):
+            raw = raw if isinstance(raw, dict) else {}
+            try:
+                sites.append(normalize_site(index, raw, self.business_types))
+            except (TypeError, ValueError) as e:
+                lines.append(self._error_line(index, raw.get("ref"), str(e)))
+
+        located = []
+        for site, error in locate_sites(sites, executor, session):
+            if error is None:
+                located.append(site)
+            else:
+                lines.append(self._error_line(site["index"], site["ref"], error))
+        if not located:
+            return lines
+
+        try:
+            with connection.cursor() as cursor:
+                results_list, timings = extract_features_batch(cursor, located)
+            features_list = [
+                build_model_features(results, site["business_type_id"])
+                for site, results in zip(located, results_list)
+            ]
+            feature_matrix = build_feature_matrix(features_list)
+            probabilities, contribs = predict_survival_contributions(feature_matrix)
+            local_explanations = (
+                rank_contribution_matrix(contribs, feature_matrix, local_explanation_top_n())
+                if contribs is not None else [{}] * len(located)
+            )
+            for results, probability, local in zip(results_list, probabilities, local_explanations):
+                results["survival_probability"] = float(probability)
+                results["survival_percentage"] = round(float(probability) * 100, 1)
+                results["feature_contributions"] = local
+
+            request_ids = (
+                _save_results(self.user, located, results_list, self.language, self.explain)
+                if self.save else [None] * len(located)
+            )
+        except Exception as e:
+            print(f"❌ 일괄 분석 청크 실패 ({offset}~): {e}")
+            lines.extend(self._error_line(site["index"], site["ref"], str(e)) for site in located)
+            return lines
+
+        print(
+            f"   ✅ {offset + 1}~{offset + len(located)}번 지점 분석 완료 "
+            f"({timings.get('engine')}, 피쳐 {timings.get('total_ms', 0):.0f}ms)"
+        )
+        for site, results, features, request_id in zip(located, results_list, features_list, request_ids):
+            if request_id and self.explain:
+                enqueue_explanation(
+                    request_id, features, results["survival_percentage"], self.language,
+                    results["feature_contributions"], pool="batch_explanation",
+                )
+            self.succeeded += 1
+            lines.append(_line({
+                "type": "result",
+                "index": site["index"],
+                "ref": site["ref"],
+                "request_id": request_id,
+                "address": site["address"],
+                "business_type_id": site["business_type_id"],
+                "latitude": site["latitude"],
+                "longitude": site["longitude"],
+                "x_coord": site["x_coord"],
+                "y_coord": site["y_coord"],
+                "survival_probability": results["survival_probability"],
+                "survival_percentage": results["survival_percentage"],
+                "features": {k: v for k, v in features.items() if k != "UPTAENM_ID"},
+            }))
+        return lines
+
+
+def run_batch_analysis(run: BatchRun) -> Iterator[str]:
+    """
+    일괄 분석 NDJSON 동기 스트림 (WSGI / 관리 명령용)
+
+    Yields:
+        str: JSON 한 줄 - {"type": "start"}, 지점마다 {"type": "result"} 또는 {"type": "error"},
+             마지막에 {"type": "summary"}
+    """
+    yield run.start_line()
+    with ThreadPoolExecutor(max_workers=run.geocode_workers) as executor, requests.Session() as session:
+        for offset in run.offsets():
+            yield from run.process_chunk(offset, executor, session)
+    yield run.summary_line()
+
+
+async def stream_batch_analysis(run: BatchRun) -> AsyncIterator[str]:
+    """
+    일괄 분석 NDJSON 비동기 스트림 (ASGI 응답용)
+
+    Note:
+        - ASGI 핸들러는 동기 이터레이터를 끝까지 읽은 뒤에야 전송하므로 비동기 생성기로 반환
+        - 청크 처리(지오코딩·피쳐 추출·예측·bulk_create)는 sync_to_async로 실행하고 끝나는 즉시 해당 줄을 전송
+    """
+    yield run.start_line()
+    executor = ThreadPoolExecutor(max_workers=run.geocode_workers)
+    session = requests.Session()
+    try:
+        for offset in run.offsets():
+            for line in await sync_to_async(run.process_chunk)(offset, executor, session):
+                yield line
+    finally:
+        executor.shutdown(wait=False)
+        session.close()
+    yield run.summary_line()
@@ -0,0 +1,81 @@
+# LocaAI/AI_Analyzer/consumers.py
+
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from channels.generic.websocket import AsyncWebsocketConsumer
+
+from .jobs import explanation_group_name, get_job_status, job_group_name
+from .models import AnalysisResult
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisJobConsumer(AsyncWebsocketConsumer):
+    """분석 작업 진행 이벤트 스트림 (ws/analysis/jobs/<job_id>/)"""
+
+    async def connect(self):
+        self.job_id = self.scope["url_route"]["kwargs"]["job_id"]
+        self.group_name = job_group_name(self.job_id)
+
+        state = await sync_to_async(get_job_status)(self.job_id)
+        user = self.scope.get("user")
+        user_id = getattr(user, "id", None)
+        if state is None or (state.get("user_id") and state["user_id"] != user_id):
+            await self.close()
+            return
+
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+        logger.info(f"✅ 분석 작업 WebSocket 연결: {self.job_id}")
+
+        # 연결 시점까지 진행된 상태를 먼저 전송 (이벤트를 놓친 경우 대비)
+        snapshot = {key: value for key, value in state.items() if key not in ("user_id", "result")}
+        await self.send(text_data=json.dumps({"type": "snapshot", **snapshot}, default=str))
+
+    async def disconnect(self, close_code):
+        if hasattr(self, "group_name"):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+        logger.info(f"❎ 분석 작업 WebSocket 종료: {close_code}")
+
+    async def analysis_event(self, event):
+        await self.send(text_data=json.dumps(event["event"]))
+
+
+class AnalysisExplanationConsumer(AsyncWebsocketConsumer):
+    """AI 설명 토큰 스트림 (ws/analysis/results/<request_id>/explanation/)"""
+
+    async def connect(self):
+        self.request_id = int(self.scope["url_route"]["kwargs"]["request_id"])
+        self.group_name = explanation_group_name(self.request_id)
+
+        user = self.scope.get("user")
+        result = await sync_to_async(
+            lambda: AnalysisResult.objects.filter(request_id=self.request_id)
+            .values("user_id", "ai_explanation", "ai_summary", "ai_explanation_status")
+            .first()
+        )()
+        if result is None or result["user_id"] != getattr(user, "id", None):
+            await self.close()
+            return
+
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+        # 이미 생성이 끝났으면 결과를 바로 전송
+        if result["ai_explanation_status"] != "pending":
+            await self.send(text_data=json.dumps({
+                "type": "explanation.ready",
+                "request_id": self.request_id,
+                "status": result["ai_explanation_status"],
+                "ai_explanation": result["ai_explanation"],
+                "ai_summary": result["ai_summary"],
+            }))
+
+    async def disconnect(self, close_code):
+        if hasattr(self, "group_name"):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def analysis_event(self, event):
+        await self.send(text_data=json.dumps(event["event"]))
@@ -0,0 +1,170 @@
+# AI_Analyzer/explanation_cache.py
+# ChatGPT 설명 캐시 (버킷화한 피쳐 요약 + 생존확률 버킷 + 언어 해시 키, Django 캐시 프레임워크 사용)
+
+import hashlib
+import math
+import numbers
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+KEY_PREFIX = "analysis:expl"
+STATS_KEYS = {"hits": f"{KEY_PREFIX}:stats:hits", "misses": f"{KEY_PREFIX}:stats:misses"}
+
+# format_features_for_analysis가 비율(%)로 출력하는 피쳐 - 유효숫자 대신 PERCENT_STEP 단위로 버킷화
+PERCENT_FEATURES = {"1A_20", "1A_30", "1A_40", "Competitor_R"}
+
+
+def _cache_settings() -> Dict[str, Any]:
+    return getattr(settings, "ANALYSIS_SETTINGS", {}).get("EXPLANATION_CACHE", {})
+
+
+def is_enabled() -> bool:
+    return bool(_cache_settings().get("ENABLED", False))
+
+
+def _get_cache():
+    return caches[_cache_settings().get("ALIAS", "default")]
+
+
+def is_process_local() -> bool:
+    """캐시 백엔드가 locmem인지 (관리 명령에서 채운 값과 적중/미스 통계가 다른 프로세스에 보이지 않음)"""
+    return isinstance(_get_cache(), LocMemCache)
+
+
+def _round_significant(value, digits: int):
+    """유효숫자 digits자리로 반올림 (정수 피쳐는 정수 유지)"""
+    if not value:
+        return value
+    rounded = round(float(value), digits - 1 - int(math.floor(math.log10(abs(float(value))))))
+    return int(rounded) if isinstance(value, numbers.Integral) else rounded
+
+
+def bucket_features(features_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    설명 프롬프트용 피쳐 버킷화
+
+    Note:
+        - 거의 같은 입지(인구 12,345명 vs 12,410명)가 같은 요약 문자열/캐시 키를 갖도록 함
+        - 캐시를 쓰면 프롬프트도 버킷화한 값으로 만들어, 캐시된 설명이 인용하는 수치가
+          같은 키를 공유하는 모든 요청에 맞도록 함
+    """
+    conf = _cache_settings()
+    digits = int(conf.get("SIGNIFICANT_DIGITS", 2))
+    percent_step = float(conf.get("PERCENT_STEP", 5.0))
+
+    bucketed = {}
+    for name, value in features_dict.items():
+        if isinstance(value, bool) or not isinstance(value, numbers.Number):
+            bucketed[name] = value
+        elif name in PERCENT_FEATURES:
+            bucketed[name] = round(float(value) / percent_step) * percent_step
+        else:
+            bucketed[name] = _round_significant(value, digits)
+    return bucketed
+
+
+def bucket_contributions(local_explanation: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    로컬 설명(피쳐 기여도 순위) 버킷화
+
+    Note:
+        - 피쳐 값은 bucket_features와 같은 규칙, 기여도는 CONTRIBUTION_STEP 단위로 반올림
+    """
+    step = float(_cache_settings().get("CONTRIBUTION_STEP", 0.05))
+
+    def bucket_items(items):
+        values = bucket_features({item["feature"]: item["value"] for item in items})
+        return [
+            {**item, "value": values[item["feature"]], "contribution": round(round(item["contribution"] / step) * step, 3)}
+            for item in items
+        ]
+
+    return {
+        **local_explanation,
+        "positive": bucket_items(local_explanation.get("positive", [])),
+        "negative": bucket_items(local_explanation.get("negative", [])),
+    }
+
+
+def survival_bucket(survival_percentage: float) -> int:
+    step = float(_cache_settings().get("SURVIVAL_STEP", 1.0))
+    return int(math.floor(float(survival_percentage) / step + 0.5))
+
+
+def explanation_key(feature_summary: str, survival_percentage: float, language: str) -> str:
+    """(피쳐 요약, 생존확률 버킷, 언어) 해시 캐시 키"""
+    digest = hashlib.sha1(
+        f"{language}|{survival_bucket(survival_percentage)}|{feature_summary}".encode("utf-8")
+    ).hexdigest()
+    return f"{KEY_PREFIX}:{digest}"
+
+
+def _count(stat: str):
+    cache = _get_cache()
+    key = STATS_KEYS[stat]
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # add 직후 제거된 경우 (LRU 컬링)
+        cache.set(key, 1, timeout=None)
+
+
+def get_cached_explanation(key: str, survival_percentage: float) -> Optional[str]:
+    """
+    캐시된 설명 조회 (적중/미스 카운터 갱신)
+
+    Returns:
+        str: 설명 텍스트 (미스 시 None)
+
+    Note:
+        - 같은 버킷이라도 생존 확률 수치는 요청마다 다르므로,
+          캐시 생성 시의 "NN.N%" 표기를 현재 요청의 수치로 바꿔서 반환
+    """
+    if not is_enabled():
+        return None
+
+    payload = _get_cache().get(key)
+    if payload is None:
+        _count("misses")
+        return None
+
+    _count("hits")
+    text = payload["text"]
+    cached_percentage = payload.get("survival_percentage")
+    if cached_percentage is not None and cached_percentage != survival_percentage:
+        text = text.replace(f"{cached_percentage}%", f"{survival_percentage}%")
+    return text
+
+
+def has_cached_explanation(key: str) -> bool:
+    """카운터를 갱신하지 않는 존재 여부 확인 (사전 적재용)"""
+    return is_enabled() and _get_cache().get(key) is not None
+
+
+def set_cached_explanation(key: str, text: str, survival_percentage: float):
+    """생성된 설명을 TTL과 함께 저장 (오래된 항목은 캐시 백엔드의 MAX_ENTRIES 컬링으로 제거)"""
+    if not is_enabled() or not text:
+        return
+    _get_cache().set(
+        key,
+        {"text": text, "survival_percentage": survival_percentage},
+        timeout=_cache_settings().get("TTL", 60 * 60 * 24 * 7),
+    )
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """적중/미스 카운터와 적중률"""
+    cache = _get_cache()
+    hits = cache.get(STATS_KEYS["hits"], 0)
+    misses = cache.get(STATS_KEYS["misses"], 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / total * 100, 1) if total else 0.0,
+    }
@@ -0,0 +1,186 @@
+# AI_Analyzer/feature_cache.py
+# 좌표 스냅 기반 공간 피쳐 캐시 (Django 캐시 프레임워크 사용)
+
+import math
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .feature_extractor import extract_spatial_features, fetch_competitor_counts
+
+
+KEY_PREFIX = "analysis:feat"
+
+# 편집 레이어별 영향 반경(m) - 해당 레이어를 사용하는 피쳐의 최대 버퍼
+INVALIDATION_RADIUS = {
+    "store": 300,   # Competitor_C / Competitor_R / Adjacent_BIZ / Business_D
+    "public": 250,  # PubBuilding
+}
+
+
+def _cache_settings() -> Dict[str, Any]:
+    return getattr(settings, "ANALYSIS_SETTINGS", {}).get("FEATURE_CACHE", {})
+
+
+def is_enabled() -> bool:
+    return bool(_cache_settings().get("ENABLED", False))
+
+
+def _get_cache():
+    return caches[_cache_settings().get("ALIAS", "default")]
+
+
+def _snap_index(value: float, step: float) -> int:
+    """좌표/면적 값을 step 단위 격자 인덱스로 스냅"""
+    return int(math.floor(float(value) / step + 0.5))
+
+
+def _cell_of(x_coord: float, y_coord: float) -> Tuple[int, int]:
+    """무효화 셀 인덱스 (CELL_M 단위)"""
+    cell_size = float(_cache_settings().get("CELL_M", 100))
+    return int(math.floor(x_coord / cell_size)), int(math.floor(y_coord / cell_size))
+
+
+def _marker_key(cell: Tuple[int, int]) -> str:
+    return f"{KEY_PREFIX}:inv:{cell[0]}:{cell[1]}"
+
+
+def _entry_key(x_coord: float, y_coord: float, business_type_id: int, area: float,
+               service_type: int) -> Tuple[str, Tuple[int, int]]:
+    """
+    캐시 키와 무효화 셀 반환
+
+    Note:
+        - 키: (GRID_M 스냅 x, y, 업종 ID, AREA_BUCKET_M2 면적 버킷, 서비스 유형)
+        - 셀은 스냅된 좌표 기준으로 계산 (같은 키는 항상 같은 셀)
+    """
+    conf = _cache_settings()
+    grid = float(conf.get("GRID_M", 10))
+    gx = _snap_index(x_coord, grid)
+    gy = _snap_index(y_coord, grid)
+    area_bucket = _snap_index(area, float(conf.get("AREA_BUCKET_M2", 10)))
+    key = f"{KEY_PREFIX}:{gx}:{gy}:{business_type_id}:{area_bucket}:{service_type}"
+    return key, _cell_of(gx * grid, gy * grid)
+
+
+def get_cached_features(x_coord: float, y_coord: float, business_type_id: int, area: float,
+                        service_type: int) -> Optional[Tuple[Dict[str, Any], Optional[Dict[str, int]]]]:
+    """
+    캐시된 피쳐 조회
+
+    Returns:
+        tuple: (AnalysisResult 필드 딕셔너리, 업종별 경쟁업체 수 또는 None), 미스 시 None
+
+    Note:
+        - 면적은 버킷 단위로 키에 들어가므로 면적 의존 값(area, total_land_value)은 요청 면적으로 재계산
+        - 셀 무효화 시각 이전에 저장된 항목은 미스로 처리하고 삭제
+    """
+    cache = _get_cache()
+    key, cell = _entry_key(x_coord, y_coord, business_type_id, area, service_type)
+    payload = cache.get(key)
+    if payload is None:
+        return None
+
+    if payload["cached_at"] <= cache.get(_marker_key(cell), 0):
+        cache.delete(key)
+        return None
+
+    results = dict(payload["results"])
+    cached_area = results.get("area") or 0
+    unit_land_value = results.get("total_land_value", 0) / cached_area if cached_area else 0
+    results["area"] = float(area)
+    results["total_land_value"] = unit_land_value * float(area)
+    return results, payload.get("competitor_counts")
+
+
+def set_cached_features(x_coord: float, y_coord: float, business_type_id: int, area: float,
+                        service_type: int, results: Dict[str, Any],
+                        competitor_counts: Optional[Dict[str, int]] = None):
+    """추출한 피쳐를 TTL과 함께 캐시에 저장"""
+    key, _ = _entry_key(x_coord, y_coord, business_type_id, area, service_type)
+    payload = {
+        "results": results,
+        "competitor_counts": competitor_counts,
+        "cached_at": time.time(),
+    }
+    _get_cache().set(key, payload, timeout=_cache_settings().get("TTL", 60 * 60 * 24))
+
+
+def _cells_near(extent: Tuple[float, float, float, float], radius: float) -> Iterator[Tuple[int, int]]:
+    xmin, ymin, xmax, ymax = extent
+    min_cell = _cell_of(xmin - radius, ymin - radius)
+    max_cell = _cell_of(xmax + radius, ymax + radius)
+    for cx in range(min_cell[0], max_cell[0] + 1):
+        for cy in range(min_cell[1], max_cell[1] + 1):
+            yield cx, cy
+
+
+def invalidate_geometry(geom, layer: str) -> int:
+    """
+    편집된 지오메트리(EPSG:5186)를 버퍼 안에 포함하는 캐시 항목 무효화
+
+    Args:
+        geom: GEOSGeometry (SRID 5186)
+        layer (str): INVALIDATION_RADIUS 키 ("store" / "public")
+
+    Returns:
+        int: 무효화 마커를 갱신한 셀 수
+
+    Note:
+        - 영향 반경 + 스냅 오차(GRID_M)만큼 확장한 범위의 셀에 무효화 시각을 기록
+        - 셀 단위라 보수적으로(더 넓게) 무효화되며, 마커는 TTL 이후 자동 만료
+    """
+    if geom is None or not is_enabled():
+        return 0
+
+    conf = _cache_settings()
+    ttl = conf.get("TTL", 60 * 60 * 24)
+    radius = INVALIDATION_RADIUS[layer] + float(conf.get("GRID_M", 10))
+    cache = _get_cache()
+    now = time.time()
+
+    cells = list(_cells_near(geom.extent, radius))
+    cache.set_many({_marker_key(cell): now for cell in cells}, timeout=ttl)
+    return len(cells)
+
+
+def get_or_extract_features(cursor, x_coord: float, y_coord: float, area: float, service_type: int,
+                            business_type_id: int, business_type_name: str,
+                            with_competitor_counts: bool = False):
+    """
+    캐시를 먼저 조회하고, 없으면 공간 피쳐를 추출해 캐시에 저장
+
+    Returns:
+        tuple: (결과 딕셔너리, 타이밍 딕셔너리, 업종별 경쟁업체 수 또는 None)
+
+    Note:
+        - 추출 타이밍에 cacheable=False가 있으면(단계별 폴백 등) 캐시에 저장하지 않음
+    """
+    competitor_counts = None
+
+    if is_enabled():
+        start = time.time()
+        cached = get_cached_features(x_coord, y_coord, business_type_id, area, service_type)
+        if cached is not None:
+            results, competitor_counts = cached
+            if with_competitor_counts and competitor_counts is None:
+                competitor_counts = fetch_competitor_counts(cursor, x_coord, y_coord)
+                set_cached_features(
+                    x_coord, y_coord, business_type_id, area, service_type, results, competitor_counts
+                )
+            print("   ♻️ 피쳐 캐시 적중")
+            return results, {"total_ms": round((time.time() - start) * 1000, 3), "engine": "cache"}, competitor_counts
+
+    results, timings = extract_spatial_features(
+        cursor, x_coord, y_coord, area, service_type, business_type_name
+    )
+    if with_competitor_counts:
+        competitor_counts = fetch_competitor_counts(cursor, x_coord, y_coord)
+
+    if is_enabled() and timings.get("cacheable", True):
+        set_cached_features(
+            x_coord, y_coord, business_type_id, area, service_type, results, competitor_counts
+        )
+    return results, timings, competitor_counts
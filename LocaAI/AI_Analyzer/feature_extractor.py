@@ -0,0 +1,853 @@
+# AI_Analyzer/feature_extractor.py
+# 분석 좌표 1개에 대한 28개 모델 피쳐를 단일 SQL 쿼리로 추출
+# (다지점 일괄 분석은 extract_features_batch: 좌표 배열 unnest + 레이어별 LATERAL 집합 쿼리)
+
+import json
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db import transaction
+
+from .layer_registry import layer_table
+
+
+# XGBoost 모델 학습 시 컬럼 순서 (UPTAENM_ID 포함 28개)
+MODEL_FEATURES = [
+    "Area", "Adjacent_BIZ", "1A_Total", "Total_LV", "Business_D", "Working_Pop",
+    "2A_20", "2A_30", "2A_40", "2A_50", "2A_60",
+    "1A_20", "1A_30", "1A_40", "1A_50", "1A_60",
+    "1A_Long_Total", "2A_Long_Total", "1A_Temp_CN", "2A_Temp_CN", "2A_Temp_Total", "2A_Long_CN",
+    "Competitor_C", "Competitor_R", "Service", "School", "PubBuilding", "UPTAENM_ID",
+]
+
+# 모델 피쳐명 -> AnalysisResult 필드명
+MODEL_FEATURE_FIELDS = {
+    "Area": "area",
+    "Adjacent_BIZ": "adjacent_biz_300m",
+    "1A_Total": "life_pop_300m",
+    "Total_LV": "total_land_value",
+    "Business_D": "business_diversity_300m",
+    "Working_Pop": "working_pop_300m",
+    "2A_20": "life_pop_20_1000m",
+    "2A_30": "life_pop_30_1000m",
+    "2A_40": "life_pop_40_1000m",
+    "2A_50": "life_pop_50_1000m",
+    "2A_60": "life_pop_60_1000m",
+    "1A_20": "life_pop_20_300m",
+    "1A_30": "life_pop_30_300m",
+    "1A_40": "life_pop_40_300m",
+    "1A_50": "life_pop_50_300m",
+    "1A_60": "life_pop_60_300m",
+    "1A_Long_Total": "long_foreign_300m",
+    "2A_Long_Total": "long_foreign_1000m",
+    "1A_Temp_CN": "temp_foreign_cn_300m",
+    "2A_Temp_CN": "temp_foreign_cn_1000m",
+    "2A_Temp_Total": "temp_foreign_1000m",
+    "2A_Long_CN": "long_foreign_cn_1000m",
+    "Competitor_C": "competitor_300m",
+    "Competitor_R": "competitor_ratio_300m",
+    "Service": "service_type",
+    "School": "school_250m",
+    "PubBuilding": "public_building_250m",
+}
+
+# ltv_5186 테이블은 geometry SRID가 900914로 등록되어 있음
+LTV_SRID = 900914
+# 최근접 필지 탐색 반경(m) - 반경 안에 필지가 없으면 공시지가 0
+LTV_RADIUS_M = 300
+
+# CTE 이름 -> 해당 CTE가 계산하는 모델 피쳐 (플랜 타이밍 리포트용)
+FEATURE_CTES = {
+    "life_300": ["1A_Total", "1A_20", "1A_30", "1A_40", "1A_50", "1A_60"],
+    "life_1000": ["2A_20", "2A_30", "2A_40", "2A_50", "2A_60"],
+    "work_300": ["Working_Pop"],
+    "temp_300": ["1A_Temp_CN"],
+    "temp_1000": ["2A_Temp_Total", "2A_Temp_CN"],
+    "long_300": ["1A_Long_Total"],
+    "long_1000": ["2A_Long_Total", "2A_Long_CN"],
+    "public_250": ["PubBuilding"],
+    "school_250": ["School"],
+    "store_300": ["Competitor_C", "Competitor_R", "Adjacent_BIZ", "Business_D"],
+    "ltv": ["Total_LV"],
+}
+
+# 공공건물·학교·점포·공시지가 결과 컬럼 (단일 쿼리 / 래스터 보조 쿼리 공통)
+POINT_LAYER_COLUMNS = """public_250.cnt, school_250.cnt,
+            store_300.competitor, store_300.total, store_300.diversity,
+            COALESCE((SELECT price FROM ltv), 0)"""
+
+# 점포 레이어 = 기본 점포 + 편집 점포 (점포 공간 인덱스와 같은 집합이어야 인덱스 로드 여부와 무관하게 같은 피쳐)
+STORE_POINTS_SQL = """(
+                SELECT geom, uptaenm FROM store_point_5186
+                UNION ALL
+                SELECT geom, uptaenm FROM editable_store_point
+            )"""
+
+# 점포 공간 인덱스 사용 시 store_300 자리에 들어가는 상수 CTE
+STORE_INDEX_CTE = "store_300 AS MATERIALIZED (SELECT 0 AS total, 0 AS diversity, 0 AS competitor)"
+
+def _quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _ratio(part, total) -> float:
+    """total 대비 part 비율(%)을 소수 둘째 자리로 반환"""
+    return round((part / total * 100) if total and total > 0 else 0, 2)
+
+
+def nearest_land_value_sql(point: str) -> str:
+    """
+    좌표에서 가장 가까운 필지의 ㎡당 공시지가(price) 서브쿼리
+
+    Args:
+        point (str): SRID 900914 포인트 SQL 식 (CTE/LATERAL 바깥 컬럼 등, 행마다 상수)
+
+    Note:
+        - ORDER BY <-> 로 GiST 인덱스 KNN 순회 → 반경 내 필지를 모두 읽어 ST_Distance로 정렬하지 않고
+          가까운 인덱스 페이지 몇 개만 읽고 LIMIT 1에서 멈춤
+        - ST_DWithin으로 탐색 반경을 제한해 반경 밖 필지는 사용하지 않음 (기존 동작과 동일)
+    """
+    return f"""SELECT COALESCE(v."A9", 0) AS price
+            FROM ltv_5186 v
+            WHERE ST_DWithin(v.geom, {point}, {LTV_RADIUS_M})
+            ORDER BY v.geom <-> {point}
+            LIMIT 1"""
+
+
+def fetch_nearest_land_values(cursor, xs: Sequence[float], ys: Sequence[float]) -> List[float]:
+    """
+    여러 좌표의 최근접 필지 ㎡당 공시지가를 한 번의 쿼리로 조회 (입력 순서 유지, 필지가 없으면 0)
+
+    Args:
+        xs, ys: EPSG:5186 좌표 배열
+    """
+    if len(xs) == 0:
+        return []
+    cursor.execute(
+        f"""
+        SELECT COALESCE(ltv.price, 0)
+        FROM unnest(%s::float8[], %s::float8[]) WITH ORDINALITY AS t(x, y, i)
+        CROSS JOIN LATERAL (SELECT ST_SetSRID(ST_MakePoint(t.x, t.y), {LTV_SRID}) AS geom) pt
+        LEFT JOIN LATERAL ({nearest_land_value_sql("pt.geom")}) ltv ON TRUE
+        ORDER BY t.i
+        """,
+        [[float(x) for x in xs], [float(y) for y in ys]],
+    )
+    return [float(row[0]) for row in cursor.fetchall()]
+
+
+def _foreign_ctes(prefix: str, table_name: Optional[str]) -> List[str]:
+    """외국인 레이어 CTE (테이블이 없으면 0을 반환하는 상수 CTE)"""
+    if table_name is None:
+        return [
+            f"{prefix}_300 AS MATERIALIZED (SELECT 0 AS total, 0 AS cn)",
+            f"{prefix}_1000 AS MATERIALIZED (SELECT 0 AS total, 0 AS cn)",
+        ]
+    table = _quote_ident(table_name)
+    return [
+        f"""{prefix}_{radius} AS MATERIALIZED (
+            SELECT COALESCE(SUM(f."총생활인구수"), 0) AS total,
+                   COALESCE(SUM(f."중국인체류인구수"), 0) AS cn
+            FROM {table} f, pt
+            WHERE ST_DWithin(f.geom, pt.geom, {radius})
+        )"""
+        for radius in (300, 1000)
+    ]
+
+
+def _point_layer_ctes(include_store: bool = True) -> List[str]:
+    """
+    공공건물·학교·점포·공시지가 CTE (래스터 엔진 사용 시에도 SQL로 계산하는 레이어)
+
+    Note:
+        - include_store=False면 점포 CTE는 0 상수 CTE (점포 공간 인덱스가 대신 계산)
+    """
+    ctes = []
+    ctes.append(
+        """public_250 AS MATERIALIZED (
+            SELECT COUNT(*) AS cnt FROM public_5186 p, pt
+            WHERE ST_DWithin(p.geom, pt.geom, 250)
+        )"""
+    )
+    ctes.append(
+        """school_250 AS MATERIALIZED (
+            SELECT COUNT(*) AS cnt FROM school_5186 s, pt
+            WHERE ST_DWithin(s.geom, pt.geom, 250)
+        )"""
+    )
+    ctes.append(
+        STORE_INDEX_CTE if not include_store else
+        f"""store_300 AS MATERIALIZED (
+            SELECT COUNT(*) AS total,
+                   COUNT(DISTINCT s.uptaenm) AS diversity,
+                   COUNT(*) FILTER (WHERE s.uptaenm = %(uptaenm)s) AS competitor
+            FROM {STORE_POINTS_SQL} s, pt
+            WHERE ST_DWithin(s.geom, pt.geom, 300)
+        )"""
+    )
+    ctes.append(
+        f"""ltv AS MATERIALIZED (
+            {nearest_land_value_sql("(SELECT geom FROM pt_ltv)")}
+        )"""
+    )
+    return ctes
+
+
+def build_feature_query(temp_table: Optional[str], long_table: Optional[str],
+                        include_store: bool = True) -> str:
+    """
+    28개 피쳐 계산용 단일 SQL 쿼리 생성
+
+    Note:
+        - 모든 레이어는 같은 좌표 CTE(pt)를 공유하고 ST_DWithin으로 인덱스 조회
+        - 각 레이어는 MATERIALIZED CTE로 분리되어 EXPLAIN 플랜에서 개별 시간 확인 가능
+        - 파라미터: x, y, uptaenm
+    """
+    ctes = [
+        "pt AS MATERIALIZED (SELECT ST_SetSRID(ST_MakePoint(%(x)s, %(y)s), 5186) AS geom)",
+        f"pt_ltv AS MATERIALIZED (SELECT ST_SetSRID(ST_MakePoint(%(x)s, %(y)s), {LTV_SRID}) AS geom)",
+    ]
+    for radius in (300, 1000):
+        ctes.append(
+            f"""life_{radius} AS MATERIALIZED (
+            SELECT COALESCE(SUM(l."총생활인구수"), 0) AS total,
+                   COALESCE(SUM(l."20대"), 0) AS pop_20,
+                   COALESCE(SUM(l."30대"), 0) AS pop_30,
+                   COALESCE(SUM(l."40대"), 0) AS pop_40,
+                   COALESCE(SUM(l."50대"), 0) AS pop_50,
+                   COALESCE(SUM(l."60대"), 0) AS pop_60
+            FROM life_pop_grid_10m_5186 l, pt
+            WHERE ST_DWithin(l.geom, pt.geom, {radius})
+        )"""
+        )
+    ctes.append(
+        """work_300 AS MATERIALIZED (
+            SELECT COALESCE(SUM(w."총_직장_인구_수"), 0) AS total
+            FROM workgrid_10m_5186 w, pt
+            WHERE ST_DWithin(w.geom, pt.geom, 300)
+        )"""
+    )
+    ctes.extend(_foreign_ctes("temp", temp_table))
+    ctes.extend(_foreign_ctes("long", long_table))
+    ctes.extend(_point_layer_ctes(include_store))
+
+    return f"""
+        WITH {", ".join(ctes)}
+        SELECT
+            life_300.total, life_300.pop_20, life_300.pop_30, life_300.pop_40, life_300.pop_50, life_300.pop_60,
+            life_1000.total, life_1000.pop_20, life_1000.pop_30, life_1000.pop_40, life_1000.pop_50, life_1000.pop_60,
+            work_300.total,
+            temp_300.cn, temp_1000.total, temp_1000.cn,
+            long_300.total, long_1000.total, long_1000.cn,
+            {POINT_LAYER_COLUMNS}
+        FROM life_300, life_1000, work_300, temp_300, temp_1000,
+             long_300, long_1000, public_250, school_250, store_300
+    """
+
+
+def build_point_feature_query(include_store: bool = True) -> str:
+    """
+    래스터 엔진이 인구 레이어를 계산할 때 나머지 레이어만 조회하는 SQL 쿼리 생성
+
+    Note:
+        - 파라미터: x, y, uptaenm
+        - 결과 컬럼은 단일 쿼리의 마지막 6개 컬럼과 동일
+    """
+    ctes = [
+        "pt AS MATERIALIZED (SELECT ST_SetSRID(ST_MakePoint(%(x)s, %(y)s), 5186) AS geom)",
+        f"pt_ltv AS MATERIALIZED (SELECT ST_SetSRID(ST_MakePoint(%(x)s, %(y)s), {LTV_SRID}) AS geom)",
+    ]
+    ctes.extend(_point_layer_ctes(include_store))
+    return f"""
+        WITH {", ".join(ctes)}
+        SELECT {POINT_LAYER_COLUMNS}
+        FROM public_250, school_250, store_300
+    """
+
+
+def _results_from_row(row, area: float, service_type: int) -> Dict[str, Any]:
+    """단일 쿼리 결과 행을 AnalysisResult 필드 딕셔너리로 변환"""
+    row = [v or 0 for v in row]
+    (
+        life_300, l300_20, l300_30, l300_40, l300_50, l300_60,
+        life_1000, l1000_20, l1000_30, l1000_40, l1000_50, l1000_60,
+        working_pop,
+        temp_cn_300, temp_total_1000, temp_cn_1000,
+        long_total_300, long_total_1000, long_cn_1000,
+        public_count, school_count,
+        competitor_count, total_biz, diversity,
+        land_price,
+    ) = row
+
+    return {
+        "life_pop_300m": int(life_300),
+        "life_pop_20_300m": _ratio(l300_20, life_300),
+        "life_pop_30_300m": _ratio(l300_30, life_300),
+        "life_pop_40_300m": _ratio(l300_40, life_300),
+        "life_pop_50_300m": _ratio(l300_50, life_300),
+        "life_pop_60_300m": _ratio(l300_60, life_300),
+        "life_pop_20_1000m": _ratio(l1000_20, life_1000),
+        "life_pop_30_1000m": _ratio(l1000_30, life_1000),
+        "life_pop_40_1000m": _ratio(l1000_40, life_1000),
+        "life_pop_50_1000m": _ratio(l1000_50, life_1000),
+        "life_pop_60_1000m": _ratio(l1000_60, life_1000),
+        "working_pop_300m": int(working_pop),
+        "temp_foreign_1000m": int(temp_total_1000),
+        "temp_foreign_cn_300m": _ratio(temp_cn_300, temp_total_1000),
+        "temp_foreign_cn_1000m": _ratio(temp_cn_1000, temp_total_1000),
+        "long_foreign_300m": int(long_total_300),
+        "long_foreign_1000m": int(long_total_1000),
+        "long_foreign_cn_1000m": _ratio(long_cn_1000, long_total_1000),
+        "public_building_250m": int(public_count),
+        "school_250m": int(school_count),
+        "competitor_300m": int(competitor_count),
+        "adjacent_biz_300m": int(total_biz),
+        "competitor_ratio_300m": _ratio(competitor_count, total_biz),
+        "business_diversity_300m": int(diversity),
+        "total_land_value": float(land_price) * area,
+        "area": area,
+        "service_type": service_type,
+    }
+
+
+def apply_store_index(results: Dict[str, Any], store_index, x_coord: float, y_coord: float,
+                      business_type_name: str) -> float:
+    """
+    점포 공간 인덱스로 경쟁업체 수·전체 점포 수·업종 다양성을 계산해 결과에 반영
+
+    Returns:
+        float: 소요 시간(ms)
+    """
+    start = time.time()
+    competitor_count, total_biz, diversity = store_index.store_features(
+        float(x_coord), float(y_coord), business_type_name, 300
+    )
+    results.update({
+        "competitor_300m": competitor_count,
+        "adjacent_biz_300m": total_biz,
+        "competitor_ratio_300m": _ratio(competitor_count, total_biz),
+        "business_diversity_300m": diversity,
+    })
+    return round((time.time() - start) * 1000, 3)
+
+
+def _collect_cte_timings(plan: Dict[str, Any], timings: Dict[str, float]):
+    """EXPLAIN JSON 플랜을 순회하며 CTE별 실제 소요 시간(ms) 수집"""
+    subplan = plan.get("Subplan Name", "")
+    if subplan.startswith("CTE "):
+        name = subplan[4:]
+        if name in FEATURE_CTES:
+            timings[name] = round(
+                plan.get("Actual Total Time", 0) * plan.get("Actual Loops", 1), 3
+            )
+    for child in plan.get("Plans", []):
+        _collect_cte_timings(child, timings)
+
+
+def profile_feature_query(cursor, query: str, params: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    EXPLAIN ANALYZE로 레이어(CTE)별 소요 시간을 측정
+
+    Returns:
+        dict: {cte_name: {"ms": float, "features": [피쳐명, ...]}}
+    """
+    cursor.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {query}", params)
+    raw = cursor.fetchone()[0]
+    plan = json.loads(raw) if isinstance(raw, str) else raw
+
+    timings: Dict[str, float] = {}
+    _collect_cte_timings(plan[0]["Plan"], timings)
+    return {
+        name: {"ms": timings.get(name, 0.0), "features": features}
+        for name, features in FEATURE_CTES.items()
+    }
+
+
+def extract_features_sql(cursor, x_coord: float, y_coord: float, area: float,
+                         service_type: int, business_type_name: str,
+                         profile: bool = False, store_index=None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    단일 SQL 쿼리로 분석 피쳐 추출
+
+    Args:
+        store_index: store_index.StoreIndex, 주어지면 점포 레이어는 인덱스로 계산
+
+    Returns:
+        tuple: (AnalysisResult 필드 딕셔너리, 레이어별 타이밍 딕셔너리)
+    """
+    temp_table = layer_table("temp_foreign", cursor)
+    long_table = layer_table("long_foreign", cursor)
+    query = build_feature_query(temp_table, long_table, include_store=store_index is None)
+    params = {"x": float(x_coord), "y": float(y_coord), "uptaenm": business_type_name}
+
+    timings: Dict[str, Any] = {}
+    if profile:
+        timings = profile_feature_query(cursor, query, params)
+
+    start = time.time()
+    cursor.execute(query, params)
+    row = cursor.fetchone()
+    timings["total_ms"] = round((time.time() - start) * 1000, 3)
+
+    results = _results_from_row(row, float(area), int(service_type))
+    if store_index is not None:
+        timings["store_index_ms"] = apply_store_index(results, store_index, x_coord, y_coord, business_type_name)
+        timings["engine"] = "sql+store_index"
+    return results, timings
+
+
+def extract_features_raster(cursor, engine, x_coord: float, y_coord: float, area: float,
+                            service_type: int, business_type_name: str,
+                            store_index=None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    인구 레이어는 메모리 래스터 엔진으로, 나머지 레이어는 축소된 SQL 쿼리로 피쳐 추출
+
+    Args:
+        engine: raster_engine.RasterFeatureEngine
+        store_index: store_index.StoreIndex, 주어지면 점포 레이어는 인덱스로 계산
+
+    Returns:
+        tuple: (AnalysisResult 필드 딕셔너리, 타이밍 딕셔너리)
+    """
+    start = time.time()
+    population = engine.population_row(float(x_coord), float(y_coord))
+    raster_ms = round((time.time() - start) * 1000, 3)
+
+    start = time.time()
+    cursor.execute(
+        build_point_feature_query(include_store=store_index is None),
+        {"x": float(x_coord), "y": float(y_coord), "uptaenm": business_type_name},
+    )
+    row = list(population) + list(cursor.fetchone())
+    sql_ms = round((time.time() - start) * 1000, 3)
+
+    timings = {"total_ms": round(raster_ms + sql_ms, 3), "engine": "raster", "raster_ms": raster_ms, "sql_ms": sql_ms}
+    results = _results_from_row(row, float(area), int(service_type))
+    if store_index is not None:
+        timings["store_index_ms"] = apply_store_index(results, store_index, x_coord, y_coord, business_type_name)
+        timings["total_ms"] = round(timings["total_ms"] + timings["store_index_ms"], 3)
+        timings["engine"] = "raster+store_index"
+    return results, timings
+
+
+def extract_features_stepwise(cursor, x_coord: float, y_coord: float, area: float,
+                              service_type: int, business_type_name: str,
+                              failed_queries: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    기존 단계별 쿼리 방식의 피쳐 추출 (디버그/비교용 폴백)
+
+    Args:
+        failed_queries (list): 주어지면 실패해 기본값(0)으로 채운 쿼리의 오류 메시지를 추가
+
+    Note:
+        - 레이어마다 개별 ST_Intersects(ST_Buffer) 쿼리를 실행
+        - 단일 쿼리 결과 검증이나 장애 시 폴백으로만 사용
+    """
+    point = f"ST_GeomFromText('POINT({float(x_coord)} {float(y_coord)})', 5186)"
+    ltv_point = f"ST_SetSRID(ST_GeomFromText('POINT({float(x_coord)} {float(y_coord)})'), {LTV_SRID})"
+    results: Dict[str, Any] = {}
+
+    def fetch(query, params=None, default=None):
+        try:
+            with transaction.atomic():
+                cursor.execute(query, params)
+                row = cursor.fetchone()
+            return [v or 0 for v in row] if row else default
+        except Exception as e:
+            print(f"   ❌ 단계별 피쳐 쿼리 오류: {e}")
+            if failed_queries is not None:
+                failed_queries.append(str(e))
+            return default
+
+    for radius in (300, 1000):
+        row = fetch(
+            f"""
+            SELECT COALESCE(SUM("총생활인구수"), 0), COALESCE(SUM("20대"), 0),
+                   COALESCE(SUM("30대"), 0), COALESCE(SUM("40대"), 0),
+                   COALESCE(SUM("50대"), 0), COALESCE(SUM("60대"), 0)
+            FROM life_pop_grid_10m_5186
+            WHERE ST_Intersects(geom, ST_Buffer({point}, {radius}))
+            """,
+            default=[0] * 6,
+        )
+        if radius == 300:
+            results["life_pop_300m"] = int(row[0])
+        for age, value in zip((20, 30, 40, 50, 60), row[1:]):
+            results[f"life_pop_{age}_{radius}m"] = _ratio(value, row[0])
+
+    row = fetch(
+        f"""
+        SELECT COALESCE(SUM("총_직장_인구_수"), 0) FROM workgrid_10m_5186
+        WHERE ST_Intersects(geom, ST_Buffer({point}, 300))
+        """,
+        default=[0],
+    )
+    results["working_pop_300m"] = int(row[0])
+
+    foreign = {}
+    for prefix, layer in (("temp", "temp_foreign"), ("long", "long_foreign")):
+        table_name = layer_table(layer, cursor)
+        for radius in (300, 1000):
+            if table_name is None:
+                foreign[(prefix, radius)] = [0, 0]
+                continue
+            foreign[(prefix, radius)] = fetch(
+                f"""
+                SELECT COALESCE(SUM("총생활인구수"), 0), COALESCE(SUM("중국인체류인구수"), 0)
+                FROM {_quote_ident(table_name)}
+                WHERE ST_Intersects(geom, ST_Buffer({point}, {radius}))
+                """,
+                default=[0, 0],
+            )
+    temp_total_1000 = foreign[("temp", 1000)][0]
+    long_total_1000 = foreign[("long", 1000)][0]
+    results.update({
+        "temp_foreign_1000m": int(temp_total_1000),
+        "temp_foreign_cn_300m": _ratio(foreign[("temp", 300)][1], temp_total_1000),
+        "temp_foreign_cn_1000m": _ratio(foreign[("temp", 1000)][1], temp_total_1000),
+        "long_foreign_300m": int(foreign[("long", 300)][0]),
+        "long_foreign_1000m": int(long_total_1000),
+        "long_foreign_cn_1000m": _ratio(foreign[("long", 1000)][1], long_total_1000),
+    })
+
+    for field, table in (("public_building_250m", "public_5186"), ("school_250m", "school_5186")):
+        row = fetch(
+            f"SELECT COUNT(*) FROM {table} WHERE ST_Intersects(geom, ST_Buffer({point}, 250))",
+            default=[0],
+        )
+        results[field] = int(row[0])
+
+    row = fetch(
+        f"""
+        SELECT COUNT(*) FILTER (WHERE uptaenm = %s), COUNT(*), COUNT(DISTINCT uptaenm)
+        FROM {STORE_POINTS_SQL} s
+        WHERE ST_Intersects(geom, ST_Buffer({point}, 300))
+        """,
+        [business_type_name],
+        default=[0, 0, 0],
+    )
+    competitor_count, total_biz, diversity = row
+    results.update({
+        "competitor_300m": int(competitor_count),
+        "adjacent_biz_300m": int(total_biz),
+        "competitor_ratio_300m": _ratio(competitor_count, total_biz),
+        "business_diversity_300m": int(diversity),
+    })
+
+    row = fetch(
+        f"""
+        {nearest_land_value_sql(ltv_point)}
+        """,
+        default=[0],
+    )
+    results.update({
+        "total_land_value": float(row[0]) * float(area),
+        "area": float(area),
+        "service_type": int(service_type),
+    })
+    return results
+
+
+def _get_store_index():
+    """점포 공간 인덱스 (비활성/생성 실패 시 None → SQL로 계산)"""
+    try:
+        from .store_index import get_store_index
+
+        return get_store_index()
+    except Exception as e:
+        print(f"⚠️ 점포 공간 인덱스 사용 불가, SQL 쿼리로 계산: {e}")
+        return None
+
+
+def extract_spatial_features(cursor, x_coord: float, y_coord: float, area: float,
+                             service_type: int, business_type_name: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    분석 좌표에 대한 공간 피쳐 추출 (설정에 따라 엔진 선택)
+
+    Returns:
+        tuple: (AnalysisResult 필드 딕셔너리, 레이어별 타이밍 딕셔너리)
+
+    Note:
+        - 래스터 스냅샷(RASTER_DIR)이 있으면 인구 레이어는 memmap 래스터 엔진으로 계산
+        - 점포 공간 인덱스(STORE_INDEX)가 켜져 있으면 점포 기반 피쳐는 인덱스로 계산
+        - ANALYSIS_SETTINGS["FEATURE_ENGINE"] == "stepwise"면 기존 단계별 쿼리 사용
+        - 단일 쿼리가 실패하면 savepoint를 롤백하고 단계별 쿼리로 폴백
+        - 단계별 쿼리 결과는 타이밍에 cacheable=False를 표시 (피쳐 캐시 저장 안 함)
+    """
+    analysis_settings = getattr(settings, "ANALYSIS_SETTINGS", {})
+    engine = analysis_settings.get("FEATURE_ENGINE", "sql")
+    profile = analysis_settings.get("PROFILE_FEATURE_QUERY", False)
+    store_index = _get_store_index() if engine != "stepwise" else None
+
+    if engine != "stepwise" and analysis_settings.get("RASTER_ENGINE", True):
+        try:
+            from .raster_engine import get_raster_engine
+
+            raster_engine = get_raster_engine()
+            if raster_engine is not None:
+                with transaction.atomic():
+                    return extract_features_raster(
+                        cursor, raster_engine, x_coord, y_coord, area, service_type, business_type_name,
+                        store_index=store_index,
+                    )
+        except Exception as e:
+            print(f"⚠️ 래스터 엔진 피쳐 추출 실패, SQL 쿼리로 폴백: {e}")
+
+    if engine != "stepwise":
+        try:
+            with transaction.atomic():
+                return extract_features_sql(
+                    cursor, x_coord, y_coord, area, service_type, business_type_name,
+                    profile=profile, store_index=store_index,
+                )
+        except Exception as e:
+            print(f"⚠️ 단일 쿼리 피쳐 추출 실패, 단계별 쿼리로 폴백: {e}")
+
+    start = time.time()
+    failed_queries: List[str] = []
+    results = extract_features_stepwise(
+        cursor, x_coord, y_coord, area, service_type, business_type_name, failed_queries=failed_queries
+    )
+    # 단계별 폴백은 실패한 레이어를 0으로 채우므로 피쳐 캐시에 저장하지 않음
+    return results, {
+        "total_ms": round((time.time() - start) * 1000, 3),
+        "engine": "stepwise",
+        "failed_queries": len(failed_queries),
+        "cacheable": False,
+    }
+
+
+def fetch_competitor_counts(cursor, x_coord: float, y_coord: float, radius: float = 300) -> Dict[str, int]:
+    """
+    반경 내 업종별 점포 수를 단일 GROUP BY 쿼리로 조회
+
+    Returns:
+        dict: {업종명(uptaenm): 점포 수}, 실패 시 빈 딕셔너리
+
+    Note:
+        - 업종 추천 시 후보 업종마다 Competitor_C / Competitor_R을 다시 계산하기 위해 사용
+        - 점포 공간 인덱스가 있으면 DB 조회 없이 인덱스에서 계산
+        - 실패해도 분석 트랜잭션이 깨지지 않도록 savepoint 안에서 실행
+    """
+    store_index = _get_store_index()
+    if store_index is not None:
+        return store_index.counts_by_type(float(x_coord), float(y_coord), radius)
+
+    try:
+        with transaction.atomic():
+            cursor.execute(
+                f"""
+                SELECT s.uptaenm, COUNT(*)
+                FROM {STORE_POINTS_SQL} s
+                WHERE ST_DWithin(s.geom, ST_SetSRID(ST_MakePoint(%s, %s), 5186), %s)
+                GROUP BY s.uptaenm
+                """,
+                [float(x_coord), float(y_coord), float(radius)],
+            )
+            return {uptaenm: int(count) for uptaenm, count in cursor.fetchall() if uptaenm}
+    except Exception as e:
+        print(f"⚠️ 업종별 경쟁업체 수 조회 실패: {e}")
+        return {}
+
+
+def _batch_foreign_laterals(prefix: str, table_name: Optional[str]) -> List[str]:
+    """다지점 쿼리용 외국인 레이어 LATERAL (테이블이 없으면 0 상수)"""
+    if table_name is None:
+        return [
+            f"CROSS JOIN (SELECT 0 AS total, 0 AS cn) {prefix}_{radius}"
+            for radius in (300, 1000)
+        ]
+    table = _quote_ident(table_name)
+    return [
+        f"""LEFT JOIN LATERAL (
+            SELECT COALESCE(SUM(f."총생활인구수"), 0) AS total,
+                   COALESCE(SUM(f."중국인체류인구수"), 0) AS cn
+            FROM {table} f
+            WHERE ST_DWithin(f.geom, pts.geom, {radius})
+        ) {prefix}_{radius} ON TRUE"""
+        for radius in (300, 1000)
+    ]
+
+
+def build_batch_feature_query(temp_table: Optional[str], long_table: Optional[str],
+                              include_population: bool = True, include_store: bool = True) -> str:
+    """
+    여러 좌표의 피쳐를 한 번에 계산하는 집합 기반 SQL 쿼리 생성
+
+    Note:
+        - 좌표는 unnest(xs, ys, uptaenm) 배열로 받고, 레이어마다 LATERAL 조인 1개로 전체 좌표를 처리
+        - 반경/집계 규칙은 단일 쿼리(build_feature_query)와 동일
+        - include_population=False면 인구 레이어는 생략 (래스터 엔진이 계산), 결과는 마지막 6개 컬럼만
+        - 파라미터: xs, ys, uptaenm (같은 길이의 배열)
+    """
+    joins = []
+    columns = []
+    if include_population:
+        for radius in (300, 1000):
+            joins.append(
+                f"""LEFT JOIN LATERAL (
+                SELECT COALESCE(SUM(l."총생활인구수"), 0) AS total,
+                       COALESCE(SUM(l."20대"), 0) AS pop_20,
+                       COALESCE(SUM(l."30대"), 0) AS pop_30,
+                       COALESCE(SUM(l."40대"), 0) AS pop_40,
+                       COALESCE(SUM(l."50대"), 0) AS pop_50,
+                       COALESCE(SUM(l."60대"), 0) AS pop_60
+                FROM life_pop_grid_10m_5186 l
+                WHERE ST_DWithin(l.geom, pts.geom, {radius})
+            ) life_{radius} ON TRUE"""
+            )
+        joins.append(
+            """LEFT JOIN LATERAL (
+                SELECT COALESCE(SUM(w."총_직장_인구_수"), 0) AS total
+                FROM workgrid_10m_5186 w
+                WHERE ST_DWithin(w.geom, pts.geom, 300)
+            ) work_300 ON TRUE"""
+        )
+        joins.extend(_batch_foreign_laterals("temp", temp_table))
+        joins.extend(_batch_foreign_laterals("long", long_table))
+        columns.append(
+            """life_300.total, life_300.pop_20, life_300.pop_30, life_300.pop_40, life_300.pop_50, life_300.pop_60,
+            life_1000.total, life_1000.pop_20, life_1000.pop_30, life_1000.pop_40, life_1000.pop_50, life_1000.pop_60,
+            work_300.total,
+            temp_300.cn, temp_1000.total, temp_1000.cn,
+            long_300.total, long_1000.total, long_1000.cn"""
+        )
+
+    joins.append(
+        """LEFT JOIN LATERAL (
+            SELECT COUNT(*) AS cnt FROM public_5186 p WHERE ST_DWithin(p.geom, pts.geom, 250)
+        ) public_250 ON TRUE"""
+    )
+    joins.append(
+        """LEFT JOIN LATERAL (
+            SELECT COUNT(*) AS cnt FROM school_5186 s WHERE ST_DWithin(s.geom, pts.geom, 250)
+        ) school_250 ON TRUE"""
+    )
+    joins.append(
+        "CROSS JOIN (SELECT 0 AS total, 0 AS diversity, 0 AS competitor) store_300" if not include_store else
+        f"""LEFT JOIN LATERAL (
+            SELECT COUNT(*) AS total,
+                   COUNT(DISTINCT s.uptaenm) AS diversity,
+                   COUNT(*) FILTER (WHERE s.uptaenm = pts.uptaenm) AS competitor
+            FROM {STORE_POINTS_SQL} s
+            WHERE ST_DWithin(s.geom, pts.geom, 300)
+        ) store_300 ON TRUE"""
+    )
+    joins.append(
+        f"""LEFT JOIN LATERAL (
+            {nearest_land_value_sql("pts.geom_ltv")}
+        ) ltv ON TRUE"""
+    )
+    columns.append(
+        """public_250.cnt, school_250.cnt,
+            store_300.competitor, store_300.total, store_300.diversity,
+            COALESCE(ltv.price, 0)"""
+    )
+
+    return f"""
+        WITH pts AS MATERIALIZED (
+            SELECT t.i, t.uptaenm,
+                   ST_SetSRID(ST_MakePoint(t.x, t.y), 5186) AS geom,
+                   ST_SetSRID(ST_MakePoint(t.x, t.y), {LTV_SRID}) AS geom_ltv
+            FROM unnest(%(xs)s::float8[], %(ys)s::float8[], %(uptaenm)s::text[]) WITH ORDINALITY AS t(x, y, uptaenm, i)
+        )
+        SELECT {", ".join(columns)}
+        FROM pts
+        {chr(10).join(joins)}
+        ORDER BY pts.i
+    """
+
+
+def extract_features_batch(cursor, sites: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    여러 좌표의 공간 피쳐를 한 번에 추출
+
+    Args:
+        sites (list): [{x_coord, y_coord, area, service_type, business_type_name}, ...]
+
+    Returns:
+        tuple: (좌표 순서대로의 AnalysisResult 필드 딕셔너리 목록, 타이밍 딕셔너리)
+
+    Note:
+        - 래스터 스냅샷이 있으면 인구 레이어는 래스터로, 점포 인덱스가 있으면 점포 피쳐는 인덱스로 계산
+        - 나머지 레이어는 좌표 배열 전체에 대해 SQL 1회
+        - 집합 쿼리가 실패하면 savepoint를 롤백하고 좌표별 extract_spatial_features로 폴백
+    """
+    if not sites:
+        return [], {"total_ms": 0.0, "engine": "batch"}
+
+    analysis_settings = getattr(settings, "ANALYSIS_SETTINGS", {})
+    start = time.time()
+    store_index = _get_store_index()
+    raster_engine = None
+    if analysis_settings.get("RASTER_ENGINE", True):
+        try:
+            from .raster_engine import get_raster_engine
+
+            raster_engine = get_raster_engine()
+        except Exception as e:
+            print(f"⚠️ 래스터 엔진 사용 불가, SQL로 인구 피쳐 계산: {e}")
+
+    temp_table = long_table = None
+    if raster_engine is None:
+        temp_table = layer_table("temp_foreign", cursor)
+        long_table = layer_table("long_foreign", cursor)
+    query = build_batch_feature_query(
+        temp_table, long_table,
+        include_population=raster_engine is None, include_store=store_index is None,
+    )
+    params = {
+        "xs": [float(site["x_coord"]) for site in sites],
+        "ys": [float(site["y_coord"]) for site in sites],
+        "uptaenm": [site["business_type_name"] for site in sites],
+    }
+
+    try:
+        with transaction.atomic():
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+    except Exception as e:
+        print(f"⚠️ 다지점 피쳐 쿼리 실패, 좌표별 추출로 폴백: {e}")
+        results_list = [
+            extract_spatial_features(
+                cursor, site["x_coord"], site["y_coord"], site["area"],
+                site["service_type"], site["business_type_name"],
+            )[0]
+            for site in sites
+        ]
+        return results_list, {"total_ms": round((time.time() - start) * 1000, 3), "engine": "per-site"}
+    sql_ms = round((time.time() - start) * 1000, 3)
+
+    results_list = []
+    for site, row in zip(sites, rows):
+        row = list(row)
+        if raster_engine is not None:
+            row = list(raster_engine.population_row(float(site["x_coord"]), float(site["y_coord"]))) + row
+        results = _results_from_row(row, float(site["area"]), int(site["service_type"]))
+        if store_index is not None:
+            apply_store_index(results, store_index, site["x_coord"], site["y_coord"], site["business_type_name"])
+        results_list.append(results)
+
+    engine = "batch" + ("+raster" if raster_engine is not None else "") + ("+store_index" if store_index is not None else "")
+    return results_list, {
+        "total_ms": round((time.time() - start) * 1000, 3),
+        "sql_ms": sql_ms,
+        "engine": engine,
+        "sites": len(sites),
+    }
+
+
+def build_model_features(results: Dict[str, Any], business_type_id: int) -> Dict[str, Any]:
+    """AnalysisResult 필드 딕셔너리를 XGBoost 입력용 28개 피쳐 딕셔너리로 변환"""
+    features = {name: results.get(field, 0) for name, field in MODEL_FEATURE_FIELDS.items()}
+    features["UPTAENM_ID"] = business_type_id
+    return features
+
+
+def print_feature_timings(timings: Dict[str, Any]):
+    """레이어별 타이밍 로그 출력"""
+    print(f"   ⏱️ 피쳐 추출 쿼리: {timings.get('total_ms', 0):.1f}ms ({timings.get('engine', 'sql')})")
+    for name, info in timings.items():
+        if isinstance(info, dict):
+            print(f"      - {name}: {info['ms']:.1f}ms -> {', '.join(info['features'])}")
@@ -0,0 +1,330 @@
+# AI_Analyzer/inference_sidecar.py
+# 로컬 추론 사이드카 (Unix 소켓) - 생존 확률 모델과 임베딩 모델을 한 프로세스에서 서빙
+#
+# 웹 워커마다 XGBoost 모델/bge-m3 임베딩 모델을 올리면 메모리가 워커 수만큼 늘어나므로,
+# python manage.py run_inference_server 로 사이드카를 띄우면 워커는 소켓으로 predict_batch/embed_batch만 호출
+# 소켓이 없거나 호출이 실패하면 호출 측은 기존처럼 프로세스 내 모델로 처리
+#
+# 프레임: [헤더 길이(4B)][페이로드 길이(4B)][JSON 헤더][바이너리 페이로드(numpy 버퍼)]
+
+import asyncio
+import json
+import os
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from django.conf import settings
+
+
+FRAME_HEADER = struct.Struct(">II")
+
+_CLIENT: Optional["InferenceClient"] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def _sidecar_settings() -> Dict[str, Any]:
+    return getattr(settings, "ANALYSIS_SETTINGS", {}).get("INFERENCE_SIDECAR", {})
+
+
+class SidecarError(Exception):
+    """사이드카 처리 오류 (호출 측은 프로세스 내 모델로 대체)"""
+
+
+class SidecarUnavailable(SidecarError):
+    """소켓 연결/통신 실패"""
+
+
+# ============================================================================
+# 프레임 인코딩
+# ============================================================================
+
+def encode_frame(header: Dict[str, Any], payload: bytes = b"") -> bytes:
+    header_bytes = json.dumps(header).encode("utf-8")
+    return FRAME_HEADER.pack(len(header_bytes), len(payload)) + header_bytes + payload
+
+
+def _array_header(array: np.ndarray) -> Dict[str, Any]:
+    return {"dtype": array.dtype.str, "shape": list(array.shape)}
+
+
+def _array_from(header: Dict[str, Any], payload: bytes) -> np.ndarray:
+    return np.frombuffer(payload, dtype=np.dtype(header["dtype"])).reshape(header["shape"])
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(size - len(buffer))
+        if not chunk:
+            raise ConnectionError("추론 서버 연결이 끊어졌습니다.")
+        buffer.extend(chunk)
+    return bytes(buffer)
+
+
+def recv_frame(sock: socket.socket) -> Tuple[Dict[str, Any], bytes]:
+    header_len, payload_len = FRAME_HEADER.unpack(_recv_exact(sock, FRAME_HEADER.size))
+    header = json.loads(_recv_exact(sock, header_len).decode("utf-8"))
+    return header, _recv_exact(sock, payload_len) if payload_len else b""
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[Dict[str, Any], bytes]:
+    header_len, payload_len = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    header = json.loads((await reader.readexactly(header_len)).decode("utf-8"))
+    return header, await reader.readexactly(payload_len) if payload_len else b""
+
+
+# ============================================================================
+# 클라이언트 (웹 워커)
+# ============================================================================
+
+class InferenceClient:
+    """
+    사이드카 동기 클라이언트
+
+    Note:
+        - 스레드별로 연결을 재사용 (작업 큐 스레드 풀에서도 안전)
+        - 연결 실패 시 RETRY_SECONDS 동안 사이드카를 건너뛰어 매 요청마다 연결을 시도하지 않음
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 10.0, retry_seconds: float = 30.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.retry_seconds = retry_seconds
+        self.down_until = 0.0
+        self._local = threading.local()
+
+    def is_available(self) -> bool:
+        return time.time() >= self.down_until and os.path.exists(self.socket_path)
+
+    def _close(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+        self._local.sock = None
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            self._local.sock = sock
+        return sock
+
+    def _call(self, header: Dict[str, Any], payload: bytes = b"") -> Tuple[Dict[str, Any], bytes]:
+        frame = encode_frame(header, payload)
+        # 재사용 연결이 사이드카 재시작으로 끊겼을 수 있으므로 한 번 재연결
+        for attempt in range(2):
+            reused = getattr(self._local, "sock", None) is not None
+            try:
+                sock = self._connection()
+                sock.sendall(frame)
+                response, response_payload = recv_frame(sock)
+                break
+            except (OSError, ConnectionError, ValueError) as e:
+                self._close()
+                if attempt == 0 and reused:
+                    continue
+                self.down_until = time.time() + self.retry_seconds
+                raise SidecarUnavailable(str(e)) from e
+
+        if not response.get("ok"):
+            raise SidecarError(response.get("error", "알 수 없는 오류"))
+        return response, response_payload
+
+    def predict_batch(self, feature_matrix: np.ndarray) -> np.ndarray:
+        """(n × 28) 피쳐 행렬 -> 생존 확률 배열"""
+        matrix = np.ascontiguousarray(feature_matrix, dtype=np.float32)
+        response, payload = self._call({"op": "predict_batch", **_array_header(matrix)}, matrix.tobytes())
+        return _array_from(response, payload).astype(np.float64)
+
+    def predict_contribs(self, feature_matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(n × 28) 피쳐 행렬 -> (생존 확률 배열, 피쳐별 기여도 행렬)"""
+        matrix = np.ascontiguousarray(feature_matrix, dtype=np.float32)
+        response, payload = self._call({"op": "predict_contribs", **_array_header(matrix)}, matrix.tobytes())
+        packed = _array_from(response, payload).astype(np.float64)
+        return packed[:, 0], packed[:, 1:]
+
+    def embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """텍스트 목록 -> (n × d) 임베딩 행렬"""
+        response, payload = self._call({"op": "embed_batch", "texts": list(texts)})
+        return _array_from(response, payload)
+
+    def ping(self) -> Dict[str, Any]:
+        return self._call({"op": "ping"})[0]
+
+
+def get_inference_client() -> Optional[InferenceClient]:
+    """
+    사이드카 클라이언트 (사용 불가면 None)
+
+    Note:
+        - INFERENCE_SIDECAR.ENABLED이고 소켓 파일이 있을 때만 반환
+    """
+    global _CLIENT
+    conf = _sidecar_settings()
+    if not conf.get("ENABLED", False):
+        return None
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = InferenceClient(
+                    conf.get("SOCKET_PATH", "/tmp/locaai-inference.sock"),
+                    timeout=conf.get("TIMEOUT", 10),
+                    retry_seconds=conf.get("RETRY_SECONDS", 30),
+                )
+    return _CLIENT if _CLIENT.is_available() else None
+
+
+def sidecar_available() -> bool:
+    return get_inference_client() is not None
+
+
+# ============================================================================
+# 서버 (사이드카 프로세스)
+# ============================================================================
+
+class MicroBatcher:
+    """
+    동시 요청 마이크로 배칭
+
+    Note:
+        - 첫 요청 후 MAX_WAIT_MS 동안(또는 max_items까지) 들어온 요청을 한 번의 모델 호출로 처리
+        - 모델 실행 중 도착한 요청은 큐에 쌓여 다음 배치로 묶임
+    """
+
+    def __init__(self, name: str, fn: Callable, concat: Callable, max_items: int, max_wait: float,
+                 executor: ThreadPoolExecutor):
+        self.name = name
+        self.fn = fn
+        self.concat = concat
+        self.max_items = max_items
+        self.max_wait = max_wait
+        self.executor = executor
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    async def submit(self, items) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((items, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            count = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+            while count < self.max_items:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+                count += len(batch[-1][0])
+
+            sizes = [len(items) for items, _ in batch]
+            try:
+                outputs = await loop.run_in_executor(self.executor, self.fn, self.concat([items for items, _ in batch]))
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            offset = 0
+            for size, (_, future) in zip(sizes, batch):
+                if not future.done():
+                    future.set_result(outputs[offset:offset + size])
+                offset += size
+
+
+class InferenceServer:
+    """생존 확률 모델 + 임베딩 모델 사이드카"""
+
+    def __init__(self, socket_path: str, survival_model=None, embedding_model=None,
+                 max_batch_rows: int = 512, max_batch_texts: int = 32, max_wait_ms: float = 5.0):
+        self.socket_path = socket_path
+        self.survival_model = survival_model
+        self.embedding_model = embedding_model
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="inference")
+        max_wait = max_wait_ms / 1000.0
+        self.batchers: Dict[str, MicroBatcher] = {}
+        if survival_model is not None:
+            self.batchers["predict_batch"] = MicroBatcher(
+                "predict_batch", survival_model.predict, np.vstack, max_batch_rows, max_wait, executor
+            )
+            # 확률과 기여도를 한 행렬로 묶어 전송 (0열 확률, 나머지 기여도)
+            self.batchers["predict_contribs"] = MicroBatcher(
+                "predict_contribs",
+                lambda matrix: np.column_stack(survival_model.predict_contribs(matrix)),
+                np.vstack,
+                max_batch_rows,
+                max_wait,
+                executor,
+            )
+        if embedding_model is not None:
+            self.batchers["embed_batch"] = MicroBatcher(
+                "embed_batch",
+                lambda texts: np.asarray(embedding_model.embed_documents(texts), dtype=np.float32),
+                lambda groups: [text for group in groups for text in group],
+                max_batch_texts,
+                max_wait,
+                executor,
+            )
+
+    async def _dispatch(self, header: Dict[str, Any], payload: bytes) -> bytes:
+        op = header.get("op")
+        if op == "ping":
+            return encode_frame({"ok": True, "ops": sorted(self.batchers), "pid": os.getpid()})
+        batcher = self.batchers.get(op)
+        if batcher is None:
+            return encode_frame({"ok": False, "error": f"지원하지 않는 작업: {op}"})
+
+        items = _array_from(header, payload) if op != "embed_batch" else header.get("texts", [])
+        if len(items) == 0:
+            result = np.zeros((0,), dtype=np.float32)
+        else:
+            result = np.ascontiguousarray(await batcher.submit(items))
+        return encode_frame({"ok": True, **_array_header(result)}, result.tobytes())
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    header, payload = await read_frame(reader)
+                except asyncio.IncompleteReadError:
+                    break
+                try:
+                    response = await self._dispatch(header, payload)
+                except Exception as e:
+                    response = encode_frame({"ok": False, "error": str(e)})
+                writer.write(response)
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # 이전 실행에서 남은 소켓
+        tasks = [asyncio.create_task(batcher.run()) for batcher in self.batchers.values()]
+        server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+        os.chmod(self.socket_path, 0o660)
+        print(f"🚀 추론 서버 시작: {self.socket_path} ({', '.join(sorted(self.batchers))})")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for task in tasks:
+                task.cancel()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
@@ -0,0 +1,495 @@
+# AI_Analyzer/jobs.py
+# 상권분석 비동기 작업 큐: 작업 등록 → 워커 풀 실행 → 진행 이벤트(Channels) / 상태 조회
+
+import json
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, transaction
+from django.utils.module_loading import import_string
+
+from .models import AnalysisRequest, AnalysisResult
+
+
+# 진행 단계 (templates/AI_Analyzer/components/progress_steps.html 의 step-* id와 동일)
+ANALYSIS_STEPS = [
+    ("population", "[1/6] 생활인구 분석"),
+    ("working", "[2/6] 직장인구 분석"),
+    ("foreign", "[3/6] 외국인 분석"),
+    ("facilities", "[4/6] 주변시설 분석"),
+    ("competition", "[5/6] 경쟁업체 분석"),
+    ("land", "[6/6] 공시지가 분석"),
+    ("ai", "AI 생존확률 예측"),
+    ("complete", "분석 완료"),
+]
+STEP_INDEX = {key: index for index, (key, _) in enumerate(ANALYSIS_STEPS, start=1)}
+FEATURE_STEPS = [key for key, _ in ANALYSIS_STEPS[:6]]
+
+# 풀 이름 -> 백엔드 ("default": 대화형 분석/설명, 그 외: JOBS["POOLS"]의 별도 풀)
+_JOB_BACKENDS: Dict[str, Any] = {}
+_JOB_BACKEND_LOCK = threading.Lock()
+
+
+def _job_settings() -> Dict[str, Any]:
+    return getattr(settings, "ANALYSIS_SETTINGS", {}).get("JOBS", {})
+
+
+def _state_cache():
+    """작업 상태 캐시 (기본 "shared" - 작업을 실행하지 않은 워커의 상태 조회도 같은 값을 봄)"""
+    return caches[_job_settings().get("CACHE_ALIAS", "shared")]
+
+
+def _state_key(job_id: str) -> str:
+    return f"analysis:job:{job_id}"
+
+
+def job_group_name(job_id: str) -> str:
+    """작업 진행 이벤트 Channels 그룹명"""
+    return f"analysis_job_{job_id}"
+
+
+# ============================================================================
+# 작업 실행 백엔드
+# ============================================================================
+
+class InProcessJobBackend:
+    """
+    웹 프로세스 안의 스레드 풀에서 작업 실행 (기본값)
+
+    Note:
+        - 내구성 없음: 대기/실행 중인 작업은 프로세스 메모리에만 있어 재시작·워커 종료 시 사라짐
+        - 남은 queued/running 요청과 pending AI 설명은 python manage.py sweep_stale_jobs 로 정리
+    """
+
+    def __init__(self, max_workers: int = 4, name: str = "default"):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"analysis-job-{name}")
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+
+    def _run(self, func: Callable, *args, **kwargs):
+        # 워커 스레드의 DB 연결은 요청 사이클 밖이므로 직접 정리
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+            with self._pending_lock:
+                self._pending -= 1
+
+    def submit(self, func: Callable, *args, **kwargs):
+        with self._pending_lock:
+            self._pending += 1
+        return self.executor.submit(self._run, func, *args, **kwargs)
+
+    def backlog(self) -> int:
+        """대기 + 실행 중인 작업 수"""
+        return self._pending
+
+
+class ImmediateJobBackend:
+    """등록 즉시 현재 스레드에서 실행 (테스트용)"""
+
+    def __init__(self, max_workers: int = 1, name: str = "default"):
+        pass
+
+    def submit(self, func: Callable, *args, **kwargs):
+        func(*args, **kwargs)
+
+    def backlog(self) -> int:
+        return 0
+
+
+def get_job_backend(pool: str = "default"):
+    """
+    ANALYSIS_SETTINGS["JOBS"]["BACKEND"] 백엔드 (프로세스·풀 단위 싱글톤)
+
+    Args:
+        pool (str): "default"(대화형 분석/설명, MAX_WORKERS) 또는 JOBS["POOLS"]의 풀 이름
+            - 입지 탐색처럼 긴 작업은 별도 풀에서 실행해 대화형 작업을 막지 않음
+    """
+    backend = _JOB_BACKENDS.get(pool)
+    if backend is None:
+        with _JOB_BACKEND_LOCK:
+            backend = _JOB_BACKENDS.get(pool)
+            if backend is None:
+                conf = _job_settings()
+                backend_class = import_string(conf.get("BACKEND", "AI_Analyzer.jobs.InProcessJobBackend"))
+                max_workers = conf.get("MAX_WORKERS", 4) if pool == "default" else conf.get("POOLS", {}).get(pool, 1)
+                backend = _JOB_BACKENDS[pool] = backend_class(max_workers=max_workers, name=pool)
+    return backend
+
+
+def reset_job_backend():
+    """설정 변경 후 백엔드 재생성 (테스트용)"""
+    _JOB_BACKENDS.clear()
+
+
+# ============================================================================
+# 작업 상태 / 진행 이벤트
+# ============================================================================
+
+def _save_state(job_id: str, state: Dict[str, Any]):
+    _state_cache().set(_state_key(job_id), state, timeout=_job_settings().get("STATUS_TTL", 60 * 60))
+
+
+def _update_state(job_id: str, **changes) -> Dict[str, Any]:
+    state = _state_cache().get(_state_key(job_id)) or {"job_id": job_id}
+    state.update(changes)
+    state["updated_at"] = time.time()
+    _save_state(job_id, state)
+    return state
+
+
+def explanation_group_name(request_id: int) -> str:
+    """AI 설명 스트리밍 Channels 그룹명"""
+    return f"analysis_explanation_{request_id}"
+
+
+def _push_group(group_name: str, event: Dict[str, Any]):
+    """Channels 그룹으로 이벤트 전송 (채널 레이어가 없으면 상태 조회로만 확인 가능)"""
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        # 결과 딕셔너리에 numpy 값이 섞여 있을 수 있어 JSON 호환 값으로 변환 후 전송
+        payload = json.loads(json.dumps(event, cls=DjangoJSONEncoder, default=float))
+        async_to_sync(channel_layer.group_send)(group_name, {"type": "analysis.event", "event": payload})
+    except Exception as e:
+        print(f"⚠️ 분석 이벤트 전송 실패 ({group_name}): {e}")
+
+
+def _push_event(job_id: str, event: Dict[str, Any]):
+    _push_group(job_group_name(job_id), event)
+
+
+class ProgressReporter:
+    """
+    분석 단계 진행 보고 (perform_spatial_analysis 의 progress 인자로 전달)
+
+    Note:
+        - reporter("population") 처럼 단계 키로 호출하면 상태 캐시 갱신 + Channels 이벤트 전송
+    """
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+
+    def __call__(self, step: str, **extra):
+        index = STEP_INDEX[step]
+        event = {
+            "type": "progress",
+            "job_id": self.job_id,
+            "step": step,
+            "step_index": index,
+            "total_steps": len(ANALYSIS_STEPS),
+            "percent": round(index / len(ANALYSIS_STEPS) * 100),
+            "message": ANALYSIS_STEPS[index - 1][1],
+            **extra,
+        }
+        _update_state(self.job_id, step=step, progress_step=index, percent=event["percent"])
+        _push_event(self.job_id, event)
+        print(f"   📡 [{self.job_id[:8]}] {event['message']}")
+
+
+def report_steps(progress: Optional[Callable], *steps: str):
+    """progress 콜백이 있을 때만 단계 보고 (동기 분석에서는 None)"""
+    if progress is None:
+        return
+    for step in steps:
+        progress(step)
+
+
+def _finish(job_id: str, request_id: Optional[int], status: str, **changes):
+    state = _update_state(job_id, status=status, **changes)
+    if request_id:
+        AnalysisRequest.objects.filter(pk=request_id).update(
+            status=status,
+            progress_step=state.get("progress_step", 0),
+            error_message=changes.get("error", ""),
+        )
+    event = {"type": status, "job_id": job_id, "request_id": request_id}
+    if status == AnalysisRequest.STATUS_FAILED:
+        event["error"] = changes.get("error", "")
+    _push_event(job_id, event)
+
+
+# ============================================================================
+# 작업 등록 / 실행
+# ============================================================================
+
+def enqueue_analysis(target, language: str = "ko", is_guest: bool = False) -> str:
+    """
+    분석 작업 등록 후 작업 ID 즉시 반환
+
+    Args:
+        target: 회원은 저장된 AnalysisRequest, 비회원은 SimpleNamespace 임시 요청 객체
+        language (str): 분석 언어
+        is_guest (bool): 비회원 여부 (비회원 결과는 DB에 저장하지 않고 상태 캐시에만 보관)
+
+    Returns:
+        str: 작업 ID
+    """
+    job_id = uuid.uuid4().hex
+    request_id = None if is_guest else target.id
+
+    if not is_guest:
+        target.job_id = job_id
+        target.status = AnalysisRequest.STATUS_QUEUED
+        target.language = language
+        target.save(update_fields=["job_id", "status", "language"])
+
+    _save_state(job_id, {
+        "job_id": job_id,
+        "status": AnalysisRequest.STATUS_QUEUED,
+        "request_id": request_id,
+        "user_id": None if is_guest else target.user_id,
+        "is_guest": is_guest,
+        "step": None,
+        "progress_step": 0,
+        "percent": 0,
+        "created_at": time.time(),
+        "updated_at": time.time(),
+    })
+
+    # 요청 행이 커밋된 뒤에 워커가 조회하도록 커밋 이후 실행
+    backend = get_job_backend()
+    transaction.on_commit(
+        lambda: backend.submit(run_analysis_job, job_id, target if is_guest else target.id, language, is_guest)
+    )
+    print(f"📥 분석 작업 등록: {job_id} ({'비회원' if is_guest else f'요청 ID {request_id}'})")
+    return job_id
+
+
+def run_analysis_job(job_id: str, target, language: str = "ko", is_guest: bool = False):
+    """
+    워커에서 실행되는 분석 작업 본체
+
+    Args:
+        target: 회원은 AnalysisRequest ID, 비회원은 임시 요청 객체
+    """
+    from django.utils.translation import activate
+
+    from .views import perform_spatial_analysis, perform_spatial_analysis_guest
+
+    request_id = None if is_guest else target
+    progress = ProgressReporter(job_id)
+    try:
+        activate(language)
+        _update_state(job_id, status=AnalysisRequest.STATUS_RUNNING, started_at=time.time())
+        if is_guest:
+            result = perform_spatial_analysis_guest(target, language=language, progress=progress)
+        else:
+            AnalysisRequest.objects.filter(pk=request_id).update(status=AnalysisRequest.STATUS_RUNNING)
+            analysis_request = AnalysisRequest.objects.select_related("business_type", "user").get(pk=request_id)
+            result = perform_spatial_analysis(analysis_request, language=language, progress=progress)
+
+        progress("complete")
+        _finish(
+            job_id,
+            request_id,
+            AnalysisRequest.STATUS_COMPLETED,
+            result=json.loads(json.dumps(result, cls=DjangoJSONEncoder, default=float)),
+            finished_at=time.time(),
+        )
+    except Exception as e:
+        print(f"❌ 분석 작업 실패 ({job_id}): {e}")
+        print(traceback.format_exc())
+        _finish(job_id, request_id, AnalysisRequest.STATUS_FAILED, error=str(e), finished_at=time.time())
+
+
+def get_job_status(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    작업 상태 조회
+
+    Note:
+        - 상태 캐시가 만료됐어도 회원 작업은 AnalysisRequest에 저장된 상태로 응답
+    """
+    state = _state_cache().get(_state_key(job_id))
+    if state is not None:
+        return state
+
+    analysis_request = AnalysisRequest.objects.filter(job_id=job_id).first()
+    if analysis_request is None:
+        return None
+    return {
+        "job_id": job_id,
+        "status": analysis_request.status,
+        "request_id": analysis_request.id,
+        "user_id": analysis_request.user_id,
+        "is_guest": False,
+        "progress_step": analysis_request.progress_step,
+        "percent": round(analysis_request.progress_step / len(ANALYSIS_STEPS) * 100),
+        "error": analysis_request.error_message,
+    }
+
+
+# ============================================================================
+# AI 설명 백그라운드 생성
+# ============================================================================
+
+def enqueue_explanation(request_id: int, features_dict: Dict[str, Any], survival_percentage: float,
+                        language: str = "ko", local_explanation: Optional[Dict[str, Any]] = None,
+                        pool: str = "default"):
+    """
+    분석 결과 저장 후 ChatGPT 설명 생성을 백그라운드로 등록
+
+    Args:
+        pool (str): 실행 풀 (일괄 분석은 대화형 풀을 막지 않도록 "batch_explanation")
+
+    Note:
+        - 결과는 ai_explanation_status='pending' 으로 먼저 저장되어 있어야 함
+        - 토큰은 ws/analysis/results/<request_id>/explanation/ 으로 스트리밍
+    """
+    get_job_backend(pool).submit(
+        run_explanation_job, request_id, features_dict, survival_percentage, language, local_explanation
+    )
+    print(f"📥 AI 설명 생성 등록: 요청 ID {request_id}")
+
+
+def run_explanation_job(request_id: int, features_dict: Dict[str, Any], survival_percentage: float,
+                        language: str = "ko", local_explanation: Optional[Dict[str, Any]] = None):
+    """
+    ChatGPT 설명을 스트리밍으로 받아 이벤트 전송 후 AnalysisResult에 저장
+
+    Note:
+        - 토큰은 일정 길이씩 모아 전송 (group_send 호출 수 절감)
+        - 피쳐 기여도가 있으면 축약 프롬프트 사용
+        - 실패 시 기여도 기반 로컬 설명(없으면 언어별 기본 메시지)으로 대체하고 status='failed'
+    """
+    from django.utils.translation import activate
+
+    from .ai_explainer import extract_summary_line, get_fallback_explanation, stream_xgboost_explanation
+
+    group_name = explanation_group_name(request_id)
+    flush_chars = _job_settings().get("EXPLANATION_FLUSH_CHARS", 40)
+    activate(language)
+
+    chunks, buffer = [], ""
+    try:
+        for token in stream_xgboost_explanation(features_dict, survival_percentage, language, local_explanation):
+            chunks.append(token)
+            buffer += token
+            if len(buffer) >= flush_chars:
+                _push_group(group_name, {"type": "explanation.token", "request_id": request_id, "text": buffer})
+                buffer = ""
+        if buffer:
+            _push_group(group_name, {"type": "explanation.token", "request_id": request_id, "text": buffer})
+
+        ai_explanation = "".join(chunks).strip()
+        if not ai_explanation:
+            raise ValueError("빈 응답")
+        ai_summary = extract_summary_line(ai_explanation)
+        status = "ready"
+        print(f"   ✅ AI 설명 생성 완료 (요청 ID {request_id}): {ai_summary}")
+    except Exception as e:
+        print(f"   ❌ AI 설명 생성 오류 (요청 ID {request_id}): {e}")
+        ai_explanation, ai_summary = get_fallback_explanation(survival_percentage, language, local_explanation)
+        status = "failed"
+
+    AnalysisResult.objects.filter(request_id=request_id).update(
+        ai_explanation=ai_explanation,
+        ai_summary=ai_summary[:100],
+        ai_explanation_status=status,
+    )
+    _push_group(group_name, {
+        "type": "explanation.ready",
+        "request_id": request_id,
+        "status": status,
+        "ai_explanation": ai_explanation,
+        "ai_summary": ai_summary,
+    })
+
+
+# ============================================================================
+# 최적 입지 탐색
+# ============================================================================
+
+SITE_SEARCH_POOL = "site_search"
+
+
+def _user_site_search_key(user_id: int) -> str:
+    return f"analysis:site_search:user:{user_id}"
+
+
+def active_site_searches(user_id: int) -> List[str]:
+    """회원의 대기/실행 중인 입지 탐색 작업 ID (모든 워커 공유 상태 캐시 기준)"""
+    cache = _state_cache()
+    active = []
+    for job_id in cache.get(_user_site_search_key(user_id)) or []:
+        state = cache.get(_state_key(job_id))
+        if state and state.get("status") in (AnalysisRequest.STATUS_QUEUED, AnalysisRequest.STATUS_RUNNING):
+            active.append(job_id)
+    return active
+
+
+def site_search_backlog() -> int:
+    """현재 프로세스의 입지 탐색 풀에 대기/실행 중인 작업 수"""
+    return get_job_backend(SITE_SEARCH_POOL).backlog()
+
+
+def enqueue_site_search(params: Dict[str, Any], user_id: int) -> str:
+    """
+    최적 입지 탐색 작업 등록 후 작업 ID 즉시 반환
+
+    Args:
+        params (dict): site_search.search_best_sites 인자 (district_code, business_type_id, ...)
+        user_id (int): 요청 회원 ID (상태 조회 권한 확인 / 회원별 동시 작업 수 제한용)
+
+    Note:
+        - 진행 이벤트는 분석 작업과 같은 ws/analysis/jobs/<job_id>/ 그룹, 결과는 analysis-jobs/<job_id>/ 로 조회
+        - 대화형 분석과 분리된 JOBS["POOLS"]["site_search"] 풀에서 실행
+    """
+    job_id = uuid.uuid4().hex
+    _save_state(job_id, {
+        "job_id": job_id,
+        "kind": "site_search",
+        "status": AnalysisRequest.STATUS_QUEUED,
+        "request_id": None,
+        "user_id": user_id,
+        "is_guest": False,
+        "percent": 0,
+        "created_at": time.time(),
+        "updated_at": time.time(),
+    })
+    _state_cache().set(
+        _user_site_search_key(user_id),
+        active_site_searches(user_id) + [job_id],
+        timeout=_job_settings().get("STATUS_TTL", 60 * 60),
+    )
+    get_job_backend(SITE_SEARCH_POOL).submit(run_site_search_job, job_id, params)
+    print(f"📥 입지 탐색 작업 등록: {job_id} ({params.get('district_code')})")
+    return job_id
+
+
+def run_site_search_job(job_id: str, params: Dict[str, Any]):
+    """워커에서 실행되는 입지 탐색 작업 본체 (청크마다 평가 후보 수를 진행 이벤트로 전송)"""
+    from .site_search import search_best_sites
+
+    def progress(evaluated: int, total: int):
+        percent = round(evaluated / total * 100) if total else 100
+        _update_state(job_id, percent=percent, evaluated=evaluated, candidates=total)
+        _push_event(job_id, {
+            "type": "progress",
+            "job_id": job_id,
+            "step": "site_search",
+            "percent": percent,
+            "evaluated": evaluated,
+            "candidates": total,
+        })
+
+    try:
+        _update_state(job_id, status=AnalysisRequest.STATUS_RUNNING, started_at=time.time())
+        result = search_best_sites(progress=progress, **params)
+        _finish(job_id, None, AnalysisRequest.STATUS_COMPLETED, result=result, finished_at=time.time())
+    except Exception as e:
+        print(f"❌ 입지 탐색 작업 실패 ({job_id}): {e}")
+        print(traceback.format_exc())
+        _finish(job_id, None, AnalysisRequest.STATUS_FAILED, error=str(e), finished_at=time.time())
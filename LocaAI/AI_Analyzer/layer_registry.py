@@ -0,0 +1,172 @@
+# AI_Analyzer/layer_registry.py
+# 공간 레이어 레지스트리 - 논리 레이어명 -> 실제 테이블명 + 행 수 추정치(pg_class.reltuples)
+#
+# 서버 시작 시(또는 python manage.py resolve_spatial_layers) 카탈로그 조회 한 번으로 모든 레이어의 후보 테이블을 해석하고
+# 결과를 공유 캐시에 저장 → 분석/대시보드 요청은 테이블 존재 확인이나 전체 COUNT(*) 없이 레지스트리만 참조
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+
+from GeoDB.models import LandValue, LifePopGrid, PublicBuilding, School, StorePoint, WorkGrid
+
+
+# 외국인 레이어 후보 테이블 (앞쪽이 우선순위)
+TEMP_FOREIGN_TABLES = [
+    "temp_25m_5186",
+    "temp_foreign_25m_5186",
+    "_단기체류외국인_25m_5186",
+    "단기체류외국인_25m_5186",
+]
+LONG_FOREIGN_TABLES = [
+    "long_25m_5186",
+    "long_foreign_25m_5186",
+    "_장기체류외국인_25m_5186",
+    "장기체류외국인_25m_5186",
+]
+
+# 논리 레이어명 -> 후보 테이블 (앞쪽이 우선순위)
+SPATIAL_LAYERS: Dict[str, List[str]] = {
+    "life_pop": [LifePopGrid._meta.db_table],
+    "work_pop": [WorkGrid._meta.db_table],
+    "temp_foreign": TEMP_FOREIGN_TABLES,
+    "long_foreign": LONG_FOREIGN_TABLES,
+    "store": [StorePoint._meta.db_table],
+    "school": [School._meta.db_table],
+    "public": [PublicBuilding._meta.db_table],
+    "land_value": [LandValue._meta.db_table],
+}
+
+CACHE_KEY = "analysis:layer_registry"
+
+# 프로세스 단위 레지스트리: (공유 캐시에서 읽은 시각, 레지스트리)
+_REGISTRY: Dict[str, Any] = {"loaded_at": 0.0, "layers": None}
+_LOCK = threading.Lock()
+
+
+def _registry_settings() -> Dict[str, Any]:
+    return getattr(settings, "ANALYSIS_SETTINGS", {}).get("LAYER_REGISTRY", {})
+
+
+def _get_cache():
+    """레지스트리 공유 캐시 (locmem이면 관리 명령의 재해석이 워커에 전달되지 않으므로 공유 백엔드 사용)"""
+    return caches[_registry_settings().get("CACHE_ALIAS", "shared")]
+
+
+def _quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def resolve_spatial_layers(cursor) -> Dict[str, Dict[str, Any]]:
+    """
+    모든 논리 레이어의 실제 테이블과 행 수 추정치 해석
+
+    Returns:
+        dict: {레이어명: {"table": 테이블명 또는 None, "rows": 행 수 추정치, "estimated": reltuples 사용 여부}}
+
+    Note:
+        - 후보 테이블 전체를 pg_class 한 번으로 조회 (테이블마다 존재 확인/COUNT(*) 하지 않음)
+        - reltuples가 0 이하(ANALYZE 전)인 테이블만 데이터 존재 여부를 확인하고 정확한 행 수를 한 번 계산
+    """
+    candidates = sorted({table for tables in SPATIAL_LAYERS.values() for table in tables})
+    cursor.execute(
+        """
+        SELECT c.relname, c.reltuples::bigint
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'public'
+          AND c.relkind IN ('r', 'p', 'm')
+          AND c.relname = ANY(%s)
+        """,
+        [candidates],
+    )
+    reltuples = dict(cursor.fetchall())
+
+    layers = {}
+    for name, tables in SPATIAL_LAYERS.items():
+        layers[name] = {"table": None, "rows": 0, "estimated": True}
+        for table_name in tables:
+            if table_name not in reltuples:
+                continue
+            rows, estimated = int(reltuples[table_name]), True
+            if rows <= 0:
+                cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {_quote_ident(table_name)} LIMIT 1)")
+                if not cursor.fetchone()[0]:
+                    continue
+                cursor.execute(f"SELECT COUNT(*) FROM {_quote_ident(table_name)}")
+                rows, estimated = int(cursor.fetchone()[0]), False
+            layers[name] = {"table": table_name, "rows": rows, "estimated": estimated}
+            break
+    return layers
+
+
+def publish_layer_registry(layers: Dict[str, Dict[str, Any]]):
+    """해석 결과를 공유 캐시와 현재 프로세스에 저장 (다른 워커는 REFRESH_SECONDS 안에 반영)"""
+    _get_cache().set(CACHE_KEY, layers, timeout=None)
+    with _LOCK:
+        _REGISTRY["layers"] = layers
+        _REGISTRY["loaded_at"] = time.time()
+
+
+def get_layer_registry(cursor=None, refresh: bool = False) -> Dict[str, Dict[str, Any]]:
+    """
+    레이어 레지스트리 반환
+
+    Args:
+        cursor: 해석이 필요할 때 사용할 DB 커서 (생략 시 새 커서)
+        refresh (bool): True면 공유 캐시를 무시하고 다시 해석
+
+    Note:
+        - 프로세스 값 → 공유 캐시 → 카탈로그 해석 순으로 사용
+        - 프로세스 값은 REFRESH_SECONDS마다 공유 캐시에서 다시 읽어 관리 명령의 재해석을 반영
+    """
+    refresh_seconds = _registry_settings().get("REFRESH_SECONDS", 10 * 60)
+    with _LOCK:
+        layers = _REGISTRY["layers"]
+        fresh = time.time() - _REGISTRY["loaded_at"] < refresh_seconds
+    if layers is not None and fresh and not refresh:
+        return layers
+
+    if not refresh:
+        cached = _get_cache().get(CACHE_KEY)
+        if cached is not None:
+            with _LOCK:
+                _REGISTRY["layers"] = cached
+                _REGISTRY["loaded_at"] = time.time()
+            return cached
+
+    if cursor is None:
+        with connection.cursor() as cursor:
+            layers = resolve_spatial_layers(cursor)
+    else:
+        layers = resolve_spatial_layers(cursor)
+    publish_layer_registry(layers)
+    return layers
+
+
+def layer_table(name: str, cursor=None) -> Optional[str]:
+    """논리 레이어 -> 실제 테이블명 (사용 가능한 테이블이 없으면 None)"""
+    return get_layer_registry(cursor)[name]["table"]
+
+
+def layer_row_estimate(name: str, cursor=None) -> int:
+    """논리 레이어 행 수 추정치 (pg_class.reltuples, 대시보드 통계용)"""
+    return get_layer_registry(cursor)[name]["rows"]
+
+
+def preload_layer_registry():
+    """서버 시작 시 백그라운드 스레드에서 레지스트리 해석 (요청 스레드를 막지 않음)"""
+
+    def _resolve():
+        try:
+            get_layer_registry()
+        except Exception as e:
+            print(f"⚠️ 공간 레이어 레지스트리 해석 실패 (첫 요청 때 다시 시도): {e}")
+        finally:
+            connection.close()
+
+    threading.Thread(target=_resolve, name="layer-registry-preload", daemon=True).start()
@@ -0,0 +1,173 @@
+# AI_Analyzer/local_explainer.py
+# XGBoost 피쳐별 기여도(pred_contribs, SHAP 값) 기반 로컬 설명
+#
+# 예측과 같은 Booster 호출에서 나온 기여도로 생존 확률을 올리고/내리는 피쳐 순위를 만들고,
+# AnalysisResult.feature_contributions에 저장 → ChatGPT 프롬프트 축약 및 LLM 실패/지연 시 즉시 대체 설명으로 사용
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .feature_extractor import MODEL_FEATURES
+
+
+# 피쳐 표시명 (ko / en / es)
+FEATURE_LABELS = {
+    "Area": ("매장 면적", "Store area", "Área de la tienda"),
+    "Adjacent_BIZ": ("300m 전체 요식업체 수", "Food businesses within 300m", "Negocios de comida en 300m"),
+    "1A_Total": ("300m 생활인구", "Resident population within 300m", "Población residente en 300m"),
+    "Total_LV": ("토지 가치", "Land value", "Valor del terreno"),
+    "Business_D": ("업종 다양성", "Business diversity", "Diversidad de negocios"),
+    "Working_Pop": ("300m 직장인구", "Working population within 300m", "Población trabajadora en 300m"),
+    "2A_20": ("1000m 20대 비율", "20s share within 1000m", "Proporción de 20s en 1000m"),
+    "2A_30": ("1000m 30대 비율", "30s share within 1000m", "Proporción de 30s en 1000m"),
+    "2A_40": ("1000m 40대 비율", "40s share within 1000m", "Proporción de 40s en 1000m"),
+    "2A_50": ("1000m 50대 비율", "50s share within 1000m", "Proporción de 50s en 1000m"),
+    "2A_60": ("1000m 60대 비율", "60s share within 1000m", "Proporción de 60s en 1000m"),
+    "1A_20": ("300m 20대 비율", "20s share within 300m", "Proporción de 20s en 300m"),
+    "1A_30": ("300m 30대 비율", "30s share within 300m", "Proporción de 30s en 300m"),
+    "1A_40": ("300m 40대 비율", "40s share within 300m", "Proporción de 40s en 300m"),
+    "1A_50": ("300m 50대 비율", "50s share within 300m", "Proporción de 50s en 300m"),
+    "1A_60": ("300m 60대 비율", "60s share within 300m", "Proporción de 60s en 300m"),
+    "1A_Long_Total": ("300m 장기체류 외국인", "Long-term foreign residents within 300m", "Residentes extranjeros de largo plazo en 300m"),
+    "2A_Long_Total": ("1000m 장기체류 외국인", "Long-term foreign residents within 1000m", "Residentes extranjeros de largo plazo en 1000m"),
+    "1A_Temp_CN": ("300m 단기체류 중국인 비율", "Short-term Chinese visitor share within 300m", "Proporción de visitantes chinos en 300m"),
+    "2A_Temp_CN": ("1000m 단기체류 중국인 비율", "Short-term Chinese visitor share within 1000m", "Proporción de visitantes chinos en 1000m"),
+    "2A_Temp_Total": ("1000m 단기체류 외국인", "Short-term foreign visitors within 1000m", "Visitantes extranjeros de corto plazo en 1000m"),
+    "2A_Long_CN": ("1000m 장기체류 중국인 비율", "Long-term Chinese resident share within 1000m", "Proporción de residentes chinos en 1000m"),
+    "Competitor_C": ("동일업종 경쟁업체 수", "Same-industry competitors", "Competidores de la misma industria"),
+    "Competitor_R": ("경쟁업체 비율", "Competitor ratio", "Ratio de competidores"),
+    "Service": ("서비스 유형", "Service type", "Tipo de servicio"),
+    "School": ("학교 수", "Schools", "Escuelas"),
+    "PubBuilding": ("공공기관 수", "Public buildings", "Edificios públicos"),
+    "UPTAENM_ID": ("업종", "Business type", "Tipo de negocio"),
+}
+LANGUAGE_INDEX = {"ko": 0, "en": 1, "es": 2}
+
+# 비율(%)로 표시하는 피쳐
+PERCENT_FEATURES = {
+    "2A_20", "2A_30", "2A_40", "2A_50", "2A_60", "1A_20", "1A_30", "1A_40", "1A_50", "1A_60",
+    "1A_Temp_CN", "2A_Temp_CN", "2A_Long_CN", "Competitor_R",
+}
+
+HEADINGS = {
+    "ko": ("상승 요인", "하락 요인", "모델 기여도 기준 주요 요인 (로그 오즈)"),
+    "en": ("Factors raising survival", "Factors lowering survival", "Key factors by model contribution (log-odds)"),
+    "es": ("Factores que aumentan la supervivencia", "Factores que reducen la supervivencia",
+           "Factores clave por contribución del modelo (log-odds)"),
+}
+
+
+def feature_label(name: str, language: str = "ko") -> str:
+    labels = FEATURE_LABELS.get(name)
+    return labels[LANGUAGE_INDEX.get(language, 0)] if labels else name
+
+
+def _format_value(name: str, value: float) -> str:
+    if name in PERCENT_FEATURES:
+        return f"{value:.1f}%"
+    if name in ("Service", "UPTAENM_ID"):
+        return str(int(value))
+    return f"{value:,.0f}" if abs(value) >= 100 else f"{value:g}"
+
+
+def rank_contributions(contribs: Sequence[float], feature_row: Sequence[float],
+                       top_n: int = 5) -> Dict[str, Any]:
+    """
+    기여도 한 행 -> 상승/하락 요인 순위
+
+    Args:
+        contribs: 피쳐별 기여도 (n_features + 1, 마지막은 bias) - 27개 피쳐 모델이면 업종 ID 제외
+        feature_row: 28개 피쳐 값 (MODEL_FEATURES 순서)
+
+    Returns:
+        dict: {"bias", "positive": [{feature, value, contribution}], "negative": [...]} (기여도 절댓값 내림차순)
+    """
+    contribs = np.asarray(contribs, dtype=np.float64)
+    n_features = contribs.size - 1
+    items = [
+        {
+            "feature": name,
+            "value": float(feature_row[i]),
+            "contribution": round(float(contribs[i]), 4),
+        }
+        for i, name in enumerate(MODEL_FEATURES[:n_features])
+    ]
+    positive = sorted((item for item in items if item["contribution"] > 0), key=lambda item: -item["contribution"])
+    negative = sorted((item for item in items if item["contribution"] < 0), key=lambda item: item["contribution"])
+    return {
+        "bias": round(float(contribs[-1]), 4),
+        "positive": positive[:top_n],
+        "negative": negative[:top_n],
+    }
+
+
+def rank_contribution_matrix(contribs: np.ndarray, feature_matrix: np.ndarray,
+                             top_n: int = 5) -> List[Dict[str, Any]]:
+    """행렬 단위 rank_contributions (행 순서 유지)"""
+    return [rank_contributions(c, f, top_n) for c, f in zip(contribs, feature_matrix)]
+
+
+def format_contributions_for_prompt(local: Dict[str, Any], language: str = "ko") -> str:
+    """
+    로컬 설명 -> 프롬프트용 축약 피쳐 요약 (기여도가 큰 피쳐만 값과 방향 표시)
+
+    Note:
+        - 28개 피쳐 전체 요약 대신 사용되어 프롬프트 길이를 줄임
+    """
+    up, down, title = HEADINGS.get(language, HEADINGS["ko"])
+    lines = [f"[{title}]", f"{up}:"]
+    for item in local.get("positive", []):
+        lines.append(
+            f"• {feature_label(item['feature'], language)}: {_format_value(item['feature'], item['value'])} "
+            f"(+{item['contribution']:.3f})"
+        )
+    lines.append(f"{down}:")
+    for item in local.get("negative", []):
+        lines.append(
+            f"• {feature_label(item['feature'], language)}: {_format_value(item['feature'], item['value'])} "
+            f"({item['contribution']:.3f})"
+        )
+    return "\n".join(lines)
+
+
+def build_local_explanation(local: Dict[str, Any], survival_percentage: float,
+                            language: str = "ko") -> Tuple[str, str]:
+    """
+    기여도만으로 만든 결정적 설명 (LLM 실패/지연 시 즉시 대체)
+
+    Returns:
+        tuple: (설명, 요약)
+    """
+    up, down, _ = HEADINGS.get(language, HEADINGS["ko"])
+    top_up = local.get("positive", [])[:3]
+    top_down = local.get("negative", [])[:3]
+
+    if language == "en":
+        summary = f"Predicted survival probability {survival_percentage}%."
+        if top_up:
+            summary += f" Main strength: {feature_label(top_up[0]['feature'], language)}."
+    elif language == "es":
+        summary = f"Probabilidad de supervivencia predicha: {survival_percentage}%."
+        if top_up:
+            summary += f" Fortaleza principal: {feature_label(top_up[0]['feature'], language)}."
+    else:
+        summary = f"예측 생존 확률 {survival_percentage}%"
+        if top_up:
+            summary += f", 주요 강점은 {feature_label(top_up[0]['feature'], language)}입니다."
+
+    lines = [summary, "", f"{up}:"]
+    lines.extend(
+        f"• {feature_label(item['feature'], language)}: {_format_value(item['feature'], item['value'])}"
+        for item in top_up
+    )
+    lines.extend(["", f"{down}:"])
+    lines.extend(
+        f"• {feature_label(item['feature'], language)}: {_format_value(item['feature'], item['value'])}"
+        for item in top_down
+    )
+    return "\n".join(lines), summary
+
+
+def contributions_available(local: Optional[Dict[str, Any]]) -> bool:
+    return bool(local) and bool(local.get("positive") or local.get("negative"))
@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from AI_Analyzer.raster_engine import build_raster_snapshot, get_raster_dir, read_current_version
+
+
+class Command(BaseCommand):
+    help = '생활인구·직장인구·외국인 격자 테이블을 memmap용 누적합 래스터 스냅샷(새 버전)으로 생성'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output-dir',
+            type=str,
+            default=None,
+            help='스냅샷 디렉터리 (기본값: ANALYSIS_SETTINGS["RASTER_DIR"])'
+        )
+        parser.add_argument(
+            '--keep',
+            type=int,
+            default=None,
+            help='보관할 버전 수 (기본값: ANALYSIS_SETTINGS["RASTER_KEEP_VERSIONS"])'
+        )
+
+    def handle(self, *args, **options):
+        raster_dir = options['output_dir'] or get_raster_dir()
+        if not raster_dir:
+            self.stdout.write(self.style.ERROR('저장 경로가 없습니다. --output-dir 또는 RASTER_DIR를 설정하세요.'))
+            return
+        keep = options['keep']
+        if keep is None:
+            keep = settings.ANALYSIS_SETTINGS.get('RASTER_KEEP_VERSIONS', 2)
+
+        previous = read_current_version(raster_dir)
+        self.stdout.write(f"래스터 스냅샷 생성 시작: {raster_dir} (현재 버전: {previous or '없음'})")
+        with connection.cursor() as cursor:
+            info = build_raster_snapshot(cursor, raster_dir, keep_versions=keep, log=self.stdout.write)
+
+        if not info['layers']:
+            self.stdout.write(self.style.WARNING('래스터화된 레이어가 없어 기존 버전을 유지합니다.'))
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f"래스터 스냅샷 {info['version']} 활성화 완료: {', '.join(info['layers'])} 레이어 "
+            f"(실행 중인 워커는 다음 분석 요청 시 새 버전을 엶)"
+        ))
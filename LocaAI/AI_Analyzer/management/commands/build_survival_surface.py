@@ -0,0 +1,101 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from AI_Analyzer.models import BusinessType
+from AI_Analyzer.survival_surface import build_survival_surface, get_surface_dir, read_current_version
+
+
+class Command(BaseCommand):
+    help = '서울 전역 격자점의 업종별 생존 확률을 미리 계산해 표면 스냅샷(새 버전)으로 저장'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--step',
+            type=float,
+            default=None,
+            help='격자 간격(m) (기본값: SURVIVAL_SURFACE["STEP_M"])'
+        )
+        parser.add_argument(
+            '--tile-size',
+            type=float,
+            default=None,
+            help='워커 작업 단위 타일 크기(m) (기본값: SURVIVAL_SURFACE["TILE_M"])'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=0,
+            help='피쳐 계산 프로세스 수 (0이면 현재 프로세스에서 처리)'
+        )
+        parser.add_argument(
+            '--area',
+            type=float,
+            default=None,
+            help='고정 면적(㎡) (기본값: SURVIVAL_SURFACE["AREA"])'
+        )
+        parser.add_argument(
+            '--service-type',
+            type=int,
+            default=None,
+            help='고정 서비스 유형 0/1 (기본값: SURVIVAL_SURFACE["SERVICE_TYPE"])'
+        )
+        parser.add_argument(
+            '--business-types',
+            type=str,
+            default=None,
+            help='계산할 업종 ID 목록 (쉼표 구분, 기본값: 전체)'
+        )
+        parser.add_argument(
+            '--keep',
+            type=int,
+            default=None,
+            help='보관할 버전 수 (기본값: SURVIVAL_SURFACE["KEEP_VERSIONS"])'
+        )
+        parser.add_argument(
+            '--output-dir',
+            type=str,
+            default=None,
+            help='표면 디렉터리 (기본값: SURVIVAL_SURFACE["DIR"])'
+        )
+
+    def handle(self, *args, **options):
+        conf = settings.ANALYSIS_SETTINGS.get('SURVIVAL_SURFACE', {})
+        surface_dir = options['output_dir'] or get_surface_dir()
+        if not surface_dir:
+            self.stdout.write(self.style.ERROR('저장 경로가 없습니다. --output-dir 또는 SURVIVAL_SURFACE["DIR"]를 설정하세요.'))
+            return
+
+        business_types = BusinessType.objects.order_by('id')
+        if options['business_types']:
+            ids = [int(v) for v in options['business_types'].split(',') if v.strip()]
+            business_types = business_types.filter(id__in=ids)
+        business_types = list(business_types.values_list('id', 'name'))
+        if not business_types:
+            self.stdout.write(self.style.ERROR('계산할 업종이 없습니다.'))
+            return
+
+        def option(name, key, default):
+            return options[name] if options[name] is not None else conf.get(key, default)
+
+        previous = read_current_version(surface_dir)
+        self.stdout.write(f"생존 확률 표면 생성 시작: {surface_dir} (현재 버전: {previous or '없음'})")
+        try:
+            info = build_survival_surface(
+                surface_dir,
+                step=option('step', 'STEP_M', 50),
+                tile_m=option('tile_size', 'TILE_M', 2000),
+                area=option('area', 'AREA', 33.0),
+                service_type=option('service_type', 'SERVICE_TYPE', 1),
+                business_types=business_types,
+                workers=options['workers'],
+                keep_versions=option('keep', 'KEEP_VERSIONS', 2),
+                log=self.stdout.write,
+            )
+        except RuntimeError as e:
+            self.stdout.write(self.style.ERROR(str(e)))
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f"생존 확률 표면 {info['version']} 활성화 완료: 격자점 {info['points']:,}개 × "
+            f"업종 {len(info['business_types'])}개 (실행 중인 워커는 다음 요청 시 새 버전을 엶)"
+        ))
@@ -0,0 +1,308 @@
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from AI_Analyzer.feature_extractor import MODEL_FEATURES
+from AI_Analyzer.model_serving import get_model_path, get_survival_model, init_pool_worker, predict_in_worker
+from shopdash.dong_geojson import invalidate_dong_geojson
+from shopdash.vector_tiles import invalidate_tiles
+
+
+# 모델 피쳐 -> store_result 컬럼 SQL 식 (MODEL_FEATURES 순서로 SELECT)
+# Competitor_R은 분석 시(_ratio)와 같이 경쟁업체 / 전체 요식업체 비율(%)을 소수 둘째 자리로 계산
+STORE_RESULT_FEATURE_SQL = {
+    "Area": "sr.area",
+    "Adjacent_BIZ": "sr.adjacent_biz",
+    "1A_Total": "sr.life_pop_total",
+    "Total_LV": "sr.total_land_value",
+    "Business_D": "sr.business_diversity_300m",
+    "Working_Pop": "sr.working_pop_300m",
+    "2A_20": "sr.life_pop_20_1000m",
+    "2A_30": "sr.life_pop_30_1000m",
+    "2A_40": "sr.life_pop_40_1000m",
+    "2A_50": "sr.life_pop_50_1000m",
+    "2A_60": "sr.life_pop_60_1000m",
+    "1A_20": "sr.life_pop_20_300m",
+    "1A_30": "sr.life_pop_30_300m",
+    "1A_40": "sr.life_pop_40_300m",
+    "1A_50": "sr.life_pop_50_300m",
+    "1A_60": "sr.life_pop_60_300m",
+    "1A_Long_Total": "sr.long_foreign_300m",
+    "2A_Long_Total": "sr.long_foreign_1000m",
+    "1A_Temp_CN": "sr.temp_foreign_cn_300m",
+    "2A_Temp_CN": "sr.temp_foreign_cn_1000m",
+    "2A_Temp_Total": "sr.temp_foreign_total",
+    "2A_Long_CN": "sr.long_foreign_cn_1000m",
+    "Competitor_C": "sr.competitor_300m",
+    "Competitor_R": (
+        "CASE WHEN sr.adjacent_biz > 0 "
+        "THEN ROUND((sr.competitor_300m * 100.0 / sr.adjacent_biz)::numeric, 2) ELSE 0 END"
+    ),
+    "Service": "sr.service_type",
+    "School": "sr.school_250m",
+    "PubBuilding": "sr.public_building_250m",
+    "UPTAENM_ID": "bt.id",
+}
+
+
+# 예측에 필요한 store_result 컬럼 (NULL이면 0으로 채우지 않고 재계산에서 제외)
+# service_type 0은 실제 범주(휴게음식점)이므로 NULL을 0으로 바꾸면 다른 점포로 예측됨
+REQUIRED_COLUMNS = sorted({
+    expression for expression in STORE_RESULT_FEATURE_SQL.values()
+    if expression.startswith("sr.")
+})
+
+# 업종이 business_type에 있고 필수 피쳐가 모두 있는 행
+SCORABLE_SQL = " AND ".join(f"{column} IS NOT NULL" for column in REQUIRED_COLUMNS)
+
+
+def build_select_sql():
+    columns = ",\n       ".join(
+        f"({STORE_RESULT_FEATURE_SQL[name]})::float8" for name in MODEL_FEATURES
+    )
+    return f"""
+        SELECT sr.id,
+       {columns}
+        FROM store_result sr
+        JOIN business_type bt ON bt.name = sr.uptaenm
+        WHERE {SCORABLE_SQL}
+        ORDER BY sr.id
+    """
+
+
+def count_unscorable(cursor):
+    """
+    재계산에서 제외되는 행 수 (결과는 기존 값 유지)
+
+    Returns:
+        tuple: (업종이 business_type에 없는 행 수, 필수 피쳐가 NULL인 행 수)
+    """
+    cursor.execute(f"""
+        SELECT COUNT(*) FILTER (WHERE bt.id IS NULL),
+               COUNT(*) FILTER (WHERE bt.id IS NOT NULL AND NOT ({SCORABLE_SQL}))
+        FROM store_result sr
+        LEFT JOIN business_type bt ON bt.name = sr.uptaenm
+    """)
+    unmatched, incomplete = cursor.fetchone()
+    return int(unmatched), int(incomplete)
+
+
+def dong_store_value_sql(cursor):
+    """
+    dong_store."result" 컬럼 타입에 맞는 store_result.result 변환 SQL
+
+    Returns:
+        tuple: (변환 SQL 또는 None, 동기화를 건너뛰는 이유)
+
+    Note:
+        - import_dong_store가 GPKG의 object 컬럼을 TEXT로 만들 수 있어, 비교할 수 없는 타입은 건너뜀
+    """
+    cursor.execute("""
+        SELECT data_type FROM information_schema.columns
+        WHERE table_name = 'dong_store' AND column_name = 'result'
+    """)
+    row = cursor.fetchone()
+    if row is None:
+        return None, 'dong_store."result" 컬럼이 없어 동기화를 건너뜁니다.'
+
+    data_type = row[0]
+    if data_type == 'boolean':
+        return 'sr.result >= 0.5', None
+    if data_type in ('smallint', 'integer', 'bigint'):
+        return '(sr.result >= 0.5)::int', None
+    if data_type in ('real', 'double precision', 'numeric'):
+        return f'sr.result::{data_type}', None
+    return None, (
+        f'dong_store."result" 컬럼 타입({data_type})이 숫자가 아니라 동기화를 건너뜁니다. '
+        f'컬럼을 double precision으로 변환한 뒤 다시 실행하세요.'
+    )
+
+
+def write_results(cursor, ids, probabilities):
+    """UPDATE ... FROM (VALUES ...) 한 문장으로 배치 반영 (값이 바뀐 행만 갱신)"""
+    values = ", ".join(["(%s::bigint, %s::float8)"] * len(ids))
+    params = [value for pair in zip(ids.tolist(), probabilities.tolist()) for value in pair]
+    cursor.execute(
+        f"""
+        UPDATE store_result AS sr
+        SET result = v.result, updated_at = NOW()
+        FROM (VALUES {values}) AS v(id, result)
+        WHERE sr.id = v.id AND sr.result IS DISTINCT FROM v.result
+        """,
+        params,
+    )
+    return cursor.rowcount
+
+
+class Command(BaseCommand):
+    help = '현재 XGBoost 모델로 store_result(및 dong_store) 생존 예측값을 일괄 재계산'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=20000,
+            help='서버 측 커서에서 한 번에 읽어 예측할 행 수 (기본값: 20000)'
+        )
+        parser.add_argument(
+            '--write-batch',
+            type=int,
+            default=5000,
+            help='UPDATE ... FROM (VALUES ...) 한 문장에 담을 행 수 (기본값: 5000)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=0,
+            help='예측 프로세스 풀 크기 (0이면 현재 프로세스에서 예측)'
+        )
+        parser.add_argument(
+            '--skip-dong-store',
+            action='store_true',
+            help='dong_store."result" 동기화를 건너뜀'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='예측만 수행하고 저장하지 않음'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        write_batch = options['write_batch']
+        workers = options['workers']
+        dry_run = options['dry_run']
+
+        model = get_survival_model()
+        if model is None:
+            self.stdout.write(self.style.ERROR('XGBoost 모델을 로드할 수 없습니다.'))
+            return
+
+        pool = None
+        if workers > 0:
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=init_pool_worker,
+                initargs=(
+                    str(get_model_path()),
+                    settings.ANALYSIS_SETTINGS.get('MODEL_SERVING', {}).get('NATIVE_FORMAT'),
+                    max(1, (multiprocessing.cpu_count() or 1) // workers),
+                ),
+            )
+            predict = lambda matrix: pool.submit(predict_in_worker, matrix)
+        else:
+            predict = model.predict
+
+        self.stdout.write(
+            f"store_result 재계산 시작 (청크 {chunk_size:,}행, 쓰기 배치 {write_batch:,}행, "
+            f"{'프로세스 ' + str(workers) + '개' if pool else '단일 프로세스'}{', DRY RUN' if dry_run else ''})"
+        )
+
+        # dong_store 동기화 가능 여부는 store_result를 다시 쓰기 전에 확인
+        dong_store_sql = None
+        if not dry_run and not options['skip_dong_store']:
+            with connection.cursor() as cursor:
+                dong_store_sql, skip_reason = dong_store_value_sql(cursor)
+            if dong_store_sql is None:
+                self.stdout.write(self.style.WARNING(skip_reason))
+
+        with connection.cursor() as cursor:
+            unmatched, incomplete = count_unscorable(cursor)
+        if unmatched or incomplete:
+            self.stdout.write(self.style.WARNING(
+                f"재계산 제외 (기존 값 유지): 업종 매칭 실패 {unmatched:,}행, 필수 피쳐 누락 {incomplete:,}행"
+            ))
+
+        start = time.time()
+        scored = updated = 0
+        pending = deque()  # (ids, future) - 풀 사용 시 DB 읽기/쓰기와 예측을 겹침
+
+        def flush(ids, probabilities):
+            nonlocal scored, updated
+            scored += len(ids)
+            if not dry_run:
+                with connection.cursor() as write_cursor:
+                    for offset in range(0, len(ids), write_batch):
+                        updated += write_results(
+                            write_cursor, ids[offset:offset + write_batch],
+                            probabilities[offset:offset + write_batch],
+                        )
+            elapsed = time.time() - start
+            self.stdout.write(f"  {scored:,}행 예측, {updated:,}행 갱신 ({scored / elapsed:,.0f} rows/s)")
+
+        try:
+            # autocommit 상태의 chunked_cursor는 WITH HOLD 서버 측 커서라 배치 UPDATE 커밋 후에도 유지됨
+            with connection.chunked_cursor() as read_cursor:
+                read_cursor.execute(build_select_sql())
+                while True:
+                    rows = read_cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    data = np.asarray(rows, dtype=np.float64)
+                    ids = data[:, 0].astype(np.int64)
+                    matrix = np.ascontiguousarray(data[:, 1:], dtype=np.float32)
+
+                    if pool is None:
+                        flush(ids, predict(matrix))
+                        continue
+
+                    pending.append((ids, predict(matrix)))
+                    while len(pending) > workers * 2:
+                        done_ids, future = pending.popleft()
+                        flush(done_ids, future.result())
+
+            while pending:
+                done_ids, future = pending.popleft()
+                flush(done_ids, future.result())
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+        elapsed = time.time() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"store_result 재계산 완료: {scored:,}행 예측, {updated:,}행 갱신, "
+            f"{unmatched + incomplete:,}행 제외, "
+            f"{elapsed:.1f}초 ({scored / elapsed if elapsed else 0:,.0f} rows/s)"
+        ))
+
+        if dong_store_sql is not None:
+            self.sync_dong_store(dong_store_sql)
+        if not dry_run:
+            # 대시보드 행정동 GeoJSON / 점포 타일 캐시 무효화 (평균 생존률·예측값 변경)
+            invalidate_dong_geojson()
+            invalidate_tiles(["stores", "store_results"])
+
+    def sync_dong_store(self, value_sql):
+        """
+        dong_store."result"를 store_result 값으로 동기화
+
+        Args:
+            value_sql (str): dong_store_value_sql이 반환한 컬럼 타입별 변환 SQL
+
+        Note:
+            - 두 테이블 모두 dong_store.gpkg에서 가져왔으므로 (X, Y, 업종)으로 매칭
+            - dong_store의 X/Y가 REAL일 수 있어 양쪽 모두 real로 맞춰 비교
+            - result 컬럼이 정수/불리언(생존 여부)이면 0.5 기준으로 변환
+        """
+        with connection.cursor() as cursor:
+            start = time.time()
+            cursor.execute(f"""
+                UPDATE dong_store AS ds
+                SET "result" = {value_sql}
+                FROM store_result AS sr
+                WHERE sr.result IS NOT NULL
+                  AND ds."X"::real = sr.x_coord::real
+                  AND ds."Y"::real = sr.y_coord::real
+                  AND ds."UPTAENM" = sr.uptaenm
+                  AND ds."result" IS DISTINCT FROM {value_sql}
+            """)
+            self.stdout.write(self.style.SUCCESS(
+                f"dong_store 동기화 완료: {cursor.rowcount:,}행 갱신 ({time.time() - start:.1f}초)"
+            ))
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from AI_Analyzer.layer_registry import (
+    SPATIAL_LAYERS,
+    _quote_ident,
+    publish_layer_registry,
+    resolve_spatial_layers,
+)
+
+
+class Command(BaseCommand):
+    help = '공간 레이어별 실제 테이블과 행 수 추정치(pg_class.reltuples)를 다시 해석해 레이어 레지스트리에 저장'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help='해석 전에 후보 테이블에 ANALYZE를 실행해 행 수 추정치 갱신'
+        )
+
+    def handle(self, *args, **options):
+        with connection.cursor() as cursor:
+            if options['analyze']:
+                candidates = sorted({table for tables in SPATIAL_LAYERS.values() for table in tables})
+                cursor.execute(
+                    """
+                    SELECT c.relname FROM pg_class c
+                    JOIN pg_namespace n ON n.oid = c.relnamespace
+                    WHERE n.nspname = 'public' AND c.relkind IN ('r', 'p', 'm') AND c.relname = ANY(%s)
+                    """,
+                    [candidates],
+                )
+                for (table_name,) in cursor.fetchall():
+                    self.stdout.write(f"ANALYZE {table_name}")
+                    cursor.execute(f"ANALYZE {_quote_ident(table_name)}")
+            layers = resolve_spatial_layers(cursor)
+
+        publish_layer_registry(layers)
+        for name, layer in layers.items():
+            if layer['table'] is None:
+                self.stdout.write(self.style.WARNING(f"  {name}: 사용 가능한 테이블 없음 (피쳐 0으로 계산)"))
+            else:
+                self.stdout.write(
+                    f"  {name}: {layer['table']} "
+                    f"({'약 ' if layer['estimated'] else ''}{layer['rows']:,}행)"
+                )
+        self.stdout.write(self.style.SUCCESS(
+            f"레이어 레지스트리 저장 완료: {len(layers)}개 레이어 (실행 중인 워커는 REFRESH_SECONDS 안에 반영)"
+        ))
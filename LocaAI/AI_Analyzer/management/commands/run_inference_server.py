@@ -0,0 +1,64 @@
+import asyncio
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from AI_Analyzer.inference_sidecar import InferenceServer
+from AI_Analyzer.model_serving import load_survival_model
+
+
+class Command(BaseCommand):
+    help = '생존 확률 모델과 임베딩 모델을 공유하는 로컬 추론 서버(Unix 소켓) 실행'
+
+    def add_arguments(self, parser):
+        conf = settings.ANALYSIS_SETTINGS.get('INFERENCE_SIDECAR', {})
+        parser.add_argument(
+            '--socket',
+            type=str,
+            default=conf.get('SOCKET_PATH', '/tmp/locaai-inference.sock'),
+            help='Unix 소켓 경로 (기본값: ANALYSIS_SETTINGS["INFERENCE_SIDECAR"]["SOCKET_PATH"])'
+        )
+        parser.add_argument(
+            '--no-embeddings',
+            action='store_true',
+            help='임베딩 모델을 올리지 않음 (predict_batch만 제공)'
+        )
+        parser.add_argument(
+            '--max-wait-ms',
+            type=float,
+            default=conf.get('MAX_WAIT_MS', 5),
+            help='마이크로 배치 대기 시간(ms)'
+        )
+
+    def handle(self, *args, **options):
+        conf = settings.ANALYSIS_SETTINGS.get('INFERENCE_SIDECAR', {})
+
+        survival_model = load_survival_model(warmup=True)
+        if survival_model is None:
+            self.stdout.write(self.style.WARNING('생존 확률 모델을 로드하지 못해 predict_batch를 제공하지 않습니다.'))
+
+        embedding_model = None
+        if not options['no_embeddings']:
+            from chatbot.utils.qdrant import load_local_embedding_model
+
+            embedding_model = load_local_embedding_model()
+            embedding_model.embed_documents(['워밍업'])
+            self.stdout.write(f"임베딩 모델 로드 완료: {settings.RAG_SETTINGS['EMBEDDING_MODEL']}")
+
+        if survival_model is None and embedding_model is None:
+            self.stdout.write(self.style.ERROR('서빙할 모델이 없습니다.'))
+            return
+
+        server = InferenceServer(
+            options['socket'],
+            survival_model=survival_model,
+            embedding_model=embedding_model,
+            max_batch_rows=conf.get('MAX_BATCH_ROWS', 512),
+            max_batch_texts=conf.get('MAX_BATCH_TEXTS', 32),
+            max_wait_ms=options['max_wait_ms'],
+        )
+        self.stdout.write(self.style.SUCCESS(f"추론 서버 대기 중: {options['socket']} (Ctrl+C로 종료)"))
+        try:
+            asyncio.run(server.serve())
+        except KeyboardInterrupt:
+            self.stdout.write('추론 서버 종료')
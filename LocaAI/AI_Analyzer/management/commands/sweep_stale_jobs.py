@@ -0,0 +1,95 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from AI_Analyzer.ai_explainer import get_fallback_explanation, result_features
+from AI_Analyzer.jobs import enqueue_explanation
+from AI_Analyzer.models import AnalysisRequest, AnalysisResult
+
+
+class Command(BaseCommand):
+    help = (
+        '재시작/워커 종료로 사라진 작업 정리: 오래된 queued/running 분석 요청은 failed로, '
+        'pending AI 설명은 기본 메시지로 마감하거나 다시 등록'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than',
+            type=int,
+            default=None,
+            help='이 시간(초)보다 오래된 행만 정리 (기본값: ANALYSIS_SETTINGS["JOBS"]["STALE_SECONDS"])'
+        )
+        parser.add_argument(
+            '--requeue-explanations',
+            action='store_true',
+            help='pending AI 설명을 실패 처리하지 않고 이 프로세스의 작업 풀에 다시 등록 (명령이 끝날 때까지 대기)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='변경하지 않고 대상 건수만 출력'
+        )
+
+    def handle(self, *args, **options):
+        job_settings = settings.ANALYSIS_SETTINGS.get('JOBS', {})
+        older_than = options['older_than'] or job_settings.get('STALE_SECONDS', 30 * 60)
+        cutoff = timezone.now() - timedelta(seconds=older_than)
+
+        stale_requests = AnalysisRequest.objects.filter(
+            status__in=[AnalysisRequest.STATUS_QUEUED, AnalysisRequest.STATUS_RUNNING],
+            created_at__lt=cutoff,
+        )
+        stale_explanations = (
+            AnalysisResult.objects.filter(ai_explanation_status='pending', created_at__lt=cutoff)
+            .select_related('request')
+        )
+
+        self.stdout.write(
+            f"{older_than}초 이상 지난 작업: 분석 요청 {stale_requests.count()}건, "
+            f"AI 설명 {stale_explanations.count()}건"
+        )
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING("DRY RUN 모드 - 변경하지 않음"))
+            return
+
+        failed_requests = stale_requests.update(
+            status=AnalysisRequest.STATUS_FAILED,
+            error_message='작업이 완료되지 않은 채 서버가 재시작되었습니다. 다시 분석해주세요.',
+        )
+
+        requeued = failed_explanations = 0
+        for result in stale_explanations.iterator():
+            language = result.request.language
+            local_explanation = result.feature_contributions or None
+            if options['requeue_explanations']:
+                enqueue_explanation(
+                    result.request_id, result_features(result), result.survival_percentage, language,
+                    local_explanation,
+                )
+                requeued += 1
+                continue
+            ai_explanation, ai_summary = get_fallback_explanation(
+                result.survival_percentage, language, local_explanation
+            )
+            AnalysisResult.objects.filter(pk=result.pk, ai_explanation_status='pending').update(
+                ai_explanation=ai_explanation,
+                ai_summary=ai_summary[:100],
+                ai_explanation_status='failed',
+            )
+            failed_explanations += 1
+
+        if requeued:
+            # 작업 풀 스레드가 끝나기 전에 명령 프로세스가 종료되지 않도록 대기
+            from AI_Analyzer.jobs import get_job_backend
+
+            backend = get_job_backend()
+            if hasattr(backend, 'executor'):
+                backend.executor.shutdown(wait=True)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"정리 완료: 분석 요청 {failed_requests}건 failed, "
+            f"AI 설명 {failed_explanations}건 기본 메시지로 마감, {requeued}건 재등록"
+        ))
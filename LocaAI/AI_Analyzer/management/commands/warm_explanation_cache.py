@@ -0,0 +1,76 @@
+from django.core.management.base import BaseCommand
+
+from AI_Analyzer import explanation_cache
+from AI_Analyzer.ai_explainer import is_fallback_explanation, prepare_explanation, result_features
+from AI_Analyzer.models import AnalysisResult
+
+
+class Command(BaseCommand):
+    help = (
+        '피쳐 기여도가 저장된 회원 분석 결과(AnalysisResult)의 ChatGPT 설명으로 설명 캐시를 미리 채움 '
+        '(기여도가 없는 과거 행은 실제 요청의 캐시 키와 맞지 않아 제외)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=1000,
+            help='최근 결과부터 읽을 최대 행 수 (기본값: 1000)'
+        )
+        parser.add_argument(
+            '--language',
+            type=str,
+            default=None,
+            help='특정 언어(ko/en/es)로 요청된 결과만 사용'
+        )
+        parser.add_argument(
+            '--overwrite',
+            action='store_true',
+            help='이미 캐시된 키도 덮어씀'
+        )
+
+    def handle(self, *args, **options):
+        if not explanation_cache.is_enabled():
+            self.stdout.write(self.style.WARNING('ANALYSIS_SETTINGS["EXPLANATION_CACHE"]["ENABLED"]가 꺼져 있습니다.'))
+            return
+        if explanation_cache.is_process_local():
+            self.stdout.write(self.style.ERROR(
+                '설명 캐시가 locmem 백엔드라 이 명령이 끝나면 적재한 값이 사라집니다. '
+                'EXPLANATION_CACHE_BACKEND를 파일 캐시(기본값) 또는 DatabaseCache(createcachetable 필요)로 설정하세요.'
+            ))
+            return
+
+        # 기여도는 언어/설명 상태 컬럼 이후에 추가되었으므로, 기여도가 있는 행만 언어와 상태 값을 신뢰할 수 있고
+        # 실제 요청도 항상 기여도 요약 키로 조회함 (피쳐 요약 키로 적재하면 적중하지 않음)
+        results = (
+            AnalysisResult.objects.filter(is_member_analysis=True, ai_explanation_status='ready')
+            .exclude(ai_explanation='')
+            .exclude(feature_contributions={})
+            .select_related('request')
+            .order_by('-created_at')
+        )
+        if options['language']:
+            results = results.filter(request__language=options['language'])
+
+        stored = skipped = fallback = 0
+        for result in results[:options['limit']]:
+            if is_fallback_explanation(result.ai_explanation, result.survival_percentage, result.feature_contributions):
+                # ChatGPT 실패 시 저장된 기본 메시지/로컬 설명은 캐시하지 않음
+                fallback += 1
+                continue
+            _, _, cache_key = prepare_explanation(
+                result_features(result), result.survival_percentage, result.request.language,
+                result.feature_contributions or None,
+            )
+            if not options['overwrite'] and explanation_cache.has_cached_explanation(cache_key):
+                skipped += 1
+                continue
+            explanation_cache.set_cached_explanation(cache_key, result.ai_explanation, result.survival_percentage)
+            stored += 1
+
+        stats = explanation_cache.get_cache_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f"설명 캐시 적재 완료: {stored}건 저장, {skipped}건 기존 키 유지, {fallback}건 기본 메시지 제외 "
+            f"(누적 적중 {stats['hits']} / 미스 {stats['misses']}, 적중률 {stats['hit_rate']}%)"
+        ))
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.3 on 2025-07-01 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("AI_Analyzer", "0005_analysisresult_business_recommendations"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="analysisrequest",
+            name="job_id",
+            field=models.CharField(
+                blank=True, max_length=32, null=True, unique=True, verbose_name="작업 ID"
+            ),
+        ),
+        migrations.AddField(
+            model_name="analysisrequest",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("queued", "대기"),
+                    ("running", "진행 중"),
+                    ("completed", "완료"),
+                    ("failed", "실패"),
+                ],
+                default="completed",
+                max_length=10,
+                verbose_name="분석 상태",
+            ),
+        ),
+        migrations.AddField(
+            model_name="analysisrequest",
+            name="progress_step",
+            field=models.IntegerField(default=0, verbose_name="진행 단계"),
+        ),
+        migrations.AddField(
+            model_name="analysisrequest",
+            name="language",
+            field=models.CharField(default="ko", max_length=5, verbose_name="언어"),
+        ),
+        migrations.AddField(
+            model_name="analysisrequest",
+            name="error_message",
+            field=models.TextField(blank=True, default="", verbose_name="오류 메시지"),
+        ),
+    ]
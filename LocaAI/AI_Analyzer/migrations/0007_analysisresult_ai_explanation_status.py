@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2025-07-01 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("AI_Analyzer", "0006_analysisrequest_job_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="analysisresult",
+            name="ai_explanation_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "생성 중"),
+                    ("ready", "완료"),
+                    ("failed", "실패(기본 메시지)"),
+                ],
+                default="ready",
+                max_length=10,
+                verbose_name="AI 설명 상태",
+            ),
+        ),
+    ]
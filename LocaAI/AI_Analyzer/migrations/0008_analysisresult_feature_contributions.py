@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2025-07-02 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("AI_Analyzer", "0007_analysisresult_ai_explanation_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="analysisresult",
+            name="feature_contributions",
+            field=models.JSONField(blank=True, default=dict, verbose_name="피쳐 기여도 (로컬 설명)"),
+        ),
+    ]
@@ -0,0 +1,206 @@
+# AI_Analyzer/model_serving.py
+# XGBoost 생존 확률 모델 서빙 (네이티브 Booster 로드 + inplace_predict)
+#
+# AppConfig.ready에서 한 번 로드/워밍업하고, 예측은 sklearn 래퍼(predict_proba)를 거치지 않고
+# Booster.inplace_predict에 C-연속 float32 배열을 바로 넘김
+
+import json
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import xgboost as xgb
+from django.conf import settings
+
+from .feature_extractor import MODEL_FEATURES
+
+
+_MODEL: Optional["SurvivalModel"] = None
+_MODEL_LOCK = threading.Lock()
+
+
+def _serving_settings() -> Dict[str, Any]:
+    return getattr(settings, "ANALYSIS_SETTINGS", {}).get("MODEL_SERVING", {})
+
+
+def get_model_path() -> Path:
+    """피클 모델 경로 (MODEL_FILE은 BASE_DIR 기준 상대경로, 실행 디렉터리와 무관)"""
+    return Path(settings.BASE_DIR) / _serving_settings().get("MODEL_FILE", "model/best_xgb_model.pkl")
+
+
+class SurvivalModel:
+    """
+    네이티브 Booster 래퍼
+
+    Note:
+        - 입력 피쳐 수(28개 또는 업종 ID를 제외한 27개)는 로드 시 Booster.num_features()로 한 번만 판별
+        - inplace_predict는 DMatrix 생성 없이 예측하며 스레드 안전
+    """
+
+    def __init__(self, booster: "xgb.Booster", source: str):
+        self.booster = booster
+        self.source = source
+        self.n_features = int(booster.num_features())
+        if self.n_features not in (len(MODEL_FEATURES), len(MODEL_FEATURES) - 1):
+            print(
+                f"⚠️ 모델 입력 피쳐 수({self.n_features})가 예상(28/27)과 다릅니다. "
+                f"앞쪽 {min(self.n_features, len(MODEL_FEATURES))}개 컬럼만 사용합니다."
+            )
+        # 업종 ID(마지막 컬럼) 제외 모델이면 27개 컬럼만 사용
+        self.n_features = min(self.n_features, len(MODEL_FEATURES))
+        try:
+            self.objective = json.loads(booster.save_config())["learner"]["objective"]["name"]
+        except Exception:
+            self.objective = ""
+
+    def predict(self, feature_matrix: np.ndarray) -> np.ndarray:
+        """
+        (n × 28) 피쳐 행렬 -> 행별 생존 확률
+
+        Returns:
+            np.ndarray: float64 확률 배열 (길이 n)
+        """
+        matrix = np.ascontiguousarray(feature_matrix[:, : self.n_features], dtype=np.float32)
+        if matrix.shape[0] == 0:
+            return np.zeros(0)
+        proba = self.booster.inplace_predict(matrix)
+        if proba.ndim == 2:
+            # multi:softprob 목적함수로 학습된 경우 (n × 2) -> 양성 클래스
+            proba = proba[:, 1]
+        return proba.astype(np.float64)
+
+    def predict_contribs(self, feature_matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        생존 확률과 피쳐별 기여도(SHAP 값, pred_contribs)를 한 번의 Booster 호출로 계산
+
+        Returns:
+            tuple: (확률 배열 (n), 기여도 행렬 (n × (n_features + 1), 마지막 열은 bias) - 로그 오즈 단위)
+
+        Note:
+            - binary:logistic / multi:softprob 모델은 기여도 합(마진)에서 확률을 바로 계산
+            - 그 밖의 목적함수는 확률을 predict로 따로 계산
+        """
+        matrix = np.ascontiguousarray(feature_matrix[:, : self.n_features], dtype=np.float32)
+        if matrix.shape[0] == 0:
+            return np.zeros(0), np.zeros((0, self.n_features + 1))
+        contribs = self.booster.predict(xgb.DMatrix(matrix), pred_contribs=True)
+        if contribs.ndim == 3:
+            # multi:softprob (n × 클래스 × 피쳐+1) -> 클래스별 마진의 softmax, 양성 클래스 기여도
+            margins = contribs.sum(axis=2)
+            margins = np.exp(margins - margins.max(axis=1, keepdims=True))
+            proba = margins[:, 1] / margins.sum(axis=1)
+            contribs = contribs[:, 1, :]
+        elif self.objective.startswith("binary:logistic"):
+            proba = 1.0 / (1.0 + np.exp(-contribs.sum(axis=1)))
+        else:
+            proba = self.predict(feature_matrix)
+        return proba.astype(np.float64), contribs.astype(np.float64)
+
+    def warmup(self, rows: int = 64):
+        """첫 요청 지연을 없애기 위해 더미 배치로 예측 경로(스레드 풀·버퍼) 초기화"""
+        start = time.time()
+        self.predict(np.zeros((rows, len(MODEL_FEATURES)), dtype=np.float32))
+        print(f"🔥 XGBoost 워밍업 완료: {rows}행 ({(time.time() - start) * 1000:.1f}ms)")
+
+
+def _unpickle_booster(pickle_path: Path) -> "xgb.Booster":
+    with open(pickle_path, "rb") as f:
+        model = pickle.load(f)
+    # sklearn 래퍼(XGBClassifier)면 내부 Booster 사용
+    return model.get_booster() if hasattr(model, "get_booster") else model
+
+
+def load_booster(pickle_path: Path, native_format: Optional[str] = None) -> "xgb.Booster":
+    """
+    Booster 로드
+
+    Args:
+        pickle_path (Path): 학습 시 저장한 피클 경로
+        native_format (str, optional): "json" / "ubj" - 피클 옆에 네이티브 포맷 사본을 두고 다음부터 그걸 로드
+
+    Note:
+        - 네이티브 사본이 피클보다 오래됐으면(모델 교체) 피클에서 다시 변환
+        - 사본 저장 실패(읽기 전용 배포 등)는 경고만 출력
+    """
+    if not native_format:
+        return _unpickle_booster(pickle_path)
+
+    native_path = pickle_path.with_suffix(f".{native_format}")
+    if native_path.exists() and native_path.stat().st_mtime >= pickle_path.stat().st_mtime:
+        return xgb.Booster(model_file=str(native_path))
+
+    booster = _unpickle_booster(pickle_path)
+    try:
+        tmp_path = native_path.with_name(f".{native_path.name}.tmp{native_path.suffix}")
+        booster.save_model(str(tmp_path))
+        os.replace(tmp_path, native_path)
+        print(f"✅ XGBoost 네이티브 포맷 변환 완료: {native_path}")
+    except Exception as e:
+        print(f"⚠️ XGBoost 네이티브 포맷 저장 실패 (피클 로드 유지): {e}")
+    return booster
+
+
+def load_survival_model(warmup: bool = False) -> Optional[SurvivalModel]:
+    """
+    모델을 로드해 프로세스 전역으로 보관
+
+    Returns:
+        SurvivalModel: 로드 실패 시 None (다음 get_survival_model 호출 때 재시도)
+    """
+    global _MODEL
+    conf = _serving_settings()
+    model_path = get_model_path()
+    with _MODEL_LOCK:
+        if _MODEL is not None:
+            return _MODEL
+        start = time.time()
+        try:
+            booster = load_booster(model_path, conf.get("NATIVE_FORMAT"))
+            model = SurvivalModel(booster, str(model_path))
+        except FileNotFoundError:
+            print(f"❌ XGBoost 모델 파일을 찾을 수 없습니다: {model_path}")
+            return None
+        except Exception as e:
+            print(f"❌ XGBoost 모델 로드 실패: {e}")
+            return None
+        print(
+            f"✅ XGBoost 모델 로드 완료: {model_path} "
+            f"({model.n_features}개 피쳐, {(time.time() - start) * 1000:.0f}ms)"
+        )
+        if warmup:
+            model.warmup(conf.get("WARMUP_ROWS", 64))
+        _MODEL = model
+    return _MODEL
+
+
+def get_survival_model() -> Optional[SurvivalModel]:
+    """로드된 모델 반환 (AppConfig.ready에서 로드되지 않았으면 지금 로드)"""
+    return _MODEL if _MODEL is not None else load_survival_model()
+
+
+# ============================================================================
+# 프로세스 풀 워커 (rescore_stores --workers)
+# ============================================================================
+
+_WORKER_MODEL: Optional[SurvivalModel] = None
+
+
+def init_pool_worker(model_path: str, native_format: Optional[str] = None, nthread: int = 1):
+    """
+    spawn 방식 워커 초기화 (Django 설정 없이 Booster만 로드)
+
+    Note:
+        - fork는 부모에서 초기화된 OpenMP 스레드 풀과 충돌할 수 있어 spawn 사용
+    """
+    global _WORKER_MODEL
+    booster = load_booster(Path(model_path), native_format)
+    booster.set_param({"nthread": nthread})
+    _WORKER_MODEL = SurvivalModel(booster, model_path)
+
+
+def predict_in_worker(feature_matrix: np.ndarray) -> np.ndarray:
+    return _WORKER_MODEL.predict(feature_matrix)
@@ -38,12 +38,29 @@ class AnalysisRequest(django_models.Model):
         service_type (int): 서비스 유형 (0: 휴게음식점, 1: 일반음식점)
         longitude, latitude (float): WGS84 좌표
         x_coord, y_coord (float): EPSG:5186 좌표
+        job_id (str): 비동기 분석 작업 ID (작업 큐로 요청한 경우)
+        status (str): 분석 상태 (queued / running / completed / failed)
+        progress_step (int): 완료된 진행 단계 수 (jobs.ANALYSIS_STEPS 기준)
+        language (str): 분석 요청 언어 (작업 실행 시 활성화)
+        error_message (str): 실패 시 오류 메시지
         created_at (datetime): 분석 요청 일시
         
     Note:
         - 공간 분석을 위해 WGS84와 EPSG:5186 좌표를 모두 저장
         - AnalysisResult와 1:1 관계
+        - 동기 분석은 기존과 같이 completed 상태로 생성, 작업 큐 분석은 queued로 생성
     """
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, '대기'),
+        (STATUS_RUNNING, '진행 중'),
+        (STATUS_COMPLETED, '완료'),
+        (STATUS_FAILED, '실패'),
+    ]
+
     user = django_models.ForeignKey('custom_auth.User', on_delete=django_models.CASCADE, verbose_name="사용자", null=True, blank=True)
     address = django_models.CharField(max_length=200, verbose_name="주소")
     area = django_models.FloatField(verbose_name="면적(㎡)")
@@ -56,6 +73,13 @@ class AnalysisRequest(django_models.Model):
     x_coord = django_models.FloatField(verbose_name="X좌표(EPSG:5186)")
     y_coord = django_models.FloatField(verbose_name="Y좌표(EPSG:5186)")
     
+    # 비동기 분석 작업 상태
+    job_id = django_models.CharField(max_length=32, unique=True, null=True, blank=True, verbose_name="작업 ID")
+    status = django_models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_COMPLETED, verbose_name="분석 상태")
+    progress_step = django_models.IntegerField(default=0, verbose_name="진행 단계")
+    language = django_models.CharField(max_length=5, default='ko', verbose_name="언어")
+    error_message = django_models.TextField(blank=True, default="", verbose_name="오류 메시지")
+    
     # 분석 결과
     created_at = django_models.DateTimeField(auto_now_add=True)
     
@@ -104,6 +128,8 @@ class AnalysisResult(django_models.Model):
         # AI 예측 결과
         survival_probability (float): 생존 확률 (0-1)
         survival_percentage (float): 생존 확률 (%)
+        ai_explanation_status (str): AI 설명 생성 상태 (pending: 백그라운드 생성 중)
+        feature_contributions (dict): 피쳐별 기여도(pred_contribs) 기반 상승/하락 요인 (로컬 설명)
         
         created_at (datetime): 결과 생성 일시
         
@@ -164,6 +190,13 @@ class AnalysisResult(django_models.Model):
     # AI 설명 가능 결과 (회원용)
     ai_explanation = django_models.TextField(verbose_name="AI 상세 설명", blank=True, default="")
     ai_summary = django_models.CharField(max_length=100, verbose_name="AI 요약", blank=True, default="")
+    ai_explanation_status = django_models.CharField(
+        max_length=10,
+        choices=[('pending', '생성 중'), ('ready', '완료'), ('failed', '실패(기본 메시지)')],
+        default='ready',
+        verbose_name="AI 설명 상태",
+    )
+    feature_contributions = django_models.JSONField(verbose_name="피쳐 기여도 (로컬 설명)", default=dict, blank=True)
     is_member_analysis = django_models.BooleanField(verbose_name="회원 분석 여부", default=False)
     
     # 업종 추천 결과
@@ -0,0 +1,385 @@
+# AI_Analyzer/raster_engine.py
+# 격자형 인구 레이어(생활인구·직장인구·외국인)를 NumPy 래스터로 보관하고 반경 합계를 메모리에서 계산
+#
+# 스냅샷 디렉터리 구조 (RASTER_DIR):
+#   CURRENT                      <- 현재 버전명 (os.replace로 원자적 교체)
+#   v20250101T000000/header.json <- origin, cell, SRID, 밴드명, 배열 shape/dtype
+#   v20250101T000000/life__total.npy ...
+# 워커는 .npy를 memmap으로 열어 OS 페이지 캐시를 공유하므로 워커 수만큼 RAM이 늘지 않음
+
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from GeoDB.models import LifePopGrid, LongForeign, TempForeign, WorkGrid
+
+from .feature_extractor import _quote_ident
+from .layer_registry import layer_table
+
+
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_SRID = 5186
+CURRENT_POINTER = "CURRENT"
+HEADER_FILE = "header.json"
+
+# 래스터화할 레이어: GeoDB 모델, 레이어 레지스트리 이름, 셀 크기(m), 폴리곤 여부, 밴드명 -> 모델 필드명
+# 폴리곤 격자는 ST_DWithin과 동일하게 "셀 사각형이 반경에 닿으면" 포함, 포인트 격자는 셀 중심 기준
+RASTER_LAYERS = {
+    "life": {
+        "model": LifePopGrid,
+        "layer": "life_pop",
+        "cell": 10,
+        "polygon": True,
+        "bands": {
+            "total": "총생활인구수",
+            "pop_20": "age_20",
+            "pop_30": "age_30",
+            "pop_40": "age_40",
+            "pop_50": "age_50",
+            "pop_60": "age_60",
+        },
+    },
+    "work": {
+        "model": WorkGrid,
+        "layer": "work_pop",
+        "cell": 10,
+        "polygon": False,
+        "bands": {"total": "총_직장_인구_수"},
+    },
+    "temp": {
+        "model": TempForeign,
+        "layer": "temp_foreign",
+        "cell": 25,
+        "polygon": False,
+        "bands": {"total": "총생활인구수", "cn": "중국인체류인구수"},
+    },
+    "long": {
+        "model": LongForeign,
+        "layer": "long_foreign",
+        "cell": 25,
+        "polygon": False,
+        "bands": {"total": "총생활인구수", "cn": "중국인체류인구수"},
+    },
+}
+
+# 프로세스 단위 래스터 엔진 캐시: (CURRENT 수정시각, 엔진)
+_RASTER_ENGINE: Tuple[Optional[int], Optional["RasterFeatureEngine"]] = (None, None)
+
+
+def band_columns(spec: Dict[str, Any]) -> Dict[str, str]:
+    """레이어 밴드명 -> 실제 DB 컬럼명 (모델 필드의 db_column 반영)"""
+    return {band: spec["model"]._meta.get_field(field).column for band, field in spec["bands"].items()}
+
+
+class RasterLayer:
+    """
+    단일 격자 레이어의 행 방향 누적합(prefix sum) 래스터
+
+    Note:
+        - prefix[band][iy, ix+1] = 해당 행의 0..ix 셀 합계 (float32, 보통 읽기 전용 memmap)
+        - 원의 행별 구간 합 = prefix[iy, i1+1] - prefix[iy, i0] 이므로 반경 합계는 행 수만큼의 뺄셈
+    """
+
+    def __init__(self, origin_x: float, origin_y: float, cell: float, polygon: bool,
+                 prefix: Dict[str, np.ndarray]):
+        self.origin_x = float(origin_x)
+        self.origin_y = float(origin_y)
+        self.cell = float(cell)
+        self.polygon = bool(polygon)
+        self.prefix = prefix
+        self.n_rows, n_cols_plus_one = next(iter(prefix.values())).shape
+        self.n_cols = n_cols_plus_one - 1
+
+    def _disk_spans(self, x_coord: float, y_coord: float, radius: float):
+        """반경 r 원과 겹치는 셀의 행 인덱스와 행별 열 구간 [i0, i1] 계산"""
+        half = self.cell / 2 if self.polygon else 0.0
+        row_lo = int(np.ceil((y_coord - radius - half - self.origin_y) / self.cell - 0.5))
+        row_hi = int(np.floor((y_coord + radius + half - self.origin_y) / self.cell - 0.5))
+        row_lo, row_hi = max(row_lo, 0), min(row_hi, self.n_rows - 1)
+        if row_hi < row_lo:
+            return None
+
+        rows = np.arange(row_lo, row_hi + 1)
+        center_y = self.origin_y + (rows + 0.5) * self.cell
+        dy = np.maximum(np.abs(center_y - y_coord) - half, 0.0)
+        span = np.sqrt(np.maximum(radius * radius - dy * dy, 0.0)) + half
+
+        col_lo = np.ceil((x_coord - span - self.origin_x) / self.cell - 0.5).astype(np.int64)
+        col_hi = np.floor((x_coord + span - self.origin_x) / self.cell - 0.5).astype(np.int64)
+        col_lo = np.clip(col_lo, 0, self.n_cols)
+        col_hi = np.clip(col_hi, -1, self.n_cols - 1)
+        valid = col_hi >= col_lo
+        return rows[valid], col_lo[valid], col_hi[valid]
+
+    def sum_within(self, x_coord: float, y_coord: float, radius: float) -> Dict[str, float]:
+        """(x, y) 반경 radius(m) 내 밴드별 합계"""
+        spans = self._disk_spans(x_coord, y_coord, radius)
+        if spans is None or spans[0].size == 0:
+            return {band: 0.0 for band in self.prefix}
+        rows, col_lo, col_hi = spans
+        return {
+            band: float(
+                (prefix[rows, col_hi + 1].astype(np.float64) - prefix[rows, col_lo]).sum()
+            )
+            for band, prefix in self.prefix.items()
+        }
+
+
+class RasterFeatureEngine:
+    """생활인구·직장인구·외국인 레이어의 반경 합계를 메모리에서 계산하는 엔진"""
+
+    def __init__(self, layers: Dict[str, RasterLayer], info: Optional[Dict[str, Any]] = None):
+        self.layers = layers
+        self.info = info or {}
+
+    @classmethod
+    def load(cls, version_dir: str) -> "RasterFeatureEngine":
+        """
+        스냅샷 버전 디렉터리를 memmap으로 열어 엔진 생성
+
+        Note:
+            - 배열은 읽기 전용 memmap이라 실제 페이지는 접근 시 OS 페이지 캐시에서 공유됨
+        """
+        with open(os.path.join(version_dir, HEADER_FILE), encoding="utf-8") as f:
+            info = json.load(f)
+        if info.get("format") != SNAPSHOT_FORMAT or info.get("srid") != SNAPSHOT_SRID:
+            raise ValueError(f"지원하지 않는 래스터 스냅샷 형식: {version_dir}")
+
+        layers = {}
+        for name, layer_info in info["layers"].items():
+            prefix = {}
+            for band, file_name in layer_info["files"].items():
+                prefix[band] = np.load(os.path.join(version_dir, file_name), mmap_mode="r")
+                if list(prefix[band].shape) != layer_info["shape"]:
+                    raise ValueError(f"래스터 배열 크기 불일치: {name}/{band}")
+            layers[name] = RasterLayer(
+                layer_info["origin_x"],
+                layer_info["origin_y"],
+                layer_info["cell"],
+                layer_info["polygon"],
+                prefix,
+            )
+        return cls(layers, info)
+
+    def _sum(self, layer: str, x_coord: float, y_coord: float, radius: float) -> Dict[str, float]:
+        if layer not in self.layers:
+            # 원본 테이블이 없던 레이어는 SQL 엔진과 동일하게 0
+            return {band: 0.0 for band in RASTER_LAYERS[layer]["bands"]}
+        return self.layers[layer].sum_within(x_coord, y_coord, radius)
+
+    def population_row(self, x_coord: float, y_coord: float) -> list:
+        """
+        단일 쿼리 결과 행의 인구 레이어 부분(앞 19개 컬럼)과 같은 순서의 값 목록
+
+        Note:
+            - 순서: life_300(6), life_1000(6), work_300, temp_300.cn, temp_1000.total/cn,
+              long_300.total, long_1000.total/cn
+        """
+        life_bands = ["total", "pop_20", "pop_30", "pop_40", "pop_50", "pop_60"]
+        life_300 = self._sum("life", x_coord, y_coord, 300)
+        life_1000 = self._sum("life", x_coord, y_coord, 1000)
+        work_300 = self._sum("work", x_coord, y_coord, 300)
+        temp_300 = self._sum("temp", x_coord, y_coord, 300)
+        temp_1000 = self._sum("temp", x_coord, y_coord, 1000)
+        long_300 = self._sum("long", x_coord, y_coord, 300)
+        long_1000 = self._sum("long", x_coord, y_coord, 1000)
+        return (
+            [life_300[b] for b in life_bands]
+            + [life_1000[b] for b in life_bands]
+            + [work_300["total"]]
+            + [temp_300["cn"], temp_1000["total"], temp_1000["cn"]]
+            + [long_300["total"], long_1000["total"], long_1000["cn"]]
+        )
+
+
+def get_raster_dir() -> str:
+    return getattr(settings, "ANALYSIS_SETTINGS", {}).get("RASTER_DIR", "")
+
+
+def read_current_version(raster_dir: str) -> Optional[str]:
+    """CURRENT 포인터가 가리키는 버전명 (없으면 None)"""
+    try:
+        with open(os.path.join(raster_dir, CURRENT_POINTER), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def get_raster_engine() -> Optional[RasterFeatureEngine]:
+    """
+    현재 버전 래스터 스냅샷이 있으면 엔진 반환 (없으면 None)
+
+    Note:
+        - 프로세스 단위로 캐시하고, CURRENT 포인터가 교체되면 워커 재시작 없이 새 버전을 다시 염
+        - 이전 버전 memmap은 참조가 사라지면 해제됨 (진행 중인 요청은 기존 엔진으로 끝까지 처리)
+    """
+    global _RASTER_ENGINE
+    raster_dir = get_raster_dir()
+    if not raster_dir:
+        return None
+    try:
+        pointer_mtime = os.stat(os.path.join(raster_dir, CURRENT_POINTER)).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    cached_mtime, engine = _RASTER_ENGINE
+    if engine is not None and cached_mtime == pointer_mtime:
+        return engine
+
+    version = read_current_version(raster_dir)
+    if version is None:
+        return None
+
+    start = time.time()
+    engine = RasterFeatureEngine.load(os.path.join(raster_dir, version))
+    _RASTER_ENGINE = (pointer_mtime, engine)
+    print(f"✅ 인구 래스터 로드 완료: {version} ({time.time() - start:.2f}초, 레이어 {', '.join(engine.layers)})")
+    return engine
+
+
+def rasterize_layer(cursor, table_name: str, cell: float, bands: Dict[str, str]):
+    """
+    격자 테이블을 (행 × 열) 래스터로 집계
+
+    Returns:
+        tuple: (origin_x, origin_y, {밴드명: float32 2D 배열})
+
+    Note:
+        - 셀 인덱스는 지오메트리 중심점 기준으로 DB에서 GROUP BY 집계 (셀당 1행만 전송)
+        - origin은 최소 중심점에서 반 셀 뺀 위치 (셀 중심 = origin + (i + 0.5) * cell)
+    """
+    table = _quote_ident(table_name)
+    cursor.execute(
+        f"""
+        SELECT MIN(ST_X(ST_Centroid(geom))), MIN(ST_Y(ST_Centroid(geom))),
+               MAX(ST_X(ST_Centroid(geom))), MAX(ST_Y(ST_Centroid(geom)))
+        FROM {table} WHERE geom IS NOT NULL
+        """
+    )
+    min_x, min_y, max_x, max_y = cursor.fetchone()
+    n_cols = int(round((max_x - min_x) / cell)) + 1
+    n_rows = int(round((max_y - min_y) / cell)) + 1
+
+    sums = ", ".join(f"SUM(COALESCE({_quote_ident(col)}, 0))" for col in bands.values())
+    cursor.execute(
+        f"""
+        SELECT ROUND((ST_X(ST_Centroid(geom)) - %s) / %s)::int AS ix,
+               ROUND((ST_Y(ST_Centroid(geom)) - %s) / %s)::int AS iy,
+               {sums}
+        FROM {table} WHERE geom IS NOT NULL
+        GROUP BY 1, 2
+        """,
+        [min_x, cell, min_y, cell],
+    )
+    rows = np.array(cursor.fetchall(), dtype=np.float64).reshape(-1, 2 + len(bands))
+
+    ix = rows[:, 0].astype(np.int64)
+    iy = rows[:, 1].astype(np.int64)
+    grids = {}
+    for offset, band in enumerate(bands):
+        grid = np.zeros((n_rows, n_cols), dtype=np.float32)
+        grid[iy, ix] = rows[:, 2 + offset]
+        grids[band] = grid
+    return min_x - cell / 2, min_y - cell / 2, grids
+
+
+def row_prefix_sums(grid: np.ndarray) -> np.ndarray:
+    """행 방향 누적합 (앞에 0 열 추가), float64로 누적 후 float32로 저장"""
+    prefix = np.zeros((grid.shape[0], grid.shape[1] + 1), dtype=np.float32)
+    prefix[:, 1:] = np.cumsum(grid, axis=1, dtype=np.float64)
+    return prefix
+
+
+def _write_pointer(raster_dir: str, version: str):
+    """CURRENT 포인터를 임시 파일 작성 후 os.replace로 원자적 교체"""
+    tmp_path = os.path.join(raster_dir, f"{CURRENT_POINTER}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(version)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, os.path.join(raster_dir, CURRENT_POINTER))
+
+
+def prune_versions(raster_dir: str, keep: int, log=print):
+    """현재 버전을 포함해 최신 keep개를 제외한 이전 버전 삭제"""
+    current = read_current_version(raster_dir)
+    versions = sorted(
+        name for name in os.listdir(raster_dir)
+        if name.startswith("v") and os.path.isdir(os.path.join(raster_dir, name))
+    )
+    for name in versions[:-keep] if keep > 0 else versions:
+        if name == current:
+            continue
+        try:
+            shutil.rmtree(os.path.join(raster_dir, name))
+            log(f"🗑️ 이전 래스터 버전 삭제: {name}")
+        except OSError as e:
+            # 다른 워커가 아직 memmap으로 열고 있으면(Windows) 삭제 실패 가능 → 다음 빌드 때 재시도
+            log(f"⚠️ 이전 래스터 버전 삭제 실패: {name} ({e})")
+
+
+def build_raster_snapshot(cursor, raster_dir: str, keep_versions: int = 2, log=print) -> Dict[str, Any]:
+    """
+    모든 격자 레이어를 래스터화하여 새 버전 스냅샷으로 저장하고 CURRENT를 교체
+
+    Returns:
+        dict: 스냅샷 헤더 정보
+
+    Note:
+        - 새 버전 디렉터리를 모두 쓴 뒤에만 CURRENT를 교체하므로 워커는 항상 완성된 버전만 엶
+    """
+    version = time.strftime("v%Y%m%dT%H%M%S")
+    version_dir = os.path.join(raster_dir, version)
+    os.makedirs(version_dir)
+
+    info = {
+        "format": SNAPSHOT_FORMAT,
+        "version": version,
+        "srid": SNAPSHOT_SRID,
+        "built_at": time.time(),
+        "layers": {},
+    }
+
+    for name, spec in RASTER_LAYERS.items():
+        table_name = layer_table(spec["layer"], cursor)
+        if table_name is None:
+            log(f"⚠️ {name}: 사용 가능한 테이블이 없어 건너뜀")
+            continue
+
+        start = time.time()
+        origin_x, origin_y, grids = rasterize_layer(cursor, table_name, spec["cell"], band_columns(spec))
+        files = {}
+        for band, grid in grids.items():
+            prefix = row_prefix_sums(grid)
+            files[band] = f"{name}__{band}.npy"
+            np.save(os.path.join(version_dir, files[band]), prefix)
+        info["layers"][name] = {
+            "model": spec["model"].__name__,
+            "table": table_name,
+            "origin_x": origin_x,
+            "origin_y": origin_y,
+            "cell": spec["cell"],
+            "polygon": spec["polygon"],
+            "bands": list(grids),
+            "files": files,
+            "shape": list(prefix.shape),
+            "dtype": str(prefix.dtype),
+        }
+        log(f"✅ {name}: {table_name} → {grid.shape[0]}×{grid.shape[1]} 셀 ({time.time() - start:.1f}초)")
+
+    if not info["layers"]:
+        # 빈 스냅샷으로 교체하면 인구 피쳐가 모두 0이 되므로 기존 버전 유지
+        shutil.rmtree(version_dir)
+        return info
+
+    with open(os.path.join(version_dir, HEADER_FILE), "w", encoding="utf-8") as f:
+        json.dump(info, f, ensure_ascii=False, indent=2)
+
+    _write_pointer(raster_dir, version)
+    prune_versions(raster_dir, keep_versions, log=log)
+    return info
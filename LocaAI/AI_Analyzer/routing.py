@@ -0,0 +1,8 @@
+# AI_Analyzer/routing.py
+from django.urls import re_path
+from . import consumers
+
+websocket_urlpatterns = [
+    re_path(r"ws/analysis/jobs/(?P<job_id>[0-9a-f]{32})/$", consumers.AnalysisJobConsumer.as_asgi()),
+    re_path(r"ws/analysis/results/(?P<request_id>\d+)/explanation/$", consumers.AnalysisExplanationConsumer.as_asgi()),
+]
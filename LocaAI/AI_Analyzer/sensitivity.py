@@ -0,0 +1,199 @@
+# AI_Analyzer/sensitivity.py
+# 저장된 분석 결과의 피쳐 벡터로 면적·서비스 유형·업종을 바꿔 보는 what-if 민감도 분석
+#
+# 공간 피쳐는 AnalysisResult에 저장된 값을 그대로 쓰고, 면적에 따라 바뀌는 Area / Total_LV(㎡당 공시지가 × 면적)와
+# Service, UPTAENM_ID만 교체한 (조합 수 × 28) 행렬을 한 번에 예측 (PostGIS 조회 없음)
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from django.conf import settings
+
+from .feature_extractor import MODEL_FEATURE_FIELDS, MODEL_FEATURES, build_model_features
+
+
+AREA = MODEL_FEATURES.index("Area")
+TOTAL_LV = MODEL_FEATURES.index("Total_LV")
+SERVICE = MODEL_FEATURES.index("Service")
+UPTAENM_ID = MODEL_FEATURES.index("UPTAENM_ID")
+COMPETITOR_C = MODEL_FEATURES.index("Competitor_C")
+COMPETITOR_R = MODEL_FEATURES.index("Competitor_R")
+
+
+def _sensitivity_settings() -> Dict[str, Any]:
+    return getattr(settings, "ANALYSIS_SETTINGS", {}).get("SENSITIVITY", {})
+
+
+def parse_range(value, default: Sequence[float], max_values: int) -> List[float]:
+    """
+    범위 입력 -> 값 목록
+
+    Args:
+        value: [값, ...] 또는 {"min", "max", "step"} (None이면 default)
+
+    Raises:
+        ValueError: 형식 오류 또는 값이 max_values개를 넘는 경우
+    """
+    if value is None:
+        values = list(default)
+    elif isinstance(value, dict):
+        low, high, step = float(value["min"]), float(value["max"]), float(value["step"])
+        if step <= 0 or high < low:
+            raise ValueError("범위는 min <= max, step > 0 이어야 합니다.")
+        if (high - low) / step + 1 > max_values:
+            raise ValueError(f"범위 값은 최대 {max_values}개까지 지정할 수 있습니다.")
+        values = list(np.round(np.arange(low, high + step / 2, step), 4))
+    elif isinstance(value, (list, tuple)):
+        values = [float(v) for v in value]
+    else:
+        values = [float(value)]
+
+    if not values:
+        raise ValueError("범위 값이 비어 있습니다.")
+    if len(values) > max_values:
+        raise ValueError(f"범위 값은 최대 {max_values}개까지 지정할 수 있습니다.")
+    return [float(v) for v in values]
+
+
+def result_feature_row(analysis_result, business_type_id: int) -> np.ndarray:
+    """저장된 AnalysisResult -> 기준 28개 피쳐 행"""
+    results = {field: getattr(analysis_result, field, 0) or 0 for field in MODEL_FEATURE_FIELDS.values()}
+    features = build_model_features(results, business_type_id)
+    return np.array([features[name] for name in MODEL_FEATURES], dtype=np.float64)
+
+
+def build_sensitivity_matrix(base_row: np.ndarray, land_price: float, areas: Sequence[float],
+                             service_types: Sequence[int], business_type_ids: Sequence[int],
+                             competitor_counts: Optional[Dict[int, int]] = None) -> np.ndarray:
+    """
+    (업종 × 서비스 유형 × 면적) 조합 행렬 생성
+
+    Args:
+        land_price (float): ㎡당 공시지가 (Total_LV = land_price × Area)
+        competitor_counts (dict, optional): {업종 ID: 300m 내 동일 업종 점포 수} - 주어지면 업종별 Competitor_C/R 교체
+
+    Returns:
+        np.ndarray: 행 순서는 업종 → 서비스 유형 → 면적 (C 순서)
+    """
+    n_types, n_services, n_areas = len(business_type_ids), len(service_types), len(areas)
+    matrix = np.repeat(base_row[None, :], n_types * n_services * n_areas, axis=0)
+
+    grid_type, grid_service, grid_area = (
+        g.ravel() for g in np.meshgrid(
+            np.asarray(business_type_ids, dtype=np.float64),
+            np.asarray(service_types, dtype=np.float64),
+            np.asarray(areas, dtype=np.float64),
+            indexing="ij",
+        )
+    )
+    matrix[:, UPTAENM_ID] = grid_type
+    matrix[:, SERVICE] = grid_service
+    matrix[:, AREA] = grid_area
+    matrix[:, TOTAL_LV] = land_price * grid_area
+
+    if competitor_counts is not None:
+        adjacent_biz = float(base_row[MODEL_FEATURES.index("Adjacent_BIZ")])
+        competitors = np.array([competitor_counts.get(int(bt_id), 0) for bt_id in business_type_ids], dtype=np.float64)
+        ratios = np.round(competitors / adjacent_biz * 100, 2) if adjacent_biz > 0 else np.zeros(n_types)
+        matrix[:, COMPETITOR_C] = np.repeat(competitors, n_services * n_areas)
+        matrix[:, COMPETITOR_R] = np.repeat(ratios, n_services * n_areas)
+    return matrix
+
+
+def competitor_counts_for(analysis_result, business_types: Dict[int, str]) -> Optional[Dict[int, int]]:
+    """
+    업종별 경쟁업체 수 (점포 공간 인덱스가 메모리에 있을 때만, 없으면 None → 저장된 값 유지)
+
+    Note:
+        - 인덱스는 DB를 조회하지 않으므로 민감도 분석에서도 PostGIS 접근 없이 계산
+    """
+    try:
+        from .store_index import get_store_index
+
+        store_index = get_store_index(build=False)
+    except Exception:
+        return None
+    if store_index is None:
+        return None
+    counts = store_index.counts_by_type(
+        float(analysis_result.request.x_coord), float(analysis_result.request.y_coord), 300
+    )
+    return {bt_id: counts.get(name, 0) for bt_id, name in business_types.items()}
+
+
+def run_sensitivity(analysis_result, params: Dict[str, Any], business_types: Dict[int, str], predict) -> Dict[str, Any]:
+    """
+    what-if 민감도 분석
+
+    Args:
+        analysis_result (AnalysisResult): 기준 분석 결과 (request 포함)
+        params (dict): areas / service_types / business_type_ids (범위 또는 목록, 생략 시 기준값)
+        business_types (dict): {업종 ID: 업종명} - 요청 업종 검증/표시용
+        predict (callable): (n × 28) 행렬 -> 확률 배열
+
+    Returns:
+        dict: base(기준 조합), curves([{business_type_id, service_type, points: [{area, survival_percentage}]}])
+
+    Raises:
+        ValueError: 범위 형식 오류, 조합 수 초과, 없는 업종
+    """
+    conf = _sensitivity_settings()
+    max_values = int(conf.get("MAX_VALUES", 100))
+    request = analysis_result.request
+    base_area = float(analysis_result.area or request.area)
+
+    areas = parse_range(params.get("areas"), [base_area], max_values)
+    if any(area <= 0 for area in areas):
+        raise ValueError("면적은 0보다 커야 합니다.")
+    service_types = [int(v) for v in parse_range(params.get("service_types"), [request.service_type], 2)]
+    if any(service_type not in (0, 1) for service_type in service_types):
+        raise ValueError("서비스 유형은 0 또는 1이어야 합니다.")
+    business_type_ids = [
+        int(v) for v in parse_range(params.get("business_type_ids"), [request.business_type_id], len(business_types))
+    ]
+    unknown = [bt_id for bt_id in business_type_ids if bt_id not in business_types]
+    if unknown:
+        raise ValueError(f"업종 ID {unknown}를 찾을 수 없습니다.")
+
+    n_rows = len(areas) * len(service_types) * len(business_type_ids)
+    if n_rows > conf.get("MAX_ROWS", 5000):
+        raise ValueError(f"조합 수({n_rows})가 최대 {conf.get('MAX_ROWS', 5000)}개를 넘습니다.")
+
+    # 저장된 총 공시지가를 기준 면적으로 나눠 ㎡당 공시지가 복원
+    land_price = float(analysis_result.total_land_value or 0) / base_area if base_area else 0.0
+    base_row = result_feature_row(analysis_result, request.business_type_id)
+    competitor_counts = (
+        competitor_counts_for(analysis_result, business_types)
+        if any(bt_id != request.business_type_id for bt_id in business_type_ids) else None
+    )
+    matrix = build_sensitivity_matrix(
+        base_row, land_price, areas, service_types, business_type_ids, competitor_counts
+    )
+    probabilities = np.asarray(predict(matrix)).reshape(len(business_type_ids), len(service_types), len(areas))
+
+    curves = []
+    for t, bt_id in enumerate(business_type_ids):
+        for s, service_type in enumerate(service_types):
+            curves.append({
+                "business_type_id": bt_id,
+                "business_type_name": business_types[bt_id],
+                "service_type": service_type,
+                "points": [
+                    {"area": area, "survival_percentage": round(float(p) * 100, 1)}
+                    for area, p in zip(areas, probabilities[t, s])
+                ],
+            })
+
+    return {
+        "request_id": request.id,
+        "base": {
+            "area": base_area,
+            "service_type": request.service_type,
+            "business_type_id": request.business_type_id,
+            "survival_percentage": analysis_result.survival_percentage,
+            "land_price_per_m2": round(land_price, 2),
+        },
+        "competitors_by_business_type": competitor_counts is not None,
+        "rows": n_rows,
+        "curves": curves,
+    }
@@ -0,0 +1,67 @@
+# LocaAI/AI_Analyzer/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from GeoDB.models import EditablePublicBuilding, EditableStorePoint
+
+from .feature_cache import invalidate_geometry
+from .store_index import on_editable_store_deleted, on_editable_store_saved
+
+# 편집 모델 → 피쳐 캐시 무효화 레이어
+EDITABLE_LAYERS = {
+    EditableStorePoint: "store",
+    EditablePublicBuilding: "public",
+}
+
+
+def _invalidate(sender, geom):
+    try:
+        invalidate_geometry(geom, EDITABLE_LAYERS[sender])
+    except Exception as e:
+        print(f"⚠️ 피쳐 캐시 무효화 실패 ({sender.__name__}): {e}")
+
+
+def _invalidate_on_commit(sender, geom):
+    """
+    편집이 커밋된 뒤에 피쳐 캐시 무효화
+
+    Note:
+        - 커밋 전에 무효화하면 그 사이 실행된 분석이 편집 전 피쳐를 마커보다 새 시각으로 캐시함
+        - 트랜잭션 밖(autocommit)에서는 즉시 실행, 롤백되면 실행되지 않음
+    """
+    if geom is None:
+        return
+    geom = geom.clone()
+    transaction.on_commit(lambda: _invalidate(sender, geom))
+
+
+@receiver(pre_save, sender=EditableStorePoint)
+@receiver(pre_save, sender=EditablePublicBuilding)
+def remember_previous_geometry(sender, instance, **kwargs):
+    """위치가 옮겨진 경우 이전 위치 주변도 무효화할 수 있도록 기존 지오메트리 보관"""
+    instance._previous_geom = None
+    if not instance.pk:
+        return
+    instance._previous_geom = (
+        sender.objects.filter(pk=instance.pk).values_list("geom", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=EditableStorePoint)
+@receiver(post_save, sender=EditablePublicBuilding)
+def invalidate_features_on_save(sender, instance, **kwargs):
+    if sender is EditableStorePoint:
+        on_editable_store_saved(instance)
+    _invalidate_on_commit(sender, instance.geom)
+    previous_geom = getattr(instance, "_previous_geom", None)
+    if previous_geom is not None and (instance.geom is None or not previous_geom.equals(instance.geom)):
+        _invalidate_on_commit(sender, previous_geom)
+
+
+@receiver(post_delete, sender=EditableStorePoint)
+@receiver(post_delete, sender=EditablePublicBuilding)
+def invalidate_features_on_delete(sender, instance, **kwargs):
+    if sender is EditableStorePoint:
+        on_editable_store_deleted(instance)
+    _invalidate_on_commit(sender, instance.geom)
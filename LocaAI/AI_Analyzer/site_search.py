@@ -0,0 +1,282 @@
+# AI_Analyzer/site_search.py
+# 구/행정동 안에서 특정 업종의 최적 입지 탐색
+#
+# 경계 안의 격자 후보점을 만들고 피쳐를 일괄 계산(SQL은 청크당 1회, 인구는 래스터, 점포는 공간 인덱스)한 뒤
+# 청크마다 모델을 한 번 호출해 상위 K개 지점을 반환. 시간 예산을 넘기면 그때까지 평가한 후보로 결과를 냄
+
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.db import connection
+
+from GeoDB.models import AdministrativeDistrict, SeoulDistrict
+
+from .feature_extractor import MODEL_FEATURES
+from .survival_surface import compute_point_features, score_points
+
+
+class SiteSearchError(Exception):
+    """탐색 입력 오류 (status: 응답 HTTP 상태 코드)"""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def _search_settings() -> Dict[str, Any]:
+    return getattr(settings, "ANALYSIS_SETTINGS", {}).get("SITE_SEARCH", {})
+
+
+def resolve_district(cursor, district_code: str) -> Tuple[str, str, str]:
+    """
+    지역 코드 -> (지역명, 테이블명, 코드 컬럼명)
+
+    Note:
+        - 5자리는 구(seoul_district.adm_sect_c), 8자리는 행정동(행정동구역.emd_cd)
+    """
+    district_code = str(district_code or "").strip()
+    if len(district_code) == 5:
+        model, code_column, name_column = SeoulDistrict, "adm_sect_c", "sgg_nm"
+    elif len(district_code) == 8:
+        model, code_column, name_column = AdministrativeDistrict, "emd_cd", "emd_kor_nm"
+    else:
+        raise SiteSearchError("지역 코드는 구 코드(5자리) 또는 행정동 코드(8자리)여야 합니다.")
+
+    table = model._meta.db_table
+    cursor.execute(f'SELECT {name_column} FROM "{table}" WHERE {code_column} = %s LIMIT 1', [district_code])
+    row = cursor.fetchone()
+    if row is None:
+        raise SiteSearchError("지역을 찾을 수 없습니다.", status=404)
+    return row[0] or district_code, table, code_column
+
+
+def generate_candidates(cursor, table: str, code_column: str, district_code: str, step: float,
+                        max_candidates: int) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    경계 안의 격자 후보점 생성
+
+    Returns:
+        tuple: (xs, ys, 실제 격자 간격) - 후보 수가 max_candidates를 넘으면 간격을 넓힘
+
+    Note:
+        - 결과는 성긴 격자(4×간격) → 2×간격 → 나머지 순으로 정렬되어,
+          시간 예산 안에 일부만 평가해도 지역 전체를 고르게 덮음
+    """
+    cursor.execute(
+        f'SELECT ST_Area(ST_Union(geom)) FROM "{table}" WHERE {code_column} = %s', [district_code]
+    )
+    district_area = float(cursor.fetchone()[0] or 0)
+    if district_area > 0 and district_area / (step * step) > max_candidates:
+        step = float(np.ceil(np.sqrt(district_area / max_candidates)))
+
+    cursor.execute(
+        f"""
+        WITH boundary AS (
+            SELECT ST_Union(geom) AS geom FROM "{table}" WHERE {code_column} = %s
+        ),
+        lattice AS (
+            SELECT gx, gy, ST_SetSRID(ST_MakePoint(gx * %s, gy * %s), 5186) AS geom
+            FROM boundary,
+                 generate_series(floor(ST_XMin(boundary.geom) / %s)::int, ceil(ST_XMax(boundary.geom) / %s)::int) gx,
+                 generate_series(floor(ST_YMin(boundary.geom) / %s)::int, ceil(ST_YMax(boundary.geom) / %s)::int) gy
+        )
+        SELECT ST_X(lattice.geom), ST_Y(lattice.geom), gx, gy
+        FROM lattice, boundary
+        WHERE ST_Intersects(boundary.geom, lattice.geom)
+        """,
+        [district_code] + [step] * 6,
+    )
+    rows = cursor.fetchall()
+    if not rows:
+        return np.zeros(0), np.zeros(0), step
+
+    points = np.array(rows, dtype=np.float64)
+    gx, gy = points[:, 2].astype(np.int64), points[:, 3].astype(np.int64)
+    level = np.where((gx % 4 == 0) & (gy % 4 == 0), 0, np.where((gx % 2 == 0) & (gy % 2 == 0), 1, 2))
+    order = np.argsort(level, kind="stable")
+    return points[order, 0], points[order, 1], step
+
+
+def select_top_sites(xs: np.ndarray, ys: np.ndarray, proba: np.ndarray, top_k: int,
+                     min_separation: float) -> List[int]:
+    """
+    생존 확률 상위 지점 선택 (이미 고른 지점과 min_separation 안에 있는 후보는 건너뜀)
+
+    Note:
+        - 인접 격자점이 상위권을 모두 차지하지 않도록 서로 떨어진 후보만 반환
+    """
+    selected: List[int] = []
+    min_dist2 = float(min_separation) ** 2
+    for idx in np.argsort(-proba, kind="stable"):
+        if all((xs[idx] - xs[s]) ** 2 + (ys[idx] - ys[s]) ** 2 >= min_dist2 for s in selected):
+            selected.append(int(idx))
+            if len(selected) >= top_k:
+                break
+    return selected
+
+
+def search_best_sites(district_code: str, business_type_id: int, business_type_name: str, area: float,
+                      service_type: int, top_k: Optional[int] = None, time_budget: Optional[float] = None,
+                      predict: Optional[Callable] = None,
+                      progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+    """
+    지역 내 최적 입지 탐색
+
+    Args:
+        district_code (str): 구 코드(5자리) 또는 행정동 코드(8자리)
+        top_k (int, optional): 반환 지점 수 (기본값: SITE_SEARCH["TOP_K"])
+        time_budget (float, optional): 평가 시간 예산(초), 초과 시 평가한 후보까지로 결과 반환
+        predict (callable, optional): (n × 28) 행렬 -> 확률 배열 (기본값: views.predict_survival_matrix)
+        progress (callable, optional): progress(평가한 후보 수, 전체 후보 수) - 청크마다 호출
+
+    Returns:
+        dict: district, candidates, evaluated, truncated, step, elapsed_ms, sites(상위 K개, 피쳐 포함)
+
+    Raises:
+        SiteSearchError: 지역 코드 오류, 래스터 스냅샷 없음 등
+
+    Note:
+        - 공공건물·학교·공시지가는 청크당 SQL 1회, 인구는 래스터 스냅샷, 점포는 공간 인덱스로 계산
+        - 청크마다 모델을 한 번 호출
+    """
+    from .raster_engine import get_raster_engine
+    from .store_index import build_store_index, get_store_index
+
+    conf = _search_settings()
+    top_k = int(top_k or conf.get("TOP_K", 10))
+    time_budget = float(time_budget or conf.get("TIME_BUDGET_SECONDS", 60))
+    chunk_size = int(conf.get("CHUNK_SIZE", 1000))
+    if predict is None:
+        from .views import predict_survival_matrix as predict
+
+    engine = get_raster_engine()
+    if engine is None:
+        raise SiteSearchError(
+            "래스터 스냅샷이 없어 입지 탐색을 할 수 없습니다. (python manage.py build_feature_raster)", status=503
+        )
+    # 작업 스레드에서 실행되므로 인덱스가 아직 없으면 직접 생성해 기다림
+    store_index = get_store_index() or build_store_index()
+
+    start = time.time()
+    with connection.cursor() as cursor:
+        district_name, table, code_column = resolve_district(cursor, district_code)
+        xs, ys, step = generate_candidates(
+            cursor, table, code_column, district_code,
+            float(conf.get("STEP_M", 50)), int(conf.get("MAX_CANDIDATES", 20000)),
+        )
+
+    total = int(xs.size)
+    print(f"🔎 [입지 탐색] {district_name} / {business_type_name}: 후보 {total:,}개 ({step:g}m 간격)")
+
+    type_codes = np.array([store_index.type_codes.get(business_type_name, -1)], dtype=np.int64)
+    type_ids = np.array([business_type_id], dtype=np.float32)
+    evaluated_idx: List[np.ndarray] = []
+    proba_chunks: List[np.ndarray] = []
+    base_chunks: List[np.ndarray] = []
+    competitor_chunks: List[np.ndarray] = []
+    total_chunks: List[np.ndarray] = []
+    evaluated = 0
+    truncated = False
+
+    for offset in range(0, total, chunk_size):
+        if time.time() - start > time_budget:
+            truncated = True
+            break
+        chunk_xs, chunk_ys = xs[offset:offset + chunk_size], ys[offset:offset + chunk_size]
+        flat, base, competitors, totals = compute_point_features(
+            chunk_xs, chunk_ys, area, service_type, engine, store_index, type_codes, clip_to_seoul=False,
+        )
+        if flat.size:
+            proba_chunks.append(score_points(predict, base, competitors, totals, type_ids)[:, 0])
+            evaluated_idx.append(offset + flat)
+            base_chunks.append(base)
+            competitor_chunks.append(competitors[:, 0])
+            total_chunks.append(totals)
+        evaluated = min(offset + chunk_size, total)
+        if progress is not None:
+            progress(evaluated, total)
+
+    result = {
+        "district_code": district_code,
+        "district_name": district_name,
+        "business_type_id": business_type_id,
+        "business_type_name": business_type_name,
+        "area": area,
+        "service_type": service_type,
+        "step": step,
+        "candidates": total,
+        "evaluated": evaluated,
+        "truncated": truncated,
+        "sites": [],
+    }
+    if proba_chunks:
+        indices = np.concatenate(evaluated_idx)
+        proba = np.concatenate(proba_chunks)
+        base = np.concatenate(base_chunks)
+        competitors = np.concatenate(competitor_chunks)
+        totals = np.concatenate(total_chunks)
+        selected = select_top_sites(
+            xs[indices], ys[indices], proba, top_k, float(conf.get("MIN_SEPARATION_M", 150))
+        )
+        result["sites"] = _describe_sites(
+            xs[indices[selected]], ys[indices[selected]], proba[selected],
+            base[selected], competitors[selected], totals[selected], business_type_id,
+        )
+
+    result["elapsed_ms"] = round((time.time() - start) * 1000, 1)
+    print(
+        f"   ✅ 입지 탐색 완료: {evaluated:,}/{total:,}개 평가"
+        f"{' (시간 예산 초과)' if truncated else ''}, {result['elapsed_ms']:.0f}ms"
+    )
+    return result
+
+
+def _describe_sites(xs, ys, proba, base, competitors, totals, business_type_id: int) -> List[Dict[str, Any]]:
+    """선택된 지점의 좌표(5186/WGS84), 행정동, 생존 확률, 28개 피쳐 벡터"""
+    from pyproj import Transformer
+
+    transformer = Transformer.from_crs("EPSG:5186", "EPSG:4326", always_xy=True)
+    lngs, lats = transformer.transform(xs, ys)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT t.i, d.emd_cd, d.emd_kor_nm
+            FROM unnest(%s::float8[], %s::float8[]) WITH ORDINALITY AS t(x, y, i)
+            LEFT JOIN LATERAL (
+                SELECT emd_cd, emd_kor_nm FROM "{AdministrativeDistrict._meta.db_table}"
+                WHERE ST_Intersects(geom, ST_SetSRID(ST_MakePoint(t.x, t.y), 5186))
+                LIMIT 1
+            ) d ON TRUE
+            """,
+            [list(map(float, xs)), list(map(float, ys))],
+        )
+        dongs = {row[0] - 1: (row[1], row[2]) for row in cursor.fetchall()}
+
+    competitor_c = MODEL_FEATURES.index("Competitor_C")
+    competitor_r = MODEL_FEATURES.index("Competitor_R")
+    sites = []
+    for rank, (x_coord, y_coord, lng, lat, p) in enumerate(
+        zip(xs, ys, np.atleast_1d(lngs), np.atleast_1d(lats), proba), start=1
+    ):
+        row = base[rank - 1].astype(np.float64)
+        row[competitor_c] = competitors[rank - 1]
+        row[competitor_r] = round(competitors[rank - 1] / totals[rank - 1] * 100, 2) if totals[rank - 1] > 0 else 0
+        features = {name: round(float(value), 4) for name, value in zip(MODEL_FEATURES, row)}
+        features["UPTAENM_ID"] = business_type_id
+        emd_cd, emd_name = dongs.get(rank - 1, (None, None))
+        sites.append({
+            "rank": rank,
+            "x_coord": float(x_coord),
+            "y_coord": float(y_coord),
+            "latitude": round(float(lat), 6),
+            "longitude": round(float(lng), 6),
+            "emd_cd": emd_cd,
+            "emd_name": emd_name,
+            "survival_probability": round(float(p), 4),
+            "survival_percentage": round(float(p) * 100, 1),
+            "features": features,
+        })
+    return sites
@@ -0,0 +1,323 @@
+# AI_Analyzer/store_index.py
+# 점포 포인트(store_point_5186 + editable_store_point) 프로세스 로컬 공간 인덱스
+#
+# 좌표 배열 + 정수 코드화된 업종(uptaenm) 배열을 격자 셀 순으로 정렬해 두고,
+# 반경 질의는 후보 셀 구간만 잘라 NumPy로 거리 필터 후 np.bincount로 업종별 점포 수를 계산
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+
+from GeoDB.models import EditableStorePoint, StorePoint
+
+
+# 업종명이 없는 점포 코드 (전체 점포 수에는 포함, 업종 다양성에는 제외 - COUNT(DISTINCT)와 동일)
+NO_TYPE_CODE = 0
+
+# 편집 점포 세대 카운터 (공유 캐시, 커밋된 편집마다 갱신)
+GENERATION_KEY = "analysis:store_index:generation"
+
+_STORE_INDEX: Optional["StoreIndex"] = None
+_STORE_INDEX_LOCK = threading.Lock()
+# 백그라운드 생성 스레드 (한 번에 하나만 실행)
+_BUILD_THREAD: Optional[threading.Thread] = None
+
+
+def _index_settings() -> Dict:
+    return getattr(settings, "ANALYSIS_SETTINGS", {}).get("STORE_INDEX", {})
+
+
+def _generation_cache():
+    return caches[_index_settings().get("CACHE_ALIAS", "shared")]
+
+
+def current_generation() -> int:
+    """모든 워커가 공유하는 편집 점포 세대 (없으면 0으로 초기화)"""
+    return _generation_cache().get_or_set(GENERATION_KEY, 0, timeout=None)
+
+
+def bump_generation() -> int:
+    """
+    편집 점포 세대 갱신
+
+    Note:
+        - 증가 대신 현재 시각(ns)을 기록하므로 캐시 항목이 사라졌다 다시 생겨도 이전 값으로 되돌아가지 않음
+    """
+    generation = time.time_ns()
+    try:
+        _generation_cache().set(GENERATION_KEY, generation, timeout=None)
+    except Exception as e:
+        print(f"⚠️ 점포 인덱스 세대 갱신 실패 (REFRESH_SECONDS 주기로 반영): {e}")
+    return generation
+
+
+class StoreIndex:
+    """
+    점포 포인트 격자 버킷 인덱스
+
+    Note:
+        - 기본 점포(store_point_5186)는 셀 키로 정렬된 정적 배열, 편집 점포는 pk별 증분 딕셔너리
+        - 셀 크기는 가장 자주 쓰는 반경(300m) 근처로 두어 질의당 3×3 셀 정도만 확인
+    """
+
+    def __init__(self, xs: np.ndarray, ys: np.ndarray, type_names: List[Optional[str]],
+                 cell_size: float = 300.0):
+        self.cell_size = float(cell_size)
+        self.type_codes: Dict[str, int] = {}
+        self.type_names: List[Optional[str]] = [None]  # NO_TYPE_CODE
+        codes = np.fromiter((self.code_of(name) for name in type_names), dtype=np.int32, count=len(type_names))
+
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        if xs.size:
+            self.origin_x, self.origin_y = float(xs.min()), float(ys.min())
+            cx, cy = self._cells(xs, ys)
+            self.n_cell_rows = int(cy.max()) + 1
+            keys = cx * self.n_cell_rows + cy
+        else:
+            self.origin_x = self.origin_y = 0.0
+            self.n_cell_rows = 1
+            keys = np.zeros(0, dtype=np.int64)
+
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.xs = xs[order]
+        self.ys = ys[order]
+        self.codes = codes[order]
+
+        # 편집 점포: pk -> (x, y, code)
+        self.editable: Dict[int, Tuple[float, float, int]] = {}
+        self.built_at = time.time()
+        # 생성 시작 시점의 편집 세대 (build_store_index에서 설정)
+        self.generation = 0
+
+    def code_of(self, type_name: Optional[str]) -> int:
+        """업종명 -> 정수 코드 (처음 보는 업종은 새 코드 발급)"""
+        if not type_name:
+            return NO_TYPE_CODE
+        code = self.type_codes.get(type_name)
+        if code is None:
+            code = len(self.type_names)
+            self.type_codes[type_name] = code
+            self.type_names.append(type_name)
+        return code
+
+    def _cells(self, xs, ys):
+        cx = np.floor((np.asarray(xs) - self.origin_x) / self.cell_size).astype(np.int64)
+        cy = np.floor((np.asarray(ys) - self.origin_y) / self.cell_size).astype(np.int64)
+        return cx, cy
+
+    def _candidate_slices(self, x_coord: float, y_coord: float, radius: float):
+        """반경의 외접 사각형과 겹치는 셀들의 정렬 배열 구간"""
+        (cx0, cx1), (cy0, cy1) = self._cells(
+            [x_coord - radius, x_coord + radius], [y_coord - radius, y_coord + radius]
+        )
+        cy0, cy1 = max(int(cy0), 0), min(int(cy1), self.n_cell_rows - 1)
+        if cy1 < cy0:
+            return []
+        slices = []
+        for cx in range(max(int(cx0), 0), int(cx1) + 1):
+            # 같은 cx의 cy0..cy1 셀은 키가 연속이므로 구간 하나로 처리
+            lo = np.searchsorted(self.keys, cx * self.n_cell_rows + cy0, side="left")
+            hi = np.searchsorted(self.keys, cx * self.n_cell_rows + cy1, side="right")
+            if hi > lo:
+                slices.append(slice(lo, hi))
+        return slices
+
+    def type_counts_within(self, x_coord: float, y_coord: float, radius: float) -> np.ndarray:
+        """
+        반경 내 업종 코드별 점포 수
+
+        Returns:
+            np.ndarray: 길이 len(type_names)의 카운트 배열 (인덱스 = 업종 코드)
+        """
+        r2 = float(radius) ** 2
+        counts = np.zeros(len(self.type_names), dtype=np.int64)
+        for sl in self._candidate_slices(x_coord, y_coord, radius):
+            dx = self.xs[sl] - x_coord
+            dy = self.ys[sl] - y_coord
+            inside = dx * dx + dy * dy <= r2
+            counts += np.bincount(self.codes[sl][inside], minlength=counts.size)
+
+        if self.editable:
+            ex, ey, ec = (np.array(col) for col in zip(*list(self.editable.values())))
+            inside = (ex - x_coord) ** 2 + (ey - y_coord) ** 2 <= r2
+            counts += np.bincount(ec[inside].astype(np.int64), minlength=counts.size)[: counts.size]
+        return counts
+
+    def counts_by_type(self, x_coord: float, y_coord: float, radius: float = 300) -> Dict[str, int]:
+        """반경 내 {업종명: 점포 수} (fetch_competitor_counts와 같은 형식)"""
+        counts = self.type_counts_within(x_coord, y_coord, radius)
+        return {
+            self.type_names[code]: int(count)
+            for code, count in enumerate(counts)
+            if count and code != NO_TYPE_CODE
+        }
+
+    def store_features(self, x_coord: float, y_coord: float, business_type_name: str,
+                       radius: float = 300) -> Tuple[int, int, int]:
+        """
+        점포 기반 피쳐 (경쟁업체 수, 전체 점포 수, 업종 다양성)
+
+        Note:
+            - 단일 쿼리의 store_300 CTE (competitor, total, diversity)와 같은 의미
+        """
+        counts = self.type_counts_within(x_coord, y_coord, radius)
+        code = self.type_codes.get(business_type_name)
+        competitor = int(counts[code]) if code is not None else 0
+        total = int(counts.sum())
+        diversity = int(np.count_nonzero(counts[1:]))
+        return competitor, total, diversity
+
+    def upsert_editable(self, pk: int, x_coord: float, y_coord: float, type_name: Optional[str]):
+        """편집 점포 추가/수정 (증분 업데이트)"""
+        self.editable[pk] = (float(x_coord), float(y_coord), self.code_of(type_name))
+
+    def remove_editable(self, pk: int):
+        self.editable.pop(pk, None)
+
+    def __len__(self):
+        return int(self.xs.size) + len(self.editable)
+
+
+def build_store_index() -> StoreIndex:
+    """
+    DB에서 점포 좌표/업종을 읽어 인덱스 생성
+
+    Note:
+        - GEOS 객체 생성을 피하려고 좌표는 SQL에서 바로 추출 (MultiPoint는 중심점 사용)
+        - 세대는 DB를 읽기 전에 기록하므로 생성 중 커밋된 편집이 있으면 완성된 인덱스도 뒤처진 것으로 판정됨
+    """
+    start = time.time()
+    generation = current_generation()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT ST_X(ST_Centroid(geom)), ST_Y(ST_Centroid(geom)), uptaenm
+            FROM {StorePoint._meta.db_table}
+            WHERE geom IS NOT NULL
+            """
+        )
+        rows = cursor.fetchall()
+
+    xs = np.fromiter((row[0] for row in rows), dtype=np.float64, count=len(rows))
+    ys = np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows))
+    index = StoreIndex(xs, ys, [row[2] for row in rows], _index_settings().get("CELL_M", 300))
+    index.generation = generation
+
+    for pk, uptaenm, geom in EditableStorePoint.objects.values_list("pk", "uptaenm", "geom"):
+        if geom is not None:
+            index.upsert_editable(pk, geom.x, geom.y, uptaenm)
+
+    print(
+        f"✅ 점포 공간 인덱스 생성 완료: {len(index):,}개 점포, "
+        f"{len(index.type_names) - 1}개 업종 ({time.time() - start:.2f}초)"
+    )
+    return index
+
+
+def _build_and_swap():
+    """새 인덱스를 만든 뒤 참조만 교체 (생성 중에는 기존 인덱스가 계속 사용됨)"""
+    global _STORE_INDEX
+    try:
+        index = build_store_index()
+    except Exception as e:
+        print(f"⚠️ 점포 공간 인덱스 생성 실패 (SQL 쿼리로 동작): {e}")
+        return
+    finally:
+        connection.close()
+    with _STORE_INDEX_LOCK:
+        _STORE_INDEX = index
+
+
+def _start_background_build() -> bool:
+    """
+    백그라운드 인덱스 생성 시작
+
+    Returns:
+        bool: 이미 생성 중이면 False
+    """
+    global _BUILD_THREAD
+    with _STORE_INDEX_LOCK:
+        if _BUILD_THREAD is not None and _BUILD_THREAD.is_alive():
+            return False
+        _BUILD_THREAD = threading.Thread(target=_build_and_swap, name="store-index-build", daemon=True)
+        _BUILD_THREAD.start()
+    return True
+
+
+def get_store_index(build: bool = True) -> Optional[StoreIndex]:
+    """
+    프로세스 로컬 점포 인덱스 반환
+
+    Args:
+        build (bool): 인덱스가 없거나 세대가 뒤처졌거나 REFRESH_SECONDS가 지났으면 백그라운드에서 새로 생성
+
+    Returns:
+        StoreIndex: 아직 생성 중이거나 편집 세대가 뒤처졌으면 None
+            (호출 측은 같은 점포 집합을 세는 SQL 쿼리로 계산)
+
+    Note:
+        - 요청 스레드는 인덱스 생성을 기다리지 않음
+        - 어느 워커에서든 편집이 커밋되면 공유 세대가 바뀌므로, 모든 워커가 재생성이 끝날 때까지
+          SQL로 계산해 편집 전 점포 수로 피쳐를 만들어 캐시하지 않음
+        - REFRESH_SECONDS만 지난 인덱스는 새 인덱스가 준비될 때까지 계속 사용
+    """
+    conf = _index_settings()
+    if not conf.get("ENABLED", False):
+        return None
+
+    index = _STORE_INDEX
+    behind = index is not None and index.generation != current_generation()
+    refresh_seconds = conf.get("REFRESH_SECONDS", 0)
+    stale = index is not None and refresh_seconds and time.time() - index.built_at > refresh_seconds
+    if (index is None or behind or stale) and build:
+        _start_background_build()
+    return None if behind else index
+
+
+def preload_store_index():
+    """서버 시작 시 백그라운드 스레드에서 인덱스 생성 (요청 스레드를 막지 않음)"""
+    _start_background_build()
+
+
+def on_editable_store_saved(instance):
+    """
+    EditableStorePoint 저장 시 커밋 후 세대 갱신 및 로컬 인덱스 증분 업데이트
+
+    Note:
+        - 롤백된 편집은 반영하지 않도록 transaction.on_commit에서 실행
+        - 세대 갱신으로 모든 워커(현재 워커 포함)는 재생성된 인덱스가 준비될 때까지 SQL로 계산
+    """
+    pk, uptaenm = instance.pk, instance.uptaenm
+    point = (instance.geom.x, instance.geom.y) if instance.geom is not None else None
+
+    def apply():
+        bump_generation()
+        index = _STORE_INDEX
+        if index is None:
+            return
+        if point is None:
+            index.remove_editable(pk)
+        else:
+            index.upsert_editable(pk, point[0], point[1], uptaenm)
+
+    transaction.on_commit(apply)
+
+
+def on_editable_store_deleted(instance):
+    """EditableStorePoint 삭제 시 커밋 후 세대 갱신 및 로컬 인덱스에서 제거"""
+    pk = instance.pk
+
+    def apply():
+        bump_generation()
+        index = _STORE_INDEX
+        if index is not None:
+            index.remove_editable(pk)
+
+    transaction.on_commit(apply)
@@ -0,0 +1,417 @@
+# AI_Analyzer/survival_surface.py
+# 서울 전역 격자점(예: 50m)에 대해 업종별 생존 확률을 미리 계산한 표면(surface) 스냅샷
+#
+# 스냅샷 디렉터리 구조 (SURVIVAL_SURFACE["DIR"]):
+#   CURRENT                        <- 현재 버전명 (raster_engine과 같은 원자적 포인터 교체)
+#   v20250101T000000/header.json   <- 격자 원점/간격/크기, 업종 목록, 면적·서비스 유형
+#   v20250101T000000/surface.npy   <- uint8 (업종 × 행 × 열), 생존 확률(%) 0~100, NODATA=255
+#
+# 피쳐 계산은 타일 단위로 프로세스 풀에서 수행 (인구: memmap 래스터, 점포: 점포 공간 인덱스,
+# 공공건물·학교·공시지가: 타일당 SQL 1회), 예측은 타일마다 모든 업종을 한 번의 inplace_predict로 처리
+
+import json
+import math
+import multiprocessing
+import os
+import shutil
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.db import connection, connections
+
+from GeoDB.models import AdministrativeDistrict
+
+from .feature_extractor import (
+    LTV_SRID,
+    MODEL_FEATURES,
+    _results_from_row,
+    build_model_features,
+    nearest_land_value_sql,
+)
+from .raster_engine import CURRENT_POINTER, HEADER_FILE, _write_pointer, prune_versions, read_current_version
+
+
+SURFACE_FORMAT = 1
+SURFACE_SRID = 5186
+SURFACE_FILE = "surface.npy"
+NODATA = 255
+
+COMPETITOR_C = MODEL_FEATURES.index("Competitor_C")
+COMPETITOR_R = MODEL_FEATURES.index("Competitor_R")
+UPTAENM_ID = MODEL_FEATURES.index("UPTAENM_ID")
+
+# 프로세스 단위 표면 캐시: (CURRENT 수정시각, 표면)
+_SURFACE: Tuple[Optional[int], Optional["SurvivalSurface"]] = (None, None)
+
+# 워커 프로세스 상태 (fork 전에 부모에서 설정)
+_WORKER: Dict[str, Any] = {}
+
+
+def _surface_settings() -> Dict[str, Any]:
+    return getattr(settings, "ANALYSIS_SETTINGS", {}).get("SURVIVAL_SURFACE", {})
+
+
+def get_surface_dir() -> str:
+    return _surface_settings().get("DIR", "")
+
+
+class SurvivalSurface:
+    """
+    업종별 생존 확률 격자
+
+    Note:
+        - 셀 (row, col)의 격자점 좌표 = (origin_x + col * step, origin_y + row * step), row 0이 남쪽
+    """
+
+    def __init__(self, values: np.ndarray, info: Dict[str, Any]):
+        self.values = values
+        self.info = info
+        self.origin_x = float(info["origin_x"])
+        self.origin_y = float(info["origin_y"])
+        self.step = float(info["step"])
+        self.type_index = {int(bt["id"]): i for i, bt in enumerate(info["business_types"])}
+
+    @classmethod
+    def load(cls, version_dir: str) -> "SurvivalSurface":
+        with open(os.path.join(version_dir, HEADER_FILE), encoding="utf-8") as f:
+            info = json.load(f)
+        if info.get("format") != SURFACE_FORMAT or info.get("srid") != SURFACE_SRID:
+            raise ValueError(f"지원하지 않는 생존 확률 표면 형식: {version_dir}")
+        values = np.load(os.path.join(version_dir, SURFACE_FILE), mmap_mode="r")
+        return cls(values, info)
+
+    def window(self, business_type_id: int, bbox: Tuple[float, float, float, float],
+               max_cells: int = 40000) -> Optional[Dict[str, Any]]:
+        """
+        EPSG:5186 bbox 안의 격자를 잘라 반환
+
+        Args:
+            bbox: (min_x, min_y, max_x, max_y)
+            max_cells: 셀 수가 이를 넘으면 stride×stride 블록의 최댓값으로 축소 (핫스팟 유지)
+
+        Returns:
+            dict: origin_x/origin_y(첫 셀 중심), cell_size, grid(2D float 배열, NaN=데이터 없음)
+                  업종이 표면에 없으면 None
+        """
+        type_idx = self.type_index.get(int(business_type_id))
+        if type_idx is None:
+            return None
+
+        n_rows, n_cols = self.values.shape[1:]
+        min_x, min_y, max_x, max_y = bbox
+        col0 = max(int(math.ceil((min_x - self.origin_x) / self.step)), 0)
+        col1 = min(int(math.floor((max_x - self.origin_x) / self.step)), n_cols - 1)
+        row0 = max(int(math.ceil((min_y - self.origin_y) / self.step)), 0)
+        row1 = min(int(math.floor((max_y - self.origin_y) / self.step)), n_rows - 1)
+        if col1 < col0 or row1 < row0:
+            grid = np.zeros((0, 0))
+            stride = 1
+        else:
+            raw = np.asarray(self.values[type_idx, row0:row1 + 1, col0:col1 + 1])
+            grid = np.where(raw == NODATA, np.nan, raw.astype(np.float32))
+            stride = max(1, int(math.ceil(math.sqrt(grid.size / max_cells))))
+            if stride > 1:
+                pad_rows = (-grid.shape[0]) % stride
+                pad_cols = (-grid.shape[1]) % stride
+                grid = np.pad(grid, ((0, pad_rows), (0, pad_cols)), constant_values=np.nan)
+                blocks = grid.reshape(grid.shape[0] // stride, stride, grid.shape[1] // stride, stride)
+                with np.errstate(all="ignore"):
+                    # 블록 전체가 NaN이면 경고 없이 NaN
+                    grid = np.fmax.reduce(np.fmax.reduce(blocks, axis=3), axis=1)
+
+        return {
+            "origin_x": self.origin_x + (col0 + (stride - 1) / 2) * self.step,
+            "origin_y": self.origin_y + (row0 + (stride - 1) / 2) * self.step,
+            "cell_size": self.step * stride,
+            "stride": stride,
+            "grid": grid,
+        }
+
+
+def get_survival_surface() -> Optional[SurvivalSurface]:
+    """현재 버전 표면 (없으면 None, CURRENT가 교체되면 다시 엶)"""
+    global _SURFACE
+    surface_dir = get_surface_dir()
+    if not surface_dir:
+        return None
+    try:
+        pointer_mtime = os.stat(os.path.join(surface_dir, CURRENT_POINTER)).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    cached_mtime, surface = _SURFACE
+    if surface is not None and cached_mtime == pointer_mtime:
+        return surface
+
+    version = read_current_version(surface_dir)
+    if version is None:
+        return None
+    surface = SurvivalSurface.load(os.path.join(surface_dir, version))
+    _SURFACE = (pointer_mtime, surface)
+    print(f"✅ 생존 확률 표면 로드 완료: {version} ({len(surface.type_index)}개 업종)")
+    return surface
+
+
+# ============================================================================
+# 표면 생성
+# ============================================================================
+
+def lattice_extent(cursor, step: float) -> Tuple[float, float, int, int]:
+    """행정동 경계 전체를 덮는 격자 (원점 x, y, 행 수, 열 수) - 원점은 step 배수로 정렬"""
+    cursor.execute(
+        f"SELECT ST_XMin(e), ST_YMin(e), ST_XMax(e), ST_YMax(e) "
+        f"FROM (SELECT ST_Extent(geom) AS e FROM \"{AdministrativeDistrict._meta.db_table}\") t"
+    )
+    min_x, min_y, max_x, max_y = cursor.fetchone()
+    origin_x = math.floor(min_x / step) * step
+    origin_y = math.floor(min_y / step) * step
+    n_cols = int(math.floor((max_x - origin_x) / step)) + 1
+    n_rows = int(math.floor((max_y - origin_y) / step)) + 1
+    return origin_x, origin_y, n_rows, n_cols
+
+
+def point_layer_rows(cursor, xs: np.ndarray, ys: np.ndarray, clip_to_seoul: bool = True):
+    """
+    격자점들의 (점 번호(1부터), 공공건물 수, 학교 수, 공시지가)를 SQL 1회로 조회
+
+    Args:
+        clip_to_seoul: True면 행정동 경계 밖의 점은 결과에서 제외
+
+    Note:
+        - 반경/최근접 규칙은 단일 쿼리의 public_250 / school_250 / ltv CTE와 동일
+    """
+    clip = (
+        f'WHERE EXISTS (SELECT 1 FROM "{AdministrativeDistrict._meta.db_table}" d '
+        f"WHERE ST_Intersects(d.geom, pts.geom))"
+        if clip_to_seoul else ""
+    )
+    cursor.execute(
+        f"""
+        WITH pts AS (
+            SELECT t.i, ST_SetSRID(ST_MakePoint(t.x, t.y), 5186) AS geom,
+                   ST_SetSRID(ST_MakePoint(t.x, t.y), {LTV_SRID}) AS geom_ltv
+            FROM unnest(%s::float8[], %s::float8[]) WITH ORDINALITY AS t(x, y, i)
+        ),
+        inside AS (
+            SELECT pts.* FROM pts {clip}
+        )
+        SELECT inside.i,
+               (SELECT COUNT(*) FROM public_5186 p WHERE ST_DWithin(p.geom, inside.geom, 250)),
+               (SELECT COUNT(*) FROM school_5186 s WHERE ST_DWithin(s.geom, inside.geom, 250)),
+               COALESCE(({nearest_land_value_sql("inside.geom_ltv")}), 0)
+        FROM inside
+        ORDER BY inside.i
+        """,
+        [xs.tolist(), ys.tolist()],
+    )
+    return cursor.fetchall()
+
+
+def compute_point_features(xs: np.ndarray, ys: np.ndarray, area: float, service_type: int,
+                           engine, store_index, type_codes: np.ndarray, clip_to_seoul: bool = True):
+    """
+    여러 점의 업종 공통 피쳐 행렬과 업종별 경쟁업체 수를 한꺼번에 계산
+
+    Args:
+        engine: 인구 래스터 엔진 (RasterFeatureEngine)
+        store_index: 점포 공간 인덱스 (StoreIndex)
+        type_codes: 대상 업종들의 점포 인덱스 업종 코드 (없으면 -1)
+
+    Returns:
+        tuple: (남은 점 인덱스 배열, 공통 피쳐 행렬(n × 28, UPTAENM_ID=0), 업종별 경쟁업체 수(n × 업종), 전체 점포 수(n))
+
+    Note:
+        - 공공건물·학교·공시지가는 점 전체에 대해 SQL 1회, 인구는 memmap 래스터, 점포는 인덱스에서 계산
+    """
+    with connection.cursor() as cursor:
+        point_rows = point_layer_rows(cursor, xs, ys, clip_to_seoul=clip_to_seoul)
+
+    flat = np.fromiter((row[0] - 1 for row in point_rows), dtype=np.int64, count=len(point_rows))
+    base = np.zeros((flat.size, len(MODEL_FEATURES)), dtype=np.float32)
+    competitors = np.zeros((flat.size, len(type_codes)), dtype=np.float32)
+    totals = np.zeros(flat.size, dtype=np.float32)
+    valid_codes = type_codes >= 0
+
+    for n, (point_idx, (_, public_count, school_count, land_price)) in enumerate(zip(flat, point_rows)):
+        x_coord, y_coord = float(xs[point_idx]), float(ys[point_idx])
+        counts = store_index.type_counts_within(x_coord, y_coord, 300)
+        total = int(counts.sum())
+        diversity = int(np.count_nonzero(counts[1:]))
+
+        row = list(engine.population_row(x_coord, y_coord)) + [
+            public_count, school_count, 0, total, diversity, land_price,
+        ]
+        features = build_model_features(_results_from_row(row, area, service_type), 0)
+        base[n] = [features[name] for name in MODEL_FEATURES]
+        competitors[n, valid_codes] = counts[type_codes[valid_codes]]
+        totals[n] = total
+
+    return flat, base, competitors, totals
+
+
+def compute_tile(tile: Tuple[int, int, int, int]):
+    """
+    타일 하나의 격자점 피쳐 계산 (워커 프로세스)
+
+    Args:
+        tile: (row0, col0, n_rows, n_cols) - 전체 격자 기준 인덱스
+
+    Returns:
+        tuple: (tile, *compute_point_features 결과) - 점 인덱스는 타일 내 평탄 인덱스
+    """
+    row0, col0, n_rows, n_cols = tile
+    step, origin_x, origin_y = _WORKER["step"], _WORKER["origin_x"], _WORKER["origin_y"]
+
+    rows, cols = np.mgrid[0:n_rows, 0:n_cols]
+    xs = origin_x + (col0 + cols.ravel()) * step
+    ys = origin_y + (row0 + rows.ravel()) * step
+    return (tile,) + compute_point_features(
+        xs, ys, _WORKER["area"], _WORKER["service_type"],
+        _WORKER["raster_engine"], _WORKER["store_index"], _WORKER["type_codes"],
+    )
+
+
+def _init_worker():
+    # fork로 상속된 DB 연결은 부모와 소켓을 공유하므로 닫지 않고 버린 뒤 새로 연결
+    for conn in connections.all():
+        conn.connection = None
+
+
+def score_points(predict, base: np.ndarray, competitors: np.ndarray, totals: np.ndarray,
+                 type_ids: np.ndarray) -> np.ndarray:
+    """
+    모든 업종에 대해 한 번에 예측 (recommend_business_type과 같은 방식으로 Competitor_C/R만 교체)
+
+    Args:
+        predict: (n × 28) 행렬 -> 확률 배열 함수 (모델 호출 1회)
+
+    Returns:
+        np.ndarray: (격자점 × 업종) 생존 확률
+    """
+    n_points, n_types = competitors.shape
+    matrix = np.repeat(base, n_types, axis=0)
+    competitor = competitors.ravel()
+    matrix[:, COMPETITOR_C] = competitor
+    totals_rep = np.repeat(totals, n_types)
+    matrix[:, COMPETITOR_R] = np.where(
+        totals_rep > 0, np.round(competitor / np.maximum(totals_rep, 1) * 100, 2), 0
+    )
+    matrix[:, UPTAENM_ID] = np.tile(type_ids, n_points)
+    return np.asarray(predict(matrix)).reshape(n_points, n_types)
+
+
+def build_survival_surface(surface_dir: str, step: float = 50, tile_m: float = 2000, area: float = 33.0,
+                           service_type: int = 1, business_types: Optional[List[Tuple[int, str]]] = None,
+                           workers: int = 0, keep_versions: int = 2, log=print) -> Dict[str, Any]:
+    """
+    격자 생존 확률 표면을 새 버전으로 생성하고 CURRENT 교체
+
+    Args:
+        business_types: (id, name) 목록 (생략 시 BusinessType 전체)
+        workers: 피쳐 계산 프로세스 수 (0이면 현재 프로세스)
+
+    Note:
+        - 인구 피쳐는 래스터 스냅샷(build_feature_raster)이 있어야 함
+        - 워커는 fork로 래스터 memmap·점포 인덱스를 공유하고, 예측은 부모 프로세스에서만 수행
+          (XGBoost OpenMP 스레드 풀은 fork 이후 자식에서 안전하지 않음)
+    """
+    from .models import BusinessType
+    from .model_serving import get_survival_model
+    from .raster_engine import get_raster_engine
+    from .store_index import build_store_index, get_store_index
+
+    engine = get_raster_engine()
+    if engine is None:
+        raise RuntimeError("래스터 스냅샷이 없습니다. python manage.py build_feature_raster 를 먼저 실행하세요.")
+    model = get_survival_model()
+    if model is None:
+        raise RuntimeError("XGBoost 모델을 로드할 수 없습니다.")
+    store_index = get_store_index() or build_store_index()
+
+    if business_types is None:
+        business_types = list(BusinessType.objects.order_by("id").values_list("id", "name"))
+    type_ids = np.array([bt_id for bt_id, _ in business_types], dtype=np.float32)
+    type_codes = np.array(
+        [store_index.type_codes.get(name, -1) for _, name in business_types], dtype=np.int64
+    )
+
+    with connection.cursor() as cursor:
+        origin_x, origin_y, n_rows, n_cols = lattice_extent(cursor, step)
+    surface = np.full((len(business_types), n_rows, n_cols), NODATA, dtype=np.uint8)
+
+    tile_cells = max(1, int(tile_m // step))
+    tiles = [
+        (r, c, min(tile_cells, n_rows - r), min(tile_cells, n_cols - c))
+        for r in range(0, n_rows, tile_cells)
+        for c in range(0, n_cols, tile_cells)
+    ]
+    log(
+        f"격자 {n_rows}×{n_cols} ({step:g}m), 타일 {len(tiles)}개, 업종 {len(business_types)}개, "
+        f"면적 {area:g}㎡, 서비스 유형 {service_type}"
+    )
+
+    _WORKER.update({
+        "step": float(step), "origin_x": origin_x, "origin_y": origin_y,
+        "raster_engine": engine, "store_index": store_index, "type_codes": type_codes,
+        "area": float(area), "service_type": int(service_type),
+    })
+
+    start = time.time()
+    points = 0
+    pool = None
+    if workers > 0:
+        connections.close_all()
+        pool = multiprocessing.get_context("fork").Pool(workers, initializer=_init_worker)
+        results = pool.imap_unordered(compute_tile, tiles)
+    else:
+        results = map(compute_tile, tiles)
+
+    try:
+        for done, (tile, flat, base, competitors, totals) in enumerate(results, 1):
+            row0, col0, tile_rows, tile_cols = tile
+            if flat.size:
+                proba = score_points(model.predict, base, competitors, totals, type_ids)
+                rows = row0 + flat // tile_cols
+                cols = col0 + flat % tile_cols
+                surface[:, rows, cols] = np.clip(np.round(proba * 100), 0, 100).astype(np.uint8).T
+                points += flat.size
+            if done % 20 == 0 or done == len(tiles):
+                elapsed = time.time() - start
+                log(f"  타일 {done}/{len(tiles)} 완료, 격자점 {points:,}개 ({points / elapsed:,.0f} points/s)")
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    version = time.strftime("v%Y%m%dT%H%M%S")
+    version_dir = os.path.join(surface_dir, version)
+    os.makedirs(version_dir)
+    info = {
+        "format": SURFACE_FORMAT,
+        "version": version,
+        "srid": SURFACE_SRID,
+        "built_at": time.time(),
+        "origin_x": origin_x,
+        "origin_y": origin_y,
+        "step": float(step),
+        "shape": list(surface.shape),
+        "area": float(area),
+        "service_type": int(service_type),
+        "model": model.source,
+        "raster_version": engine.info.get("version"),
+        "points": points,
+        "business_types": [{"id": int(bt_id), "name": name} for bt_id, name in business_types],
+    }
+    try:
+        np.save(os.path.join(version_dir, SURFACE_FILE), surface)
+        with open(os.path.join(version_dir, HEADER_FILE), "w", encoding="utf-8") as f:
+            json.dump(info, f, ensure_ascii=False, indent=2)
+    except Exception:
+        shutil.rmtree(version_dir, ignore_errors=True)
+        raise
+
+    _write_pointer(surface_dir, version)
+    prune_versions(surface_dir, keep_versions, log=log)
+    return info
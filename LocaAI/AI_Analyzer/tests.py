@@ -1,3 +1,196 @@
-from django.test import TestCase
+import json
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from asgiref.sync import async_to_sync
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+from django.conf import settings
+
+from . import feature_cache, jobs
+from .batch_analysis import BatchRun, stream_batch_analysis
+from .feature_extractor import _results_from_row
+from .raster_engine import RASTER_LAYERS, RasterFeatureEngine, RasterLayer, row_prefix_sums
+
+
+def _fake_guest_analysis(temp_request, language='ko', progress=None):
+    """공간 분석 대신 진행 단계만 보고하는 가짜 분석"""
+    jobs.report_steps(progress, *jobs.FEATURE_STEPS, "ai")
+    return {"survival_percentage": 71.5, "is_member_analysis": False}
+
+
+@override_settings(ANALYSIS_SETTINGS={
+    **settings.ANALYSIS_SETTINGS,
+    "JOBS": {**settings.ANALYSIS_SETTINGS["JOBS"], "BACKEND": "AI_Analyzer.jobs.ImmediateJobBackend"},
+})
+class AnalysisJobQueueTestCase(SimpleTestCase):
+    def setUp(self):
+        jobs.reset_job_backend()
+        self.addCleanup(jobs.reset_job_backend)
+        self.temp_request = SimpleNamespace(id=0, user=None, business_type_id=1)
+
+    def test_guest_job_completes_with_result(self):
+        """비회원 작업은 등록 후 완료 상태와 결과를 상태 조회로 확인할 수 있다"""
+        with mock.patch("AI_Analyzer.views.perform_spatial_analysis_guest", side_effect=_fake_guest_analysis):
+            job_id = jobs.enqueue_analysis(self.temp_request, language="ko", is_guest=True)
+
+        state = jobs.get_job_status(job_id)
+        self.assertEqual(state["status"], "completed")
+        self.assertEqual(state["step"], "complete")
+        self.assertEqual(state["percent"], 100)
+        self.assertEqual(state["result"]["survival_percentage"], 71.5)
+
+    def test_failed_job_records_error(self):
+        """분석 중 예외가 나면 failed 상태와 오류 메시지가 남는다"""
+        with mock.patch("AI_Analyzer.views.perform_spatial_analysis_guest", side_effect=RuntimeError("boom")):
+            job_id = jobs.enqueue_analysis(self.temp_request, is_guest=True)
+
+        state = jobs.get_job_status(job_id)
+        self.assertEqual(state["status"], "failed")
+        self.assertEqual(state["error"], "boom")
+
+
+class BatchAnalysisStreamTestCase(SimpleTestCase):
+    def test_lines_are_sent_per_chunk(self):
+        """청크 결과 줄은 다음 청크를 처리하기 전에 스트림으로 나간다"""
+        run = BatchRun(None, [{"ref": i} for i in range(5)], business_types={}, chunk_size=2)
+        processed = []
+
+        def fake_chunk(offset, executor, session):
+            processed.append(offset)
+            return [json.dumps({"type": "result", "index": index}) + "\n" for index in range(offset, min(offset + 2, 5))]
+
+        async def consume():
+            received = []
+            async for line in stream_batch_analysis(run):
+                received.append((json.loads(line)["type"], json.loads(line).get("index"), list(processed)))
+            return received
+
+        with mock.patch.object(run, "process_chunk", side_effect=fake_chunk):
+            received = async_to_sync(consume)()
+
+        self.assertEqual(received[0], ("start", None, []))
+        self.assertEqual(received[1:3], [("result", 0, [0]), ("result", 1, [0])])
+        self.assertEqual(received[3:5], [("result", 2, [0, 2]), ("result", 3, [0, 2])])
+        self.assertEqual(received[5], ("result", 4, [0, 2, 4]))
+        self.assertEqual(received[6][0], "summary")
+
+
+def _sql_reference_sum(grid, origin_x, origin_y, cell, polygon, x_coord, y_coord, radius):
+    """SQL 경로(ST_DWithin)와 같은 규칙의 전수 합계: 폴리곤 셀은 사각형이 반경에 닿으면, 포인트는 중심 기준"""
+    center_x = origin_x + (np.arange(grid.shape[1]) + 0.5) * cell
+    center_y = origin_y + (np.arange(grid.shape[0]) + 0.5) * cell
+    dx = np.abs(center_x[None, :] - x_coord)
+    dy = np.abs(center_y[:, None] - y_coord)
+    if polygon:
+        dx = np.maximum(dx - cell / 2, 0.0)
+        dy = np.maximum(dy - cell / 2, 0.0)
+    mask = dx * dx + dy * dy <= radius * radius
+    return float(grid.astype(np.float64)[mask].sum())
+
+
+class RasterEngineParityTestCase(SimpleTestCase):
+    """합성 격자에서 래스터 엔진 인구 피쳐가 SQL 경로와 같은지 확인"""
+
+    ORIGIN = (200000.0, 550000.0)
+    EXTENT_M = 2600
+
+    def setUp(self):
+        rng = np.random.RandomState(20250101)
+        self.grids = {}
+        layers = {}
+        for name, spec in RASTER_LAYERS.items():
+            size = int(self.EXTENT_M / spec["cell"])
+            grids = {band: rng.uniform(0, 40, (size, size)).astype(np.float32) for band in spec["bands"]}
+            self.grids[name] = grids
+            layers[name] = RasterLayer(
+                self.ORIGIN[0], self.ORIGIN[1], spec["cell"], spec["polygon"],
+                {band: row_prefix_sums(grid) for band, grid in grids.items()},
+            )
+        self.engine = RasterFeatureEngine(layers)
+
+    def _reference_row(self, x_coord, y_coord):
+        def total(name, band, radius):
+            spec = RASTER_LAYERS[name]
+            return _sql_reference_sum(
+                self.grids[name][band], self.ORIGIN[0], self.ORIGIN[1], spec["cell"], spec["polygon"],
+                x_coord, y_coord, radius,
+            )
+
+        life_bands = ["total", "pop_20", "pop_30", "pop_40", "pop_50", "pop_60"]
+        return (
+            [total("life", band, 300) for band in life_bands]
+            + [total("life", band, 1000) for band in life_bands]
+            + [total("work", "total", 300)]
+            + [total("temp", "cn", 300), total("temp", "total", 1000), total("temp", "cn", 1000)]
+            + [total("long", "total", 300), total("long", "total", 1000), total("long", "cn", 1000)]
+        )
+
+    def test_population_features_match_sql_reference(self):
+        """격자 중앙·비정렬 좌표·경계 근처에서 피쳐 값이 SQL 기준과 반올림 오차 이내로 같다"""
+        point_columns = [0] * 6
+        for x_coord, y_coord in ((201300.0, 551300.0), (201023.9, 550640.1), (200150.5, 552410.2)):
+            with self.subTest(x=x_coord, y=y_coord):
+                raster_row = self.engine.population_row(x_coord, y_coord)
+                reference_row = self._reference_row(x_coord, y_coord)
+                for raster_value, reference_value in zip(raster_row, reference_row):
+                    self.assertAlmostEqual(raster_value, reference_value, delta=max(1e-6 * reference_value, 0.05))
+
+                raster = _results_from_row(raster_row + point_columns, 33.0, 1)
+                reference = _results_from_row(reference_row + point_columns, 33.0, 1)
+                for field, value in reference.items():
+                    # 정수 피쳐는 int() 절사, 비율은 소수 둘째 자리 반올림 경계만 허용
+                    self.assertLessEqual(abs(raster[field] - value), 1 if isinstance(value, int) else 0.01, field)
+
+
+FEATURE_CACHE_TEST_SETTINGS = {
+    **settings.ANALYSIS_SETTINGS["FEATURE_CACHE"],
+    "ENABLED": True,
+    "GRID_M": 10,
+    "AREA_BUCKET_M2": 10,
+    "CELL_M": 100,
+}
+
+
+@override_settings(ANALYSIS_SETTINGS={**settings.ANALYSIS_SETTINGS, "FEATURE_CACHE": FEATURE_CACHE_TEST_SETTINGS})
+class FeatureCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        caches[FEATURE_CACHE_TEST_SETTINGS["ALIAS"]].clear()
+        self.results = {"life_pop_300m": 1200, "area": 30.0, "total_land_value": 3000.0}
+
+    def test_nearby_coordinates_share_snapped_key(self):
+        """GRID_M / AREA_BUCKET_M2 안의 좌표·면적은 같은 키, 업종·서비스가 다르면 다른 키"""
+        key, cell = feature_cache._entry_key(201003.0, 550996.0, 5, 31.0, 1)
+        self.assertEqual(feature_cache._entry_key(200998.0, 551004.0, 5, 34.0, 1), (key, cell))
+        self.assertNotEqual(feature_cache._entry_key(201006.0, 550996.0, 5, 31.0, 1)[0], key)
+        self.assertNotEqual(feature_cache._entry_key(201003.0, 550996.0, 6, 31.0, 1)[0], key)
+        self.assertNotEqual(feature_cache._entry_key(201003.0, 550996.0, 5, 31.0, 0)[0], key)
+        self.assertNotEqual(feature_cache._entry_key(201003.0, 550996.0, 5, 36.0, 1)[0], key)
+
+    def test_hit_rescales_area_dependent_values(self):
+        """적중 시 면적 버킷 안의 요청 면적으로 area / total_land_value를 다시 계산"""
+        feature_cache.set_cached_features(201000.0, 551000.0, 5, 30.0, 1, self.results)
+        results, competitor_counts = feature_cache.get_cached_features(201002.0, 550998.0, 5, 32.0, 1)
+        self.assertEqual(results["life_pop_300m"], 1200)
+        self.assertEqual(results["area"], 32.0)
+        self.assertAlmostEqual(results["total_land_value"], 3200.0)
+        self.assertIsNone(competitor_counts)
+
+    def test_edit_invalidates_only_cells_within_radius(self):
+        """편집 지오메트리 영향 반경 안의 셀만 무효화되고 먼 항목은 유지"""
+        feature_cache.set_cached_features(201000.0, 551000.0, 5, 30.0, 1, self.results)
+        feature_cache.set_cached_features(203000.0, 551000.0, 5, 30.0, 1, self.results)
+
+        near_edit = SimpleNamespace(extent=(201250.0, 551000.0, 201250.0, 551000.0))
+        self.assertGreater(feature_cache.invalidate_geometry(near_edit, "store"), 0)
+
+        self.assertIsNone(feature_cache.get_cached_features(201000.0, 551000.0, 5, 30.0, 1))
+        self.assertIsNotNone(feature_cache.get_cached_features(203000.0, 551000.0, 5, 30.0, 1))
+
+    def test_stepwise_features_are_not_cached(self):
+        """단계별 폴백 결과(cacheable=False)는 캐시에 저장하지 않음"""
+        timings = {"engine": "stepwise", "cacheable": False}
+        with mock.patch.object(feature_cache, "extract_spatial_features", return_value=(self.results, timings)):
+            feature_cache.get_or_extract_features(None, 201000.0, 551000.0, 30.0, 1, 5, "카페")
+        self.assertIsNone(feature_cache.get_cached_features(201000.0, 551000.0, 5, 30.0, 1))
@@ -8,7 +8,14 @@ urlpatterns = [
     path('analyze/', views.analyze_page, name='analyze_page'),
     path('get-coordinates/', views.get_coordinates, name='get_coordinates'),
     path('analyze-business/', views.analyze_location, name='analyze_location'),
+    path('analysis-jobs/', views.create_analysis_job, name='create_analysis_job'),
+    path('analysis-jobs/<str:job_id>/', views.analysis_job_status, name='analysis_job_status'),
+    path('analyze-batch/', views.analyze_batch, name='analyze_batch'),
+    path('site-search/', views.create_site_search_job, name='create_site_search_job'),
     path('api/result/<int:request_id>/', views.get_analysis_result_api, name='get_analysis_result_api'),
+    path('api/result/<int:request_id>/explanation/', views.get_analysis_explanation_api, name='get_analysis_explanation_api'),
+    path('api/survival-surface/', views.survival_surface_api, name='survival_surface_api'),
+    path('api/result/<int:request_id>/sensitivity/', views.analysis_sensitivity_api, name='analysis_sensitivity_api'),
     path('result/<int:request_id>/', views.result_detail, name='result_detail'),
     path('database-info/', views.database_info, name='database_info'),
     path('pdf-data/<int:request_id>/', views.get_pdf_data, name='get_pdf_data'),
@@ -1,7 +1,8 @@
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404
 from django.shortcuts import render, redirect
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.contrib.gis.db import models
@@ -14,12 +15,22 @@ import json
 import requests
 from pyproj import Proj, Transformer
 from .models import BusinessType, AnalysisRequest, AnalysisResult, AnalysisSession, AnalysisSessionLog
+from .feature_extractor import (
+    MODEL_FEATURES,
+    build_model_features,
+    print_feature_timings,
+)
+from .feature_cache import get_or_extract_features
+from .model_serving import get_survival_model
+from .inference_sidecar import SidecarError, get_inference_client
+from .jobs import FEATURE_STEPS, enqueue_analysis, enqueue_explanation, get_job_status, report_steps
+from .ai_explainer import get_fallback_explanation
+from django.conf import settings
 import time
-import pickle
 import numpy as np
-import os
 import math
 import logging
+import traceback
 from datetime import datetime, timezone, timedelta
 import random
 import pandas as pd
@@ -33,38 +44,74 @@ from rest_framework.decorators import api_view
 from chatbot.models import ChatSession, ChatLog, ChatMemory
 from django.core.serializers.json import DjangoJSONEncoder
 
+logger = logging.getLogger(__name__)
+
 # PDF 생성은 클라이언트 사이드에서 jsPDF로 처리
 
-# XGBoost 모델 전역 변수
-XGBOOST_MODEL = None
+def build_feature_matrix(feature_dicts):
+    """
+    피쳐 딕셔너리 목록을 (n × 28) 모델 입력 행렬로 변환
+
+    Args:
+        feature_dicts (list): 피쳐 딕셔너리 목록
+
+    Returns:
+        np.ndarray: 학습 시 컬럼 순서(MODEL_FEATURES)를 따르는 float 행렬
+    """
+    return np.array(
+        [[features.get(name, 0) for name in MODEL_FEATURES] for features in feature_dicts],
+        dtype=float,
+    ).reshape(len(feature_dicts), len(MODEL_FEATURES))
 
 
-def load_xgboost_model():
+def predict_survival_matrix(feature_matrix):
     """
-    XGBoost 모델을 로드하는 함수
+    (n × 28) 피쳐 행렬의 생존 확률을 한 번의 inplace_predict 호출로 예측
+
+    Args:
+        feature_matrix (np.ndarray): build_feature_matrix로 만든 행렬
 
     Returns:
-        object: 로드된 XGBoost 모델 객체, 실패 시 None
+        np.ndarray: 행별 생존 확률 (0.0 ~ 1.0), 예측 실패 시 0.0
 
     Note:
-        - 모델은 전역 변수로 캐시되어 중복 로드를 방지
-        - 모델 파일 경로: model/best_xgb_model.pkl
+        - 28개/27개(업종 ID 제외) 피쳐 여부는 모델 로드 시 판별 (model_serving.SurvivalModel)
+        - 추론 사이드카가 떠 있으면 사이드카로, 없거나 실패하면 프로세스 내 모델로 예측
     """
-    global XGBOOST_MODEL
-    if XGBOOST_MODEL is None:
-        # 상대경로로 변경
-        model_path = os.path.join("model", "best_xgb_model.pkl")
+    n_rows = feature_matrix.shape[0]
+    if n_rows == 0:
+        return np.zeros(0)
+
+    client = get_inference_client()
+    if client is not None:
         try:
-            with open(model_path, "rb") as f:
-                XGBOOST_MODEL = pickle.load(f)
-            print(f"✅ XGBoost 모델 로드 완료: {model_path}")
-        except FileNotFoundError:
-            print(f"❌ XGBoost 모델 파일을 찾을 수 없습니다: {model_path}")
-            XGBOOST_MODEL = None
-        except Exception as e:
-            print(f"❌ XGBoost 모델 로드 실패: {e}")
-            XGBOOST_MODEL = None
-    return XGBOOST_MODEL
+            return client.predict_batch(feature_matrix)
+        except SidecarError as e:
+            print(f"⚠️ 추론 서버 예측 실패, 프로세스 내 모델 사용: {e}")
+
+    model = get_survival_model()
+    if model is None:
+        print("❌ AI 모델이 로드되지 않아 예측을 수행할 수 없습니다.")
+        return np.zeros(n_rows)
+
+    try:
+        return model.predict(feature_matrix)
+    except Exception as e:
+        print(f"❌ AI 모델 예측 중 오류가 발생했습니다: {e}")
+        return np.zeros(n_rows)
+
+
+def predict_survival_probabilities(feature_dicts):
+    """
+    여러 피쳐 딕셔너리의 장기 생존 확률을 일괄 예측
+
+    Args:
+        feature_dicts (list): 분석 결과에서 추출한 피쳐 딕셔너리 목록
+
+    Returns:
+        np.ndarray: 입력 순서대로의 생존 확률 배열
+    """
+    return predict_survival_matrix(build_feature_matrix(feature_dicts))
 
 
 def predict_survival_probability(features_dict):
@@ -78,134 +125,92 @@ def predict_survival_probability(features_dict):
         float: 생존 확률 (0.0 ~ 1.0), 예측 실패 시 0.0
 
     Note:
-        - 28개 피쳐(업종 ID 포함) 우선 시도, 실패시 27개 피쳐로 재시도
-        - 피쳐 순서는 모델 학습 시와 동일해야 함
+        - predict_survival_probabilities의 단건 버전
+        - 피쳐 순서는 모델 학습 시와 동일해야 함 (MODEL_FEATURES)
     """
-    try:
-        model = load_xgboost_model()
-        if model is None:
-            print("❌ AI 모델이 로드되지 않아 예측을 수행할 수 없습니다.")
-            return 0.0
+    survival_probability = float(predict_survival_probabilities([features_dict])[0])
+    print(
+        f"🤖 AI 모델 예측 완료 - 장기 생존 확률: {survival_probability:.3f} ({survival_probability*100:.1f}%)"
+    )
+    return survival_probability
+
 
-        # 먼저 28개 피쳐로 시도 (업종 ID 포함)
+def predict_survival_contributions(feature_matrix):
+    """
+    생존 확률과 피쳐별 기여도(pred_contribs)를 한 번의 모델 호출로 계산
+
+    Returns:
+        tuple: (확률 배열, 기여도 행렬 또는 None)
+
+    Note:
+        - 기여도 계산이 불가능하면 predict_survival_matrix로 확률만 예측 (기여도 None)
+    """
+    if feature_matrix.shape[0] == 0:
+        return np.zeros(0), None
+
+    client = get_inference_client()
+    if client is not None:
         try:
-            # 학습 데이터의 컬럼 순서대로 피쳐 배열 생성
-            # 순서: Area, Adjacent_BIZ, 1A_Total, Total_LV, Business_D, Working_Pop,
-            #       2A_20, 2A_30, 2A_40, 2A_50, 2A_60, 1A_20, 1A_30, 1A_40, 1A_50, 1A_60,
-            #       1A_Long_Total, 2A_Long_Total, 1A_Temp_CN, 2A_Temp_CN, 2A_Temp_Total, 2A_Long_CN,
-            #       Competitor_C, Competitor_R, Service, School, PubBuilding, UPTAENM
-
-            feature_array = [
-                features_dict.get("Area", 0),
-                features_dict.get("Adjacent_BIZ", 0),
-                features_dict.get("1A_Total", 0),
-                features_dict.get("Total_LV", 0),
-                features_dict.get("Business_D", 0),
-                features_dict.get("Working_Pop", 0),
-                features_dict.get("2A_20", 0),
-                features_dict.get("2A_30", 0),
-                features_dict.get("2A_40", 0),
-                features_dict.get("2A_50", 0),
-                features_dict.get("2A_60", 0),
-                features_dict.get("1A_20", 0),
-                features_dict.get("1A_30", 0),
-                features_dict.get("1A_40", 0),
-                features_dict.get("1A_50", 0),
-                features_dict.get("1A_60", 0),
-                features_dict.get("1A_Long_Total", 0),
-                features_dict.get("2A_Long_Total", 0),
-                features_dict.get("1A_Temp_CN", 0),
-                features_dict.get("2A_Temp_CN", 0),
-                features_dict.get("2A_Temp_Total", 0),
-                features_dict.get("2A_Long_CN", 0),
-                features_dict.get("Competitor_C", 0),
-                features_dict.get("Competitor_R", 0),
-                features_dict.get("Service", 0),
-                features_dict.get("School", 0),
-                features_dict.get("PubBuilding", 0),
-                features_dict.get("UPTAENM_ID", 0),  # 업종 ID (숫자)
-            ]
-
-            print(f"🔍 AI 모델 입력 피쳐 수: {len(feature_array)} (28개, 업종 ID 포함)")
-            print(f"   업종 ID: {features_dict.get('UPTAENM_ID', 0)}")
-
-            # numpy 배열로 변환하고 2D로 reshape (1개 샘플)
-            feature_array = np.array(feature_array, dtype=float).reshape(1, -1)
-
-            # 예측 수행 (확률 반환)
-            survival_probability = model.predict_proba(feature_array)[0][
-                1
-            ]  # 생존(1) 클래스의 확률
-
-            print(
-                f"🤖 AI 모델 예측 완료 (28개 피쳐) - 장기 생존 확률: {survival_probability:.3f} ({survival_probability*100:.1f}%)"
-            )
+            return client.predict_contribs(feature_matrix)
+        except SidecarError as e:
+            print(f"⚠️ 추론 서버 기여도 계산 실패, 프로세스 내 모델 사용: {e}")
 
-            return float(survival_probability)
-
-        except Exception as e28:
-            print(f"⚠️ 28개 피쳐로 예측 실패: {e28}")
-            print("   27개 피쳐(업종 ID 제외)로 재시도...")
-
-            # 27개 피쳐로 재시도 (업종 ID 제외)
-            feature_array = [
-                features_dict.get("Area", 0),
-                features_dict.get("Adjacent_BIZ", 0),
-                features_dict.get("1A_Total", 0),
-                features_dict.get("Total_LV", 0),
-                features_dict.get("Business_D", 0),
-                features_dict.get("Working_Pop", 0),
-                features_dict.get("2A_20", 0),
-                features_dict.get("2A_30", 0),
-                features_dict.get("2A_40", 0),
-                features_dict.get("2A_50", 0),
-                features_dict.get("2A_60", 0),
-                features_dict.get("1A_20", 0),
-                features_dict.get("1A_30", 0),
-                features_dict.get("1A_40", 0),
-                features_dict.get("1A_50", 0),
-                features_dict.get("1A_60", 0),
-                features_dict.get("1A_Long_Total", 0),
-                features_dict.get("2A_Long_Total", 0),
-                features_dict.get("1A_Temp_CN", 0),
-                features_dict.get("2A_Temp_CN", 0),
-                features_dict.get("2A_Temp_Total", 0),
-                features_dict.get("2A_Long_CN", 0),
-                features_dict.get("Competitor_C", 0),
-                features_dict.get("Competitor_R", 0),
-                features_dict.get("Service", 0),
-                features_dict.get("School", 0),
-                features_dict.get("PubBuilding", 0),
-            ]
-
-            print(f"🔍 AI 모델 입력 피쳐 수: {len(feature_array)} (27개, 업종 ID 제외)")
-
-            # numpy 배열로 변환하고 2D로 reshape (1개 샘플)
-            feature_array = np.array(feature_array, dtype=float).reshape(1, -1)
-
-            # 예측 수행 (확률 반환)
-            survival_probability = model.predict_proba(feature_array)[0][
-                1
-            ]  # 생존(1) 클래스의 확률
-
-            print(
-                f"🤖 AI 모델 예측 완료 (27개 피쳐) - 장기 생존 확률: {survival_probability:.3f} ({survival_probability*100:.1f}%)"
-            )
+    model = get_survival_model()
+    if model is not None:
+        try:
+            return model.predict_contribs(feature_matrix)
+        except Exception as e:
+            print(f"⚠️ 피쳐 기여도 계산 실패, 확률만 예측: {e}")
+    return predict_survival_matrix(feature_matrix), None
 
-            return float(survival_probability)
 
-    except Exception as e:
-        print(f"❌ AI 모델 예측 중 오류가 발생했습니다: {e}")
-        return 0.0
+def local_explanation_top_n():
+    return getattr(settings, 'ANALYSIS_SETTINGS', {}).get('LOCAL_EXPLANATION', {}).get('TOP_N', 5)
 
 
-def recommend_business_type(features_dict, current_business_type_id):
+def predict_survival_with_explanation(features_dict):
+    """
+    장기 생존 확률과 로컬 설명(피쳐별 기여도 순위)을 함께 계산
+
+    Returns:
+        tuple: (생존 확률 0.0 ~ 1.0, 로컬 설명 딕셔너리 - 계산 불가 시 빈 딕셔너리)
+    """
+    from .local_explainer import rank_contributions
+
+    feature_matrix = build_feature_matrix([features_dict])
+    probabilities, contribs = predict_survival_contributions(feature_matrix)
+    survival_probability = float(probabilities[0])
+    local_explanation = (
+        rank_contributions(contribs[0], feature_matrix[0], local_explanation_top_n()) if contribs is not None else {}
+    )
+    print(
+        f"🤖 AI 모델 예측 완료 - 장기 생존 확률: {survival_probability:.3f} ({survival_probability*100:.1f}%)"
+        f"{', 피쳐 기여도 포함' if local_explanation else ''}"
+    )
+    return survival_probability, local_explanation
+
+
+def _empty_recommendation():
+    return {
+        'recommended_business_type_id': None,
+        'recommended_business_type_name': '',
+        'recommended_survival_probability': 0.0,
+        'recommended_survival_percentage': 0.0,
+        'top_recommendations': [],
+        'all_recommendations': []
+    }
+
+
+def recommend_business_type(features_dict, current_business_type_id, business_types=None,
+                            competitor_counts=None):
     """
     모든 업종에 대해 생존확률을 분석하여 상위 업종들을 추천하는 함수
 
     Args:
-        features_dict (dict): 분석 결과에서 추출한 피쳐 딕셔너리 (업종 ID 제외)
+        features_dict (dict): 분석 결과에서 추출한 피쳐 딕셔너리
         current_business_type_id (int): 현재 선택된 업종 ID
+        business_types (list, optional): (id, name) 튜플 목록, 생략 시 BusinessType 전체 조회
+        competitor_counts (dict, optional): 반경 300m 내 {업종명: 점포 수} (fetch_competitor_counts)
 
     Returns:
         dict: {
@@ -218,84 +223,65 @@ def recommend_business_type(features_dict, current_business_type_id):
         }
 
     Note:
-        - 현재 선택된 업종을 제외한 모든 업종에 대해 예측 수행
+        - 현재 선택된 업종을 제외한 모든 업종을 (업종 수 × 28) 행렬 하나로 만들어 한 번에 예측
+        - competitor_counts가 주어지면 후보 업종별 Competitor_C / Competitor_R을 해당 업종 기준으로 교체
         - 생존확률 순으로 정렬하여 상위 업종들 반환
     """
     try:
         print("\n🎯 [업종 추천] 모든 업종 생존확률 분석 시작...")
-        
-        # 모든 업종 조회
-        all_business_types = BusinessType.objects.all().order_by('id')
-        print(f"   📋 총 {len(all_business_types)}개 업종 분석 예정")
-        
-        business_results = []
-        analyzed_count = 0
-        
-        for business_type in all_business_types:
-            # 현재 선택된 업종은 제외
-            if business_type.id == current_business_type_id:
-                continue
-                
-            # 해당 업종에 대한 피쳐 딕셔너리 생성
-            business_features = features_dict.copy()
-            business_features['UPTAENM_ID'] = business_type.id
-            
-            # 생존확률 예측
-            probability = predict_survival_probability(business_features)
-            analyzed_count += 1
-            
-            print(f"   📊 {business_type.name} (ID: {business_type.id}): {probability*100:.1f}%")
-            
-            # 결과 리스트에 추가
-            business_results.append({
-                'id': business_type.id,
-                'name': business_type.name,
-                'probability': probability,
-                'percentage': round(probability * 100, 1)
-            })
-        
-        print(f"   ✅ {analyzed_count}개 업종 분석 완료")
-        
-        # 생존확률 순으로 정렬 (높은 순)
-        business_results.sort(key=lambda x: x['probability'], reverse=True)
-        
-        if business_results:
-            # 1위 업종
-            best_business = business_results[0]
-            
-            result = {
-                'recommended_business_type_id': best_business['id'],
-                'recommended_business_type_name': best_business['name'],
-                'recommended_survival_probability': best_business['probability'],
-                'recommended_survival_percentage': best_business['percentage'],
-                'top_recommendations': business_results[:10],  # 상위 10개
-                'all_recommendations': business_results       # 전체 리스트
-            }
-            
-            print(f"🏆 추천 업종: {best_business['name']} ({best_business['percentage']}%)")
-            return result
-        else:
+
+        if business_types is None:
+            business_types = list(BusinessType.objects.order_by('id').values_list('id', 'name'))
+        candidates = [(bt_id, name) for bt_id, name in business_types if bt_id != current_business_type_id]
+
+        if not candidates:
             print("❌ 추천할 업종을 찾을 수 없습니다.")
-            return {
-                'recommended_business_type_id': None,
-                'recommended_business_type_name': '',
-                'recommended_survival_probability': 0.0,
-                'recommended_survival_percentage': 0.0,
-                'top_recommendations': [],
-                'all_recommendations': []
+            return _empty_recommendation()
+
+        # 기준 피쳐 행을 업종 수만큼 복제하고 업종 ID 컬럼만 교체
+        feature_matrix = np.repeat(build_feature_matrix([features_dict]), len(candidates), axis=0)
+        feature_matrix[:, MODEL_FEATURES.index('UPTAENM_ID')] = [bt_id for bt_id, _ in candidates]
+
+        if competitor_counts is not None:
+            # 후보 업종별 경쟁업체 수/비율 (같은 업종 점포 수 ÷ 300m 내 전체 점포 수)
+            competitors = np.array([competitor_counts.get(name, 0) for _, name in candidates], dtype=float)
+            adjacent_biz = float(features_dict.get('Adjacent_BIZ', 0) or 0)
+            ratios = np.round(competitors / adjacent_biz * 100, 2) if adjacent_biz > 0 else np.zeros(len(candidates))
+            feature_matrix[:, MODEL_FEATURES.index('Competitor_C')] = competitors
+            feature_matrix[:, MODEL_FEATURES.index('Competitor_R')] = ratios
+
+        probabilities = predict_survival_matrix(feature_matrix)
+        print(f"   ✅ {len(candidates)}개 업종 일괄 분석 완료")
+
+        business_results = [
+            {
+                'id': bt_id,
+                'name': name,
+                'probability': float(probability),
+                'percentage': round(float(probability) * 100, 1)
             }
-            
-    except Exception as e:
-        print(f"❌ 업종 추천 중 오류 발생: {e}")
+            for (bt_id, name), probability in zip(candidates, probabilities)
+        ]
+
+        # 생존확률 순으로 정렬 (높은 순)
+        business_results.sort(key=lambda x: x['probability'], reverse=True)
+
+        # 1위 업종
+        best_business = business_results[0]
+        print(f"🏆 추천 업종: {best_business['name']} ({best_business['percentage']}%)")
         return {
-            'recommended_business_type_id': None,
-            'recommended_business_type_name': '',
-            'recommended_survival_probability': 0.0,
-            'recommended_survival_percentage': 0.0,
-            'top_recommendations': [],
-            'all_recommendations': []
+            'recommended_business_type_id': best_business['id'],
+            'recommended_business_type_name': best_business['name'],
+            'recommended_survival_probability': best_business['probability'],
+            'recommended_survival_percentage': best_business['percentage'],
+            'top_recommendations': business_results[:10],  # 상위 10개
+            'all_recommendations': business_results       # 전체 리스트
         }
 
+    except Exception as e:
+        print(f"❌ 업종 추천 중 오류 발생: {e}")
+        return _empty_recommendation()
+
 
 def index(request):
     """
@@ -454,6 +440,94 @@ def get_coordinates(request):
         )
 
 
+ANALYSIS_REQUIRED_FIELDS = [
+    "address",
+    "area",
+    "business_type_id",
+    "service_type",
+    "longitude",
+    "latitude",
+    "x_coord",
+    "y_coord",
+]
+
+
+class AnalysisInputError(Exception):
+    """분석 요청 입력 오류 (status: HTTP 상태 코드)"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def build_analysis_target(request, data):
+    """
+    분석 요청 JSON을 검증하고 분석 대상 객체 생성
+
+    Args:
+        request: HTTP 요청 객체 (회원 여부 판단)
+        data (dict): 분석 요청 JSON
+
+    Returns:
+        tuple: (분석 대상, 언어, 비회원 여부)
+            - 회원: 저장된 AnalysisRequest
+            - 비회원: 데이터베이스에 저장하지 않는 SimpleNamespace 임시 요청 객체
+
+    Raises:
+        AnalysisInputError: 필수 필드 누락(400) 또는 업종 없음(404)
+        ValueError: 숫자 필드 변환 실패
+    """
+    # 입력 데이터 검증 - 원본 AI_Analyzer 변수명 사용
+    for field in ANALYSIS_REQUIRED_FIELDS:
+        if field not in data:
+            raise AnalysisInputError(f"{field}가 필요합니다.")
+
+    language = data.get("language", "ko")  # 언어 정보 추출 (기본값: 한국어)
+    business_type_id = data["business_type_id"]
+
+    # 언어 활성화
+    from django.utils.translation import activate
+    activate(language)
+    print(f"🌍 언어 활성화: {language}")
+
+    try:
+        business_type = BusinessType.objects.get(id=business_type_id)
+    except BusinessType.DoesNotExist:
+        raise AnalysisInputError(f"업종 ID {business_type_id}를 찾을 수 없습니다.", status=404)
+
+    values = {
+        "address": data["address"],
+        "area": float(data["area"]),
+        "service_type": int(data["service_type"]),
+        "longitude": float(data["longitude"]),
+        "latitude": float(data["latitude"]),
+        "x_coord": float(data["x_coord"]),
+        "y_coord": float(data["y_coord"]),
+    }
+    print(f"🔍 [DEBUG] 분석 대상: 업종 {business_type.name}(ID {business_type.id}), {values}")
+
+    # 회원과 비회원 구분 처리
+    if request.user.is_authenticated:
+        analysis_request = AnalysisRequest.objects.create(
+            user=request.user,
+            business_type=business_type,
+            language=language,
+            **values,
+        )
+        return analysis_request, language, False
+
+    # 비회원: 임시 분석 요청 객체 생성 (데이터베이스에 저장하지 않음)
+    from types import SimpleNamespace
+    temp_request = SimpleNamespace(
+        id=0,  # 임시 ID
+        user=None,
+        business_type=business_type,  # BusinessType 객체
+        business_type_id=business_type.id,  # ID 추가
+        **values,
+    )
+    return temp_request, language, True
+
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def analyze_location(request):
@@ -478,6 +552,9 @@ def analyze_location(request):
         400: 필수 필드 누락 또는 잘못된 JSON
         404: 업종을 찾을 수 없는 경우
         500: 분석 중 오류 발생
+
+    Note:
+        - 요청 안에서 동기로 분석 (기존 화면 호환), 작업 큐 방식은 create_analysis_job 사용
     """
     try:
         # 원본 AI_Analyzer와 같이 JSON 데이터로 받기
@@ -487,99 +564,22 @@ def analyze_location(request):
         print(f"🔍 [DEBUG] 받은 JSON 데이터: {data}")
         print(f"🔍 [DEBUG] Content-Type: {request.content_type}")
 
-        # 입력 데이터 검증 - 원본 AI_Analyzer 변수명 사용
-        required_fields = [
-            "address",
-            "area",
-            "business_type_id",
-            "service_type",
-            "longitude",
-            "latitude",
-            "x_coord",
-            "y_coord",
-        ]
-        for field in required_fields:
-            if field not in data:
-                print(f"❌ [ERROR] 필수 필드 누락: {field}")
-                return JsonResponse({"error": f"{field}가 필요합니다."}, status=400)
-
-        # 데이터 추출
-        business_type_id = data["business_type_id"]
-        address = data["address"]
-        area = data["area"]
-        service_type = data["service_type"]
-        longitude = data["longitude"]
-        latitude = data["latitude"]
-        x_coord = data["x_coord"]
-        y_coord = data["y_coord"]
-        language = data.get("language", "ko")  # 언어 정보 추출 (기본값: 한국어)
-
-        # 디버깅: 추출된 값들 출력
-        print(f"🔍 [DEBUG] 추출된 값들:")
-        print(f"   business_type_id: {business_type_id}")
-        print(f"   address: {address}")
-        print(f"   area: {area}")
-        print(f"   service_type: {service_type}")
-        print(f"   x_coord: {x_coord}")
-        print(f"   y_coord: {y_coord}")
-        print(f"   longitude: {longitude}")
-        print(f"   latitude: {latitude}")
-        print(f"   language: {language}")
-        
-        # 언어 활성화
-        from django.utils.translation import activate
-        activate(language)
-        print(f"🌍 언어 활성화: {language}")
-
-        # 분석 요청 저장 - 원본 AI_Analyzer와 동일
         try:
-            business_type = BusinessType.objects.get(id=business_type_id)
-        except BusinessType.DoesNotExist:
-            print(f"❌ [ERROR] 업종을 찾을 수 없습니다: ID {business_type_id}")
-            return JsonResponse(
-                {"error": f"업종 ID {business_type_id}를 찾을 수 없습니다."}, status=404
-            )
+            target, language, is_guest = build_analysis_target(request, data)
+        except AnalysisInputError as e:
+            print(f"❌ [ERROR] {e}")
+            return JsonResponse({"error": str(e)}, status=e.status)
 
-        # 회원과 비회원 구분 처리
-        if request.user.is_authenticated:
+        if not is_guest:
             # 회원: 데이터베이스에 저장하고 분석 수행
-            analysis_request = AnalysisRequest.objects.create(
-                user=request.user,
-                address=address,
-                area=float(area),
-                business_type=business_type,
-                service_type=int(service_type),
-                longitude=float(longitude),
-                latitude=float(latitude),
-                x_coord=float(x_coord),
-                y_coord=float(y_coord),
-            )
-
-            # 공간 분석 수행
-            result = perform_spatial_analysis(analysis_request, language=language)
+            result = perform_spatial_analysis(target, language=language)
 
             return JsonResponse(
-                {"success": True, "request_id": analysis_request.id, "result": result, "is_guest": False}
+                {"success": True, "request_id": target.id, "result": result, "is_guest": False}
             )
         else:
-            # 비회원: 임시 분석 요청 객체 생성 (데이터베이스에 저장하지 않음)
-            from types import SimpleNamespace
-            temp_request = SimpleNamespace(
-                id=0,  # 임시 ID
-                user=None,
-                address=address,
-                area=float(area),
-                business_type=business_type,  # BusinessType 객체
-                business_type_id=business_type.id,  # ID 추가
-                service_type=int(service_type),
-                longitude=float(longitude),
-                latitude=float(latitude),
-                x_coord=float(x_coord),
-                y_coord=float(y_coord),
-            )
-
             # 공간 분석 수행 (저장하지 않는 버전)
-            result = perform_spatial_analysis_guest(temp_request, language=language)
+            result = perform_spatial_analysis_guest(target, language=language)
 
             return JsonResponse(
                 {"success": True, "request_id": 0, "result": result, "is_guest": True}
@@ -603,648 +603,215 @@ def analyze_location(request):
         )
 
 
-def perform_spatial_analysis_guest(temp_request, language='ko'):
-    """
-    비회원용 공간 분석 (데이터베이스에 저장하지 않음)
-    
-    Args:
-        temp_request: 임시 분석 요청 객체
-        
-    Returns:
-        dict: 분석 결과 딕셔너리
+@csrf_exempt
+@require_http_methods(["POST"])
+def create_analysis_job(request):
     """
-    import time
+    위치 분석 작업 등록 (비동기)
 
-    print(f"\n🚀 === 비회원 상권분석 시작 ===")
-    print(f"📍 좌표: ({temp_request.x_coord}, {temp_request.y_coord})")
-    print(f"📍 주소: {temp_request.address}")
-    print(f"📏 면적: {temp_request.area}㎡, 업종: {temp_request.business_type.name}")
+    Args:
+        request: HTTP 요청 객체 (JSON body는 analyze_location과 동일)
 
-    x_coord = temp_request.x_coord
-    y_coord = temp_request.y_coord
-    area = temp_request.area
-    business_type_id = temp_request.business_type_id
-    service_type = temp_request.service_type
+    Returns:
+        JsonResponse (202): job_id, 상태 조회 URL, 진행 이벤트 WebSocket 경로
 
+    Note:
+        - 분석은 작업 큐 워커에서 실행되고 [1/6]..[6/6] 진행 이벤트가 ws/analysis/jobs/<job_id>/ 로 전송됨
+        - 회원 작업은 AnalysisRequest/AnalysisResult에 저장, 비회원 결과는 상태 조회로만 확인
+    """
     try:
-        with connection.cursor() as cursor:
-            results = {}
-
-            print("\n📊 [1/6] 생활인구 분석 시작...")
-            step_start = time.time()
-            # 1. 생활인구 분석 (300m)
-            try:
-                cursor.execute(
-                    f"""
-                    SELECT 
-                        COALESCE(SUM("총생활인구수"), 0) as total_pop,
-                        COALESCE(SUM("20대"), 0) as pop_20,
-                        COALESCE(SUM("30대"), 0) as pop_30,
-                        COALESCE(SUM("40대"), 0) as pop_40,
-                        COALESCE(SUM("50대"), 0) as pop_50,
-                        COALESCE(SUM("60대"), 0) as pop_60
-                    FROM life_pop_grid_10m_5186 
-                    WHERE ST_Intersects(geom, ST_Buffer(ST_GeomFromText('POINT({x_coord} {y_coord})', 5186), 300))
-                """
-                )
-
-                row = cursor.fetchone()
-                total_pop_300m = row[0] if row[0] else 0
-
-                results.update(
-                    {
-                        "life_pop_300m": int(total_pop_300m),
-                        "life_pop_20_300m": round(
-                            (
-                                (row[1] / total_pop_300m * 100)
-                                if total_pop_300m > 0
-                                else 0
-                            ),
-                            2,
-                        ),
-                        "life_pop_30_300m": round(
-                            (
-                                (row[2] / total_pop_300m * 100)
-                                if total_pop_300m > 0
-                                else 0
-                            ),
-                            2,
-                        ),
-                        "life_pop_40_300m": round(
-                            (
-                                (row[3] / total_pop_300m * 100)
-                                if total_pop_300m > 0
-                                else 0
-                            ),
-                            2,
-                        ),
-                        "life_pop_50_300m": round(
-                            (
-                                (row[4] / total_pop_300m * 100)
-                                if total_pop_300m > 0
-                                else 0
-                            ),
-                            2,
-                        ),
-                        "life_pop_60_300m": round(
-                            (
-                                (row[5] / total_pop_300m * 100)
-                                if total_pop_300m > 0
-                                else 0
-                            ),
-                            2,
-                        ),
-                    }
-                )
-                print(f"   ✅ 300m 생활인구: {int(total_pop_300m):,}명")
-            except Exception as e:
-                print(f"   ❌ 생활인구 300m 분석 중 데이터베이스 오류: {e}")
-                results.update(
-                    {
-                        "life_pop_300m": 0,
-                        "life_pop_20_300m": 0,
-                        "life_pop_30_300m": 0,
-                        "life_pop_40_300m": 0,
-                        "life_pop_50_300m": 0,
-                        "life_pop_60_300m": 0,
-                    }
-                )
-
-            time.sleep(0.1)
-
-            # 2. 생활인구 분석 (1000m) - 연령대별 비율 포함
-            try:
-                cursor.execute(
-                    f"""
-                    SELECT 
-                        COALESCE(SUM("총생활인구수"), 0) as total_pop,
-                        COALESCE(SUM("20대"), 0) as pop_20,
-                        COALESCE(SUM("30대"), 0) as pop_30,
-                        COALESCE(SUM("40대"), 0) as pop_40,
-                        COALESCE(SUM("50대"), 0) as pop_50,
-                        COALESCE(SUM("60대"), 0) as pop_60
-                    FROM life_pop_grid_10m_5186 
-                    WHERE ST_Intersects(geom, ST_Buffer(ST_GeomFromText('POINT({x_coord} {y_coord})', 5186), 1000))
-                """
-                )
+        data = json.loads(request.body)
+        target, language, is_guest = build_analysis_target(request, data)
+        job_id = enqueue_analysis(target, language=language, is_guest=is_guest)
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "잘못된 JSON 형식입니다."}, status=400)
+    except AnalysisInputError as e:
+        return JsonResponse({"error": str(e)}, status=e.status)
+    except ValueError as e:
+        return JsonResponse({"error": f"데이터 형식이 잘못되었습니다: {str(e)}"}, status=400)
+
+    return JsonResponse(
+        {
+            "success": True,
+            "job_id": job_id,
+            "request_id": 0 if is_guest else target.id,
+            "is_guest": is_guest,
+            "status_url": reverse("AI_Analyzer:analysis_job_status", args=[job_id]),
+            "websocket_path": f"/ws/analysis/jobs/{job_id}/",
+        },
+        status=202,
+    )
 
-                row = cursor.fetchone()
-                total_pop_1000m = row[0] if row[0] else 0
 
-                results.update(
-                    {
-                        "life_pop_20_1000m": round(
-                            (
-                                (row[1] / total_pop_1000m * 100)
-                                if total_pop_1000m > 0
-                                else 0
-                            ),
-                            2,
-                        ),
-                        "life_pop_30_1000m": round(
-                            (
-                                (row[2] / total_pop_1000m * 100)
-                                if total_pop_1000m > 0
-                                else 0
-                            ),
-                            2,
-                        ),
-                        "life_pop_40_1000m": round(
-                            (
-                                (row[3] / total_pop_1000m * 100)
-                                if total_pop_1000m > 0
-                                else 0
-                            ),
-                            2,
-                        ),
-                        "life_pop_50_1000m": round(
-                            (
-                                (row[4] / total_pop_1000m * 100)
-                                if total_pop_1000m > 0
-                                else 0
-                            ),
-                            2,
-                        ),
-                        "life_pop_60_1000m": round(
-                            (
-                                (row[5] / total_pop_1000m * 100)
-                                if total_pop_1000m > 0
-                                else 0
-                            ),
-                            2,
-                        ),
-                    }
-                )
-                print(f"   ✅ 1000m 생활인구 연령대별 비율 분석 완료")
-            except Exception as e:
-                print(f"   ❌ 생활인구 1000m 분석 중 데이터베이스 오류: {e}")
-                results.update(
-                    {
-                        "life_pop_20_1000m": 0,
-                        "life_pop_30_1000m": 0,
-                        "life_pop_40_1000m": 0,
-                        "life_pop_50_1000m": 0,
-                        "life_pop_60_1000m": 0,
-                    }
-                )
+@csrf_exempt
+@require_http_methods(["POST"])
+def analyze_batch(request):
+    """
+    다지점 일괄 분석 (JSON 목록 또는 CSV 업로드)
 
-            time.sleep(0.1)
-            print("✅ [1/6] 생활인구 분석 완료")
+    Args:
+        request: HTTP 요청 객체
+            - JSON: {"sites": [{address | latitude/longitude | x_coord/y_coord, area, business_type_id,
+                     service_type, ref}], "language": "ko", "explain": false}
+            - multipart: file=CSV (같은 컬럼 헤더), language, explain
 
-            print("\n👔 [2/6] 직장인구 분석 시작...")
-            # 3. 직장인구 분석 (300m)
-            try:
-                cursor.execute(
-                    f"""
-                    SELECT COALESCE(SUM("총_직장_인구_수"), 0) as working_pop
-                    FROM workgrid_10m_5186 
-                    WHERE ST_Intersects(geom, ST_Buffer(ST_GeomFromText('POINT({x_coord} {y_coord})', 5186), 300))
-                """
-                )
-                row = cursor.fetchone()
-                working_pop_300m = int(row[0]) if row[0] else 0
-                results["working_pop_300m"] = working_pop_300m
-                print(f"   ✅ 300m 직장인구: {working_pop_300m:,}명")
-            except Exception as e:
-                print(f"   ❌ 직장인구 분석 오류: {e}")
-                results["working_pop_300m"] = 0
+    Returns:
+        StreamingHttpResponse: application/x-ndjson (비동기 이터레이터), 청크가 끝날 때마다 지점별 결과 줄 전송
 
-            time.sleep(0.1)
-            print("✅ [2/6] 직장인구 분석 완료")
+    Note:
+        - 청크마다 지오코딩(동시 요청) → 집합 SQL 피쳐 추출 → 모델 1회 예측
+        - 회원 요청은 AnalysisRequest/AnalysisResult를 bulk_create로 저장 (업종 추천은 생략)
+    """
+    from .batch_analysis import BatchInputError, BatchRun, parse_batch_sites, stream_batch_analysis
 
-            print("\n🌍 [3/6] 외국인 분석 시작...")
-            # 3. 단기체류외국인 분석
-            try:
-                print(f"=== 단기체류외국인 분석 시작 ===")
-                print(f"테스트 좌표: ({x_coord}, {y_coord})")
-
-                # 새로운 테이블명을 우선순위로
-                foreign_tables = [
-                    "temp_25m_5186",
-                    "temp_foreign_25m_5186",
-                    "_단기체류외국인_25m_5186",
-                    "단기체류외국인_25m_5186",
-                ]
-                temp_total_1000m = 0
-                temp_cn_1000m = 0
-                temp_cn_300m = 0
-                used_table = None
-
-                # 사용 가능한 테이블 확인
-                for table_name in foreign_tables:
-                    try:
-                        # 테이블 존재 여부 확인 (PostgreSQL 문법)
-                        cursor.execute(
-                            """
-                            SELECT EXISTS (
-                                SELECT FROM pg_catalog.pg_tables 
-                                WHERE schemaname = 'public' 
-                                AND tablename = %s
-                            )
-                        """,
-                            [table_name],
-                        )
+    try:
+        sites, language, explain = parse_batch_sites(request)
+    except BatchInputError as e:
+        return JsonResponse({"error": str(e)}, status=e.status)
 
-                        if not cursor.fetchone()[0]:
-                            print(f"테이블 {table_name}: 존재하지 않음")
-                            continue
-
-                        cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                        table_count = cursor.fetchone()[0]
-                        print(f"테이블 {table_name}: {table_count:,}개 레코드 존재")
-
-                        if table_count == 0:
-                            print(f"테이블 {table_name}: 데이터가 없음")
-                            continue
-
-                        # 1000m 쿼리 - 총수와 중국인수 조회
-                        cursor.execute(
-                            f"""
-                            SELECT COALESCE(SUM("총생활인구수"), 0) as temp_total,
-                                   COALESCE(SUM("중국인체류인구수"), 0) as temp_cn
-                            FROM {table_name} 
-                            WHERE ST_Intersects(geom, ST_Buffer(ST_GeomFromText('POINT({x_coord} {y_coord})', 5186), 1000))
-                        """
-                        )
-                        row = cursor.fetchone()
-                        temp_total_1000m = row[0] if row[0] else 0
-                        temp_cn_1000m = row[1] if row[1] else 0
-                        print(f"단기체류외국인 1000m - 테이블 {table_name} 사용: 총 {temp_total_1000m}명, 중국인 {temp_cn_1000m}명")
+    from django.utils.translation import activate
+    activate(language)
 
-                        used_table = table_name
-                        break
-                    except Exception as e:
-                        print(f"단기체류외국인 테이블 {table_name} 시도 실패: {e}")
-                        continue
+    # 인증 여부/업종 목록은 여기(동기 뷰)에서 확정하고, 청크 처리는 비동기 스트림이 sync_to_async로 실행
+    run = BatchRun(request.user, sites, language=language, explain=explain)
+    response = StreamingHttpResponse(stream_batch_analysis(run), content_type="application/x-ndjson")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # 프록시 버퍼링 없이 줄 단위 전송
+    return response
 
-                if not used_table:
-                    print("❌ 사용 가능한 단기체류외국인 테이블이 없습니다. 기본값 0 사용")
 
-                time.sleep(0.1)
+@csrf_exempt
+@require_http_methods(["POST"])
+def create_site_search_job(request):
+    """
+    구/행정동 내 최적 입지 탐색 작업 등록 (비동기)
 
-                # 300m 내 중국인 (같은 테이블 사용)
-                if used_table:
-                    try:
-                        cursor.execute(
-                            f"""
-                            SELECT COALESCE(SUM("중국인체류인구수"), 0) as temp_cn
-                            FROM {used_table} 
-                            WHERE ST_Intersects(geom, ST_Buffer(ST_GeomFromText('POINT({x_coord} {y_coord})', 5186), 300))
-                        """
-                        )
-                        row = cursor.fetchone()
-                        temp_cn_300m = row[0] if row[0] else 0
-                        print(f"단기체류외국인 300m - 테이블 {used_table} 사용: 중국인 {temp_cn_300m}명")
-                    except Exception as e:
-                        print(f"단기체류외국인 300m 쿼리 실패: {e}")
-                        temp_cn_300m = 0
+    Args:
+        request: HTTP 요청 객체 (JSON body: district_code, business_type_id, area, service_type,
+                 선택: top_k, time_budget)
 
-                results.update({
-                    "temp_foreign_1000m": int(temp_total_1000m),
-                    "temp_foreign_cn_300m": round((temp_cn_300m / temp_total_1000m * 100) if temp_total_1000m > 0 else 0, 2),
-                    "temp_foreign_cn_1000m": round((temp_cn_1000m / temp_total_1000m * 100) if temp_total_1000m > 0 else 0, 2),
-                })
-                print(f"   ✅ 단기체류외국인 분석 완료: 1000m {int(temp_total_1000m):,}명")
-            except Exception as e:
-                print(f"단기체류외국인 전체 분석 오류: {e}")
-                results.update({
-                    "temp_foreign_1000m": 0,
-                    "temp_foreign_cn_300m": 0,
-                    "temp_foreign_cn_1000m": 0,
-                })
+    Returns:
+        JsonResponse (202): job_id, 상태 조회 URL, 진행 이벤트 WebSocket 경로
 
-            time.sleep(0.1)
+    Note:
+        - 진행 이벤트(평가한 후보 수)는 ws/analysis/jobs/<job_id>/ 로 전송되고,
+          완료 시 analysis-jobs/<job_id>/ 상태 조회의 result에 상위 K개 지점이 담김
+        - 회원 전용, 회원별 동시 작업 수(MAX_ACTIVE_PER_USER)와 워커별 대기 작업 수(MAX_BACKLOG) 제한
+    """
+    from .jobs import active_site_searches, enqueue_site_search, site_search_backlog
 
-            # 4. 장기체류외국인 분석
-            try:
-                print(f"=== 장기체류외국인 분석 시작 ===")
-                print(f"분석 좌표: ({x_coord}, {y_coord})")
-
-                # 새로운 테이블명을 우선순위로
-                long_tables = [
-                    "long_25m_5186",
-                    "long_foreign_25m_5186",
-                    "_장기체류외국인_25m_5186",
-                    "장기체류외국인_25m_5186",
-                ]
-                print(f"확인할 테이블 목록: {long_tables}")
-                long_total_300m = 0
-                long_total_1000m = 0
-                long_cn_1000m = 0
-                used_table = None
-
-                # 사용 가능한 테이블 확인 및 300m 쿼리
-                for table_name in long_tables:
-                    try:
-                        # 테이블 존재 여부 확인 (PostgreSQL 문법)
-                        cursor.execute(
-                            """
-                            SELECT EXISTS (
-                                SELECT FROM pg_catalog.pg_tables 
-                                WHERE schemaname = 'public' 
-                                AND tablename = %s
-                            )
-                        """,
-                            [table_name],
-                        )
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "로그인이 필요합니다."}, status=401)
 
-                        if not cursor.fetchone()[0]:
-                            print(f"테이블 {table_name}: 존재하지 않음")
-                            continue
-
-                        cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                        table_count = cursor.fetchone()[0]
-                        print(f"테이블 {table_name}: {table_count:,}개 레코드 존재")
-
-                        if table_count == 0:
-                            print(f"테이블 {table_name}: 데이터가 없음")
-                            continue
-
-                        # 300m 쿼리
-                        cursor.execute(
-                            f"""
-                            SELECT COALESCE(SUM("총생활인구수"), 0) as long_total
-                            FROM {table_name} 
-                            WHERE ST_Intersects(geom, ST_Buffer(ST_GeomFromText('POINT({x_coord} {y_coord})', 5186), 300))
-                        """
-                        )
-                        row = cursor.fetchone()
-                        long_total_300m = row[0] if row[0] else 0
-                        print(f"장기체류외국인 300m - 테이블 {table_name} 사용: 총 {long_total_300m}명")
-
-                        # 1000m 쿼리 - 총수와 중국인수 조회
-                        cursor.execute(
-                            f"""
-                            SELECT COALESCE(SUM("총생활인구수"), 0) as long_total,
-                                   COALESCE(SUM("중국인체류인구수"), 0) as long_cn
-                            FROM {table_name} 
-                            WHERE ST_Intersects(geom, ST_Buffer(ST_GeomFromText('POINT({x_coord} {y_coord})', 5186), 1000))
-                        """
-                        )
-                        row = cursor.fetchone()
-                        long_total_1000m = row[0] if row[0] else 0
-                        long_cn_1000m = row[1] if row[1] else 0
-                        print(f"장기체류외국인 1000m - 테이블 {table_name} 사용: 총 {long_total_1000m}명, 중국인 {long_cn_1000m}명")
+    conf = settings.ANALYSIS_SETTINGS.get("SITE_SEARCH", {})
+    if len(active_site_searches(request.user.id)) >= conf.get("MAX_ACTIVE_PER_USER", 1):
+        return JsonResponse({"error": "진행 중인 입지 탐색이 끝난 뒤 다시 요청해주세요."}, status=429)
+    if site_search_backlog() >= conf.get("MAX_BACKLOG", 4):
+        return JsonResponse({"error": "입지 탐색 요청이 많습니다. 잠시 후 다시 시도해주세요."}, status=429)
 
-                        used_table = table_name
-                        break
-                    except Exception as e:
-                        print(f"장기체류외국인 테이블 {table_name} 시도 실패: {e}")
-                        continue
+    try:
+        data = json.loads(request.body)
+        for field in ("district_code", "business_type_id", "area", "service_type"):
+            if field not in data:
+                return JsonResponse({"error": f"{field}가 필요합니다."}, status=400)
+        business_type = BusinessType.objects.filter(id=data["business_type_id"]).first()
+        if business_type is None:
+            return JsonResponse({"error": f"업종 ID {data['business_type_id']}를 찾을 수 없습니다."}, status=404)
+
+        params = {
+            "district_code": str(data["district_code"]),
+            "business_type_id": business_type.id,
+            "business_type_name": business_type.name,
+            "area": float(data["area"]),
+            "service_type": int(data["service_type"]),
+            "top_k": min(int(data.get("top_k") or conf.get("TOP_K", 10)), conf.get("MAX_TOP_K", 50)),
+            "time_budget": min(
+                float(data.get("time_budget") or conf.get("TIME_BUDGET_SECONDS", 60)),
+                conf.get("MAX_TIME_BUDGET_SECONDS", 300),
+            ),
+        }
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "잘못된 JSON 형식입니다."}, status=400)
+    except (TypeError, ValueError) as e:
+        return JsonResponse({"error": f"데이터 형식이 잘못되었습니다: {str(e)}"}, status=400)
+
+    job_id = enqueue_site_search(params, user_id=request.user.id)
+    return JsonResponse(
+        {
+            "success": True,
+            "job_id": job_id,
+            "status_url": reverse("AI_Analyzer:analysis_job_status", args=[job_id]),
+            "websocket_path": f"/ws/analysis/jobs/{job_id}/",
+        },
+        status=202,
+    )
 
-                if not used_table:
-                    print("❌ 사용 가능한 장기체류외국인 테이블이 없습니다. 기본값 0 사용")
 
-                results.update({
-                    "long_foreign_300m": int(long_total_300m),
-                    "long_foreign_1000m": int(long_total_1000m),
-                    "long_foreign_cn_1000m": round((long_cn_1000m / long_total_1000m * 100) if long_total_1000m > 0 else 0, 2),
-                })
-                print(f"   ✅ 장기체류외국인 분석 완료: 300m {int(long_total_300m):,}명, 1000m {int(long_total_1000m):,}명")
-            except Exception as e:
-                print(f"장기체류외국인 전체 분석 오류: {e}")
-                results.update({
-                    "long_foreign_300m": 0,
-                    "long_foreign_1000m": 0,
-                    "long_foreign_cn_1000m": 0,
-                })
+@require_http_methods(["GET"])
+def analysis_job_status(request, job_id):
+    """
+    분석 작업 상태 조회 (WebSocket을 쓰지 않는 클라이언트용 폴링)
 
-            time.sleep(0.1)
-            print("✅ [3/6] 외국인 분석 완료")
+    Returns:
+        JsonResponse: status, step, percent, 완료 시 result (회원은 request_id로 결과 API 조회 가능)
+    """
+    state = get_job_status(job_id)
+    # 회원 작업은 본인만 조회 가능
+    if state is None or (state.get("user_id") and state["user_id"] != request.user.id):
+        return JsonResponse({"error": "작업을 찾을 수 없습니다."}, status=404)
 
-            print("\n🏪 [5/6] 경쟁업체 분석 시작...")
-            # 5. 경쟁업체 분석 (300m)
-            try:
-                business_type_name = temp_request.business_type.name
-                print(f"   검색 대상 업종: {business_type_name} (ID: {business_type_id})")
-
-                # 동일 업종 경쟁업체 - 업종명으로 매칭
-                cursor.execute(
-                    f"""
-                    SELECT COUNT(*) as competitor_count
-                    FROM store_point_5186 
-                    WHERE ST_Intersects(geom, ST_Buffer(ST_GeomFromText('POINT({x_coord} {y_coord})', 5186), 300))
-                      AND uptaenm = '{business_type_name}'
-                """
-                )
-                row = cursor.fetchone()
-                competitor_count = int(row[0]) if row[0] else 0
-
-                time.sleep(0.1)
-
-                # 전체 요식업체
-                cursor.execute(
-                    f"""
-                    SELECT COUNT(*) as total_biz,
-                           COUNT(DISTINCT uptaenm) as diversity
-                    FROM store_point_5186 
-                    WHERE ST_Intersects(geom, ST_Buffer(ST_GeomFromText('POINT({x_coord} {y_coord})', 5186), 300))
-                """
-                )
-                row = cursor.fetchone()
-                total_biz = int(row[0]) if row[0] else 0
-                diversity = int(row[1]) if row[1] else 0
-
-                # 디버깅: 주변 업종들 출력
-                if competitor_count == 0:
-                    print(f"   ⚠️  '{business_type_name}' 업종 경쟁업체가 0개입니다.")
-                    print("   주변 업종들 확인 중...")
-                    cursor.execute(
-                        f"""
-                        SELECT uptaenm, COUNT(*) as count
-                        FROM store_point_5186 
-                        WHERE ST_Intersects(geom, ST_Buffer(ST_GeomFromText('POINT({x_coord} {y_coord})', 5186), 300))
-                        GROUP BY uptaenm
-                        ORDER BY count DESC
-                        LIMIT 5
-                    """
-                    )
-                    nearby_types = cursor.fetchall()
-                    for uptae, count in nearby_types:
-                        print(f"     - {uptae}: {count}개")
+    response = {key: value for key, value in state.items() if key != "user_id"}
+    if state.get("request_id") and state.get("status") == AnalysisRequest.STATUS_COMPLETED:
+        response["result_url"] = reverse("AI_Analyzer:get_analysis_result_api", args=[state["request_id"]])
+    return JsonResponse(response)
 
-                results.update(
-                    {
-                        "competitor_300m": competitor_count,
-                        "adjacent_biz_300m": total_biz,
-                        "competitor_ratio_300m": round(
-                            (
-                                (competitor_count / total_biz * 100)
-                                if total_biz > 0
-                                else 0
-                            ),
-                            2,
-                        ),
-                        "business_diversity_300m": diversity,
-                    }
-                )
-                print(f"   ✅ 300m 경쟁업체: {competitor_count}개 / 전체 {total_biz}개 (비율: {round((competitor_count / total_biz * 100) if total_biz > 0 else 0, 1)}%)")
-            except Exception as e:
-                print(f"   ❌ 상권 분석 오류: {e}")
-                results.update(
-                    {
-                        "competitor_300m": 0,
-                        "adjacent_biz_300m": 0,
-                        "competitor_ratio_300m": 0,
-                        "business_diversity_300m": 0,
-                    }
-                )
 
-            time.sleep(0.1)
-            print("✅ [5/6] 경쟁업체 분석 완료")
+def perform_spatial_analysis_guest(temp_request, language='ko', progress=None):
+    """
+    비회원용 공간 분석 (데이터베이스에 저장하지 않음)
+    
+    Args:
+        temp_request: 임시 분석 요청 객체
+        progress (callable, optional): 작업 큐 진행 보고 콜백 (jobs.ProgressReporter)
+        
+    Returns:
+        dict: 분석 결과 딕셔너리
+    """
 
-            print("\n💰 [6/6] 공시지가 분석 시작...")
-            # 6. 공시지가 분석
-            try:
-                cursor.execute(
-                    f"""
-                    SELECT COALESCE("A9", 0) as land_price
-                    FROM ltv_5186
-                    WHERE ST_Intersects(
-                        ltv_5186.geom,
-                        ST_Buffer(
-                            ST_SetSRID(ST_GeomFromText('POINT({x_coord} {y_coord})'), 900914),
-                            300
-                        )
-                    )
-                    ORDER BY ST_Distance(
-                        ltv_5186.geom,
-                        ST_SetSRID(ST_GeomFromText('POINT({x_coord} {y_coord})'), 900914)
-                    )
-                    LIMIT 1
-                """
-                )
-                row = cursor.fetchone()
-                land_price = row[0] if row[0] else 0
-                total_land_value = land_price * area
-                results.update({
-                    "total_land_value": total_land_value,
-                })
-                print(f"   ✅ 공시지가: {land_price:,.0f}원/㎡")
-                print(f"   ✅ 총 공시지가: {total_land_value:,.0f}원")
-            except Exception as e:
-                print(f"   ❌ 공시지가 분석 오류: {e}")
-                results.update({
-                    "total_land_value": 0,
-                })
-            print("✅ [6/6] 공시지가 분석 완료")
+    print(f"\n🚀 === 비회원 상권분석 시작 ===")
+    print(f"📍 좌표: ({temp_request.x_coord}, {temp_request.y_coord})")
+    print(f"📍 주소: {temp_request.address}")
+    print(f"📏 면적: {temp_request.area}㎡, 업종: {temp_request.business_type.name}")
 
-            print("\n🏫 [7/7] 시설 분석 시작...")
-            # 7. 시설 분석 (250m)
-            try:
-                # 공공시설 분석
-                cursor.execute(
-                    f"""
-                    SELECT COUNT(*) as public_count
-                    FROM public_facility_point_5186 
-                    WHERE ST_Intersects(geom, ST_Buffer(ST_GeomFromText('POINT({x_coord} {y_coord})', 5186), 250))
-                """
-                )
-                row = cursor.fetchone()
-                public_building_250m = int(row[0]) if row[0] else 0
-
-                # 학교 분석
-                cursor.execute(
-                    f"""
-                    SELECT COUNT(*) as school_count
-                    FROM school_point_5186 
-                    WHERE ST_Intersects(geom, ST_Buffer(ST_GeomFromText('POINT({x_coord} {y_coord})', 5186), 250))
-                """
-                )
-                row = cursor.fetchone()
-                school_250m = int(row[0]) if row[0] else 0
+    x_coord = temp_request.x_coord
+    y_coord = temp_request.y_coord
+    area = temp_request.area
+    business_type_id = temp_request.business_type_id
+    service_type = temp_request.service_type
 
-                print(f"   ✅ 250m 공공시설: {public_building_250m}개")
-                print(f"   ✅ 250m 학교: {school_250m}개")
-            except Exception as e:
-                print(f"   ❌ 시설 분석 오류: {e}")
-                public_building_250m = 0
-                school_250m = 0
-            print("✅ [7/7] 시설 분석 완료")
-
-            # 기본 정보 추가
-            results.update({
-                "area": area,
-                "service_type": service_type,
-                "public_building_250m": public_building_250m,
-                "school_250m": school_250m,
-            })
+    try:
+        with connection.cursor() as cursor:
+            print("\n📊 [1/6] 공간 피쳐 추출 시작 (생활인구·직장인구·외국인·주변시설·경쟁업체·공시지가)...")
+            results, feature_timings, _ = get_or_extract_features(
+                cursor, x_coord, y_coord, area, service_type,
+                business_type_id, temp_request.business_type.name,
+            )
+            print_feature_timings(feature_timings)
+            print("✅ [6/6] 공간 피쳐 추출 완료")
+            report_steps(progress, *FEATURE_STEPS)
 
             # AI 모델용 변수들 추가 (1A_*, 2A_* 형식으로 모든 변수 포함)
-            results.update({
-                # 1A_* 변수들 (300m 생활인구)
-                "1A_Total": results.get("life_pop_300m", 0),
-                "1A_20": results.get("life_pop_20_300m", 0),
-                "1A_30": results.get("life_pop_30_300m", 0),
-                "1A_40": results.get("life_pop_40_300m", 0),
-                "1A_50": results.get("life_pop_50_300m", 0),
-                "1A_60": results.get("life_pop_60_300m", 0),
-                "1A_Long_Total": results.get("long_foreign_300m", 0),
-                "1A_Temp_CN": results.get("temp_foreign_cn_300m", 0),
-                
-                # 2A_* 변수들 (1000m 생활인구 및 외국인)
-                "2A_20": results.get("life_pop_20_1000m", 0),
-                "2A_30": results.get("life_pop_30_1000m", 0), 
-                "2A_40": results.get("life_pop_40_1000m", 0),
-                "2A_50": results.get("life_pop_50_1000m", 0),
-                "2A_60": results.get("life_pop_60_1000m", 0),
-                "2A_Temp_Total": results.get("temp_foreign_1000m", 0),
-                "2A_Temp_CN": results.get("temp_foreign_cn_1000m", 0),
-                "2A_Long_Total": results.get("long_foreign_1000m", 0),
-                "2A_Long_CN": results.get("long_foreign_cn_1000m", 0),
-                
-                # 기타 변수들
-                "Working_Pop": results.get("working_pop_300m", 0),
-                "PubBuilding": results.get("public_building_250m", 0),
-                "School": results.get("school_250m", 0),
-                "Competitor_C": results.get("competitor_300m", 0),
-                "Competitor_R": results.get("competitor_ratio_300m", 0),
-                "Adjacent_BIZ": results.get("adjacent_biz_300m", 0),
-                "Business_D": results.get("business_diversity_300m", 0),
-                "Area": area,
-                "Total_LV": results.get("total_land_value", 0),
-                "Service": service_type,
-            })
+            features_for_ai = build_model_features(results, business_type_id)
+            results.update({k: v for k, v in features_for_ai.items() if k != "UPTAENM_ID"})
 
             # 비회원 분석에서도 28개 피쳐를 모두 사용하여 AI 예측 수행
             try:
-                # 28개 피쳐로 AI 예측 수행 (results에서 직접 가져오기)
-                features_for_ai = {
-                    "Area": results.get("Area", 0),
-                    "Adjacent_BIZ": results.get("Adjacent_BIZ", 0),
-                    "1A_Total": results.get("1A_Total", 0),
-                    "Total_LV": results.get("Total_LV", 0),
-                    "Business_D": results.get("Business_D", 0),
-                    "Working_Pop": results.get("Working_Pop", 0),
-                    "2A_20": results.get("2A_20", 0),
-                    "2A_30": results.get("2A_30", 0),
-                    "2A_40": results.get("2A_40", 0),
-                    "2A_50": results.get("2A_50", 0),
-                    "2A_60": results.get("2A_60", 0),
-                    "1A_20": results.get("1A_20", 0),
-                    "1A_30": results.get("1A_30", 0),
-                    "1A_40": results.get("1A_40", 0),
-                    "1A_50": results.get("1A_50", 0),
-                    "1A_60": results.get("1A_60", 0),
-                    "1A_Long_Total": results.get("1A_Long_Total", 0),
-                    "2A_Long_Total": results.get("2A_Long_Total", 0),
-                    "1A_Temp_CN": results.get("1A_Temp_CN", 0),
-                    "2A_Temp_CN": results.get("2A_Temp_CN", 0),
-                    "2A_Temp_Total": results.get("2A_Temp_Total", 0),
-                    "2A_Long_CN": results.get("2A_Long_CN", 0),
-                    "Competitor_C": results.get("Competitor_C", 0),
-                    "Competitor_R": results.get("Competitor_R", 0),
-                    "Service": results.get("Service", 0),
-                    "School": results.get("School", 0),
-                    "PubBuilding": results.get("PubBuilding", 0),
-                    "UPTAENM_ID": business_type_id,  # 업종 ID
-                }
-
-                survival_probability = predict_survival_probability(features_for_ai)
+                survival_probability, local_explanation = predict_survival_with_explanation(features_for_ai)
                 survival_percentage = round(survival_probability * 100, 1)
                 
                 results['survival_percentage'] = survival_percentage
                 results['survival_probability'] = survival_probability
+                results['feature_contributions'] = local_explanation
                 results['is_member_analysis'] = False  # 비회원 분석 표시
                 
                 print(f"   ✅ AI 생존 확률 (28개 피쳐): {survival_percentage}%")
@@ -1252,6 +819,7 @@ def perform_spatial_analysis_guest(temp_request, language='ko'):
                 print(f"   ❌ AI 예측 오류: {e}")
                 results['survival_percentage'] = 50  # 기본값
                 results['survival_probability'] = 0.5
+            report_steps(progress, "ai")
 
             print("✅ === 비회원 상권분석 완료 ===")
             return results
@@ -1262,12 +830,13 @@ def perform_spatial_analysis_guest(temp_request, language='ko'):
         raise e
 
 @transaction.atomic
-def perform_spatial_analysis(analysis_request, language='ko'):
+def perform_spatial_analysis(analysis_request, language='ko', progress=None):
     """
     실제 공간 분석 수행
 
     Args:
         analysis_request (AnalysisRequest): 분석 요청 객체
+        progress (callable, optional): 작업 큐 진행 보고 콜백 (jobs.ProgressReporter)
 
     Returns:
         dict: 분석 결과 데이터
@@ -1306,777 +875,88 @@ def perform_spatial_analysis(analysis_request, language='ko'):
     while retry_count < max_retries:
         try:
             with connection.cursor() as cursor:
-                results = {}
-
-                print("\n📊 [1/6] 생활인구 분석 시작...")
+                print("\n📊 [1/6] 공간 피쳐 추출 시작 (생활인구·직장인구·외국인·주변시설·경쟁업체·공시지가)...")
                 step_start = time.time()
-                # 1. 생활인구 분석 (300m)
-                try:
-                    cursor.execute(
-                        f"""
-                        SELECT 
-                            COALESCE(SUM("총생활인구수"), 0) as total_pop,
-                            COALESCE(SUM("20대"), 0) as pop_20,
-                            COALESCE(SUM("30대"), 0) as pop_30,
-                            COALESCE(SUM("40대"), 0) as pop_40,
-                            COALESCE(SUM("50대"), 0) as pop_50,
-                            COALESCE(SUM("60대"), 0) as pop_60
-                        FROM life_pop_grid_10m_5186 
-                        WHERE ST_Intersects(geom, ST_Buffer(ST_GeomFromText('POINT({x_coord} {y_coord})', 5186), 300))
-                    """
-                    )
-
-                    row = cursor.fetchone()
-                    total_pop_300m = row[0] if row[0] else 0
-
-                    results.update(
-                        {
-                            "life_pop_300m": int(total_pop_300m),
-                            "life_pop_20_300m": round(
-                                (
-                                    (row[1] / total_pop_300m * 100)
-                                    if total_pop_300m > 0
-                                    else 0
-                                ),
-                                2,
-                            ),
-                            "life_pop_30_300m": round(
-                                (
-                                    (row[2] / total_pop_300m * 100)
-                                    if total_pop_300m > 0
-                                    else 0
-                                ),
-                                2,
-                            ),
-                            "life_pop_40_300m": round(
-                                (
-                                    (row[3] / total_pop_300m * 100)
-                                    if total_pop_300m > 0
-                                    else 0
-                                ),
-                                2,
-                            ),
-                            "life_pop_50_300m": round(
-                                (
-                                    (row[4] / total_pop_300m * 100)
-                                    if total_pop_300m > 0
-                                    else 0
-                                ),
-                                2,
-                            ),
-                            "life_pop_60_300m": round(
-                                (
-                                    (row[5] / total_pop_300m * 100)
-                                    if total_pop_300m > 0
-                                    else 0
-                                ),
-                                2,
-                            ),
-                        }
-                    )
-                    print(f"   ✅ 300m 생활인구: {int(total_pop_300m):,}명")
-                except Exception as e:
-                    print(f"   ❌ 생활인구 300m 분석 중 데이터베이스 오류: {e}")
-                    results.update(
-                        {
-                            "life_pop_300m": 0,
-                            "life_pop_20_300m": 0,
-                            "life_pop_30_300m": 0,
-                            "life_pop_40_300m": 0,
-                            "life_pop_50_300m": 0,
-                            "life_pop_60_300m": 0,
-                        }
-                    )
-
-                # 각 쿼리 사이에 작은 지연 추가
-                time.sleep(0.1)
-
-                # 2. 생활인구 분석 (1000m)
-                try:
-                    cursor.execute(
-                        f"""
-                        SELECT 
-                            COALESCE(SUM("총생활인구수"), 0) as total_pop,
-                            COALESCE(SUM("20대"), 0) as pop_20,
-                            COALESCE(SUM("30대"), 0) as pop_30,
-                            COALESCE(SUM("40대"), 0) as pop_40,
-                            COALESCE(SUM("50대"), 0) as pop_50,
-                            COALESCE(SUM("60대"), 0) as pop_60
-                        FROM life_pop_grid_10m_5186 
-                        WHERE ST_Intersects(geom, ST_Buffer(ST_GeomFromText('POINT({x_coord} {y_coord})', 5186), 1000))
-                    """
-                    )
-
-                    row = cursor.fetchone()
-                    total_pop_1000m = row[0] if row[0] else 0
-
-                    results.update(
-                        {
-                            "life_pop_20_1000m": round(
-                                (
-                                    (row[1] / total_pop_1000m * 100)
-                                    if total_pop_1000m > 0
-                                    else 0
-                                ),
-                                2,
-                            ),
-                            "life_pop_30_1000m": round(
-                                (
-                                    (row[2] / total_pop_1000m * 100)
-                                    if total_pop_1000m > 0
-                                    else 0
-                                ),
-                                2,
-                            ),
-                            "life_pop_40_1000m": round(
-                                (
-                                    (row[3] / total_pop_1000m * 100)
-                                    if total_pop_1000m > 0
-                                    else 0
-                                ),
-                                2,
-                            ),
-                            "life_pop_50_1000m": round(
-                                (
-                                    (row[4] / total_pop_1000m * 100)
-                                    if total_pop_1000m > 0
-                                    else 0
-                                ),
-                                2,
-                            ),
-                            "life_pop_60_1000m": round(
-                                (
-                                    (row[5] / total_pop_1000m * 100)
-                                    if total_pop_1000m > 0
-                                    else 0
-                                ),
-                                2,
-                            ),
-                        }
-                    )
-                    print(f"   ✅ 1000m 생활인구: {int(total_pop_1000m):,}명")
-                except Exception as e:
-                    print(f"   ❌ 생활인구 1000m 분석 중 데이터베이스 오류: {e}")
-                    results.update(
-                        {
-                            "life_pop_20_1000m": 0,
-                            "life_pop_30_1000m": 0,
-                            "life_pop_40_1000m": 0,
-                            "life_pop_50_1000m": 0,
-                            "life_pop_60_1000m": 0,
-                        }
-                    )
-
-                time.sleep(0.1)
-                step_times["생활인구_분석"] = time.time() - step_start
-                print(
-                    f"✅ [1/6] 생활인구 분석 완료 ({step_times['생활인구_분석']:.2f}초)"
+                # 업종 추천용 업종별 경쟁업체 수(단일 GROUP BY 쿼리)까지 함께 조회, 캐시 적중 시 생략
+                results, feature_timings, competitor_counts = get_or_extract_features(
+                    cursor,
+                    x_coord,
+                    y_coord,
+                    area,
+                    service_type,
+                    business_type_id,
+                    analysis_request.business_type.name,
+                    with_competitor_counts=True,
                 )
-
-                print("\n👔 [2/6] 직장인구 분석 시작...")
-                step_start = time.time()
-                # 3. 직장인구 분석 (300m)
-                try:
-                    cursor.execute(
-                        f"""
-                        SELECT COALESCE(SUM("총_직장_인구_수"), 0) as working_pop
-                        FROM workgrid_10m_5186 
-                        WHERE ST_Intersects(geom, ST_Buffer(ST_GeomFromText('POINT({x_coord} {y_coord})', 5186), 300))
-                    """
-                    )
-
-                    row = cursor.fetchone()
-                    working_pop = int(row[0]) if row[0] else 0
-                    results["working_pop_300m"] = working_pop
-                    print(f"   ✅ 300m 직장인구: {working_pop:,}명")
-                except Exception as e:
-                    print(f"   ❌ 직장인구 분석 중 데이터베이스 오류: {e}")
-                    results["working_pop_300m"] = 0
-
-                time.sleep(0.1)
-                step_times["직장인구_분석"] = time.time() - step_start
+                step_times["공간피쳐_추출"] = time.time() - step_start
+                print_feature_timings(feature_timings)
                 print(
-                    f"✅ [2/6] 직장인구 분석 완료 ({step_times['직장인구_분석']:.2f}초)"
-                )
-
-                # 4. 단기체류외국인 분석
-                try:
-                    print(f"\n🌍 [3/6] 외국인 분석 시작...")
-                    step_start = time.time()
-                    print(f"=== 단기체류외국인 분석 시작 ===")
-                    print(f"테스트 좌표: ({x_coord}, {y_coord})")
-
-                    # 새로운 테이블명을 우선순위로
-                    foreign_tables = [
-                        "temp_25m_5186",
-                        "temp_foreign_25m_5186",
-                        "_단기체류외국인_25m_5186",
-                        "단기체류외국인_25m_5186",
-                    ]
-                    temp_total_1000m = 0
-                    temp_cn_1000m = 0
-                    temp_cn_300m = 0
-                    used_table = None
-
-                    # 사용 가능한 테이블 확인
-                    for table_name in foreign_tables:
-                        try:
-                            # 테이블 존재 여부 확인 (PostgreSQL 문법)
-                            cursor.execute(
-                                """
-                                SELECT EXISTS (
-                                    SELECT FROM pg_catalog.pg_tables 
-                                    WHERE schemaname = 'public' 
-                                    AND tablename = %s
-                                )
-                            """,
-                                [table_name],
-                            )
-
-                            if not cursor.fetchone()[0]:
-                                print(f"테이블 {table_name}: 존재하지 않음")
-                                continue
-
-                            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                            table_count = cursor.fetchone()[0]
-                            print(f"테이블 {table_name}: {table_count:,}개 레코드 존재")
-
-                            if table_count == 0:
-                                print(f"테이블 {table_name}: 데이터가 없음")
-                                continue
-
-                            # 1000m 쿼리 - 총수와 중국인수 조회
-                            cursor.execute(
-                                f"""
-                                SELECT COALESCE(SUM("총생활인구수"), 0) as temp_total,
-                                       COALESCE(SUM("중국인체류인구수"), 0) as temp_cn
-                                FROM {table_name} 
-                                WHERE ST_Intersects(geom, ST_Buffer(ST_GeomFromText('POINT({x_coord} {y_coord})', 5186), 1000))
-                            """
-                            )
-                            row = cursor.fetchone()
-                            temp_total_1000m = row[0] if row[0] else 0
-                            temp_cn_1000m = row[1] if row[1] else 0
-                            print(
-                                f"단기체류외국인 1000m - 테이블 {table_name} 사용: 총 {temp_total_1000m}명, 중국인 {temp_cn_1000m}명"
-                            )
-
-                            used_table = table_name
-                            break
-                        except Exception as e:
-                            print(f"단기체류외국인 테이블 {table_name} 시도 실패: {e}")
-                            continue
-
-                    if not used_table:
-                        print(
-                            "❌ 사용 가능한 단기체류외국인 테이블이 없습니다. 기본값 0 사용"
-                        )
-
-                    time.sleep(0.1)
-
-                    # 300m 내 중국인 (같은 테이블 사용)
-                    if used_table:
-                        try:
-                            cursor.execute(
-                                f"""
-                                SELECT COALESCE(SUM("중국인체류인구수"), 0) as temp_cn
-                                FROM {used_table} 
-                                WHERE ST_Intersects(geom, ST_Buffer(ST_GeomFromText('POINT({x_coord} {y_coord})', 5186), 300))
-                            """
-                            )
-                            row = cursor.fetchone()
-                            temp_cn_300m = row[0] if row[0] else 0
-                            print(
-                                f"단기체류외국인 300m - 테이블 {used_table} 사용: 중국인 {temp_cn_300m}명"
-                            )
-                        except Exception as e:
-                            print(f"단기체류외국인 300m 쿼리 실패: {e}")
-                            temp_cn_300m = 0
-
-                    results.update(
-                        {
-                            "temp_foreign_1000m": int(temp_total_1000m),
-                            "temp_foreign_cn_300m": round(
-                                (
-                                    (temp_cn_300m / temp_total_1000m * 100)
-                                    if temp_total_1000m > 0
-                                    else 0
-                                ),
-                                2,
-                            ),
-                            "temp_foreign_cn_1000m": round(
-                                (
-                                    (temp_cn_1000m / temp_total_1000m * 100)
-                                    if temp_total_1000m > 0
-                                    else 0
-                                ),
-                                2,
-                            ),
-                        }
-                    )
-                    print(
-                        f"   ✅ 단기체류외국인 분석 완료: 1000m {int(temp_total_1000m):,}명"
-                    )
-                except Exception as e:
-                    print(f"단기체류외국인 전체 분석 오류: {e}")
-                    results.update(
-                        {
-                            "temp_foreign_1000m": 0,
-                            "temp_foreign_cn_300m": 0,
-                            "temp_foreign_cn_1000m": 0,
-                        }
-                    )
-
-                time.sleep(0.1)
-
-                # 5. 장기체류외국인 분석
-                try:
-                    print(f"=== 장기체류외국인 분석 시작 ===")
-                    print(f"분석 좌표: ({x_coord}, {y_coord})")
-
-                    # 새로운 테이블명을 우선순위로
-                    long_tables = [
-                        "long_25m_5186",
-                        "long_foreign_25m_5186",
-                        "_장기체류외국인_25m_5186",
-                        "장기체류외국인_25m_5186",
-                    ]
-                    print(f"확인할 테이블 목록: {long_tables}")
-                    long_total_300m = 0
-                    long_total_1000m = 0
-                    long_cn_1000m = 0
-                    used_table = None
-
-                    # 사용 가능한 테이블 확인 및 300m 쿼리
-                    for table_name in long_tables:
-                        try:
-                            # 테이블 존재 여부 확인 (PostgreSQL 문법)
-                            cursor.execute(
-                                """
-                                SELECT EXISTS (
-                                    SELECT FROM pg_catalog.pg_tables 
-                                    WHERE schemaname = 'public' 
-                                    AND tablename = %s
-                                )
-                            """,
-                                [table_name],
-                            )
-
-                            if not cursor.fetchone()[0]:
-                                print(f"테이블 {table_name}: 존재하지 않음")
-                                continue
-
-                            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                            table_count = cursor.fetchone()[0]
-                            print(f"테이블 {table_name}: {table_count:,}개 레코드 존재")
-
-                            if table_count == 0:
-                                print(f"테이블 {table_name}: 데이터가 없음")
-                                continue
-
-                            # 300m 쿼리 - 총수 조회
-                            query_300m = f"""
-                                SELECT COALESCE(SUM("총생활인구수"), 0) as long_total
-                                FROM {table_name} 
-                                WHERE ST_Intersects(geom, ST_Buffer(ST_GeomFromText('POINT({x_coord} {y_coord})', 5186), 300))
-                            """
-                            print(f"300m 쿼리 실행: {query_300m}")
-                            cursor.execute(query_300m)
-                            row = cursor.fetchone()
-                            long_total_300m = row[0] if row[0] else 0
-                            print(
-                                f"장기체류외국인 300m - 테이블 {table_name} 사용: {long_total_300m}명 (raw result: {row})"
-                            )
-
-                            used_table = table_name
-                            break
-                        except Exception as e:
-                            print(f"장기체류외국인 테이블 {table_name} 시도 실패: {e}")
-                            continue
-
-                    if not used_table:
-                        print(
-                            "❌ 사용 가능한 장기체류외국인 테이블이 없습니다. 기본값 0 사용"
-                        )
-                        print("📋 확인된 테이블 상태:")
-                        for table in long_tables:
-                            try:
-                                cursor.execute("""
-                                    SELECT EXISTS (
-                                        SELECT FROM pg_catalog.pg_tables 
-                                        WHERE schemaname = 'public' 
-                                        AND tablename = %s
-                                    )
-                                """, [table])
-                                exists = cursor.fetchone()[0]
-                                print(f"  - {table}: {'존재함' if exists else '존재하지 않음'}")
-                            except Exception as e:
-                                print(f"  - {table}: 확인 실패 ({e})")
-
-                    time.sleep(0.1)
-
-                    # 1000m 쿼리 (같은 테이블 사용) - 총수와 중국인수 조회
-                    if used_table:
-                        try:
-                            query_1000m = f"""
-                                SELECT COALESCE(SUM("총생활인구수"), 0) as long_total,
-                                       COALESCE(SUM("중국인체류인구수"), 0) as long_cn
-                                FROM {used_table} 
-                                WHERE ST_Intersects(geom, ST_Buffer(ST_GeomFromText('POINT({x_coord} {y_coord})', 5186), 1000))
-                            """
-                            print(f"1000m 쿼리 실행: {query_1000m}")
-                            cursor.execute(query_1000m)
-                            row = cursor.fetchone()
-                            long_total_1000m = row[0] if row[0] else 0
-                            long_cn_1000m = row[1] if row[1] else 0
-                            print(
-                                f"장기체류외국인 1000m - 테이블 {used_table} 사용: 총 {long_total_1000m}명, 중국인 {long_cn_1000m}명 (raw result: {row})"
-                            )
-                        except Exception as e:
-                            print(f"장기체류외국인 1000m 쿼리 실패: {e}")
-                            long_total_1000m = 0
-                            long_cn_1000m = 0
-
-                    results.update(
-                        {
-                            "long_foreign_300m": int(long_total_300m),
-                            "long_foreign_1000m": int(long_total_1000m),
-                            "long_foreign_cn_1000m": round(
-                                (
-                                    (long_cn_1000m / long_total_1000m * 100)
-                                    if long_total_1000m > 0
-                                    else 0
-                                ),
-                                2,
-                            ),
-                        }
-                    )
-                    print(
-                        f"   ✅ 장기체류외국인 분석 완료: 300m {int(long_total_300m):,}명, 1000m {int(long_total_1000m):,}명"
-                    )
-                except Exception as e:
-                    print(f"장기체류외국인 전체 분석 오류: {e}")
-                    results.update(
-                        {
-                            "long_foreign_300m": 0,
-                            "long_foreign_1000m": 0,
-                            "long_foreign_cn_1000m": 0,
-                        }
-                    )
-
-                time.sleep(0.1)
-                print("✅ [3/6] 외국인 분석 완료")
-
-                print("\n🏢 [4/6] 주변시설 분석 시작...")
-                # 6. 공공건물 분석 (250m)
-                try:
-                    cursor.execute(
-                        f"""
-                        SELECT COUNT(*) as pub_count
-                        FROM public_5186 
-                        WHERE ST_Intersects(geom, ST_Buffer(ST_GeomFromText('POINT({x_coord} {y_coord})', 5186), 250))
-                    """
-                    )
-                    row = cursor.fetchone()
-                    pub_count = int(row[0]) if row[0] else 0
-                    results["public_building_250m"] = pub_count
-                    print(f"   ✅ 250m 공공건물: {pub_count}개")
-                except Exception as e:
-                    print(f"   ❌ 공공건물 분석 오류: {e}")
-                    results["public_building_250m"] = 0
-
-                time.sleep(0.1)
-
-                # 7. 학교 분석 (250m)
-                try:
-                    cursor.execute(
-                        f"""
-                        SELECT COUNT(*) as school_count
-                        FROM school_5186 
-                        WHERE ST_Intersects(geom, ST_Buffer(ST_GeomFromText('POINT({x_coord} {y_coord})', 5186), 250))
-                    """
-                    )
-                    row = cursor.fetchone()
-                    school_count = int(row[0]) if row[0] else 0
-                    results["school_250m"] = school_count
-                    print(f"   ✅ 250m 학교: {school_count}개")
-                except Exception as e:
-                    print(f"   ❌ 학교 분석 오류: {e}")
-                    results["school_250m"] = 0
-
-                time.sleep(0.1)
-                print("✅ [4/6] 주변시설 분석 완료")
-
-                print("\n🏪 [5/6] 경쟁업체 분석 시작...")
-                # 8. 상권 분석 (300m)
-                try:
-                    # BusinessType에서 업종명 가져오기
-                    business_type_name = analysis_request.business_type.name
-                    print(
-                        f"   검색 대상 업종: {business_type_name} (ID: {business_type_id})"
-                    )
-
-                    # 동일 업종 경쟁업체 - 업종명으로 매칭
-                    cursor.execute(
-                        f"""
-                        SELECT COUNT(*) as competitor_count
-                        FROM store_point_5186 
-                        WHERE ST_Intersects(geom, ST_Buffer(ST_GeomFromText('POINT({x_coord} {y_coord})', 5186), 300))
-                          AND uptaenm = '{business_type_name}'
-                    """
-                    )
-                    row = cursor.fetchone()
-                    competitor_count = int(row[0]) if row[0] else 0
-
-                    time.sleep(0.1)
-
-                    # 전체 요식업체
-                    cursor.execute(
-                        f"""
-                        SELECT COUNT(*) as total_biz,
-                               COUNT(DISTINCT uptaenm) as diversity
-                        FROM store_point_5186 
-                        WHERE ST_Intersects(geom, ST_Buffer(ST_GeomFromText('POINT({x_coord} {y_coord})', 5186), 300))
-                    """
-                    )
-                    row = cursor.fetchone()
-                    total_biz = int(row[0]) if row[0] else 0
-                    diversity = int(row[1]) if row[1] else 0
-
-                    # 디버깅: 주변 업종들 출력
-                    if competitor_count == 0:
-                        print(
-                            f"   ⚠️  '{business_type_name}' 업종 경쟁업체가 0개입니다."
-                        )
-                        print("   주변 업종들 확인 중...")
-                        cursor.execute(
-                            f"""
-                            SELECT uptaenm, COUNT(*) as count
-                            FROM store_point_5186 
-                            WHERE ST_Intersects(geom, ST_Buffer(ST_GeomFromText('POINT({x_coord} {y_coord})', 5186), 300))
-                            GROUP BY uptaenm
-                            ORDER BY count DESC
-                            LIMIT 5
-                        """
-                        )
-                        nearby_types = cursor.fetchall()
-                        for uptae, count in nearby_types:
-                            print(f"     - {uptae}: {count}개")
-
-                    results.update(
-                        {
-                            "competitor_300m": competitor_count,
-                            "adjacent_biz_300m": total_biz,
-                            "competitor_ratio_300m": round(
-                                (
-                                    (competitor_count / total_biz * 100)
-                                    if total_biz > 0
-                                    else 0
-                                ),
-                                2,
-                            ),
-                            "business_diversity_300m": diversity,
-                        }
-                    )
-                    print(
-                        f"   ✅ 300m 경쟁업체: {competitor_count}개 / 전체 {total_biz}개 (비율: {round((competitor_count / total_biz * 100) if total_biz > 0 else 0, 1)}%)"
-                    )
-                except Exception as e:
-                    print(f"   ❌ 상권 분석 오류: {e}")
-                    results.update(
-                        {
-                            "competitor_300m": 0,
-                            "adjacent_biz_300m": 0,
-                            "competitor_ratio_300m": 0,
-                            "business_diversity_300m": 0,
-                        }
-                    )
-
-                time.sleep(0.1)
-                print("✅ [5/6] 경쟁업체 분석 완료")
-
-                print("\n💰 [6/6] 공시지가 분석 시작...")
-                # 6. 공시지가 분석
-                print("\n💰 [6/6] 공시지가 분석 시작...")
-                try:
-                    cursor.execute(
-                        f"""
-                        SELECT COALESCE("A9", 0) as land_price
-                        FROM ltv_5186
-                        WHERE ST_Intersects(
-                            ltv_5186.geom,
-                            ST_Buffer(
-                                ST_SetSRID(ST_GeomFromText('POINT({x_coord} {y_coord})'), 900914),
-                                300
-                            )
-                        )
-                        ORDER BY ST_Distance(
-                            ltv_5186.geom,
-                            ST_SetSRID(ST_GeomFromText('POINT({x_coord} {y_coord})'), 900914)
-                        )
-                        LIMIT 1
-                    """
-                    )
-                    row = cursor.fetchone()
-                    land_price = row[0] if row[0] else 0
-                    total_land_value = land_price * area
-                    results.update({
-                        "total_land_value": total_land_value,
-                    })
-                    print(f"   ✅ 공시지가: {land_price:,.0f}원/㎡")
-                    print(f"   ✅ 총 공시지가: {total_land_value:,.0f}원")
-                except Exception as e:
-                    print(f"   ❌ 공시지가 분석 오류: {e}")
-                    results.update({
-                        "total_land_value": 0,
-                    })
-
-                # 기본 정보 추가
-                results.update(
-                    {
-                        "area": area,
-                        "service_type": service_type,
-                    }
+                    f"✅ [6/6] 공간 피쳐 추출 완료 ({step_times['공간피쳐_추출']:.2f}초, 업종별 경쟁업체 {len(competitor_counts or {})}개 업종)"
                 )
+                report_steps(progress, *FEATURE_STEPS)
 
-                # 다른 페이지에서 사용할 수 있도록 변수명 매핑
-                print(f"📋 변수 매핑 중...")
-
-                # 생활인구 관련 (300m = 1A, 1000m = 2A)
-                _1A_Total = results["life_pop_300m"]  # 300m내 총생활인구
-                _1A_20 = results["life_pop_20_300m"]  # 300m내 20대 비율(%)
-                _1A_30 = results["life_pop_30_300m"]  # 300m내 30대 비율(%)
-                _1A_40 = results["life_pop_40_300m"]  # 300m내 40대 비율(%)
-                _1A_50 = results["life_pop_50_300m"]  # 300m내 50대 비율(%)
-                _1A_60 = results["life_pop_60_300m"]  # 300m내 60대 비율(%)
-                _2A_20 = results["life_pop_20_1000m"]  # 1000m내 20대 비율(%)
-                _2A_30 = results["life_pop_30_1000m"]  # 1000m내 30대 비율(%)
-                _2A_40 = results["life_pop_40_1000m"]  # 1000m내 40대 비율(%)
-                _2A_50 = results["life_pop_50_1000m"]  # 1000m내 50대 비율(%)
-                _2A_60 = results["life_pop_60_1000m"]  # 1000m내 60대 비율(%)
-
-                # 외국인 관련
-                _1A_Temp_CN = results[
-                    "temp_foreign_cn_300m"
-                ]  # 300m내 단기체류 중국인 비율(%)
-                _2A_Temp_Total = results[
-                    "temp_foreign_1000m"
-                ]  # 1000m내 단기체류외국인 총수
-                _2A_Temp_CN = results[
-                    "temp_foreign_cn_1000m"
-                ]  # 1000m내 단기체류 중국인 비율(%)
-                _1A_Long_Total = results[
-                    "long_foreign_300m"
-                ]  # 300m내 장기체류외국인 총수
-                _2A_Long_Total = results[
-                    "long_foreign_1000m"
-                ]  # 1000m내 장기체류외국인 총수
-                _2A_Long_CN = results[
-                    "long_foreign_cn_1000m"
-                ]  # 1000m내 장기체류 중국인 비율(%)
-
-                # 직장인구 및 시설
-                Working_Pop = results["working_pop_300m"]  # 300m내 직장인구
-                PubBuilding = results["public_building_250m"]  # 250m내 공공건물 수
-                School = results["school_250m"]  # 250m내 학교 수
-
-                # 경쟁업체 관련
-                Competitor_C = results["competitor_300m"]  # 300m내 동일업종 경쟁업체 수
-                Competitor_R = results[
-                    "competitor_ratio_300m"
-                ]  # 300m내 경쟁업체 비율(%)
-                Adjacent_BIZ = results["adjacent_biz_300m"]  # 300m내 전체 요식업체 수
-                Business_D = results["business_diversity_300m"]  # 300m내 업종 다양성
-
-                # 기본 정보
-                Area = results["area"]  # 면적(㎡)
-                Total_LV = results["total_land_value"]  # 총 공시지가
-                Service = results[
-                    "service_type"
-                ]  # 서비스 유형 (0:휴게음식점, 1:일반음식점)
+                # 다른 페이지에서 사용할 수 있도록 변수명 매핑 (1A_*, 2A_* 형식)
+                features_for_ai = build_model_features(results, business_type_id)
 
                 # 변수 매핑 완료 로그
                 print(f"✅ 변수 매핑 완료:")
-                print(f"   생활인구: 1A_Total={_1A_Total:,}명")
+                print(f"   생활인구: 1A_Total={features_for_ai['1A_Total']:,}명")
                 print(
-                    f"   외국인: 2A_Temp_Total={_2A_Temp_Total:,}명, 1A_Long_Total={_1A_Long_Total:,}명"
+                    f"   외국인: 2A_Temp_Total={features_for_ai['2A_Temp_Total']:,}명, 1A_Long_Total={features_for_ai['1A_Long_Total']:,}명"
                 )
-                print(f"   직장인구: Working_Pop={Working_Pop:,}명")
+                print(f"   직장인구: Working_Pop={features_for_ai['Working_Pop']:,}명")
                 print(
-                    f"   경쟁업체: Competitor_C={Competitor_C}개 (비율 {Competitor_R}%)"
+                    f"   경쟁업체: Competitor_C={features_for_ai['Competitor_C']}개 (비율 {features_for_ai['Competitor_R']}%)"
+                )
+                print(
+                    f"   면적/지가: Area={features_for_ai['Area']}㎡, Total_LV={features_for_ai['Total_LV']:,.0f}원"
                 )
-                print(f"   면적/지가: Area={Area}㎡, Total_LV={Total_LV:,.0f}원")
 
                 # AI 모델을 이용한 장기 생존 확률 예측
                 print("\n🤖 [AI 예측] 장기 생존 확률 분석 시작...")
-                features_for_ai = {
-                    "Area": Area,
-                    "Adjacent_BIZ": Adjacent_BIZ,
-                    "1A_Total": _1A_Total,
-                    "Total_LV": Total_LV,
-                    "Business_D": Business_D,
-                    "Working_Pop": Working_Pop,
-                    "2A_20": _2A_20,
-                    "2A_30": _2A_30,
-                    "2A_40": _2A_40,
-                    "2A_50": _2A_50,
-                    "2A_60": _2A_60,
-                    "1A_20": _1A_20,
-                    "1A_30": _1A_30,
-                    "1A_40": _1A_40,
-                    "1A_50": _1A_50,
-                    "1A_60": _1A_60,
-                    "1A_Long_Total": _1A_Long_Total,
-                    "2A_Long_Total": _2A_Long_Total,
-                    "1A_Temp_CN": _1A_Temp_CN,
-                    "2A_Temp_CN": _2A_Temp_CN,
-                    "2A_Temp_Total": _2A_Temp_Total,
-                    "2A_Long_CN": _2A_Long_CN,
-                    "Competitor_C": Competitor_C,
-                    "Competitor_R": Competitor_R,
-                    "Service": Service,
-                    "School": School,
-                    "PubBuilding": PubBuilding,
-                    "UPTAENM_ID": business_type_id,  # 업종 ID (숫자)로 변경
-                }
-
-                survival_probability = predict_survival_probability(features_for_ai)
+                # 피쳐별 기여도(로컬 설명)도 같은 모델 호출에서 계산
+                survival_probability, local_explanation = predict_survival_with_explanation(features_for_ai)
                 survival_percentage = round(survival_probability * 100, 1)
 
                 # 업종 추천 기능 수행
-                recommendation_result = recommend_business_type(features_for_ai, business_type_id)
+                recommendation_result = recommend_business_type(
+                    features_for_ai, business_type_id, competitor_counts=competitor_counts
+                )
+                report_steps(progress, "ai")
 
                 # 회원의 경우 ChatGPT를 통한 AI 설명 생성
+                # DEFERRED_EXPLANATION이면 결과를 먼저 저장/반환하고 설명은 커밋 후 백그라운드에서 생성
                 ai_explanation = ""
                 ai_summary = ""
-                if analysis_request.user.is_authenticated:
+                ai_explanation_status = "ready"
+                deferred_explanation = getattr(settings, "ANALYSIS_SETTINGS", {}).get("DEFERRED_EXPLANATION", False)
+                if analysis_request.user.is_authenticated and deferred_explanation:
+                    ai_explanation_status = "pending"
+                    # ChatGPT 설명이 도착하기 전까지는 기여도 기반 로컬 설명을 바로 보여줌
+                    if local_explanation:
+                        ai_explanation, ai_summary = get_fallback_explanation(
+                            survival_percentage, language, local_explanation
+                        )
+                elif analysis_request.user.is_authenticated:
+                    # 언어 활성화 (AI 설명 생성 전)
+                    from django.utils.translation import activate
+                    activate(language)
+                    print(f"🌍 AI 설명 생성을 위한 언어 활성화: {language}")
+
+                    from .ai_explainer import get_xgboost_explanation, extract_summary_line
                     try:
-                        # 언어 활성화 (AI 설명 생성 전)
-                        from django.utils.translation import activate
-                        activate(language)
-                        print(f"🌍 AI 설명 생성을 위한 언어 활성화: {language}")
-                        
-                        from .ai_explainer import get_xgboost_explanation, extract_summary_line
-                        ai_explanation = get_xgboost_explanation(features_for_ai, survival_percentage)
+                        ai_explanation = get_xgboost_explanation(
+                            features_for_ai, survival_percentage, language, local_explanation,
+                            raise_on_error=True,
+                        )
                         ai_summary = extract_summary_line(ai_explanation)
                         print(f"   ✅ AI 설명 생성 완료: {ai_summary}")
                     except Exception as e:
                         print(f"   ❌ AI 설명 생성 오류: {e}")
-                        
-                        # 오류 메시지도 다국어화
-                        error_messages = {
-                            'ko': f"생존 확률 {survival_percentage}%로 예측되었습니다.\n\n상세한 분석을 위해 잠시 후 다시 시도해주세요.",
-                            'en': f"Survival probability predicted as {survival_percentage}%.\n\nPlease try again later for detailed analysis.",
-                            'es': f"Probabilidad de supervivencia predicha como {survival_percentage}%.\n\nPor favor, inténtelo de nuevo más tarde para un análisis detallado."
-                        }
-                        summary_messages = {
-                            'ko': f"생존 확률 {survival_percentage}%로 예측되었습니다.",
-                            'en': f"Survival probability predicted as {survival_percentage}%.",
-                            'es': f"Probabilidad de supervivencia predicha como {survival_percentage}%."
-                        }
-                        
-                        ai_explanation = error_messages.get(language, error_messages['ko'])
-                        ai_summary = summary_messages.get(language, summary_messages['ko'])
+                        ai_explanation, ai_summary = get_fallback_explanation(
+                            survival_percentage, language, local_explanation
+                        )
+                        ai_explanation_status = "failed"
 
                 # AI 예측 결과를 results에 추가
                 results.update(
@@ -2085,6 +965,8 @@ def perform_spatial_analysis(analysis_request, language='ko'):
                         "survival_percentage": survival_percentage,
                         "ai_explanation": ai_explanation,
                         "ai_summary": ai_summary,
+                        "ai_explanation_status": ai_explanation_status,
+                        "feature_contributions": local_explanation,
                         "is_member_analysis": True,
                         # 업종 추천 결과 추가
                         "recommended_business_type_id": recommendation_result.get('recommended_business_type_id'),
@@ -2102,6 +984,14 @@ def perform_spatial_analysis(analysis_request, language='ko'):
                     user=analysis_request.user,  # 사용자 정보 명시적 저장
                     **results
                 )
+                if ai_explanation_status == "pending":
+                    # 결과 커밋 후 설명 생성 등록 (워커가 저장된 결과 행을 갱신)
+                    transaction.on_commit(
+                        lambda: enqueue_explanation(
+                            analysis_request.id, features_for_ai, survival_percentage, language,
+                            local_explanation,
+                        )
+                    )
 
                 print(f"🎉 === 상권분석 완료 === 요청 ID: {analysis_request.id}")
                 print(f"📊 생활인구: {results['life_pop_300m']:,}명")
@@ -2113,46 +1003,11 @@ def perform_spatial_analysis(analysis_request, language='ko'):
                 print(f"💰 토지가치: {results['total_land_value']:,.0f}원")
                 print(f"🤖 AI 예측 생존확률: {survival_percentage}%")
 
-                # 새로운 변수들을 results에 추가하여 반환
+                # 모델 변수들과 좌표 정보를 results에 추가하여 반환
                 results.update(
-                    {
-                        # 생활인구 관련 변수들
-                        "1A_Total": _1A_Total,
-                        "1A_20": _1A_20,
-                        "1A_30": _1A_30,
-                        "1A_40": _1A_40,
-                        "1A_50": _1A_50,
-                        "1A_60": _1A_60,
-                        "2A_20": _2A_20,
-                        "2A_30": _2A_30,
-                        "2A_40": _2A_40,
-                        "2A_50": _2A_50,
-                        "2A_60": _2A_60,
-                        # 외국인 관련 변수들
-                        "1A_Temp_CN": _1A_Temp_CN,
-                        "2A_Temp_Total": _2A_Temp_Total,
-                        "2A_Temp_CN": _2A_Temp_CN,
-                        "1A_Long_Total": _1A_Long_Total,
-                        "2A_Long_Total": _2A_Long_Total,
-                        "2A_Long_CN": _2A_Long_CN,
-                        # 직장인구 및 시설 변수들
-                        "Working_Pop": Working_Pop,
-                        "PubBuilding": PubBuilding,
-                        "School": School,
-                        # 경쟁업체 관련 변수들
-                        "Competitor_C": Competitor_C,
-                        "Competitor_R": Competitor_R,
-                        "Adjacent_BIZ": Adjacent_BIZ,
-                        "Business_D": Business_D,
-                        # 기본 정보 변수들
-                        "Area": Area,
-                        "Total_LV": Total_LV,
-                        "Service": Service,
-                        # 좌표 정보 (추가 요청사항)
-                        "X_Coord": x_coord,
-                        "Y_Coord": y_coord,
-                    }
+                    {k: v for k, v in features_for_ai.items() if k != "UPTAENM_ID"}
                 )
+                results.update({"X_Coord": x_coord, "Y_Coord": y_coord})
 
                 return results
 
@@ -2318,6 +1173,8 @@ def get_analysis_result_api(request, request_id):
                 # AI 설명 관련 필드들
                 "ai_explanation": analysis_result.ai_explanation or "",
                 "ai_summary": analysis_result.ai_summary or "",
+                "ai_explanation_status": analysis_result.ai_explanation_status,
+                "feature_contributions": analysis_result.feature_contributions or {},
                 "is_member_analysis": analysis_result.is_member_analysis or False,
                 
                 # 업종 추천 관련 필드들
@@ -2341,6 +1198,170 @@ def get_analysis_result_api(request, request_id):
         )
 
 
+@require_http_methods(["GET"])
+def get_analysis_explanation_api(request, request_id):
+    """
+    백그라운드 AI 설명 생성 상태 조회 API (WebSocket을 쓰지 않는 클라이언트용 폴링)
+
+    Args:
+        request: HTTP 요청 객체
+        request_id (int): 분석 요청 ID
+
+    Returns:
+        JsonResponse: {status, ai_explanation, ai_summary}
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "로그인이 필요합니다."}, status=401)
+
+    analysis_result = AnalysisResult.objects.filter(request_id=request_id).select_related("request").first()
+    if analysis_result is None:
+        return JsonResponse({"error": "분석 결과를 찾을 수 없습니다."}, status=404)
+    if not (request.user.is_superuser or analysis_result.request.user_id == request.user.id):
+        return JsonResponse({"error": "이 분석 결과에 접근할 권한이 없습니다."}, status=403)
+
+    return JsonResponse({
+        "request_id": request_id,
+        "status": analysis_result.ai_explanation_status,
+        "ai_explanation": analysis_result.ai_explanation or "",
+        "ai_summary": analysis_result.ai_summary or "",
+        "feature_contributions": analysis_result.feature_contributions or {},
+    })
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def analysis_sensitivity_api(request, request_id):
+    """
+    저장된 분석 결과 기준 what-if 민감도 분석 API
+
+    Args:
+        request: HTTP 요청 객체 (JSON body: areas, service_types, business_type_ids
+                 - 각각 [값, ...] 또는 {"min", "max", "step"}, 생략 시 기준값)
+        request_id (int): 분석 요청 ID
+
+    Returns:
+        JsonResponse: base(기준 조합), curves(업종 × 서비스 유형별 면적-생존확률 곡선)
+
+    Note:
+        - 공간 피쳐는 저장된 값을 재사용하고 Area / Total_LV / Service / UPTAENM_ID만 바꿔 한 번에 예측
+        - PostGIS 조회 없음 (업종별 경쟁업체 수는 메모리의 점포 공간 인덱스가 있을 때만 반영)
+    """
+    from .sensitivity import run_sensitivity
+
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "로그인이 필요합니다."}, status=401)
+
+    analysis_result = AnalysisResult.objects.filter(request_id=request_id).select_related("request").first()
+    if analysis_result is None:
+        return JsonResponse({"error": "분석 결과를 찾을 수 없습니다."}, status=404)
+    if not (request.user.is_superuser or analysis_result.request.user_id == request.user.id):
+        return JsonResponse({"error": "이 분석 결과에 접근할 권한이 없습니다."}, status=403)
+
+    try:
+        params = json.loads(request.body or b"{}")
+        if not isinstance(params, dict):
+            return JsonResponse({"error": "요청 본문은 JSON 객체여야 합니다."}, status=400)
+        business_types = dict(BusinessType.objects.values_list("id", "name"))
+        result = run_sensitivity(analysis_result, params, business_types, predict_survival_matrix)
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "잘못된 JSON 형식입니다."}, status=400)
+    except (KeyError, TypeError, ValueError) as e:
+        return JsonResponse({"error": f"데이터 형식이 잘못되었습니다: {str(e)}"}, status=400)
+
+    return JsonResponse(result)
+
+
+WGS84_TO_5186 = Transformer.from_crs("EPSG:4326", "EPSG:5186", always_xy=True)
+EPSG5186_TO_WGS84 = Transformer.from_crs("EPSG:5186", "EPSG:4326", always_xy=True)
+
+
+def parse_bbox(value):
+    """
+    "minLng,minLat,maxLng,maxLat"(WGS84) -> EPSG:5186 (min_x, min_y, max_x, max_y)
+
+    Raises:
+        ValueError: 형식이 잘못된 경우
+    """
+    min_lng, min_lat, max_lng, max_lat = (float(v) for v in value.split(","))
+    if min_lng >= max_lng or min_lat >= max_lat:
+        raise ValueError("bbox 범위가 올바르지 않습니다.")
+    # 네 모서리를 모두 변환해 투영 왜곡이 있어도 bbox 전체를 덮도록 함
+    xs, ys = WGS84_TO_5186.transform(
+        [min_lng, min_lng, max_lng, max_lng], [min_lat, max_lat, min_lat, max_lat]
+    )
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+@require_http_methods(["GET"])
+def survival_surface_api(request):
+    """
+    미리 계산한 격자 생존 확률 표면을 bbox + 업종 기준 히트맵으로 반환
+
+    Args:
+        request: HTTP 요청 객체 (GET: bbox=minLng,minLat,maxLng,maxLat, business_type_id, format=grid|points)
+
+    Returns:
+        JsonResponse: grid 형식은 {origin_x, origin_y, cell_size, rows, cols, values(행 = 남→북, null=서울 밖)},
+                      points 형식은 {points: [[lat, lng, 생존확률(%)], ...]}
+
+    Note:
+        - 표면은 python manage.py build_survival_surface 로 생성 (고정 면적·서비스 유형 기준)
+        - 셀 수가 MAX_CELLS를 넘으면 블록 최댓값으로 축소하고 cell_size/stride에 반영
+    """
+    from .survival_surface import get_survival_surface
+
+    try:
+        bbox = parse_bbox(request.GET.get("bbox", ""))
+        business_type_id = int(request.GET.get("business_type_id", ""))
+    except (TypeError, ValueError):
+        return JsonResponse(
+            {"error": "bbox(minLng,minLat,maxLng,maxLat)와 business_type_id가 필요합니다."}, status=400
+        )
+    output_format = request.GET.get("format", "grid")
+    if output_format not in ("grid", "points"):
+        return JsonResponse({"error": "format은 grid 또는 points만 지원합니다."}, status=400)
+
+    surface = get_survival_surface()
+    if surface is None:
+        return JsonResponse({"error": "생존 확률 표면이 아직 생성되지 않았습니다."}, status=503)
+
+    conf = settings.ANALYSIS_SETTINGS.get("SURVIVAL_SURFACE", {})
+    window = surface.window(business_type_id, bbox, max_cells=conf.get("MAX_CELLS", 40000))
+    if window is None:
+        return JsonResponse({"error": "표면에 없는 업종입니다."}, status=404)
+
+    grid = window["grid"]
+    payload = {
+        "version": surface.info.get("version"),
+        "business_type_id": business_type_id,
+        "area": surface.info.get("area"),
+        "service_type": surface.info.get("service_type"),
+        "srid": surface.info.get("srid"),
+        "cell_size": window["cell_size"],
+        "stride": window["stride"],
+    }
+
+    if output_format == "points":
+        rows, cols = np.nonzero(~np.isnan(grid))
+        lngs, lats = EPSG5186_TO_WGS84.transform(
+            window["origin_x"] + cols * window["cell_size"],
+            window["origin_y"] + rows * window["cell_size"],
+        )
+        payload["points"] = [
+            [round(float(lat), 6), round(float(lng), 6), int(value)]
+            for lat, lng, value in zip(np.atleast_1d(lats), np.atleast_1d(lngs), grid[rows, cols])
+        ]
+    else:
+        payload.update({
+            "origin_x": window["origin_x"],
+            "origin_y": window["origin_y"],
+            "rows": int(grid.shape[0]),
+            "cols": int(grid.shape[1]),
+            "values": [[None if np.isnan(v) else int(v) for v in row] for row in grid],
+        })
+    return JsonResponse(payload)
+
+
 @staff_member_required
 def database_info(request):
     """
@@ -2398,71 +1419,23 @@ def database_info(request):
         except:
             geometry_columns = []
 
-        # 공간 테이블들 정보 (재시도 로직 포함)
-        spatial_tables = [
-            ["life_pop_grid_10m_5186"],
-            ["workgrid_10m_5186"],
-            [
-                "temp_25m_5186",
-                "temp_foreign_25m_5186",
-                "_단기체류외국인_25m_5186",
-                "단기체류외국인_25m_5186",
-            ],
-            [
-                "long_25m_5186",
-                "long_foreign_25m_5186",
-                "_장기체류외국인_25m_5186",
-                "장기체류외국인_25m_5186",
-            ],
-            ["store_point_5186"],
-            ["school_5186"],
-            ["ltv_5186"],
-            ["public_5186"],
-        ]
+        # 공간 테이블 행 수 (레이어 레지스트리의 pg_class.reltuples 추정치 - 테이블별 COUNT(*) 없음)
+        # 외국인 레이어는 실제 해석된 테이블과 관계없이 temp_25m_5186 / long_25m_5186 키로 표시
+        from .layer_registry import SPATIAL_LAYERS, get_layer_registry
 
-        spatial_table_counts = {}
-        for table_group in spatial_tables:
-            found = False
-            for table_name in table_group:
-                try:
-                    cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                    count = cursor.fetchone()[0]
-                    if table_name in [
-                        "temp_25m_5186",
-                        "temp_foreign_25m_5186",
-                        "_단기체류외국인_25m_5186",
-                        "단기체류외국인_25m_5186",
-                    ]:
-                        spatial_table_counts["temp_25m_5186"] = count
-                    elif table_name in [
-                        "long_25m_5186",
-                        "long_foreign_25m_5186",
-                        "_장기체류외국인_25m_5186",
-                        "장기체류외국인_25m_5186",
-                    ]:
-                        spatial_table_counts["long_25m_5186"] = count
-                    else:
-                        spatial_table_counts[table_name] = count
-                    found = True
-                    break
-                except:
-                    continue
-
-            if not found:
-                # 첫 번째 테이블명으로 0값 저장
-                primary_table = table_group[0]
-                if "temp" in primary_table.lower():
-                    spatial_table_counts["temp_25m_5186"] = 0
-                elif "long" in primary_table.lower():
-                    spatial_table_counts["long_25m_5186"] = 0
-                else:
-                    spatial_table_counts[primary_table] = 0
+        display_keys = {"temp_foreign": "temp_25m_5186", "long_foreign": "long_25m_5186"}
+        spatial_layers = get_layer_registry(cursor)
+        spatial_table_counts = {
+            display_keys.get(name, SPATIAL_LAYERS[name][0]): layer["rows"]
+            for name, layer in spatial_layers.items()
+        }
 
     context = {
         "tables": tables,
         "spatial_refs": spatial_refs,
         "geometry_columns": geometry_columns,
         "spatial_table_counts": spatial_table_counts,
+        "spatial_layers": spatial_layers,
     }
 
     return render(request, "admin/database_info.html", context)
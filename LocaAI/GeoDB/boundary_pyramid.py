@@ -0,0 +1,141 @@
+# GeoDB/boundary_pyramid.py
+# 행정경계(구 / 행정동) 단순화 피라미드 - 허용오차별로 미리 단순화해 EPSG:4326으로 저장 (boundary_simplified)
+#
+# 생성: python manage.py build_boundary_pyramid
+# 조회: zoom 또는 tolerance 파라미터 -> level_from_params -> boundary_geojson_sql (레벨별 좌표 소수 자릿수로 양자화)
+
+from typing import Dict, Iterable, Optional
+
+from django.db import connection, transaction
+
+from .models import AdministrativeDistrict, SeoulDistrict
+
+
+# (레벨, 허용오차 m, GeoJSON 좌표 소수 자릿수) - 소수 5자리 ≈ 1.1m, 4자리 ≈ 11m, 3자리 ≈ 110m
+PYRAMID_LEVELS = [
+    (0, 0.0, 6),
+    (1, 2.0, 5),
+    (2, 10.0, 5),
+    (3, 40.0, 4),
+    (4, 150.0, 3),
+]
+
+# 경계 종류 -> (원본 테이블, 코드 컬럼)
+BOUNDARY_SOURCES = {
+    "district": (SeoulDistrict._meta.db_table, "adm_sect_c"),
+    "dong": (AdministrativeDistrict._meta.db_table, "emd_cd"),
+}
+
+# 서울 위도(약 37.5°)에서 줌 0 타일(256px) 픽셀 하나의 실제 거리(m) - 줌이 1 오를 때마다 절반
+SEOUL_PIXEL_M_AT_Z0 = 156543.03 * 0.79
+
+
+def level_for_tolerance(tolerance: float) -> int:
+    """허용오차(m) 이하인 가장 거친 레벨"""
+    return max(level for level, level_tolerance, _ in PYRAMID_LEVELS if level_tolerance <= tolerance)
+
+
+def level_for_zoom(zoom: float) -> int:
+    """줌 레벨의 화면 픽셀 크기 이하로 단순화된 가장 거친 레벨 (단순화 오차가 1픽셀을 넘지 않음)"""
+    return level_for_tolerance(SEOUL_PIXEL_M_AT_Z0 / (2 ** float(zoom)))
+
+
+def level_decimals(level: int) -> int:
+    return PYRAMID_LEVELS[level][2]
+
+
+def level_from_params(query) -> Optional[int]:
+    """
+    요청 파라미터(zoom 또는 tolerance) -> 피라미드 레벨
+
+    Returns:
+        int: 레벨 (둘 다 없으면 None - 호출 측 기존 원본 좌표계 응답 유지)
+
+    Raises:
+        ValueError: 숫자가 아니거나 음수인 경우
+    """
+    if query.get("tolerance") not in (None, ""):
+        tolerance = float(query["tolerance"])
+        if tolerance < 0:
+            raise ValueError("tolerance는 0 이상이어야 합니다.")
+        return level_for_tolerance(tolerance)
+    if query.get("zoom") not in (None, ""):
+        zoom = float(query["zoom"])
+        if not 0 <= zoom <= 24:
+            raise ValueError("zoom은 0~24 범위여야 합니다.")
+        return level_for_zoom(zoom)
+    return None
+
+
+def boundary_geojson_sql(layer: str, code_expr: str, geom_expr: str) -> str:
+    """
+    레벨별 단순화 경계 GeoJSON SQL 식 (파라미터: level, decimals)
+
+    Args:
+        code_expr, geom_expr: 원본 행의 코드/지오메트리 SQL 식
+
+    Note:
+        - 피라미드가 아직 없으면 원본 경계를 4326으로 변환해 사용
+    """
+    return f"""ST_AsGeoJSON(COALESCE(
+                (SELECT bs.geom FROM boundary_simplified bs
+                 WHERE bs.layer = '{layer}' AND bs.level = %(level)s AND bs.code = {code_expr}),
+                ST_Transform({geom_expr}, 4326)
+            ), %(decimals)s)::json"""
+
+
+def coverage_simplify_available(cursor) -> bool:
+    """ST_CoverageSimplify 사용 가능 여부 (PostGIS 3.4 이상 + GEOS 3.12 이상)"""
+    cursor.execute("SELECT to_regprocedure('st_coveragesimplify(geometry, double precision, boolean)') IS NOT NULL")
+    return bool(cursor.fetchone()[0])
+
+
+def build_boundary_pyramid(layers: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """
+    구/행정동 경계 단순화 피라미드 재생성 (기존 행 교체)
+
+    Returns:
+        dict: {경계 종류: 저장한 행 수}
+
+    Raises:
+        RuntimeError: ST_CoverageSimplify를 쓸 수 없는 PostGIS 버전
+
+    Note:
+        - 경계 종류 전체를 하나의 커버리지로 보고 ST_CoverageSimplify(윈도 함수)로 단순화
+          → 이웃 폴리곤의 공유 경계선을 한 번만 단순화하므로 틈/겹침이 생기지 않음
+        - 미터 단위인 원본(EPSG:5186)에서 단순화한 뒤 4326으로 변환
+        - 피라미드가 없으면 조회는 원본 경계를 그대로 4326으로 변환해 사용 (boundary_geojson_sql)
+    """
+    layers = list(layers) if layers is not None else list(BOUNDARY_SOURCES)
+    counts = {}
+    with transaction.atomic(), connection.cursor() as cursor:
+        if not coverage_simplify_available(cursor):
+            raise RuntimeError(
+                "ST_CoverageSimplify를 사용할 수 없습니다 (PostGIS 3.4 / GEOS 3.12 이상 필요). "
+                "피라미드 없이 원본 경계를 사용합니다."
+            )
+        cursor.execute("DELETE FROM boundary_simplified WHERE layer = ANY(%s)", [layers])
+        for layer in layers:
+            table, code_column = BOUNDARY_SOURCES[layer]
+            counts[layer] = 0
+            for level, tolerance, _ in PYRAMID_LEVELS:
+                geom = f"ST_CoverageSimplify(src.geom, {tolerance}) OVER ()" if tolerance else "src.geom"
+                cursor.execute(
+                    f"""
+                    INSERT INTO boundary_simplified (layer, code, level, tolerance_m, geom)
+                    SELECT %s, simplified.code, %s, %s,
+                           ST_Multi(ST_CollectionExtract(ST_MakeValid(ST_Transform(simplified.geom, 4326)), 3))
+                    FROM (
+                        SELECT src.code, {geom} AS geom
+                        FROM (
+                            SELECT DISTINCT ON ("{code_column}") "{code_column}" AS code, geom
+                            FROM "{table}"
+                            WHERE geom IS NOT NULL AND "{code_column}" IS NOT NULL
+                        ) src
+                    ) simplified
+                    WHERE simplified.geom IS NOT NULL
+                    """,
+                    [layer, level, tolerance],
+                )
+                counts[layer] += cursor.rowcount
+    return counts
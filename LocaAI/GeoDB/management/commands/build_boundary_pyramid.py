@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from GeoDB.boundary_pyramid import BOUNDARY_SOURCES, PYRAMID_LEVELS, build_boundary_pyramid
+from shopdash.dong_geojson import invalidate_dong_geojson
+
+
+class Command(BaseCommand):
+    help = '구/행정동 경계를 허용오차별로 단순화해 boundary_simplified(EPSG:4326)에 저장 (zoom/tolerance 파라미터 응답용)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--layer',
+            action='append',
+            choices=sorted(BOUNDARY_SOURCES),
+            help='재생성할 경계 종류 (여러 번 지정 가능, 생략 시 전체)'
+        )
+
+    def handle(self, *args, **options):
+        for level, tolerance, decimals in PYRAMID_LEVELS:
+            self.stdout.write(f"  레벨 {level}: 허용오차 {tolerance:g}m, 좌표 소수 {decimals}자리")
+
+        try:
+            counts = build_boundary_pyramid(options['layer'])
+        except RuntimeError as e:
+            self.stdout.write(self.style.ERROR(str(e)))
+            return
+        if 'dong' in counts:
+            invalidate_dong_geojson()
+        for layer, count in counts.items():
+            self.stdout.write(f"  {layer}: {count:,}행")
+        self.stdout.write(self.style.SUCCESS(
+            "경계 단순화 피라미드 생성 완료 (구 단위 지도 레벨 파일은 refresh_district_summary로 재생성)"
+        ))
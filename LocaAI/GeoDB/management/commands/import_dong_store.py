@@ -4,6 +4,10 @@ import geopandas as gpd
 import pandas as pd
 import os
 
+from shopdash.dong_geojson import invalidate_dong_geojson
+from shopdash.store_points import prepare_store_points
+from shopdash.vector_tiles import invalidate_tiles
+
 class Command(BaseCommand):
     help = 'dong_store.gpkg 파일을 dong_store 테이블로 가져오기 (행정동별 업체 집계 데이터)'
     
@@ -195,6 +199,14 @@ class Command(BaseCommand):
                 total_count = cursor.fetchone()[0]
                 
                 self.stdout.write(self.style.SUCCESS(f"dong_store 테이블 생성 완료: 총 {total_count:,}개 레코드"))
+
+            # 점포 지도용 EPSG:4326 좌표 컬럼 (요청마다 2097 → 4326 변환하지 않도록 미리 저장)
+            converted = prepare_store_points()
+            self.stdout.write(f"geom_4326 변환 완료: {converted:,}개 (서울 범위 밖 좌표 제외)")
+
+            # 대시보드 행정동 GeoJSON / 점포 타일 캐시 무효화
+            invalidate_dong_geojson()
+            invalidate_tiles(["stores"])
                 
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"오류 발생: {str(e)}"))
@@ -2,6 +2,8 @@ from django.core.management.base import BaseCommand
 from django.contrib.gis.geos import Point
 from django.db import transaction
 from GeoDB.models import StoreResult
+from shopdash.dong_geojson import invalidate_dong_geojson
+from shopdash.vector_tiles import invalidate_tiles
 import geopandas as gpd
 import os
 
@@ -211,6 +213,10 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR(f"파일 처리 중 오류: {str(e)}"))
             return
         
+        # 대시보드 행정동 GeoJSON / 점포 예측 타일 캐시 무효화 (평균 생존률 변경)
+        invalidate_dong_geojson()
+        invalidate_tiles(["store_results"])
+
         # 결과 출력
         self.stdout.write(self.style.SUCCESS(f"GPKG 데이터 가져오기 완료!"))
         self.stdout.write(f"총 처리 행수: {len(gdf):,}개")
@@ -1,7 +1,9 @@
 from django.core.management.base import BaseCommand
 from django.contrib.gis.geos import MultiPolygon, Polygon
 from django.db import transaction
+from GeoDB.boundary_pyramid import build_boundary_pyramid
 from GeoDB.models import SeoulDistrict
+from shopdash.vector_tiles import invalidate_tiles
 import geopandas as gpd
 import os
 
@@ -200,6 +202,14 @@ class Command(BaseCommand):
             self.stdout.write(f"전체: {len(gdf):,}개")
             
             if success_count > 0:
+                # 구 경계 타일 캐시 무효화 (구 단위 지도 GeoJSON은 refresh_district_summary로 재생성)
+                invalidate_tiles(["districts"])
+                try:
+                    counts = build_boundary_pyramid(["district"])
+                    self.stdout.write(f"구 경계 단순화 피라미드 재생성: {counts['district']:,}행")
+                except RuntimeError as e:
+                    self.stdout.write(self.style.WARNING(str(e)))
+
                 # 저장된 데이터 샘플 표시
                 sample_district = SeoulDistrict.objects.first()
                 if sample_district:
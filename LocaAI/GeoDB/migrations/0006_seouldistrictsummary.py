@@ -0,0 +1,74 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("GeoDB", "0005_seouldistrict"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SeoulDistrictSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "adm_sect_c",
+                    models.CharField(max_length=10, unique=True, verbose_name="행정구역코드"),
+                ),
+                (
+                    "district_name",
+                    models.CharField(max_length=50, verbose_name="구명"),
+                ),
+                (
+                    "full_name",
+                    models.CharField(max_length=100, verbose_name="전체 구명"),
+                ),
+                (
+                    "dong_count",
+                    models.IntegerField(default=0, verbose_name="행정동 수"),
+                ),
+                (
+                    "total_population",
+                    models.BigIntegerField(default=0, verbose_name="총 생활인구"),
+                ),
+                (
+                    "total_businesses",
+                    models.IntegerField(default=0, verbose_name="업체 수"),
+                ),
+                (
+                    "area_sqkm",
+                    models.FloatField(default=0, verbose_name="면적(㎢)"),
+                ),
+                (
+                    "refreshed_at",
+                    models.DateTimeField(auto_now=True, verbose_name="갱신시간"),
+                ),
+                (
+                    "district",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="summary",
+                        to="GeoDB.seouldistrict",
+                        verbose_name="구",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "서울시구별집계",
+                "verbose_name_plural": "서울시구별집계",
+                "db_table": "seoul_district_summary",
+                "ordering": ["adm_sect_c"],
+                "managed": True,
+            },
+        ),
+    ]
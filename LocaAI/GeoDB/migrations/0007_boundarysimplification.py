@@ -0,0 +1,66 @@
+import django.contrib.gis.db.models.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("GeoDB", "0006_seouldistrictsummary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BoundarySimplification",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "layer",
+                    models.CharField(
+                        choices=[("district", "구"), ("dong", "행정동")],
+                        max_length=10,
+                        verbose_name="경계 종류",
+                    ),
+                ),
+                (
+                    "code",
+                    models.CharField(
+                        help_text="구: adm_sect_c, 행정동: emd_cd",
+                        max_length=10,
+                        verbose_name="행정구역코드",
+                    ),
+                ),
+                (
+                    "level",
+                    models.PositiveSmallIntegerField(
+                        help_text="0: 원본 정밀도", verbose_name="단순화 레벨"
+                    ),
+                ),
+                (
+                    "tolerance_m",
+                    models.FloatField(verbose_name="허용오차(m)"),
+                ),
+                (
+                    "geom",
+                    django.contrib.gis.db.models.fields.MultiPolygonField(
+                        srid=4326, verbose_name="단순화 경계"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "행정경계 단순화",
+                "verbose_name_plural": "행정경계 단순화",
+                "db_table": "boundary_simplified",
+                "ordering": ["layer", "level", "code"],
+                "managed": True,
+                "unique_together": {("layer", "level", "code")},
+            },
+        ),
+    ]
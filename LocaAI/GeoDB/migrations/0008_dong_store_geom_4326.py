@@ -0,0 +1,49 @@
+from django.db import migrations
+
+
+# dong_store는 import_dong_store 명령이 원시 SQL로 만드는 테이블(모델 없음)이므로
+# 테이블이 이미 있을 때만 EPSG:4326 좌표 컬럼/인덱스를 추가하고 채움 (shopdash.store_points.prepare_store_points와 동일)
+ADD_GEOM_4326 = """
+DO $$
+BEGIN
+    IF to_regclass('public.dong_store') IS NOT NULL THEN
+        ALTER TABLE dong_store ADD COLUMN IF NOT EXISTS geom_4326 geometry(Point, 4326);
+        UPDATE dong_store
+        SET geom_4326 = p.geom
+        FROM (
+            SELECT id, ST_Transform(ST_SetSRID(ST_MakePoint("X", "Y"), 2097), 4326) AS geom
+            FROM dong_store
+            WHERE geom_4326 IS NULL AND "X" IS NOT NULL AND "Y" IS NOT NULL
+        ) p
+        WHERE dong_store.id = p.id
+          AND p.geom && ST_MakeEnvelope(126.7, 37.4, 127.3, 37.7, 4326);
+        CREATE INDEX IF NOT EXISTS idx_dong_store_geom_4326 ON dong_store USING GIST (geom_4326);
+        CREATE INDEX IF NOT EXISTS idx_dong_store_emd_kor_nm_id ON dong_store (emd_kor_nm, id)
+            WHERE geom_4326 IS NOT NULL;
+    END IF;
+END
+$$;
+"""
+
+DROP_GEOM_4326 = """
+DO $$
+BEGIN
+    IF to_regclass('public.dong_store') IS NOT NULL THEN
+        DROP INDEX IF EXISTS idx_dong_store_emd_kor_nm_id;
+        DROP INDEX IF EXISTS idx_dong_store_geom_4326;
+        ALTER TABLE dong_store DROP COLUMN IF EXISTS geom_4326;
+    END IF;
+END
+$$;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("GeoDB", "0007_boundarysimplification"),
+    ]
+
+    operations = [
+        migrations.RunSQL(ADD_GEOM_4326, reverse_sql=DROP_GEOM_4326),
+    ]
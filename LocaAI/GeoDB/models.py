@@ -409,3 +409,53 @@ class SeoulDistrict(models.Model):
         if self.geom:
             return round(self.geom.area / 1000000, 2)  # sqm to sqkm
         return 0
+
+
+class SeoulDistrictSummary(models.Model):
+    """서울시 구별 집계 요약 (대시보드 구 단위 지도용, refresh_district_summary 명령으로 갱신)"""
+    district = django_models.OneToOneField(
+        SeoulDistrict, on_delete=django_models.CASCADE, related_name="summary", verbose_name="구"
+    )
+    adm_sect_c = django_models.CharField(max_length=10, unique=True, verbose_name="행정구역코드")
+    district_name = django_models.CharField(max_length=50, verbose_name="구명")
+    full_name = django_models.CharField(max_length=100, verbose_name="전체 구명")
+    dong_count = django_models.IntegerField(default=0, verbose_name="행정동 수")
+    total_population = django_models.BigIntegerField(default=0, verbose_name="총 생활인구")
+    total_businesses = django_models.IntegerField(default=0, verbose_name="업체 수")
+    area_sqkm = django_models.FloatField(default=0, verbose_name="면적(㎢)")
+    refreshed_at = django_models.DateTimeField(auto_now=True, verbose_name="갱신시간")
+
+    class Meta:
+        db_table = 'seoul_district_summary'
+        verbose_name = "서울시구별집계"
+        verbose_name_plural = "서울시구별집계"
+        managed = True
+        ordering = ['adm_sect_c']
+
+    def __str__(self):
+        return f"{self.district_name} ({self.adm_sect_c})"
+
+
+class BoundarySimplification(models.Model):
+    """행정경계 단순화 피라미드 (구/행정동 경계를 허용오차별로 단순화해 EPSG:4326으로 저장, build_boundary_pyramid 명령으로 생성)"""
+    LAYER_CHOICES = [
+        ('district', '구'),
+        ('dong', '행정동'),
+    ]
+
+    layer = django_models.CharField(max_length=10, choices=LAYER_CHOICES, verbose_name="경계 종류")
+    code = django_models.CharField(max_length=10, verbose_name="행정구역코드", help_text="구: adm_sect_c, 행정동: emd_cd")
+    level = django_models.PositiveSmallIntegerField(verbose_name="단순화 레벨", help_text="0: 원본 정밀도")
+    tolerance_m = django_models.FloatField(verbose_name="허용오차(m)")
+    geom = models.MultiPolygonField(srid=4326, verbose_name="단순화 경계")
+
+    class Meta:
+        db_table = 'boundary_simplified'
+        verbose_name = "행정경계 단순화"
+        verbose_name_plural = "행정경계 단순화"
+        managed = True
+        unique_together = [('layer', 'level', 'code')]
+        ordering = ['layer', 'level', 'code']
+
+    def __str__(self):
+        return f"{self.get_layer_display()} {self.code} (레벨 {self.level}, {self.tolerance_m:g}m)"
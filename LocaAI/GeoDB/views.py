@@ -18,6 +18,7 @@ from .models import (
     EditablePublicBuilding,
     AdministrativeDistrict,
 )
+from .boundary_pyramid import boundary_geojson_sql, level_decimals, level_from_params
 
 
 def is_admin(user):
@@ -85,6 +86,9 @@ def spatial_data_api(request):
                 }
                 for item in data
             ]
+        elif data_type in ("districts", "dongs"):
+            # 단순화 피라미드 경계 (EPSG:4326, zoom 또는 tolerance 파라미터로 레벨 선택, 기본 원본 레벨 0)
+            result = _boundary_rows(data_type, request.GET, limit)
         elif data_type == "life_population":
             data = LifePopGrid.objects.all()[:limit]
             result = [
@@ -108,6 +112,45 @@ def spatial_data_api(request):
         return JsonResponse({"success": False, "error": str(e)})
 
 
+def _boundary_rows(data_type, query, limit):
+    """
+    구/행정동 경계 목록 (code, name, geometry)
+
+    Args:
+        query: request.GET - zoom / tolerance(m) / gu_code(행정동만, 구 코드 접두어)
+    """
+    level = level_from_params(query)
+    if level is None:
+        level = 0
+    params = {"level": level, "decimals": level_decimals(level), "limit": limit}
+    if data_type == "districts":
+        sql = f"""
+            SELECT sd.adm_sect_c, sd.sgg_nm, {boundary_geojson_sql("district", "sd.adm_sect_c", "sd.geom")}
+            FROM seoul_district sd
+            ORDER BY sd.adm_sect_c
+            LIMIT %(limit)s
+        """
+    else:
+        gu_code = query.get("gu_code", "")
+        if gu_code and not gu_code.isdigit():
+            raise ValueError("Invalid gu_code")
+        params["prefix"] = f"{gu_code}%"
+        sql = f"""
+            SELECT ad.emd_cd, ad.emd_kor_nm, {boundary_geojson_sql("dong", "ad.emd_cd", "ad.geom")}
+            FROM "{AdministrativeDistrict._meta.db_table}" ad
+            WHERE ad.emd_cd LIKE %(prefix)s
+            ORDER BY ad.emd_cd
+            LIMIT %(limit)s
+        """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    return [
+        {"code": code, "name": name, "level": level, "geometry": json.loads(geometry) if isinstance(geometry, str) else geometry}
+        for code, name, geometry in rows
+    ]
+
+
 def get_spatial_statistics():
     """공간 데이터 통계 수집"""
     stats = {}
@@ -8,8 +8,11 @@ class ChatbotConfig(AppConfig):
     def ready(self):
         # 서버 시작 시 임베딩 모델, 컬렉션 목록 미리 로딩 (선택적)
         try:
-            from chatbot.utils.qdrant import get_embedding_model, list_all_collections, get_qdrant_client
-            get_embedding_model()
+            from AI_Analyzer.inference_sidecar import sidecar_available
+            from chatbot.utils.qdrant import load_local_embedding_model, list_all_collections, get_qdrant_client
+            # 추론 사이드카가 떠 있으면 임베딩 모델을 워커에 올리지 않음
+            if not sidecar_available():
+                load_local_embedding_model()
             list_all_collections()
             get_qdrant_client()
             print("[OK] 챗봇 시스템 초기화 완료")
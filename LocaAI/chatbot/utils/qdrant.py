@@ -4,6 +4,7 @@ from typing import Any, List
 from qdrant_client import QdrantClient
 from langchain_community.vectorstores import Qdrant
 from langchain_huggingface import HuggingFaceEmbeddings
+from langchain_core.embeddings import Embeddings
 from langchain_core.retrievers import BaseRetriever
 from langchain_core.documents import Document
 from django.conf import settings
@@ -43,9 +44,34 @@ def get_qdrant_client() -> QdrantClient:
     return QdrantClient(url=settings.QDRANT_URL, api_key=settings.QDRANT_API_KEY)
 
 
+class SidecarEmbeddings(Embeddings):
+    """
+    추론 사이드카(AI_Analyzer run_inference_server)의 embed_batch를 쓰는 임베딩
+
+    소켓이 없거나 호출이 실패하면 프로세스 내 HuggingFace 모델을 로드해 사용
+    """
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        from AI_Analyzer.inference_sidecar import SidecarError, get_inference_client
+
+        client = get_inference_client()
+        if client is not None:
+            try:
+                return client.embed_batch(texts).tolist()
+            except SidecarError as e:
+                print(f"⚠️ 추론 서버 임베딩 실패, 프로세스 내 모델 사용: {e}")
+        return load_local_embedding_model().embed_documents(texts)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(list(texts))
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed([text])[0]
+
+
 @lru_cache
-def get_embedding_model() -> HuggingFaceEmbeddings:
-    """HuggingFace 기반 임베딩 모델 로딩"""
+def load_local_embedding_model() -> HuggingFaceEmbeddings:
+    """HuggingFace 기반 임베딩 모델 로딩 (프로세스 내)"""
     return HuggingFaceEmbeddings(
         model_name=settings.RAG_SETTINGS["EMBEDDING_MODEL"],
         model_kwargs={
@@ -54,6 +80,14 @@ def get_embedding_model() -> HuggingFaceEmbeddings:
     )
 
 
+@lru_cache
+def get_embedding_model() -> Embeddings:
+    """임베딩 모델 (추론 사이드카 사용 설정 시 사이드카 우선, 아니면 프로세스 내 모델)"""
+    if settings.ANALYSIS_SETTINGS.get("INFERENCE_SIDECAR", {}).get("ENABLED"):
+        return SidecarEmbeddings()
+    return load_local_embedding_model()
+
+
 def list_all_collections() -> List[str]:
     """Qdrant 서버에 존재하는 모든 컬렉션 이름을 반환"""
     try:
@@ -3,12 +3,15 @@ import os
 import django
 from django.core.asgi import get_asgi_application
 from channels.routing import ProtocolTypeRouter, URLRouter
+from channels.auth import AuthMiddlewareStack
 
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 django.setup()  # ✅ 이 줄 꼭 필요
 from chatbot.routing import websocket_urlpatterns
+from AI_Analyzer.routing import websocket_urlpatterns as analyzer_websocket_urlpatterns
 application = ProtocolTypeRouter({
     "http": get_asgi_application(),
-    "websocket": URLRouter(websocket_urlpatterns),
+    # 분석 작업 진행 스트림은 작업 소유자 확인을 위해 세션 사용자 필요
+    "websocket": AuthMiddlewareStack(URLRouter(websocket_urlpatterns + analyzer_websocket_urlpatterns)),
 })
\ No newline at end of file
@@ -14,9 +14,12 @@ LocaAI Django Settings
 """
 
 import os
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
 from chatbot.rag_settings import RAG_SETTINGS
+from AI_Analyzer.analysis_settings import ANALYSIS_SETTINGS
+from shopdash.dashboard_settings import DASHBOARD_SETTINGS
 import platform
 
 # ============================================================================
@@ -305,7 +308,59 @@ QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
 print(f"[INFO] Qdrant API Key: {'설정됨' if QDRANT_API_KEY else '없음'}")
 
 # Channels (WebSocket) 설정
-CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+# InMemoryChannelLayer는 한 프로세스 안에서만 전달되므로 워커가 여럿이면(uvicorn --workers, 다중 컨테이너)
+# 분석 진행 / AI 설명 스트리밍 이벤트가 다른 워커에 연결된 WebSocket에 닿지 않음
+# → CHANNEL_REDIS_URL 설정 시 Redis 채널 레이어 사용 (pip install channels-redis)
+CHANNEL_REDIS_URL = os.getenv("CHANNEL_REDIS_URL")
+if CHANNEL_REDIS_URL:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.core.RedisChannelLayer",
+            "CONFIG": {"hosts": [CHANNEL_REDIS_URL]},
+        }
+    }
+else:
+    CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+
+# ============================================================================
+# 캐시 설정
+# ============================================================================
+# 워커/관리 명령이 함께 보는 캐시는 기본 파일 캐시(같은 호스트의 모든 프로세스가 공유, model/cache/)
+# 여러 호스트로 배포하면 *_CACHE_BACKEND=django.core.cache.backends.db.DatabaseCache
+# (*_CACHE_LOCATION=테이블명, python manage.py createcachetable 실행) 또는 Redis 백엔드 사용
+# 테스트(manage.py test)에서만 locmem
+TESTING = len(sys.argv) > 1 and sys.argv[1] == "test"
+CACHE_DIR = BASE_DIR / "model" / "cache"
+SHARED_CACHE_BACKEND = (
+    "django.core.cache.backends.locmem.LocMemCache"
+    if TESTING
+    else "django.core.cache.backends.filebased.FileBasedCache"
+)
+
+# 상권분석 피쳐 캐시 (signals.py의 셀 무효화 표시도 같은 백엔드에 저장되므로 모든 프로세스에 반영)
+FEATURE_CACHE = ANALYSIS_SETTINGS["FEATURE_CACHE"]
+EXPLANATION_CACHE = ANALYSIS_SETTINGS["EXPLANATION_CACHE"]
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    # 프로세스 간 공유 상태 (분석 작업 상태 / 비회원 결과 등)
+    "shared": {
+        "BACKEND": os.getenv("SHARED_CACHE_BACKEND", SHARED_CACHE_BACKEND),
+        "LOCATION": os.getenv("SHARED_CACHE_LOCATION", str(CACHE_DIR / "shared")),
+        "TIMEOUT": None,
+    },
+    FEATURE_CACHE["ALIAS"]: {
+        "BACKEND": os.getenv("FEATURE_CACHE_BACKEND", SHARED_CACHE_BACKEND),
+        "LOCATION": os.getenv("FEATURE_CACHE_LOCATION", str(CACHE_DIR / "analysis_features")),
+        "TIMEOUT": FEATURE_CACHE["TTL"],
+        "OPTIONS": {"MAX_ENTRIES": FEATURE_CACHE["MAX_ENTRIES"]},
+    },
+    EXPLANATION_CACHE["ALIAS"]: {
+        "BACKEND": os.getenv("EXPLANATION_CACHE_BACKEND", SHARED_CACHE_BACKEND),
+        "LOCATION": os.getenv("EXPLANATION_CACHE_LOCATION", str(CACHE_DIR / "analysis_explanations")),
+        "TIMEOUT": EXPLANATION_CACHE["TTL"],
+        "OPTIONS": {"MAX_ENTRIES": EXPLANATION_CACHE["MAX_ENTRIES"]},
+    },
+}
 
 # ============================================================================
 # SMTP 메일 서버 설정
@@ -0,0 +1,39 @@
+# LocaAI/shopdash/dashboard_settings.py
+# ✅ 대시보드 설정
+from pathlib import Path
+
+# LocaAI 프로젝트 루트 (settings.BASE_DIR와 동일)
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+DASHBOARD_SETTINGS = {
+    # 구 단위 지도 (api/seoul-districts/) - python manage.py refresh_district_summary 로 집계/GeoJSON 재생성
+    "DISTRICT_CHOROPLETH": {
+        "PATH": str(PROJECT_DIR / "model" / "district_choropleth.geojson.gz"),
+        "COORD_DECIMALS": 2,  # GeoJSON 좌표 소수 자릿수 (EPSG:5186, m 단위)
+        "GZIP_LEVEL": 9,
+    },
+    # 벡터 타일 (tiles/<layer>/<z>/<x>/<y>.pbf) 디스크/LRU 캐시 - 무효화: python manage.py clear_tile_cache
+    "VECTOR_TILES": {
+        "DIR": str(PROJECT_DIR / "model" / "tile_cache"),
+        "EXTENT": 4096,  # 타일 좌표 해상도
+        "BUFFER": 64,  # 타일 경계 버퍼 (extent 단위)
+        "MAX_ZOOM": 20,
+        "LRU_SIZE": 1024,  # 워커별 메모리 타일 수
+        "FILTERED_TTL": 5 * 60,  # 디스크에 쓰지 않는 필터/빈 타일의 메모리 보관 시간(초)
+        "MAX_FILTER_VALUES": 20,  # 필터 하나에 지정할 수 있는 값 개수
+        "FILTER_VALUES_REFRESH_SECONDS": 10 * 60,  # 업종/행정동명 허용 값 목록을 다시 읽는 주기
+        "MAX_AGE": 60 * 60,  # 브라우저 Cache-Control max-age(초)
+    },
+    # 행정동 지도 (api/dong-geojson/) gu_code별 캐시
+    "DONG_GEOJSON": {
+        "TTL": 60 * 60 * 24,  # 초 (적재 명령이 명시적으로 무효화하므로 길게 유지)
+    },
+    # 행정동 점포 지도 (api/dong-stores/) - dong_store.geom_4326 준비: python manage.py prepare_store_points
+    "DONG_STORES": {
+        "PAGE_SIZE": 1000,  # 커서 페이지 기본 크기 (NDJSON 스트리밍 시 DB 조회 단위)
+        "MAX_PAGE_SIZE": 5000,
+        "CLUSTER_MAX_ZOOM": 16,  # 이 줌 미만이면 auto 모드에서 격자 클러스터
+        "CLUSTER_PIXELS": 60,  # 클러스터 격자 한 칸 크기 (화면 px)
+        "SCHEMA_REFRESH_SECONDS": 10 * 60,  # dong_store 컬럼 정보(geom_4326 / result 타입)를 다시 읽는 주기
+    },
+}
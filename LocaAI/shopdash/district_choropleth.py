@@ -0,0 +1,207 @@
+# shopdash/district_choropleth.py
+# 서울시 구 단위 지도(choropleth) - 구별 집계 요약(SeoulDistrictSummary) + 미리 만든 gzip GeoJSON
+#
+# python manage.py refresh_district_summary 가 집계 → GeoJSON → gzip 파일(os.replace로 원자적 교체)까지 생성하고,
+# 요청은 파일 바이트와 강한 ETag를 그대로 반환 (파일 수정시각이 바뀌면 워커가 다시 읽음)
+# zoom/tolerance 요청용으로 단순화 피라미드 레벨별(EPSG:4326) 파일도 함께 생성 (<PATH>.L<레벨>)
+
+import gzip
+import hashlib
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from GeoDB.boundary_pyramid import PYRAMID_LEVELS, boundary_geojson_sql, level_decimals
+from GeoDB.models import SeoulDistrict, SeoulDistrictSummary
+
+
+# 구별 행정동 수 / 생활인구 / 업체 수 / 면적 (집합 쿼리 1회, 업체는 기존과 같이 행정동 이름으로 매칭)
+SUMMARY_SQL = """
+    WITH dongs AS (
+        SELECT LEFT(emd_cd, 5) AS gu, COUNT(*) AS dong_count
+        FROM "행정동구역"
+        GROUP BY 1
+    ),
+    life AS (
+        SELECT LEFT(emd_cd, 5) AS gu, SUM(총생활인구수_sum) AS population
+        FROM dong_life
+        GROUP BY 1
+    ),
+    stores AS (
+        SELECT LEFT(ad.emd_cd, 5) AS gu, COUNT(*) AS businesses
+        FROM dong_store ds
+        JOIN "행정동구역" ad ON ds.emd_kor_nm = ad.emd_kor_nm
+        GROUP BY 1
+    )
+    SELECT sd.adm_sect_c,
+           COALESCE(d.dong_count, 0),
+           COALESCE(l.population, 0)::bigint,
+           COALESCE(s.businesses, 0),
+           ROUND((ST_Area(sd.geom) / 1000000)::numeric, 2)::float8
+    FROM seoul_district sd
+    LEFT JOIN dongs d ON d.gu = sd.adm_sect_c
+    LEFT JOIN life l ON l.gu = sd.adm_sect_c
+    LEFT JOIN stores s ON s.gu = sd.adm_sect_c
+"""
+
+# 요약 + 경계 -> FeatureCollection JSON 텍스트 (기존 응답과 같은 properties, {geometry}는 경계 GeoJSON 식)
+CHOROPLETH_SQL = """
+    SELECT json_build_object(
+        'type', 'FeatureCollection',
+        'features', COALESCE(json_agg(json_build_object(
+            'type', 'Feature',
+            'id', s.adm_sect_c,
+            'properties', json_build_object(
+                'adm_sect_c', s.adm_sect_c,
+                'district_name', s.district_name,
+                'full_name', s.full_name,
+                'dong_count', s.dong_count,
+                'total_population', s.total_population,
+                'total_businesses', s.total_businesses,
+                'area_sqkm', s.area_sqkm
+            ),
+            'geometry', {geometry}
+        ) ORDER BY s.adm_sect_c), '[]'::json)
+    )::text
+    FROM seoul_district_summary s
+    JOIN seoul_district sd ON sd.id = s.district_id
+"""
+
+# 프로세스 단위 캐시: 파일 경로 -> (파일 수정시각, ETag, gzip 바이트)
+_CHOROPLETH: Dict[str, Tuple[int, str, bytes]] = {}
+_LOCK = threading.Lock()
+# 파일이 없을 때 요청 스레드들이 한 번만 생성하도록 직렬화
+_BUILD_LOCK = threading.Lock()
+
+
+def _choropleth_settings() -> Dict[str, Any]:
+    return getattr(settings, "DASHBOARD_SETTINGS", {}).get("DISTRICT_CHOROPLETH", {})
+
+
+def get_choropleth_path(level: Optional[int] = None) -> str:
+    """원본 좌표계 파일 경로 (level이 주어지면 해당 단순화 레벨 파일: district_choropleth.L<레벨>.geojson.gz)"""
+    path = _choropleth_settings().get("PATH") or os.path.join(settings.BASE_DIR, "model", "district_choropleth.geojson.gz")
+    if level is None:
+        return path
+    base, ext = os.path.splitext(path)
+    if ext == ".gz":
+        base, inner = os.path.splitext(base)
+        ext = f"{inner}{ext}"
+    return f"{base}.L{level}{ext}"
+
+
+def refresh_district_summary() -> int:
+    """
+    구별 집계 요약 재계산 (기존 행 교체)
+
+    Returns:
+        int: 저장한 구 수
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(SUMMARY_SQL)
+        stats = {row[0]: row[1:] for row in cursor.fetchall()}
+
+    summaries = []
+    for district in SeoulDistrict.objects.defer("geom"):
+        dong_count, population, businesses, area_sqkm = stats.get(district.adm_sect_c, (0, 0, 0, 0))
+        summaries.append(SeoulDistrictSummary(
+            district=district,
+            adm_sect_c=district.adm_sect_c,
+            district_name=district.district_name_only,
+            full_name=district.sgg_nm,
+            dong_count=int(dong_count),
+            total_population=int(population),
+            total_businesses=int(businesses),
+            area_sqkm=float(area_sqkm or 0),
+        ))
+
+    with transaction.atomic():
+        SeoulDistrictSummary.objects.all().delete()
+        SeoulDistrictSummary.objects.bulk_create(summaries)
+    return len(summaries)
+
+
+def build_district_choropleth(path: Optional[str] = None, level: Optional[int] = None) -> Dict[str, Any]:
+    """
+    집계 요약으로 GeoJSON을 만들어 gzip 파일로 저장 (임시 파일에 쓴 뒤 os.replace)
+
+    Args:
+        level (int, optional): 단순화 피라미드 레벨 - 주어지면 EPSG:4326 단순화 경계, 없으면 원본 좌표계
+
+    Returns:
+        dict: path, features(구 수), raw_bytes, gzip_bytes, etag
+
+    Note:
+        - 요약이 비어 있으면 먼저 refresh_district_summary 실행
+    """
+    if not SeoulDistrictSummary.objects.exists():
+        refresh_district_summary()
+
+    conf = _choropleth_settings()
+    path = path or get_choropleth_path(level)
+    if level is None:
+        geometry = "ST_AsGeoJSON(sd.geom, %(decimals)s)::json"
+        params = {"decimals": int(conf.get("COORD_DECIMALS", 2))}
+    else:
+        geometry = boundary_geojson_sql("district", "sd.adm_sect_c", "sd.geom")
+        params = {"level": level, "decimals": level_decimals(level)}
+    with connection.cursor() as cursor:
+        cursor.execute(CHOROPLETH_SQL.format(geometry=geometry), params)
+        raw = cursor.fetchone()[0].encode("utf-8")
+    # mtime=0으로 고정해 같은 내용이면 같은 바이트/ETag
+    payload = gzip.compress(raw, compresslevel=int(conf.get("GZIP_LEVEL", 9)), mtime=0)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # 동시에 생성하는 다른 프로세스/스레드와 임시 파일이 겹치지 않도록 이름 구분
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return {
+        "path": path,
+        "features": SeoulDistrictSummary.objects.count(),
+        "raw_bytes": len(raw),
+        "gzip_bytes": len(payload),
+        "etag": _etag(payload),
+    }
+
+
+def build_district_choropleths() -> Dict[Optional[int], Dict[str, Any]]:
+    """원본 좌표계 파일과 모든 단순화 레벨 파일 생성 (refresh_district_summary 명령에서 사용)"""
+    levels = [None] + [level for level, _, _ in PYRAMID_LEVELS]
+    return {level: build_district_choropleth(level=level) for level in levels}
+
+
+def _etag(payload: bytes) -> str:
+    return f'"{hashlib.sha256(payload).hexdigest()[:32]}"'
+
+
+def get_district_choropleth(level: Optional[int] = None) -> Tuple[str, bytes]:
+    """
+    미리 만든 gzip GeoJSON과 강한 ETag (level이 주어지면 해당 단순화 레벨 파일)
+
+    Returns:
+        tuple: (ETag, gzip 바이트)
+
+    Note:
+        - 파일이 없으면 한 번 생성 (이후에는 refresh_district_summary 명령으로만 갱신)
+        - 파일 수정시각이 바뀐 경우에만 다시 읽음
+    """
+    path = get_choropleth_path(level)
+    if not os.path.exists(path):
+        with _BUILD_LOCK:
+            if not os.path.exists(path):
+                build_district_choropleth(path, level)
+    mtime = os.stat(path).st_mtime_ns
+
+    with _LOCK:
+        cached = _CHOROPLETH.get(path)
+        if cached is None or cached[0] != mtime:
+            with open(path, "rb") as f:
+                payload = f.read()
+            cached = (mtime, _etag(payload), payload)
+            _CHOROPLETH[path] = cached
+    return cached[1], cached[2]
@@ -0,0 +1,125 @@
+# shopdash/dong_geojson.py
+# 구 단위 행정동 경계 + 통계 GeoJSON (단일 집합 쿼리로 FeatureCollection 생성, gu_code·단순화 레벨별 캐시)
+#
+# dong_store / store_result를 다시 적재하는 관리 명령은 invalidate_dong_geojson()으로 캐시 전체를 무효화
+# (버전 번호는 프로세스 간 공유 캐시 "shared"에 두어 관리 명령의 무효화가 모든 웹 워커에 반영됨,
+#  본문은 워커별 default 캐시에 버전 키로 저장)
+
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import connection
+
+from GeoDB.boundary_pyramid import boundary_geojson_sql, level_decimals
+
+
+CACHE_PREFIX = "shopdash:dong_geojson"
+VERSION_KEY = f"{CACHE_PREFIX}:version"
+
+# 원본 좌표계(EPSG:5186) 응답의 GeoJSON 좌표 소수 자릿수 (cm)
+SOURCE_DECIMALS = 2
+
+# 행정동별 통계를 미리 집계한 뒤 경계와 조인해 FeatureCollection JSON 텍스트 한 행으로 반환
+# (업체 수·업종·생존률은 기존과 같이 행정동 이름(emd_kor_nm) 기준으로 매칭, {geometry}는 경계 GeoJSON 식)
+DONG_GEOJSON_SQL = """
+    WITH dongs AS MATERIALIZED (
+        SELECT emd_cd, emd_kor_nm, emd_eng_nm, geom
+        FROM "행정동구역"
+        WHERE emd_cd LIKE %(prefix)s
+    ),
+    store_types AS (
+        SELECT ds.emd_kor_nm, ds."UPTAENM" AS uptaenm, COUNT(*) AS cnt
+        FROM dong_store ds
+        WHERE ds.emd_kor_nm IN (SELECT emd_kor_nm FROM dongs)
+        GROUP BY ds.emd_kor_nm, ds."UPTAENM"
+    ),
+    store_stats AS (
+        SELECT emd_kor_nm,
+               SUM(cnt) AS total_businesses,
+               (ARRAY_AGG(uptaenm ORDER BY cnt DESC) FILTER (WHERE uptaenm IS NOT NULL))[1] AS top_business_type,
+               MAX(cnt) FILTER (WHERE uptaenm IS NOT NULL) AS top_business_count
+        FROM store_types
+        GROUP BY emd_kor_nm
+    ),
+    survival AS (
+        SELECT sr.emd_kor_nm, AVG(sr.result * 100) AS avg_survival_rate
+        FROM "store_result" sr
+        WHERE sr.emd_kor_nm IN (SELECT emd_kor_nm FROM dongs) AND sr.result IS NOT NULL
+        GROUP BY sr.emd_kor_nm
+    )
+    SELECT json_build_object(
+        'type', 'FeatureCollection',
+        'features', COALESCE(json_agg(json_build_object(
+            'type', 'Feature',
+            'properties', json_build_object(
+                'emd_cd', d.emd_cd,
+                'emd_kor_nm', d.emd_kor_nm,
+                'emd_eng_nm', d.emd_eng_nm,
+                'dong_life', COALESCE(dl.총생활인구수_sum, 0)::bigint,
+                'dong_work', COALESCE(dw.총_직장_인구_수_sum, 0)::bigint,
+                'total_businesses', COALESCE(ss.total_businesses, 0),
+                'avg_survival_rate', ROUND(COALESCE(sv.avg_survival_rate, 0)::numeric, 1),
+                'top_business_type', COALESCE(ss.top_business_type, '정보없음'),
+                'top_business_count', COALESCE(ss.top_business_count, 0)
+            ),
+            'geometry', {geometry}
+        ) ORDER BY d.emd_cd), '[]'::json)
+    )::text
+    FROM dongs d
+    LEFT JOIN dong_life dl ON dl.emd_cd = d.emd_cd
+    LEFT JOIN dong_work dw ON dw.emd_cd = d.emd_cd
+    LEFT JOIN store_stats ss ON ss.emd_kor_nm = d.emd_kor_nm
+    LEFT JOIN survival sv ON sv.emd_kor_nm = d.emd_kor_nm
+"""
+
+
+def _version_cache():
+    return caches["shared"]
+
+
+def _cache_key(gu_code: str, level: Optional[int]) -> str:
+    version = _version_cache().get_or_set(VERSION_KEY, 0, timeout=None)
+    return f"{CACHE_PREFIX}:v{version}:{gu_code}:{'src' if level is None else f'L{level}'}"
+
+
+def build_dong_geojson(gu_code: str, level: Optional[int] = None) -> str:
+    """
+    구 코드의 행정동 FeatureCollection JSON 텍스트 생성 (쿼리 1회)
+
+    Args:
+        gu_code (str): 구 코드 (예: 11110) - emd_cd 접두어로 사용
+        level (int, optional): 단순화 피라미드 레벨 - 주어지면 EPSG:4326 단순화 경계, 없으면 원본 EPSG:5186 경계
+    """
+    if level is None:
+        geometry = f"ST_AsGeoJSON(d.geom, {SOURCE_DECIMALS})::json"
+        params = {"prefix": f"{gu_code}%"}
+    else:
+        geometry = boundary_geojson_sql("dong", "d.emd_cd", "d.geom")
+        params = {"prefix": f"{gu_code}%", "level": level, "decimals": level_decimals(level)}
+    with connection.cursor() as cursor:
+        cursor.execute(DONG_GEOJSON_SQL.format(geometry=geometry), params)
+        return cursor.fetchone()[0]
+
+
+def get_dong_geojson_text(gu_code: str, level: Optional[int] = None) -> str:
+    """캐시된 FeatureCollection JSON 텍스트 (없으면 생성 후 저장)"""
+    key = _cache_key(gu_code, level)
+    payload: Optional[str] = cache.get(key)
+    if payload is None:
+        payload = build_dong_geojson(gu_code, level)
+        ttl = getattr(settings, "DASHBOARD_SETTINGS", {}).get("DONG_GEOJSON", {}).get("TTL", 60 * 60 * 24)
+        cache.set(key, payload, timeout=ttl)
+    return payload
+
+
+def invalidate_dong_geojson():
+    """
+    모든 gu_code의 캐시 무효화 (버전을 현재 시각으로 교체 → 이전 버전 키는 TTL로 만료)
+
+    Note:
+        - dong_store / store_result를 다시 적재하거나 갱신한 뒤 호출
+    """
+    # 증가 대신 시각을 쓰므로 공유 캐시에서 버전 키가 지워졌다 다시 생겨도 이전 번호와 겹치지 않음
+    _version_cache().set(VERSION_KEY, time.time_ns(), timeout=None)
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from shopdash.vector_tiles import TILE_LAYERS, get_tile_dir, invalidate_tiles
+
+
+class Command(BaseCommand):
+    help = '벡터 타일 디스크 캐시 삭제 (다음 요청 시 DB에서 다시 생성)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--layer',
+            action='append',
+            choices=sorted(TILE_LAYERS),
+            help='삭제할 레이어 (여러 번 지정 가능, 생략 시 전체)'
+        )
+
+    def handle(self, *args, **options):
+        removed = invalidate_tiles(options['layer'])
+        if not removed:
+            self.stdout.write(self.style.WARNING(f"삭제할 타일 캐시가 없습니다: {get_tile_dir()}"))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"타일 캐시 삭제 완료: {', '.join(removed)} (실행 중인 워커의 메모리 캐시도 다음 요청 시 무효화)"
+        ))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from shopdash.store_points import prepare_store_points
+from shopdash.vector_tiles import invalidate_tiles
+
+
+class Command(BaseCommand):
+    help = 'dong_store에 EPSG:4326 좌표 컬럼(geom_4326)과 인덱스를 준비하고 비어 있는 행을 채움 (점포 지도 / 점포 타일용)'
+
+    def handle(self, *args, **options):
+        converted = prepare_store_points()
+        invalidate_tiles(["stores"])
+        self.stdout.write(self.style.SUCCESS(
+            f"geom_4326 준비 완료: {converted:,}개 변환 (서울 범위 밖 좌표는 NULL로 남겨 지도에서 제외)"
+        ))
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from shopdash.district_choropleth import (
+    build_district_choropleth,
+    build_district_choropleths,
+    refresh_district_summary,
+)
+from shopdash.vector_tiles import invalidate_tiles
+
+
+class Command(BaseCommand):
+    help = '서울시 구별 집계 요약(행정동 수·생활인구·업체 수·면적)을 재계산하고 구 단위 지도용 gzip GeoJSON을 다시 생성'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            type=str,
+            default=None,
+            help='gzip GeoJSON 경로 (기본값: DASHBOARD_SETTINGS["DISTRICT_CHOROPLETH"]["PATH"])'
+        )
+
+    def handle(self, *args, **options):
+        count = refresh_district_summary()
+        if not count:
+            self.stdout.write(self.style.WARNING('seoul_district 데이터가 없습니다. import_seoul_districts를 먼저 실행하세요.'))
+            return
+        self.stdout.write(f"구별 집계 요약 갱신: {count}개 구")
+
+        if options['output']:
+            info = build_district_choropleth(options['output'])
+        else:
+            built = build_district_choropleths()
+            info = built[None]
+            for level, level_info in built.items():
+                if level is not None:
+                    self.stdout.write(f"  단순화 레벨 {level}: {level_info['path']} (gzip {level_info['gzip_bytes'] / 1024:,.0f}KB)")
+        invalidate_tiles(["districts"])
+        self.stdout.write(self.style.SUCCESS(
+            f"구 단위 GeoJSON 생성 완료: {info['path']} "
+            f"({info['raw_bytes'] / 1024:,.0f}KB → gzip {info['gzip_bytes'] / 1024:,.0f}KB, ETag {info['etag']}) "
+            f"(실행 중인 워커는 다음 요청 시 새 파일을 읽음)"
+        ))
@@ -0,0 +1,299 @@
+# shopdash/store_points.py
+# 행정동 점포 지도 (api/dong-stores/) - 미리 변환한 EPSG:4326 점(dong_store.geom_4326) 기반 격자 클러스터 / 커서 페이지
+#
+# dong_store는 관리 명령이 원시 SQL로 만드는 테이블이라 모델이 없음 → 컬럼/인덱스는 GeoDB 0008 마이그레이션과
+# prepare_store_points(import_dong_store가 테이블을 다시 만든 직후 자동 실행)가 추가
+# geom_4326이 아직 없으면 X/Y(EPSG:2097)를 요청 시 변환하는 식으로 대체
+
+import json
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection
+
+
+# 서울 범위 (EPSG:4326) - 범위 밖으로 변환되는 좌표는 geom_4326을 비워 지도에서 제외
+SEOUL_BOUNDS = (126.7, 37.4, 127.3, 37.7)
+
+# EPSG:3857 한 변 길이(m) - 줌 레벨별 화면 픽셀 크기 계산용
+WEB_MERCATOR_WORLD = 40075016.68557849
+
+# geom_4326이 없을 때 쓰는 요청 시 변환 식
+TRANSFORMED_GEOM_SQL = 'ST_Transform(ST_SetSRID(ST_MakePoint(ds."X", ds."Y"), 2097), 4326)'
+
+# 프로세스 단위 dong_store 스키마 정보 (요청마다 information_schema를 조회하지 않음)
+_SCHEMA: Dict[str, Any] = {"loaded_at": 0.0, "columns": None}
+_SCHEMA_LOCK = threading.Lock()
+
+# 점포 한 건 -> GeoJSON Feature 텍스트 (기존 응답과 같은 properties)
+# {geom}: 4326 점 식, {has_geom}: 지도 표시 가능 조건, {survives}: 생존 여부 불리언 식
+STORE_FEATURE_SQL = """
+    SELECT ds.id,
+           json_build_object(
+               'type', 'Feature',
+               'geometry', ST_AsGeoJSON({geom}, 6)::json,
+               'properties', json_build_object(
+                   '상호명', COALESCE(ds."BPLCNM", ds."UPTAENM", '상호명 미상'),
+                   '업종명', COALESCE(ds."UPTAENM", '업종 미상'),
+                   '주소', COALESCE(ds."SITEWHLADDR", '주소 미상'),
+                   '생존상태', CASE WHEN {survives} THEN '생존 예상' WHEN NOT {survives} THEN '위험' ELSE '분석중' END
+               )
+           )::text
+    FROM dong_store ds
+    WHERE ds.emd_kor_nm = %(emd_kor_nm)s
+      AND ds.id > %(after)s
+      AND {has_geom}
+      AND ds."UPTAENM" IS NOT NULL
+    ORDER BY ds.id
+    LIMIT %(limit)s
+"""
+
+# 화면 격자(cell m, EPSG:3857) 단위 클러스터 -> FeatureCollection 텍스트
+STORE_CLUSTER_SQL = """
+    WITH stores AS (
+        SELECT {geom} AS geom_4326,
+               ST_SnapToGrid(ST_Transform({geom}, 3857), %(cell)s) AS cell,
+               {survives} AS survives
+        FROM dong_store ds
+        WHERE ds.emd_kor_nm = %(emd_kor_nm)s
+          AND {has_geom}
+          AND ds."UPTAENM" IS NOT NULL
+    ),
+    clusters AS (
+        SELECT ST_Centroid(ST_Collect(geom_4326)) AS geom,
+               COUNT(*) AS store_count,
+               COUNT(*) FILTER (WHERE survives) AS survive_count,
+               COUNT(*) FILTER (WHERE NOT survives) AS risk_count,
+               COUNT(*) FILTER (WHERE survives IS NULL) AS unknown_count
+        FROM stores
+        GROUP BY cell
+    )
+    SELECT json_build_object(
+        'type', 'FeatureCollection',
+        'features', COALESCE(json_agg(json_build_object(
+            'type', 'Feature',
+            'geometry', ST_AsGeoJSON(geom, 6)::json,
+            'properties', json_build_object(
+                'cluster', true,
+                'count', store_count,
+                'survive_count', survive_count,
+                'risk_count', risk_count,
+                'unknown_count', unknown_count,
+                'survival_rate', ROUND(100.0 * survive_count / NULLIF(survive_count + risk_count, 0), 1)
+            )
+        ) ORDER BY store_count DESC), '[]'::json)
+    )::text,
+    COALESCE(SUM(store_count), 0)
+    FROM clusters
+"""
+
+
+def _store_settings() -> Dict[str, Any]:
+    return getattr(settings, "DASHBOARD_SETTINGS", {}).get("DONG_STORES", {})
+
+
+def cluster_max_zoom() -> int:
+    """이 줌 미만이면 auto 모드에서 클러스터 응답"""
+    return int(_store_settings().get("CLUSTER_MAX_ZOOM", 16))
+
+
+def page_size(requested: Optional[str] = None) -> int:
+    """
+    페이지 크기 (요청값은 MAX_PAGE_SIZE로 제한)
+
+    Raises:
+        ValueError: 숫자가 아니거나 1 미만인 경우
+    """
+    conf = _store_settings()
+    if requested in (None, ""):
+        return int(conf.get("PAGE_SIZE", 1000))
+    size = int(requested)
+    if size < 1:
+        raise ValueError("limit은 1 이상이어야 합니다.")
+    return min(size, int(conf.get("MAX_PAGE_SIZE", 5000)))
+
+
+def prepare_store_points() -> int:
+    """
+    dong_store.geom_4326 컬럼/인덱스 준비 및 비어 있는 행 채우기
+
+    Returns:
+        int: 새로 변환한 행 수
+
+    Note:
+        - X/Y(EPSG:2097)를 4326으로 한 번만 변환해 저장 (요청마다 변환하지 않음)
+        - 서울 범위 밖으로 변환되는 좌표는 NULL로 남겨 조회에서 제외
+        - (emd_kor_nm, id) 인덱스로 행정동별 커서 페이지를 인덱스 순서대로 조회
+    """
+    with connection.cursor() as cursor:
+        cursor.execute('ALTER TABLE dong_store ADD COLUMN IF NOT EXISTS geom_4326 geometry(Point, 4326)')
+        cursor.execute(
+            """
+            UPDATE dong_store
+            SET geom_4326 = p.geom
+            FROM (
+                SELECT id, ST_Transform(ST_SetSRID(ST_MakePoint("X", "Y"), 2097), 4326) AS geom
+                FROM dong_store
+                WHERE geom_4326 IS NULL AND "X" IS NOT NULL AND "Y" IS NOT NULL
+            ) p
+            WHERE dong_store.id = p.id
+              AND p.geom && ST_MakeEnvelope(%s, %s, %s, %s, 4326)
+            """,
+            list(SEOUL_BOUNDS),
+        )
+        updated = cursor.rowcount
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_dong_store_geom_4326 ON dong_store USING GIST (geom_4326)')
+        cursor.execute(
+            'CREATE INDEX IF NOT EXISTS idx_dong_store_emd_kor_nm_id ON dong_store (emd_kor_nm, id) '
+            'WHERE geom_4326 IS NOT NULL'
+        )
+        cursor.execute('ANALYZE dong_store')
+    store_columns(refresh=True)
+    return updated
+
+
+def store_columns(refresh: bool = False) -> Dict[str, str]:
+    """
+    dong_store의 geom_4326 / result 컬럼 타입 (프로세스 단위 캐시)
+
+    Returns:
+        dict: {컬럼명: data_type} - 없는 컬럼은 빠짐
+
+    Note:
+        - SCHEMA_REFRESH_SECONDS마다 다시 조회 (다른 프로세스의 prepare_store_points / 테이블 재생성 반영)
+    """
+    refresh_seconds = _store_settings().get("SCHEMA_REFRESH_SECONDS", 10 * 60)
+    with _SCHEMA_LOCK:
+        columns = _SCHEMA["columns"]
+        if columns is not None and not refresh and time.time() - _SCHEMA["loaded_at"] < refresh_seconds:
+            return columns
+
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT column_name, data_type FROM information_schema.columns
+            WHERE table_name = 'dong_store' AND column_name IN ('geom_4326', 'result')
+        """)
+        columns = dict(cursor.fetchall())
+    with _SCHEMA_LOCK:
+        _SCHEMA["columns"] = columns
+        _SCHEMA["loaded_at"] = time.time()
+    return columns
+
+
+def has_store_geom() -> bool:
+    """미리 변환한 geom_4326 컬럼 사용 가능 여부"""
+    return "geom_4326" in store_columns()
+
+
+def _store_sql(template: str) -> str:
+    """
+    점포 SQL 템플릿에 좌표/생존 여부 식 채우기
+
+    Note:
+        - 생존 여부는 rescore_stores의 동기화와 같은 기준 (불리언은 그대로, 숫자는 0.5 이상이면 생존)
+        - geom_4326이 없으면 X/Y를 변환하고 서울 범위로 직접 거름
+    """
+    columns = store_columns()
+    result_type = columns.get("result")
+    if result_type == "boolean":
+        survives = 'ds."result"'
+    elif result_type in ("smallint", "integer", "bigint", "real", "double precision", "numeric"):
+        survives = '(ds."result" >= 0.5)'
+    else:
+        survives = "NULL::boolean"
+
+    if "geom_4326" in columns:
+        geom, has_geom = "ds.geom_4326", "ds.geom_4326 IS NOT NULL"
+    else:
+        geom = TRANSFORMED_GEOM_SQL
+        has_geom = (
+            f'ds."X" IS NOT NULL AND ds."Y" IS NOT NULL '
+            f'AND {geom} && ST_MakeEnvelope({", ".join(str(v) for v in SEOUL_BOUNDS)}, 4326)'
+        )
+    return template.format(geom=geom, has_geom=has_geom, survives=survives)
+
+
+def get_dong_name(emd_cd: str) -> Optional[str]:
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT emd_kor_nm FROM "행정동구역" WHERE emd_cd = %s', [emd_cd])
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def fetch_store_page(emd_kor_nm: str, after: int, limit: int) -> Tuple[List[str], Optional[int]]:
+    """
+    id 기준 커서 페이지 (OFFSET 없이 마지막 id 다음부터 조회)
+
+    Returns:
+        tuple: (Feature JSON 텍스트 목록, 다음 커서 - 마지막 페이지면 None)
+    """
+    query = _store_sql(STORE_FEATURE_SQL)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            query,
+            {"emd_kor_nm": emd_kor_nm, "after": after, "limit": limit + 1},
+        )
+        rows = cursor.fetchall()
+    next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+    return [feature for _, feature in rows[:limit]], next_cursor
+
+
+def store_page_text(emd_kor_nm: str, after: int, limit: int) -> str:
+    """한 페이지 FeatureCollection 텍스트 (기존 응답 필드 + next_cursor)"""
+    features, next_cursor = fetch_store_page(emd_kor_nm, after, limit)
+    meta = json.dumps({
+        "dong_name": emd_kor_nm,
+        "total_stores": len(features),
+        "next_cursor": next_cursor,
+        "mode": "points",
+    }, ensure_ascii=False)
+    return f'{{"type": "FeatureCollection", "features": [{", ".join(features)}], {meta[1:]}'
+
+
+async def aiter_store_features(emd_kor_nm: str, after: int = 0) -> AsyncIterator[str]:
+    """
+    행정동 전체 점포를 페이지 단위로 조회하며 한 줄에 Feature 하나씩 생성 (NDJSON / GeoJSON-seq)
+
+    Note:
+        - 메모리에는 한 페이지(PAGE_SIZE)만 유지
+        - ASGI 핸들러는 동기 이터레이터를 끝까지 읽은 뒤 전송하므로, 페이지 조회만 sync_to_async로 실행하고
+          페이지가 나올 때마다 바로 전송
+    """
+    limit = page_size()
+    fetch_page = sync_to_async(fetch_store_page)
+    while True:
+        features, next_cursor = await fetch_page(emd_kor_nm, after, limit)
+        for feature in features:
+            yield f"{feature}\n"
+        if next_cursor is None:
+            return
+        after = next_cursor
+
+
+def store_clusters_text(emd_kor_nm: str, zoom: float) -> str:
+    """
+    줌 레벨 화면 격자(CLUSTER_PIXELS px) 단위 점포 클러스터 FeatureCollection 텍스트
+
+    Note:
+        - 클러스터별 점포 수와 생존 예상 / 위험 / 분석중 구성, 생존률(%)
+    """
+    pixels = int(_store_settings().get("CLUSTER_PIXELS", 60))
+    cell = WEB_MERCATOR_WORLD / (2 ** zoom) / 256 * pixels
+    query = _store_sql(STORE_CLUSTER_SQL)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            query,
+            {"emd_kor_nm": emd_kor_nm, "cell": cell},
+        )
+        collection, total = cursor.fetchone()
+    meta = json.dumps({
+        "dong_name": emd_kor_nm,
+        "total_stores": int(total),
+        "next_cursor": None,
+        "mode": "clusters",
+        "zoom": zoom,
+    }, ensure_ascii=False)
+    return f"{collection[:-1]}, {meta[1:]}"
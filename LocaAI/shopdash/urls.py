@@ -20,4 +20,5 @@ urlpatterns = [
     path('api/seoul-districts/', views.get_seoul_districts_geojson, name='seoul_districts_geojson'),
     path('api/dong-geojson/', views.get_dong_geojson, name='dong_geojson'),
     path('api/dong-stores/', views.get_dong_stores, name='dong_stores'),
+    path('tiles/<str:layer>/<int:z>/<int:x>/<int:y>.pbf', views.vector_tile, name='vector_tile'),
 ] 
\ No newline at end of file
@@ -0,0 +1,398 @@
+# shopdash/vector_tiles.py
+# 대시보드 지도용 Mapbox Vector Tile (ST_AsMVT / ST_AsMVTGeom) + 디스크/LRU 타일 캐시
+#
+# 캐시 구조 (VECTOR_TILES["DIR"]):
+#   <layer>/<z>/<x>/<y>.pbf          <- 필터 없고 내용이 있는 서울 범위 타일만 디스크에 저장
+# 속성 필터(업종 등)가 있는 타일과 빈 타일은 워커 메모리 LRU에만 FILTERED_TTL 동안 보관 (임의 요청으로 디스크가 늘지 않도록)
+# 워커는 최근 타일을 메모리 LRU에 두고 파일 수정시각으로 검증하므로, 디렉터리를 지우면 모든 워커에서 무효화됨
+# 무효화: python manage.py clear_tile_cache [--layer ...] 또는 데이터 적재 명령의 invalidate_tiles()
+
+import hashlib
+import math
+import os
+import re
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection
+
+from .store_points import has_store_geom
+
+
+# EPSG:3857 한 변 길이(m), 서울 위도(약 37.5°)에서 3857 → 실제 거리 배율
+WEB_MERCATOR_WORLD = 40075016.68557849
+SEOUL_SCALE = 0.79
+# 서울 범위 (경도 최소, 위도 최소, 경도 최대, 위도 최대) - 밖의 타일은 DB/캐시 없이 빈 타일
+SEOUL_BOUNDS = (126.7, 37.4, 127.3, 37.7)
+
+# 필터 허용 값: 구 코드는 5자리 형식, 업종/행정동명은 DB에 있는 값만
+FILTER_VALUE_PATTERNS = {
+    "gu_code": re.compile(r"^\d{5}$"),
+}
+FILTER_VALUE_SQL = {
+    "uptaenm": "SELECT name FROM business_type",
+    "emd_kor_nm": 'SELECT DISTINCT emd_kor_nm FROM "행정동구역" WHERE emd_kor_nm IS NOT NULL',
+}
+
+# 레이어 정의
+#   from: FROM 절, geom: 지오메트리 SQL 식, srid: 원본 좌표계
+#   bbox: 타일 범위 조건 ({env}는 원본 좌표계 타일 범위) - 공간 인덱스를 쓰도록 && 사용
+#   attributes: 항상 포함, detail_attributes: detail_zoom 이상에서만 포함
+#   filters: 쿼리 파라미터명 -> SQL 식 (여러 값이면 OR)
+TILE_LAYERS: Dict[str, Dict[str, Any]] = {
+    "districts": {
+        "from": "seoul_district sd LEFT JOIN seoul_district_summary s ON s.district_id = sd.id",
+        "geom": "sd.geom",
+        "srid": 5186,
+        "polygon": True,
+        "bbox": "sd.geom && {env}",
+        "min_zoom": 0,
+        "max_zoom": 16,
+        "attributes": {
+            "adm_sect_c": "sd.adm_sect_c",
+            "district_name": "s.district_name",
+        },
+        "detail_zoom": 10,
+        "detail_attributes": {
+            "dong_count": "s.dong_count",
+            "total_population": "s.total_population",
+            "total_businesses": "s.total_businesses",
+            "area_sqkm": "s.area_sqkm",
+        },
+        "filters": {},
+    },
+    "dongs": {
+        "from": '"행정동구역" ad',
+        "geom": "ad.geom",
+        "srid": 5186,
+        "polygon": True,
+        "bbox": "ad.geom && {env}",
+        "min_zoom": 10,
+        "max_zoom": 18,
+        "attributes": {
+            "emd_cd": "ad.emd_cd",
+            "emd_kor_nm": "ad.emd_kor_nm",
+        },
+        "detail_zoom": 13,
+        "detail_attributes": {
+            "emd_eng_nm": "ad.emd_eng_nm",
+        },
+        "filters": {"gu_code": "LEFT(ad.emd_cd, 5)"},
+    },
+    # dong_store는 미리 변환한 geom_4326(서울 범위 밖 좌표는 NULL) 사용,
+    # 컬럼이 아직 없으면 fallback(X/Y EPSG:2097 좌표 범위 조건)으로 대체
+    "stores": {
+        "from": "dong_store ds",
+        "geom": "ds.geom_4326",
+        "srid": 4326,
+        "polygon": False,
+        "bbox": "ds.geom_4326 && {env}",
+        "min_zoom": 14,
+        "max_zoom": 20,
+        "attributes": {
+            "uptaenm": 'ds."UPTAENM"',
+            "result": 'ds."result"',
+        },
+        "detail_zoom": 16,
+        "detail_attributes": {
+            "bplcnm": 'ds."BPLCNM"',
+            "address": 'ds."SITEWHLADDR"',
+        },
+        "filters": {"uptaenm": 'ds."UPTAENM"', "emd_kor_nm": "ds.emd_kor_nm"},
+        "fallback": {
+            "geom": 'ST_SetSRID(ST_MakePoint(ds."X", ds."Y"), 2097)',
+            "srid": 2097,
+            "bbox": 'ds."X" BETWEEN ST_XMin({env}) AND ST_XMax({env}) AND ds."Y" BETWEEN ST_YMin({env}) AND ST_YMax({env})',
+        },
+    },
+    "store_results": {
+        "from": "store_result sr",
+        "geom": "sr.geom",
+        "srid": 5186,
+        "polygon": False,
+        "bbox": "sr.geom && {env}",
+        "min_zoom": 13,
+        "max_zoom": 20,
+        "attributes": {
+            "uptaenm": "sr.uptaenm",
+            "survival_percentage": "ROUND((sr.result * 100)::numeric, 1)",
+        },
+        "detail_zoom": 16,
+        "detail_attributes": {
+            "area": "sr.area",
+            "emd_kor_nm": "sr.emd_kor_nm",
+        },
+        "filters": {"uptaenm": "sr.uptaenm", "emd_kor_nm": "sr.emd_kor_nm"},
+    },
+}
+
+# 프로세스 단위 타일 LRU: 경로 -> (파일 수정시각, 타일 바이트)
+_TILE_LRU: "OrderedDict[str, Tuple[int, bytes]]" = OrderedDict()
+# 디스크에 쓰지 않는 타일(필터/빈 타일) LRU: 경로 -> (만료 시각, 타일 바이트)
+_MEMORY_LRU: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+_LOCK = threading.Lock()
+# 필터별 허용 값: 필터명 -> (조회 시각, 값 집합)
+_KNOWN_VALUES: Dict[str, Tuple[float, frozenset]] = {}
+
+
+class TileError(Exception):
+    """잘못된 타일 요청 (레이어/좌표/필터)"""
+
+
+def _tile_settings() -> Dict[str, Any]:
+    return getattr(settings, "DASHBOARD_SETTINGS", {}).get("VECTOR_TILES", {})
+
+
+def get_tile_dir() -> str:
+    return _tile_settings().get("DIR") or os.path.join(settings.BASE_DIR, "model", "tile_cache")
+
+
+def known_filter_values(name: str) -> frozenset:
+    """업종명/행정동명 필터의 허용 값 (워커별로 FILTER_VALUES_REFRESH_SECONDS 동안 캐시)"""
+    refresh_seconds = _tile_settings().get("FILTER_VALUES_REFRESH_SECONDS", 10 * 60)
+    cached = _KNOWN_VALUES.get(name)
+    if cached is not None and time.time() - cached[0] < refresh_seconds:
+        return cached[1]
+    with connection.cursor() as cursor:
+        cursor.execute(FILTER_VALUE_SQL[name])
+        values = frozenset(row[0] for row in cursor.fetchall())
+    _KNOWN_VALUES[name] = (time.time(), values)
+    return values
+
+
+def parse_tile_filters(layer: str, query) -> Dict[str, List[str]]:
+    """
+    쿼리 파라미터 중 레이어가 지원하는 속성 필터만 추출
+
+    Args:
+        query: request.GET (QueryDict) - ?uptaenm=한식&uptaenm=카페 처럼 여러 값 가능
+
+    Raises:
+        TileError: 허용되지 않은 필터 값이거나 값 개수가 MAX_FILTER_VALUES를 넘을 때
+    """
+    max_values = int(_tile_settings().get("MAX_FILTER_VALUES", 20))
+    filters = {}
+    for name in TILE_LAYERS[layer]["filters"]:
+        values = sorted({v for v in query.getlist(name) if v})
+        if not values:
+            continue
+        if len(values) > max_values:
+            raise TileError(f"{name} 필터는 최대 {max_values}개 값까지 지정할 수 있습니다.")
+        if name in FILTER_VALUE_PATTERNS:
+            invalid = [v for v in values if not FILTER_VALUE_PATTERNS[name].match(v)]
+        else:
+            invalid = sorted(set(values) - known_filter_values(name))
+        if invalid:
+            raise TileError(f"알 수 없는 {name} 값: {', '.join(invalid[:5])}")
+        filters[name] = values
+    return filters
+
+
+def seoul_tile_range(z: int) -> Tuple[int, int, int, int]:
+    """줌 z에서 서울 범위를 덮는 타일 좌표 범위 (x_min, y_min, x_max, y_max)"""
+    def tile_xy(lon: float, lat: float) -> Tuple[int, int]:
+        n = 2 ** z
+        lat_rad = math.radians(lat)
+        x = int((lon + 180.0) / 360.0 * n)
+        y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+        return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+    min_lon, min_lat, max_lon, max_lat = SEOUL_BOUNDS
+    x_min, y_min = tile_xy(min_lon, max_lat)
+    x_max, y_max = tile_xy(max_lon, min_lat)
+    return x_min, y_min, x_max, y_max
+
+
+def build_tile_query(layer: str, z: int, filters: Dict[str, List[str]]) -> str:
+    """
+    레이어 타일 SQL 생성 (파라미터: z, x, y, extent, buffer, margin, tolerance, 필터명)
+
+    Note:
+        - 폴리곤은 원본 좌표계에서 줌 레벨 픽셀 크기로 단순화한 뒤 3857로 변환 (낮은 줌일수록 꼭짓점 감소)
+        - 속성은 detail_zoom 이상에서만 상세 컬럼을 포함해 낮은 줌 타일 크기를 줄임
+    """
+    spec = TILE_LAYERS[layer]
+    if "fallback" in spec and not has_store_geom():
+        spec = {**spec, **spec["fallback"]}
+    attributes = dict(spec["attributes"])
+    if z >= spec["detail_zoom"]:
+        attributes.update(spec["detail_attributes"])
+    columns = ", ".join(f'{expr} AS "{name}"' for name, expr in attributes.items())
+
+    geom = spec["geom"]
+    if spec["polygon"]:
+        geom = f"ST_SimplifyPreserveTopology({geom}, %(tolerance)s)"
+
+    env = f"(SELECT ST_Transform(env_margin, {spec['srid']}) FROM bounds)"
+    conditions = [spec["bbox"].format(env=env)]
+    conditions.extend(f"{spec['filters'][name]} = ANY(%({name})s)" for name in filters)
+
+    return f"""
+        WITH bounds AS MATERIALIZED (
+            SELECT ST_TileEnvelope(%(z)s, %(x)s, %(y)s) AS env,
+                   ST_TileEnvelope(%(z)s, %(x)s, %(y)s, margin => %(margin)s) AS env_margin
+        ),
+        features AS (
+            SELECT ST_AsMVTGeom(
+                       ST_Transform({geom}, 3857), (SELECT env FROM bounds), %(extent)s, %(buffer)s, true
+                   ) AS geom,
+                   {columns}
+            FROM {spec["from"]}
+            WHERE {" AND ".join(conditions)}
+        )
+        SELECT ST_AsMVT(features.*, '{layer}', %(extent)s, 'geom')
+        FROM features
+        WHERE geom IS NOT NULL
+    """
+
+
+def render_tile(layer: str, z: int, x: int, y: int, filters: Dict[str, List[str]]) -> bytes:
+    """DB에서 타일 한 장 생성 (내용이 없으면 빈 바이트)"""
+    conf = _tile_settings()
+    extent = int(conf.get("EXTENT", 4096))
+    buffer = int(conf.get("BUFFER", 64))
+    params = {
+        "z": z, "x": x, "y": y,
+        "extent": extent,
+        "buffer": buffer,
+        "margin": buffer / extent,
+        # 화면 픽셀(256px) 하나에 해당하는 원본 좌표계 거리
+        "tolerance": WEB_MERCATOR_WORLD / (2 ** z) / 256 * SEOUL_SCALE,
+        **filters,
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(build_tile_query(layer, z, filters), params)
+        row = cursor.fetchone()
+    return bytes(row[0]) if row and row[0] else b""
+
+
+def tile_path(layer: str, z: int, x: int, y: int, filters: Dict[str, List[str]]) -> str:
+    name = str(y)
+    if filters:
+        digest = hashlib.sha1(repr(sorted(filters.items())).encode("utf-8")).hexdigest()[:12]
+        name = f"{y}-{digest}"
+    return os.path.join(get_tile_dir(), layer, str(z), str(x), f"{name}.pbf")
+
+
+def _lru_get(path: str) -> Optional[bytes]:
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        with _LOCK:
+            _TILE_LRU.pop(path, None)
+        return None
+
+    with _LOCK:
+        cached = _TILE_LRU.get(path)
+        if cached is not None and cached[0] == mtime:
+            _TILE_LRU.move_to_end(path)
+            return cached[1]
+
+    with open(path, "rb") as f:
+        payload = f.read()
+    _lru_put(path, mtime, payload)
+    return payload
+
+
+def _lru_put(path: str, mtime: int, payload: bytes):
+    max_entries = int(_tile_settings().get("LRU_SIZE", 1024))
+    with _LOCK:
+        _TILE_LRU[path] = (mtime, payload)
+        _TILE_LRU.move_to_end(path)
+        while len(_TILE_LRU) > max_entries:
+            _TILE_LRU.popitem(last=False)
+
+
+def _memory_get(path: str) -> Optional[bytes]:
+    with _LOCK:
+        cached = _MEMORY_LRU.get(path)
+        if cached is None:
+            return None
+        if cached[0] < time.time():
+            _MEMORY_LRU.pop(path, None)
+            return None
+        _MEMORY_LRU.move_to_end(path)
+        return cached[1]
+
+
+def _memory_put(path: str, payload: bytes):
+    conf = _tile_settings()
+    max_entries = int(conf.get("LRU_SIZE", 1024))
+    with _LOCK:
+        _MEMORY_LRU[path] = (time.time() + conf.get("FILTERED_TTL", 5 * 60), payload)
+        _MEMORY_LRU.move_to_end(path)
+        while len(_MEMORY_LRU) > max_entries:
+            _MEMORY_LRU.popitem(last=False)
+
+
+def get_tile(layer: str, z: int, x: int, y: int, filters: Optional[Dict[str, List[str]]] = None) -> bytes:
+    """
+    타일 조회 (LRU → 디스크 캐시 → DB 순)
+
+    Raises:
+        TileError: 없는 레이어 또는 범위를 벗어난 타일 좌표
+
+    Note:
+        - 레이어 줌 범위나 서울 범위 밖이면 DB 조회 없이 빈 타일
+        - 디스크에는 필터 없고 내용이 있는 타일만 저장 (디스크 크기는 서울 범위 타일 수로 제한됨)
+        - 필터 타일과 빈 타일은 메모리 LRU에만 FILTERED_TTL 동안 보관
+    """
+    if layer not in TILE_LAYERS:
+        raise TileError(f"알 수 없는 레이어: {layer}")
+    if not (0 <= z <= int(_tile_settings().get("MAX_ZOOM", 22)) and 0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise TileError(f"잘못된 타일 좌표: {z}/{x}/{y}")
+    spec = TILE_LAYERS[layer]
+    if not spec["min_zoom"] <= z <= spec["max_zoom"]:
+        return b""
+    x_min, y_min, x_max, y_max = seoul_tile_range(z)
+    if not (x_min <= x <= x_max and y_min <= y <= y_max):
+        return b""
+
+    filters = filters or {}
+    path = tile_path(layer, z, x, y, filters)
+    payload = _memory_get(path)
+    if payload is None and not filters:
+        payload = _lru_get(path)
+    if payload is not None:
+        return payload
+
+    payload = render_tile(layer, z, x, y, filters)
+    if filters or not payload:
+        _memory_put(path, payload)
+        return payload
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+    _lru_put(path, os.stat(path).st_mtime_ns, payload)
+    return payload
+
+
+def invalidate_tiles(layers: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    레이어 타일 캐시 삭제 (생략 시 전체)
+
+    Returns:
+        list: 삭제한 레이어명
+
+    Note:
+        - 다른 워커의 LRU 항목은 다음 조회 때 파일이 없으므로 자동으로 버려짐
+    """
+    layers = list(layers) if layers is not None else list(TILE_LAYERS)
+    removed = []
+    for layer in layers:
+        layer_dir = os.path.join(get_tile_dir(), layer)
+        if os.path.isdir(layer_dir):
+            shutil.rmtree(layer_dir, ignore_errors=True)
+            removed.append(layer)
+    prefixes = tuple(os.path.join(get_tile_dir(), layer, "") for layer in layers)
+    with _LOCK:
+        for lru in (_TILE_LRU, _MEMORY_LRU):
+            for path in [path for path in lru if path.startswith(prefixes)]:
+                lru.pop(path, None)
+    return removed
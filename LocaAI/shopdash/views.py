@@ -1,10 +1,26 @@
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.utils.http import parse_etags
 from django.db.models import Sum, Count, Avg, Q
 from django.db import connection
+from django.conf import settings
 from AI_Analyzer.models import AnalysisResult, BusinessType
+from AI_Analyzer.layer_registry import layer_row_estimate
+from GeoDB.boundary_pyramid import level_from_params
 from GeoDB.models import StoreResult
-import json
+from .district_choropleth import get_district_choropleth
+from .dong_geojson import get_dong_geojson_text
+from .store_points import (
+    aiter_store_features,
+    cluster_max_zoom,
+    get_dong_name,
+    page_size,
+    store_clusters_text,
+    store_page_text,
+)
+from .vector_tiles import TILE_LAYERS, TileError, get_tile, parse_tile_filters
+import gzip
+from urllib.parse import quote
 
 
 def dashboard_view(request):
@@ -371,11 +387,8 @@ def dashboard_stats(request):
             """)
             avg_survival_rate = cursor.fetchone()[0]
             
-            # 서울시 전체 업소 수 (store_point_5186 전체 행 수)
-            cursor.execute("""
-                SELECT COUNT(*) FROM "store_point_5186"
-            """)
-            total_businesses = cursor.fetchone()[0]
+            # 서울시 전체 업소 수 (store_point_5186 행 수 추정치, 레이어 레지스트리)
+            total_businesses = layer_row_estimate("store", cursor)
             
             # 분석이 이루어진 활발 지역 수
             cursor.execute("""
@@ -386,16 +399,9 @@ def dashboard_stats(request):
             """)
             active_districts = cursor.fetchone()[0]
             
-            # 추가 통계: 전체 데이터 기반
-            cursor.execute("""
-                SELECT COUNT(*) FROM "public_5186"
-            """)
-            total_public = cursor.fetchone()[0]
-            
-            cursor.execute("""
-                SELECT COUNT(*) FROM "school_5186"
-            """)
-            total_schools = cursor.fetchone()[0]
+            # 추가 통계: 공공건물/학교 행 수 추정치 (레이어 레지스트리)
+            total_public = layer_row_estimate("public", cursor)
+            total_schools = layer_row_estimate("school", cursor)
             
             stats = {
                 'total_analysis': int(total_analysis) if total_analysis else 0,
@@ -583,13 +589,8 @@ def district_data(request):
             
             districts = cursor.fetchall()
             
-            # 업체 수 데이터 (대략적인 추정)
-            cursor.execute("""
-                SELECT COUNT(*) as total_businesses
-                FROM "store_point_5186"
-            """)
-            
-            total_businesses = cursor.fetchone()[0]
+            # 업체 수 데이터 (대략적인 추정, 레이어 레지스트리)
+            total_businesses = layer_row_estimate("store", cursor)
             businesses_per_district = total_businesses // 25  # 25개구 평균
             
         district_data = {}
@@ -663,18 +664,12 @@ def get_geometry_data(request):
     """지오메트리 데이터 API - 전체 공간 데이터 통계"""
     try:
         with connection.cursor() as cursor:
-            # 전체 공간 데이터 테이블들의 통계 (빠른 조회)
-            spatial_tables = [
-                'store_point_5186',
-                'public_5186',
-                'school_5186'
-            ]
-            
-            table_stats = {}
-            for table in spatial_tables:
-                cursor.execute(f'SELECT COUNT(*) FROM "{table}"')
-                count = cursor.fetchone()[0]
-                table_stats[table] = count
+            # 전체 공간 데이터 테이블들의 행 수 추정치 (레이어 레지스트리)
+            table_stats = {
+                'store_point_5186': layer_row_estimate('store', cursor),
+                'public_5186': layer_row_estimate('public', cursor),
+                'school_5186': layer_row_estimate('school', cursor),
+            }
             
             # 서울시 전체 업종별 상점 분포 (상위 5개)
             cursor.execute("""
@@ -721,64 +716,38 @@ def get_geometry_data(request):
 
 
 def get_seoul_districts_geojson(request):
-    """서울시 구별 경계면 벡터 타일 데이터 API"""
+    """
+    서울시 구별 경계면 GeoJSON API (refresh_district_summary 명령으로 미리 만든 gzip 파일 전송)
+
+    Note:
+        - 강한 ETag + If-None-Match → 변경이 없으면 304 (본문 없음)
+        - gzip을 받지 않는 클라이언트에만 압축을 풀어 전송 (ETag도 표현별로 구분)
+        - zoom 또는 tolerance(m) 파라미터가 있으면 해당 단순화 레벨의 EPSG:4326 경계, 없으면 기존 원본 좌표계
+    """
     try:
-        from GeoDB.models import SeoulDistrict
-        from django.contrib.gis.serializers import geojson
-        from django.db.models import Count, Sum
-        
-        # 구별 데이터 조회
-        districts = SeoulDistrict.objects.all().order_by('adm_sect_c')
-        
-        features = []
-        for district in districts:
-            # 해당 구의 행정동 수 계산 (간단한 쿼리)
-            with connection.cursor() as cursor:
-                # 행정동 수 계산
-                cursor.execute("""
-                    SELECT COUNT(*) FROM "행정동구역" 
-                    WHERE emd_cd LIKE %s
-                """, [f"{district.adm_sect_c}%"])
-                dong_count = cursor.fetchone()[0] or 0
-                
-                # 인구 수 계산
-                cursor.execute("""
-                    SELECT COALESCE(SUM(총생활인구수_sum), 0) FROM dong_life 
-                    WHERE emd_cd LIKE %s
-                """, [f"{district.adm_sect_c}%"])
-                total_population = int(cursor.fetchone()[0] or 0)
-                
-                # 실제 업체 수 계산 (dong_store 테이블에서 COUNT)
-                cursor.execute("""
-                    SELECT COUNT(*) FROM dong_store ds
-                    JOIN "행정동구역" ad ON ds.emd_kor_nm = ad.emd_kor_nm
-                    WHERE ad.emd_cd LIKE %s
-                """, [f"{district.adm_sect_c}%"])
-                total_businesses = int(cursor.fetchone()[0] or 0)
-            
-            # GeoJSON Feature 생성 (원본 좌표계 사용)
-            feature = {
-                "type": "Feature",
-                "id": district.adm_sect_c,  # 벡터 타일용 ID 추가
-                "properties": {
-                    "adm_sect_c": district.adm_sect_c,
-                    "district_name": district.district_name_only,
-                    "full_name": district.sgg_nm,
-                    "dong_count": dong_count,
-                    "total_population": total_population,
-                    "total_businesses": total_businesses,
-                    "area_sqkm": district.area_sqkm
-                },
-                "geometry": json.loads(district.geom.geojson)
-            }
-            features.append(feature)
-        
-        geojson_data = {
-            "type": "FeatureCollection",
-            "features": features
-        }
-        
-        return JsonResponse(geojson_data)
+        try:
+            level = level_from_params(request.GET)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        etag, payload = get_district_choropleth(level)
+        accepts_gzip = 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if not accepts_gzip:
+            etag = f'{etag[:-1]}-identity"'
+
+        if_none_match = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+        if etag in if_none_match or '*' in if_none_match:
+            response = HttpResponseNotModified()
+        elif accepts_gzip:
+            response = HttpResponse(payload, content_type='application/json')
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(gzip.decompress(payload), content_type='application/json')
+
+        response['ETag'] = etag
+        response['Cache-Control'] = 'no-cache'  # 매번 ETag로 재검증
+        response['Vary'] = 'Accept-Encoding'
+        return response
         
     except Exception as e:
         print(f"Seoul districts GeoJSON error: {e}")
@@ -786,104 +755,61 @@ def get_seoul_districts_geojson(request):
 
 
 def get_dong_stores(request):
-    """행정동별 점포 데이터 API - 행정동 이름으로 직접 조회 (성능 최적화)"""
+    """
+    행정동별 점포 데이터 API (미리 변환한 EPSG:4326 점 사용)
+
+    Args:
+        emd_cd: 행정동 코드
+        zoom: 지도 줌 레벨 - CLUSTER_MAX_ZOOM 미만이면 격자 클러스터(점포 수·생존 구성) 응답
+        mode: auto(기본) / points / clusters
+        format: json(기본, 커서 페이지 FeatureCollection) / ndjson(전체 점포를 한 줄에 Feature 하나씩 스트리밍)
+        cursor, limit: 페이지 커서(이전 응답의 next_cursor)와 페이지 크기
+
+    Note:
+        - 점포를 잘라내지 않음: next_cursor가 null이 될 때까지 이어서 요청하거나 format=ndjson 사용
+    """
     try:
         emd_cd = request.GET.get('emd_cd')  # 행정동 코드
         
         if not emd_cd:
             return JsonResponse({'error': 'emd_cd parameter required'}, status=400)
-        
-        from django.db import connection
-        
-        with connection.cursor() as cursor:
-            # 행정동 이름 조회
-            cursor.execute("""
-                SELECT emd_kor_nm FROM "행정동구역" WHERE emd_cd = %s
-            """, [emd_cd])
-            
-            dong_result = cursor.fetchone()
-            if not dong_result:
-                return JsonResponse({'error': 'Invalid emd_cd'}, status=400)
-            
-            emd_kor_nm = dong_result[0]
-            
-            # 🚀 성능 최적화: 한 번의 쿼리로 모든 점포 데이터와 좌표 변환을 동시에 처리
-            cursor.execute("""
-                SELECT 
-                    "BPLCNM",
-                    "UPTAENM", 
-                    "SITEWHLADDR",
-                    "result",
-                    ST_X(ST_Transform(ST_SetSRID(ST_MakePoint("X", "Y"), 2097), 4326)) as lon,
-                    ST_Y(ST_Transform(ST_SetSRID(ST_MakePoint("X", "Y"), 2097), 4326)) as lat
-                FROM dong_store
-                WHERE emd_kor_nm = %s
-                    AND "X" IS NOT NULL 
-                    AND "Y" IS NOT NULL
-                    AND "UPTAENM" IS NOT NULL
-                ORDER BY "UPTAENM"
-                LIMIT 500
-            """, [emd_kor_nm])
-            
-            stores = cursor.fetchall()
 
-            # GeoJSON 형태로 변환 (이미 변환된 좌표 사용)
-            features = []
-            conversion_success = 0
-            conversion_failed = 0
-            
-            for store in stores:
-                상호명, 업종명, 주소, 생존예측, lon, lat = store
-                
-                # NULL 값 처리
-                상호명 = 상호명 or 업종명 or '상호명 미상'
-                업종명 = 업종명 or '업종 미상'
-                주소 = 주소 or '주소 미상'
-                
-                # 좌표 유효성 검사
-                if lon is None or lat is None:
-                    conversion_failed += 1
-                    continue
-                
-                # 변환된 좌표가 서울 범위 내인지 확인
-                if not (126.7 <= lon <= 127.3 and 37.4 <= lat <= 37.7):
-                    conversion_failed += 1
-                    continue
-                
-                conversion_success += 1
-                
-                # 생존 상태 처리
-                if 생존예측 is True:
-                    생존상태 = '생존 예상'
-                elif 생존예측 is False:
-                    생존상태 = '위험'
-                else:
-                    생존상태 = '분석중'
-                
-                # GeoJSON Feature 생성 (이미 변환된 좌표 사용)
-                feature = {
-                    "type": "Feature",
-                    "geometry": {
-                        "type": "Point",
-                        "coordinates": [lon, lat]
-                    },
-                    "properties": {
-                        "상호명": 상호명,
-                        "업종명": 업종명,
-                        "주소": 주소,
-                        "생존상태": 생존상태
-                    }
-                }
-                features.append(feature)
-            
-            result = {
-                "type": "FeatureCollection",
-                "features": features,
-                "dong_name": emd_kor_nm,
-                "total_stores": len(features)
-            }
-            
-            return JsonResponse(result)
+        mode = request.GET.get('mode', 'auto')
+        output_format = request.GET.get('format', 'json')
+        if mode not in ('auto', 'points', 'clusters'):
+            return JsonResponse({'error': 'mode must be auto, points or clusters'}, status=400)
+        if output_format not in ('json', 'ndjson'):
+            return JsonResponse({'error': 'format must be json or ndjson'}, status=400)
+        try:
+            zoom = float(request.GET['zoom']) if request.GET.get('zoom') else None
+            after = int(request.GET.get('cursor') or 0)
+            limit = page_size(request.GET.get('limit'))
+        except ValueError:
+            return JsonResponse({'error': 'Invalid zoom, cursor or limit'}, status=400)
+        if zoom is not None and not 0 <= zoom <= 24:
+            return JsonResponse({'error': 'zoom must be between 0 and 24'}, status=400)
+
+        emd_kor_nm = get_dong_name(emd_cd)
+        if not emd_kor_nm:
+            return JsonResponse({'error': 'Invalid emd_cd'}, status=400)
+
+        if mode == 'auto':
+            mode = 'clusters' if zoom is not None and zoom < cluster_max_zoom() else 'points'
+        if mode == 'clusters':
+            if zoom is None:
+                return JsonResponse({'error': 'zoom parameter required for clusters'}, status=400)
+            return HttpResponse(store_clusters_text(emd_kor_nm, zoom), content_type='application/json')
+
+        if output_format == 'ndjson':
+            # 비동기 이터레이터: ASGI에서 페이지가 조회될 때마다 바로 전송 (동기 생성기는 끝까지 버퍼링됨)
+            response = StreamingHttpResponse(
+                aiter_store_features(emd_kor_nm, after), content_type='application/geo+json-seq'
+            )
+            response['X-Dong-Name'] = quote(emd_kor_nm)
+            return response
+
+        # FeatureCollection은 DB에서 Feature JSON 텍스트로 만들어지므로 파싱 없이 이어 붙여 전송
+        return HttpResponse(store_page_text(emd_kor_nm, after, limit), content_type='application/json')
             
     except Exception as e:
         print(f"❌ 점포 데이터 조회 실패: {e}")
@@ -891,108 +817,56 @@ def get_dong_stores(request):
 
 
 def get_dong_geojson(request):
-    """행정동별 경계면 GeoJSON 데이터 API"""
+    """
+    행정동별 경계면 GeoJSON 데이터 API (단일 집합 쿼리, gu_code·단순화 레벨별 캐시)
+
+    Note:
+        - zoom 또는 tolerance(m) 파라미터가 있으면 해당 단순화 레벨의 EPSG:4326 경계, 없으면 기존 원본 좌표계
+    """
     try:
         gu_code = request.GET.get('gu_code')  # 구 코드 (예: 11110)
         
         if not gu_code:
             return JsonResponse({'error': 'gu_code parameter required'}, status=400)
+        if not gu_code.isdigit() or len(gu_code) > 10:
+            return JsonResponse({'error': 'Invalid gu_code'}, status=400)
+        try:
+            level = level_from_params(request.GET)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
         
-        from django.db import connection
-        
-        with connection.cursor() as cursor:
-            # 행정동 기본 정보 조회 (원본 좌표계 사용)
-            cursor.execute("""
-                SELECT emd_cd, emd_kor_nm, emd_eng_nm, ST_AsGeoJSON(geom) as geometry
-                FROM "행정동구역"
-                WHERE emd_cd LIKE %s
-                ORDER BY emd_cd
-            """, [f"{gu_code}%"])
-            
-            admin_results = cursor.fetchall()
-            
-            # 각 행정동의 인구 데이터 조회
-            results = []
-            for admin_row in admin_results:
-                emd_cd, emd_kor_nm, emd_eng_nm, geometry = admin_row
-                
-                # 거주인구 조회
-                cursor.execute("""
-                    SELECT COALESCE(총생활인구수_sum, 0) FROM dong_life WHERE emd_cd = %s
-                """, [emd_cd])
-                dong_life = int(cursor.fetchone()[0] or 0)
-                
-                # 직장인구 조회
-                cursor.execute("""
-                    SELECT COALESCE(총_직장_인구_수_sum, 0) FROM dong_work WHERE emd_cd = %s
-                """, [emd_cd])
-                dong_work = int(cursor.fetchone()[0] or 0)
-                
-                # 실제 업체 수 조회 (dong_store 테이블에서 COUNT)
-                cursor.execute("""
-                    SELECT COUNT(*) FROM dong_store ds
-                    JOIN "행정동구역" ad ON ds.emd_kor_nm = ad.emd_kor_nm
-                    WHERE ad.emd_cd = %s
-                """, [emd_cd])
-                total_businesses = int(cursor.fetchone()[0] or 0)
-                
-                # 평균 생존률 조회 (store_result 테이블에서)
-                cursor.execute("""
-                    SELECT COALESCE(AVG(result * 100), 0) 
-                    FROM "store_result" sr
-                    JOIN "행정동구역" ad ON sr.emd_kor_nm = ad.emd_kor_nm
-                    WHERE ad.emd_cd = %s AND sr.result IS NOT NULL
-                """, [emd_cd])
-                avg_survival_rate = float(cursor.fetchone()[0] or 0)
-                
-                # 가장 많은 업종 조회 (dong_store 테이블에서)
-                cursor.execute("""
-                    SELECT ds."UPTAENM", COUNT(*) as count
-                    FROM dong_store ds
-                    JOIN "행정동구역" ad ON ds.emd_kor_nm = ad.emd_kor_nm
-                    WHERE ad.emd_cd = %s AND ds."UPTAENM" IS NOT NULL
-                    GROUP BY ds."UPTAENM"
-                    ORDER BY count DESC
-                    LIMIT 1
-                """, [emd_cd])
-                
-                top_business_result = cursor.fetchone()
-                if top_business_result:
-                    top_business_type, top_business_count = top_business_result
-                else:
-                    top_business_type, top_business_count = "정보없음", 0
-                
-                results.append((emd_cd, emd_kor_nm, emd_eng_nm, geometry, dong_life, dong_work, 
-                              total_businesses, avg_survival_rate, top_business_type, top_business_count))
-        
-        features = []
-        for row in results:
-            emd_cd, emd_kor_nm, emd_eng_nm, geometry, dong_life, dong_work, total_businesses, avg_survival_rate, top_business_type, top_business_count = row
-            
-            feature = {
-                "type": "Feature",
-                "properties": {
-                    "emd_cd": emd_cd,
-                    "emd_kor_nm": emd_kor_nm,
-                    "emd_eng_nm": emd_eng_nm,
-                    "dong_life": int(dong_life) if dong_life else 0,
-                    "dong_work": int(dong_work) if dong_work else 0,
-                    "total_businesses": int(total_businesses) if total_businesses else 0,
-                    "avg_survival_rate": round(float(avg_survival_rate), 1),
-                    "top_business_type": top_business_type,
-                    "top_business_count": int(top_business_count)
-                },
-                "geometry": json.loads(geometry) if geometry else None
-            }
-            features.append(feature)
-        
-        geojson_data = {
-            "type": "FeatureCollection",
-            "features": features
-        }
-        
-        return JsonResponse(geojson_data)
+        # FeatureCollection은 DB에서 JSON 텍스트로 만들어지므로 파싱 없이 그대로 전송
+        return HttpResponse(get_dong_geojson_text(gu_code, level), content_type='application/json')
         
     except Exception as e:
         print(f"Dong GeoJSON error: {e}")
-        return JsonResponse({'error': str(e)}, status=500) 
\ No newline at end of file
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+def vector_tile(request, layer, z, x, y):
+    """
+    Mapbox Vector Tile API (구 / 행정동 / 점포 / 점포 예측 결과 레이어)
+
+    Args:
+        layer (str): districts / dongs / stores / store_results
+        z, x, y (int): 타일 좌표 (XYZ, EPSG:3857)
+
+    Note:
+        - 속성 필터: ?uptaenm=한식&uptaenm=카페, ?emd_kor_nm=..., ?gu_code=11110 (레이어별 지원 필터만 적용,
+          등록된 업종/행정동명과 5자리 구 코드가 아니면 400)
+        - 캐시에 있으면 DB를 조회하지 않음, 내용이 없는 타일은 204
+    """
+    try:
+        if layer not in TILE_LAYERS:
+            return JsonResponse({'error': f'Unknown layer: {layer}'}, status=404)
+        payload = get_tile(layer, z, x, y, parse_tile_filters(layer, request.GET))
+    except TileError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        print(f"❌ 벡터 타일 생성 실패 ({layer}/{z}/{x}/{y}): {e}")
+        return JsonResponse({'error': str(e)}, status=500)
+
+    response = HttpResponse(payload, status=200 if payload else 204, content_type='application/vnd.mapbox-vector-tile')
+    max_age = getattr(settings, 'DASHBOARD_SETTINGS', {}).get('VECTOR_TILES', {}).get('MAX_AGE', 60 * 60)
+    response['Cache-Control'] = f'public, max-age={max_age}'
+    return response
@@ -766,23 +766,30 @@ class SeoulCommercialMap {
                 this.map.removeLayer(this.storeLayer);
             }
             
-            // 점포 데이터 API 호출
-            const apiUrl = `/shopdash/api/dong-stores/?emd_cd=${dongCode}`;
-            const response = await fetch(apiUrl);
+            // 점포 데이터 API 호출 (next_cursor가 없을 때까지 페이지 단위로 이어서 조회)
+            const vectorSource = new ol.source.Vector();
+            const geoJsonFormat = new ol.format.GeoJSON();
+            const storeData = { total_stores: 0 };
+            let cursor = null;
             
-            if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status}`);
-            }
-            
-            const storeData = await response.json();
-            
-            // Vector Source 생성 (백엔드에서 이미 EPSG:4326으로 변환됨)
-            const vectorSource = new ol.source.Vector({
-                features: new ol.format.GeoJSON().readFeatures(storeData, {
+            do {
+                const apiUrl = `/shopdash/api/dong-stores/?emd_cd=${dongCode}${cursor ? `&cursor=${cursor}` : ''}`;
+                const response = await fetch(apiUrl);
+                
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}`);
+                }
+                
+                const page = await response.json();
+                
+                // 백엔드에서 이미 EPSG:4326으로 변환됨
+                vectorSource.addFeatures(geoJsonFormat.readFeatures(page, {
                     dataProjection: 'EPSG:4326',
                     featureProjection: 'EPSG:3857'
-                })
-            });
+                }));
+                storeData.total_stores += page.total_stores;
+                cursor = page.next_cursor;
+            } while (cursor);
             
             // 🚀 성능 개선: 동적 스타일링 (생존상태에 따른 색상)
             const createStoreStyle = (feature) => {